@@ -18,11 +18,45 @@ from .scoring import (
     calculate_criticality_scores,
     calculate_account_health_score,
     calculate_temporal_clustering_penalty,
+    build_score_features,
+    score_components,
+    ScoreWeights,
+)
+from .rescoring import (
+    SCORE_FEATURES_FILE,
+    score_feature_table,
+    save_score_features,
+    load_score_features,
+    load_weights,
+    load_weight_profiles,
+    rescore,
+    rescore_run,
+    sensitivity_sweep,
 )
 from .asset_correlation import (
     analyze_asset_correlations,
     build_account_intelligence_brief,
 )
+from .fleet_index import (
+    FleetAssetIndex,
+    AssetSighting,
+    FailureCluster,
+    FAILURE_CLUSTER_WINDOW_DAYS,
+)
+from .result_tables import (
+    TABLES_DIR,
+    case_table,
+    message_score_table,
+    timeline_table,
+    opportunity_table,
+    deployment_table,
+    support_case_table,
+    evaluation_table,
+    save_case_tables,
+    save_result_table,
+    find_result_table,
+    load_result_table,
+)
 
 __all__ = [
     # Data loading
@@ -40,8 +74,42 @@ __all__ = [
     'calculate_criticality_scores',
     'calculate_account_health_score',
     'calculate_temporal_clustering_penalty',
+    'build_score_features',
+    'score_components',
+    'ScoreWeights',
+
+    # Re-scoring
+    'SCORE_FEATURES_FILE',
+    'score_feature_table',
+    'save_score_features',
+    'load_score_features',
+    'load_weights',
+    'load_weight_profiles',
+    'rescore',
+    'rescore_run',
+    'sensitivity_sweep',
 
     # Asset correlation
     'analyze_asset_correlations',
     'build_account_intelligence_brief',
+
+    # Fleet asset index
+    'FleetAssetIndex',
+    'AssetSighting',
+    'FailureCluster',
+    'FAILURE_CLUSTER_WINDOW_DAYS',
+
+    # Result tables
+    'TABLES_DIR',
+    'case_table',
+    'message_score_table',
+    'timeline_table',
+    'opportunity_table',
+    'deployment_table',
+    'support_case_table',
+    'evaluation_table',
+    'save_case_tables',
+    'save_result_table',
+    'find_result_table',
+    'load_result_table',
 ]
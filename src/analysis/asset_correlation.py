@@ -9,6 +9,30 @@ from typing import Any, Dict, List
 from ..core import streaming_output
 
 
+# Serial patterns, compiled once. Chassis serials contain a dash and drive
+# serials do not, so a serial always gets the same component type.
+CHASSIS_SERIAL_PATTERNS = [
+    re.compile(r'(A1-\d{6,})', re.IGNORECASE),  # New chassis
+    re.compile(r'(R[123]-\d{6,})', re.IGNORECASE),  # Refurbished chassis
+]
+DRIVE_SERIAL_PATTERNS = [
+    re.compile(r'(WD[A-Z0-9]{8,})', re.IGNORECASE),  # Western Digital
+    re.compile(r'(ST[A-Z0-9]{8,})', re.IGNORECASE),  # Seagate
+    re.compile(r'(SAMSUNG[A-Z0-9]{6,})', re.IGNORECASE),  # Samsung
+]
+
+
+def serial_record(serial: str, component_type: str) -> Dict:
+    """Metadata dict of an extracted (upper-cased) serial."""
+    is_refurb = component_type == 'Chassis' and serial.startswith('R')
+    return {
+        'serial': serial,
+        'component_type': component_type,
+        'is_refurb': is_refurb,
+        'refurb_level': serial[:2] if is_refurb else None,
+    }
+
+
 def extract_serials_from_text(text: str) -> List[Dict]:
     """
     Extract serial numbers from message text.
@@ -24,46 +48,15 @@ def extract_serials_from_text(text: str) -> List[Dict]:
 
     serials = []
 
-    # TrueNAS chassis serial patterns
-    chassis_patterns = [
-        r'(A1-\d{6,})',  # New chassis
-        r'(R[123]-\d{6,})',  # Refurbished chassis
-    ]
-
-    # Drive serial patterns
-    drive_patterns = [
-        r'(WD[A-Z0-9]{8,})',  # Western Digital
-        r'(ST[A-Z0-9]{8,})',  # Seagate
-        r'(SAMSUNG[A-Z0-9]{6,})',  # Samsung
-        r'([A-Z0-9]{12,20})',  # Generic long serial
-    ]
-
     # Extract chassis serials
-    for pattern in chassis_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            serial = match.upper()
-            is_refurb = serial.startswith('R')
-            refurb_level = serial[:2] if is_refurb else None
-
-            serials.append({
-                'serial': serial,
-                'component_type': 'Chassis',
-                'is_refurb': is_refurb,
-                'refurb_level': refurb_level
-            })
+    for pattern in CHASSIS_SERIAL_PATTERNS:
+        for match in pattern.findall(text):
+            serials.append(serial_record(match.upper(), 'Chassis'))
 
-    # Extract drive serials (less aggressive matching)
-    for pattern in drive_patterns[:3]:  # Only named patterns
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            serial = match.upper()
-            serials.append({
-                'serial': serial,
-                'component_type': 'Drive',
-                'is_refurb': False,
-                'refurb_level': None
-            })
+    # Extract drive serials (named vendor patterns only)
+    for pattern in DRIVE_SERIAL_PATTERNS:
+        for match in pattern.findall(text):
+            serials.append(serial_record(match.upper(), 'Drive'))
 
     return serials
 
@@ -101,41 +94,34 @@ def analyze_asset_correlations(
     refurb_breakdown = {'R1': 0, 'R2': 0, 'R3': 0}
 
     for case in case_analysis:
-        case_serials = set()
+        # serial -> metadata, from the case's asset serial and its messages
+        case_serials = {}
 
         # Get asset serial from case data
         asset_serial = str(case.get('asset_serial', '')).strip()
         if asset_serial and asset_serial.lower() not in ['', 'nan', 'none']:
-            extracted = extract_serials_from_text(asset_serial)
-            for item in extracted:
-                case_serials.add(item['serial'])
+            for item in extract_serials_from_text(asset_serial):
+                case_serials.setdefault(item['serial'], item)
 
         # Extract serials from messages
         messages = case.get('messages_full', '')
         if messages:
-            extracted = extract_serials_from_text(messages)
-            for item in extracted:
-                case_serials.add(item['serial'])
+            for item in extract_serials_from_text(messages):
+                case_serials.setdefault(item['serial'], item)
 
         if case_serials:
             cases_with_asset_data += 1
 
         # Map serials to cases
-        for serial in case_serials:
-            if serial not in serial_to_cases:
-                serial_to_cases[serial] = []
-
-            # Get serial metadata
-            serial_info = extract_serials_from_text(serial)
-            component_type = serial_info[0]['component_type'] if serial_info else 'Unknown'
-            is_refurb = serial_info[0]['is_refurb'] if serial_info else False
-            refurb_level = serial_info[0]['refurb_level'] if serial_info else None
+        for serial, serial_info in case_serials.items():
+            is_refurb = serial_info['is_refurb']
+            refurb_level = serial_info['refurb_level']
 
-            serial_to_cases[serial].append({
+            serial_to_cases.setdefault(serial, []).append({
                 'case_number': case['case_number'],
                 'criticality_score': case['criticality_score'],
                 'severity': case['severity'],
-                'component_type': component_type,
+                'component_type': serial_info['component_type'],
                 'is_refurb': is_refurb,
                 'refurb_level': refurb_level,
             })
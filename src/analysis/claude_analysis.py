@@ -17,6 +17,8 @@ import numpy as np
 import pandas as pd
 
 from ..core import get_claude_client, streaming_output, Config
+from ..context.product_context import ProductContext
+from ..context.retrieval import RetrievalContext
 from .data_loader import build_tech_map_for_case
 
 
@@ -76,6 +78,21 @@ CHURN RISK INDICATORS:
 """
 
 
+def context_for_case(analysis_context: Any, query: str, case_number: Any = None) -> str:
+    """
+    Prompt context of one case.
+
+    A ProductContext first selects the context of the case's product line.
+    A RetrievalContext adds the documentation passages relevant to the
+    query (case details and messages); a plain string is used as-is.
+    """
+    if isinstance(analysis_context, ProductContext):
+        analysis_context = analysis_context.for_case_number(case_number)
+    if isinstance(analysis_context, RetrievalContext):
+        return analysis_context.for_case(query)
+    return analysis_context
+
+
 def extract_frustrated_excerpts(case_data: pd.DataFrame, frustrated_phrases: List[str]) -> List[Dict]:
     """
     Extract message excerpts containing frustrated phrases.
@@ -334,6 +351,11 @@ def run_claude_analysis(
             })
 
         messages_json = json.dumps(messages_to_analyze, indent=2)
+        case_context = context_for_case(
+            analysis_context,
+            f"{severity} {support_level} " + " ".join(m['text'] for m in messages_to_analyze),
+            case_num,
+        )
 
         # ORIGINAL HAIKU PROMPT - ENHANCED FOR BUSINESS IMPACT DETECTION
         claude_prompt = f"""Analyze EACH message in this support case individually for frustration level.
@@ -345,7 +367,7 @@ Case Duration: {case_age} days
 Total Messages: {interaction_count}
 Severity: {severity}
 
-{analysis_context}
+{case_context}
 
 MESSAGES TO ANALYZE:
 {messages_json}
@@ -689,6 +711,12 @@ def run_deepseek_quick_scoring(
         else:
             messages_for_deepseek = messages_full[:12000]
 
+        case_context = context_for_case(
+            analysis_context,
+            f"{case['severity']} {case.get('issue_category', '')} {key_phrase} {messages_for_deepseek}",
+            case['case_number'],
+        )
+
         # ENHANCED SONNET QUICK SCORING PROMPT
         quick_prompt = f"""Assess this customer support case for prioritization scoring.
 
@@ -704,7 +732,7 @@ Severity: {case['severity']}
 KEY PHRASE DETECTED BY INITIAL ANALYSIS:
 "{key_phrase}"
 
-{analysis_context}
+{case_context}
 
 CRITICAL SIGNALS TO WATCH FOR:
 - Executive involvement: "execs", "management", "CEO", "CTO", "board"
@@ -849,6 +877,11 @@ def run_deepseek_detailed_timeline(
                     asset_section = f"\nASSET CORRELATION: This asset ({serial}) appears in {len(related)} cases.\n"
 
         account_brief_full = account_brief[:2500] if account_brief else "Enterprise storage customer."
+        case_context = context_for_case(
+            analysis_context,
+            f"{case['severity']} {case.get('issue_category', '')} {case.get('messages_full', '')}",
+            case['case_number'],
+        )
 
         # STEP 1: ORIGINAL TIMELINE PROMPT
         timeline_prompt = f"""{account_brief_full}
@@ -865,7 +898,7 @@ Case Duration: {case['case_age_days']} days
 Message Count: {case['interaction_count']} messages
 Initial Assessment: {case['claude_analysis']['frustration_score']}/10 frustration score
 
-{analysis_context}
+{case_context}
 
 RESPONSE OWNERSHIP CONTEXT (CRITICAL):
 Each message below is marked with [CUSTOMER] or [SUPPORT] and includes delay attribution.
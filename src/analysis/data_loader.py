@@ -14,9 +14,11 @@ from pathlib import Path
 from datetime import datetime
 from typing import Tuple, Optional, Dict, Any
 
+import numpy as np
 import pandas as pd
 
 from ..core import print_progress, print_success, print_warning, streaming_output
+from ..data.normalization import normalize_severity_codes, parse_date_column
 
 
 def extract_tech_info_from_message(message_text: str) -> Optional[Dict[str, str]]:
@@ -218,10 +220,7 @@ def load_and_prepare_data(
 
     # Parse dates
     if "Message Date" in df.columns:
-        try:
-            df["Message Date"] = pd.to_datetime(df["Message Date"], errors="coerce")
-        except:
-            df["Message Date"] = pd.NaT
+        df["Message Date"] = parse_date_column(df["Message Date"])
         df["Message Date"] = df["Message Date"].fillna(current_date)
     else:
         if "Created Date" in df.columns:
@@ -235,19 +234,13 @@ def load_and_prepare_data(
         df["Status"] = df["Status"].fillna("Unknown")
 
     if "Created Date" in df.columns:
-        try:
-            df["Created Date"] = pd.to_datetime(df["Created Date"], errors="coerce")
-        except:
-            df["Created Date"] = pd.NaT
+        df["Created Date"] = parse_date_column(df["Created Date"])
         df["Created Date"] = df["Created Date"].fillna(current_date)
     else:
         df["Created Date"] = current_date
 
     if "Last Modified Date" in df.columns:
-        try:
-            df["Last Modified Date"] = pd.to_datetime(df["Last Modified Date"], errors="coerce")
-        except:
-            df["Last Modified Date"] = pd.NaT
+        df["Last Modified Date"] = parse_date_column(df["Last Modified Date"])
         df["Last Modified Date"] = df["Last Modified Date"].fillna(current_date)
     else:
         df["Last Modified Date"] = current_date
@@ -259,22 +252,103 @@ def load_and_prepare_data(
         df["case_age_days"] = df["case_age_days"].fillna(0).astype(int)
 
     # Normalize severity
-    def extract_severity(severity_str):
-        severity_str = str(severity_str).upper()
-        if "S1" in severity_str:
-            return "S1"
-        elif "S2" in severity_str:
-            return "S2"
-        elif "S3" in severity_str:
-            return "S3"
-        elif "S4" in severity_str:
-            return "S4"
+    df["Severity"] = normalize_severity_codes(df["Severity"])
+
+    return df, current_date
+
+
+# Phrases that mark a case as a duplicate of another case
+DUPLICATE_INDICATORS = [
+    'duplicate case',
+    'closing as duplicate',
+    'duplicate ticket',
+    'closed as duplicate',
+    'this is a duplicate of',
+    'related open case',
+    'closing this case as a duplicate',
+]
+DUPLICATE_INDICATOR_PATTERN = re.compile('|'.join(re.escape(p) for p in DUPLICATE_INDICATORS))
+# Every indicator contains one of these, so a plain substring check can
+# rule out most cases before the regex runs
+DUPLICATE_INDICATOR_ANCHORS = ('duplicate', 'related open case')
+
+# Parent case references, checked in priority order: "case id", "ticket", "case #".
+# ("open case id NNNNN" is covered by the "case id" alternative.)
+PARENT_REFERENCE_KINDS = ['case_id', 'ticket', 'case_hash']
+PARENT_REFERENCE_PATTERN = re.compile(
+    r'case\s*id:?\s*#?0*(?P<case_id>\d{5,8})'
+    r'|ticket\s*#?0*(?P<ticket>\d{5,8})'
+    r'|case\s*#0*(?P<case_hash>\d{5,8})'
+)
+
+
+def _build_case_number_index(case_numbers) -> Dict[int, Any]:
+    """
+    Map numeric case numbers to the key used in the dataframe.
+
+    Case numbers may be stored as ints or as strings with or without zero
+    padding. When several keys share a number, numeric keys win, then the
+    unpadded string, then the 8-digit padded string.
+    """
+    index: Dict[int, Any] = {}
+    ranks: Dict[int, int] = {}
+
+    for key in case_numbers:
+        if isinstance(key, (int, float, np.integer, np.floating)):
+            if key != key or int(key) != key:
+                continue
+            number, rank = int(key), 0
         else:
-            return "S4"
+            text = str(key).strip()
+            if not text.isdigit():
+                continue
+            number = int(text)
+            rank = 1 if text == str(number) else 2 if text == f"{number:08d}" else 3
 
-    df["Severity"] = df["Severity"].apply(extract_severity)
+        if number not in index or rank < ranks[number]:
+            index[number] = key
+            ranks[number] = rank
 
-    return df, current_date
+    return index
+
+
+def _resolve_parent_chains(parent_map: Dict[Any, Any]) -> Dict[Any, Any]:
+    """
+    Point every duplicate at the root of its chain (A -> B -> C gives A -> C).
+
+    Cycles (A dup of B, B dup of A) are broken by keeping the smallest case
+    number in the cycle as the root.
+    """
+    parent_map = dict(parent_map)
+
+    # Break cycles (nodes on the current walk are marked False, finished ones True)
+    finished: Dict[Any, bool] = {}
+    for start in list(parent_map):
+        path = []
+        node = start
+        while node in parent_map and node not in finished:
+            finished[node] = False
+            path.append(node)
+            node = parent_map[node]
+        if finished.get(node) is False:
+            cycle = path[path.index(node):]
+            del parent_map[min(cycle, key=str)]
+        for member in path:
+            finished[member] = True
+
+    # Resolve roots, remembering each resolved node
+    roots: Dict[Any, Any] = {}
+    for start in parent_map:
+        path = []
+        node = start
+        while node in parent_map and node not in roots:
+            path.append(node)
+            node = parent_map[node]
+        root = roots.get(node, node)
+        for member in path:
+            roots[member] = root
+
+    return roots
 
 
 def detect_and_merge_case_relationships(
@@ -284,6 +358,12 @@ def detect_and_merge_case_relationships(
     """
     Detect duplicate relationships and merge child cases into parents.
 
+    Messages are joined per case once, duplicate indicators and parent
+    references are found with single compiled patterns, and parents are
+    resolved through a normalized case-number index. Duplicate rows are
+    relabelled in place and escalation-event rows inserted ahead of them,
+    so the merge is one concat/sort rather than one frame per case.
+
     Args:
         df: DataFrame with case data
         console_output: Object with stream_message() method for output
@@ -294,137 +374,138 @@ def detect_and_merge_case_relationships(
     if console_output is None:
         console_output = streaming_output
 
-    # Build case number to messages map
-    case_groups = df.groupby('Case Number')
+    console_output.stream_message("\nDetecting case relationships (duplicates/escalations)...")
+
+    source_df = df
+    df = df[df['Case Number'].notna()]
+    messages = df['Message'].dropna().astype(str)
+    if messages.empty:
+        console_output.stream_message("  No duplicate relationships detected")
+        return source_df
+
+    # Join each case's messages (in row order) without a per-group Python agg
+    codes, case_keys = pd.factorize(df.loc[messages.index, 'Case Number'], sort=True)
+    ordered_messages = messages.to_numpy()[np.argsort(codes, kind='stable')].tolist()
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(case_keys)))))
+    case_texts = pd.Series(
+        [' '.join(ordered_messages[bounds[i]:bounds[i + 1]]).lower() for i in range(len(case_keys))],
+        index=case_keys,
+        dtype=object,
+    )
+    case_index = _build_case_number_index(df['Case Number'].unique())
 
     parent_map = {}  # child_case_num -> parent_case_num
-    duplicate_cases = set()
 
-    console_output.stream_message("\nDetecting case relationships (duplicates/escalations)...")
+    # PHASE 1: Detect relationships (only cases with a duplicate indicator)
+    flagged = case_texts[[
+        any(anchor in text for anchor in DUPLICATE_INDICATOR_ANCHORS)
+        and DUPLICATE_INDICATOR_PATTERN.search(text) is not None
+        for text in case_texts
+    ]]
 
-    # PHASE 1: Detect relationships
-    for case_num, case_data in case_groups:
-        messages_text = ' '.join(case_data['Message'].dropna().astype(str)).lower()
-
-        # Look for duplicate indicators
-        duplicate_indicators = [
-            'duplicate case',
-            'closing as duplicate',
-            'duplicate ticket',
-            'closed as duplicate',
-            'this is a duplicate of',
-            'related open case',
-            'closing this case as a duplicate',
-        ]
-
-        is_duplicate = any(indicator in messages_text for indicator in duplicate_indicators)
-
-        if is_duplicate:
-            # Extract parent case reference
-            patterns = [
-                r'case\s*id:?\s*#?0*(\d{5,8})',
-                r'ticket\s*#?0*(\d{5,8})',
-                r'case\s*#0*(\d{5,8})',
-                r'open\s+case\s+id:?\s*#?0*(\d{5,8})',
-            ]
-
-            for pattern in patterns:
-                matches = re.findall(pattern, messages_text)
-                for match in matches:
-                    parent_num = int(match)
-
-                    # Normalize current case number for comparison
-                    try:
-                        current_case_normalized = int(case_num)
-                    except (ValueError, TypeError):
-                        current_case_normalized = case_num
-
-                    # Verify it's not self-reference
-                    if parent_num == current_case_normalized:
-                        continue
-
-                    # Check if parent exists
-                    parent_exists = False
-                    for check_num in [parent_num, str(parent_num), f"{parent_num:08d}"]:
-                        if check_num in case_groups.groups:
-                            parent_exists = True
-                            parent_num = check_num
-                            break
-
-                    if parent_exists:
-                        parent_map[case_num] = parent_num
-                        duplicate_cases.add(case_num)
-                        console_output.stream_message(f"  Case {case_num} is duplicate of {parent_num}")
-                        break
-                    else:
-                        if case_num not in parent_map:
-                            console_output.stream_message(
-                                f"  Case {case_num} references parent {parent_num} (not in dataset)"
-                            )
-
-                if case_num in parent_map:
+    for case_num, messages_text in flagged.items():
+        try:
+            current_case_normalized = int(case_num)
+        except (ValueError, TypeError):
+            current_case_normalized = case_num
+
+        references: Dict[str, list] = {kind: [] for kind in PARENT_REFERENCE_KINDS}
+        for match in PARENT_REFERENCE_PATTERN.finditer(messages_text):
+            references[match.lastgroup].append(int(match.group(match.lastgroup)))
+
+        for kind in PARENT_REFERENCE_KINDS:
+            for parent_num in references[kind]:
+                # Verify it's not self-reference
+                if parent_num == current_case_normalized:
+                    continue
+
+                parent_key = case_index.get(parent_num)
+                if parent_key is not None:
+                    parent_map[case_num] = parent_key
+                    console_output.stream_message(f"  Case {case_num} is duplicate of {parent_key}")
                     break
+                console_output.stream_message(
+                    f"  Case {case_num} references parent {parent_num} (not in dataset)"
+                )
+
+            if case_num in parent_map:
+                break
 
-    if len(duplicate_cases) == 0:
+    if len(parent_map) == 0:
         console_output.stream_message("  No duplicate relationships detected")
-        return df
+        return source_df
 
-    console_output.stream_message(f"\n  Found {len(duplicate_cases)} duplicate cases to merge")
+    console_output.stream_message(f"\n  Found {len(parent_map)} duplicate cases to merge")
 
-    # PHASE 2: Merge duplicates into parents
-    merged_rows = []
-
-    for case_num, case_data in case_groups:
-        if case_num in duplicate_cases:
-            # This is a duplicate - merge into parent
-            parent_num = parent_map[case_num]
-
-            # Create escalation event marker
-            escalation_event = pd.DataFrame([{
-                'Case Number': parent_num,
-                'Customer Name': case_data.iloc[0]['Customer Name'],
-                'Message': f"[ESCALATION EVENT] Customer spawned duplicate case {case_num} "
-                          f"indicating lack of response on this case. Messages from duplicate case follow below.",
-                'Message Date': case_data['Message Date'].min(),
-                'Severity': case_data.iloc[0]['Severity'],
-                'Support Level': case_data.iloc[0]['Support Level'],
-                'Created Date': case_data.iloc[0]['Created Date'],
-                'Last Modified Date': case_data.iloc[0]['Last Modified Date'],
-                'Status': case_data.iloc[0]['Status'],
-                'Case Age Days': case_data.iloc[0].get('Case Age Days', 0),
-            }])
-
-            merged_rows.append(escalation_event)
-
-            # Merge duplicate messages into parent
-            duplicate_messages = case_data.copy()
-            duplicate_messages['Case Number'] = parent_num
-            duplicate_messages['Message'] = (
-                "[DUPLICATE CASE " + str(case_num) + "] " +
-                duplicate_messages['Message'].astype(str)
-            )
-
-            merged_rows.append(duplicate_messages)
-
-            console_output.stream_message(
-                f"  Merged {len(case_data)} messages from case {case_num} -> parent {parent_num}"
-            )
-        else:
-            # Not a duplicate - include as-is
-            merged_rows.append(case_data)
+    # Follow chains so no messages land on a case that is itself merged away
+    parent_map = _resolve_parent_chains(parent_map)
 
-    # Combine all rows
-    df_merged = pd.concat(merged_rows, ignore_index=True)
+    # PHASE 2: Merge duplicates into parents
+    # Order rows as groupby would (by case number, original order within a case)
+    ordered = df.sort_values('Case Number', kind='stable')
+    case_numbers = ordered['Case Number']
+    is_duplicate = case_numbers.isin(parent_map.keys())
+    group_rank = pd.factorize(case_numbers, sort=True)[0]
+
+    duplicate_rows = ordered[is_duplicate]
+    first_rows = duplicate_rows.groupby('Case Number', sort=True).head(1).set_index('Case Number')
+    first_dates = duplicate_rows.groupby('Case Number', sort=True)['Message Date'].min()
+    message_counts = duplicate_rows.groupby('Case Number', sort=True).size().to_dict()
+
+    # Escalation event markers, one per duplicate case
+    escalations = pd.DataFrame({
+        'Case Number': [parent_map[c] for c in first_rows.index],
+        'Customer Name': first_rows['Customer Name'].values,
+        'Message': [
+            f"[ESCALATION EVENT] Customer spawned duplicate case {c} "
+            f"indicating lack of response on this case. Messages from duplicate case follow below."
+            for c in first_rows.index
+        ],
+        'Message Date': first_dates.reindex(first_rows.index).values,
+        'Severity': first_rows['Severity'].values,
+        'Support Level': first_rows['Support Level'].values,
+        'Created Date': first_rows['Created Date'].values,
+        'Last Modified Date': first_rows['Last Modified Date'].values,
+        'Status': first_rows['Status'].values,
+        'Case Age Days': (
+            first_rows['Case Age Days'].values if 'Case Age Days' in first_rows.columns else 0
+        ),
+    })
+
+    # Relabel duplicate messages onto their parent
+    merged = ordered.copy()
+    child_numbers = case_numbers[is_duplicate]
+    merged.loc[is_duplicate, 'Message'] = (
+        "[DUPLICATE CASE " + child_numbers.astype(str) + "] " +
+        merged.loc[is_duplicate, 'Message'].astype(str)
+    )
+    merged.loc[is_duplicate, 'Case Number'] = child_numbers.map(parent_map)
+
+    # Insert each escalation row directly ahead of its duplicate's messages
+    group_of = dict(zip(case_numbers.values, group_rank))
+    merged['_merge_group'] = group_rank
+    merged['_merge_slot'] = 1
+    escalations['_merge_group'] = [group_of[c] for c in first_rows.index]
+    escalations['_merge_slot'] = 0
+
+    df_merged = pd.concat([merged, escalations], ignore_index=True)
+    df_merged = df_merged.sort_values(['_merge_group', '_merge_slot'], kind='stable')
+    df_merged = df_merged.drop(columns=['_merge_group', '_merge_slot']).reset_index(drop=True)
+
+    for case_num in first_rows.index:
+        console_output.stream_message(
+            f"  Merged {message_counts[case_num]} messages from case {case_num} -> parent {parent_map[case_num]}"
+        )
 
     # Sort by case number and message date
     df_merged = df_merged.sort_values(['Case Number', 'Message Date'])
 
-    original_case_count = len(case_groups)
+    original_case_count = case_numbers.nunique()
     merged_case_count = df_merged['Case Number'].nunique()
 
     console_output.stream_message(f"\nMerge complete:")
     console_output.stream_message(f"  Original cases: {original_case_count}")
     console_output.stream_message(f"  After merging: {merged_case_count}")
-    console_output.stream_message(f"  Duplicates merged: {len(duplicate_cases)}")
+    console_output.stream_message(f"  Duplicates merged: {len(parent_map)}")
 
     return df_merged
@@ -0,0 +1,364 @@
+"""
+Fleet-wide asset index for cross-account hardware failure clustering.
+
+analyze_asset_correlations() looks at the cases of one account. The fleet
+index is built once over the support and deployment records of every
+account and maps:
+- serials -> sightings (account, case, source, date)
+- serial prefixes (chassis A1/R1-R3, WD/ST/SAMSUNG drives) -> sightings
+- manufacturing batches (prefix + BATCH_SUFFIX_LENGTH characters) -> sightings
+
+Message bodies are shared through MESSAGE_ARENA, so each distinct body is
+scanned once no matter how many records quote it.
+
+On top of the index, failure_clusters() finds batches (or prefixes, or
+serials) failing at several customers within a time window:
+
+    index = FleetAssetIndex.from_linked_data(linked_data)
+    index.for_serial("WDZX1234ABCD")
+    clusters = index.failure_clusters(window_days=30, min_accounts=2)
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from ..data.models import MESSAGE_ARENA, Deployment, SupportCase
+from .asset_correlation import extract_serials_from_text
+
+
+# Characters after the vendor prefix that identify a manufacturing batch
+BATCH_SUFFIX_LENGTH = 4
+
+# Default window of failure-cluster detection
+FAILURE_CLUSTER_WINDOW_DAYS = 30
+
+# Longest first, so SAMSUNG is not read as "SA..."
+_SERIAL_PREFIXES = ('SAMSUNG', 'A1', 'R1', 'R2', 'R3', 'WD', 'ST')
+
+_LEVELS = ('serial', 'prefix', 'batch')
+
+
+def serial_prefix(serial: str) -> str:
+    """Vendor / chassis prefix of an extracted serial (A1, R2, WD, ST, SAMSUNG)."""
+    for prefix in _SERIAL_PREFIXES:
+        if serial.startswith(prefix):
+            return prefix
+    return serial[:2]
+
+
+def serial_batch(serial: str) -> str:
+    """Batch key of an extracted serial: its prefix plus the next few characters."""
+    prefix = serial_prefix(serial)
+    rest = serial[len(prefix):].lstrip('-')
+    return prefix + rest[:BATCH_SUFFIX_LENGTH]
+
+
+def _field_serials(value: Any) -> Dict[str, str]:
+    """
+    Serials of an explicit serial-number field.
+
+    The field is authoritative, so a value too short for the message
+    patterns is still indexed as-is.
+    """
+    text = str(value or '').strip()
+    if text.lower() in ('', 'nan', 'none'):
+        return {}
+    serials = {item['serial']: item['component_type'] for item in extract_serials_from_text(text)}
+    if not serials:
+        serial = text.upper()
+        prefix = serial_prefix(serial)
+        if prefix in ('A1', 'R1', 'R2', 'R3') and '-' in serial:
+            serials[serial] = 'Chassis'
+        elif prefix in ('WD', 'ST', 'SAMSUNG'):
+            serials[serial] = 'Drive'
+        else:
+            serials[serial] = 'Unknown'
+    return serials
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    parsed = pd.to_datetime(str(value), errors='coerce')
+    return None if pd.isna(parsed) else parsed.to_pydatetime()
+
+
+@dataclass
+class AssetSighting:
+    """One serial seen in one support case or deployment."""
+    serial: str
+    component_type: str
+    account_name: str
+    case_number: str
+    source: str  # "support" or "deployment"
+    date: Optional[datetime] = None
+    order_number: str = ""
+
+    @property
+    def prefix(self) -> str:
+        return serial_prefix(self.serial)
+
+    @property
+    def batch(self) -> str:
+        return serial_batch(self.serial)
+
+
+@dataclass
+class FailureCluster:
+    """Sightings of one serial, prefix or batch at several accounts within a window."""
+    key: str
+    level: str  # "serial", "prefix" or "batch"
+    component_type: str
+    start: datetime
+    end: datetime
+    accounts: List[str] = field(default_factory=list)
+    case_numbers: List[str] = field(default_factory=list)
+    serials: List[str] = field(default_factory=list)
+
+    @property
+    def account_count(self) -> int:
+        return len(self.accounts)
+
+    @property
+    def span_days(self) -> int:
+        return (self.end - self.start).days
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'key': self.key,
+            'level': self.level,
+            'component_type': self.component_type,
+            'start': self.start.strftime("%Y-%m-%d"),
+            'end': self.end.strftime("%Y-%m-%d"),
+            'span_days': self.span_days,
+            'account_count': self.account_count,
+            'accounts': self.accounts,
+            'case_numbers': self.case_numbers,
+            'serials': self.serials,
+        }
+
+
+class FleetAssetIndex:
+    """
+    Serial, prefix and batch index over the records of every account.
+
+    Usage:
+        index = FleetAssetIndex.from_linked_data(linked_data)
+        index.for_prefix("R2")              # refurbished R2 chassis, all accounts
+        index.cross_account_serials()       # serials reported by 2+ accounts
+        index.failure_clusters(window_days=30)
+    """
+
+    def __init__(self):
+        self.sightings: List[AssetSighting] = []
+        self._by_level: Dict[str, Dict[str, List[int]]] = {level: defaultdict(list) for level in _LEVELS}
+        # Arena message id -> ((serial, component type), ...)
+        self._body_serials: Dict[int, Tuple[Tuple[str, str], ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.sightings)
+
+    # ----------------------------------------------------------------- build
+
+    def add(self, sighting: AssetSighting) -> None:
+        position = len(self.sightings)
+        self.sightings.append(sighting)
+        self._by_level['serial'][sighting.serial].append(position)
+        self._by_level['prefix'][sighting.prefix].append(position)
+        self._by_level['batch'][sighting.batch].append(position)
+
+    def _add_serials(
+        self,
+        serials: Dict[str, str],
+        account_name: str,
+        case_number: Any,
+        source: str,
+        date: Optional[datetime],
+        order_number: str = "",
+    ) -> None:
+        for serial, component_type in serials.items():
+            self.add(AssetSighting(
+                serial=serial,
+                component_type=component_type,
+                account_name=account_name,
+                case_number=str(case_number),
+                source=source,
+                date=date,
+                order_number=order_number or "",
+            ))
+
+    def _body(self, message_id: int) -> Tuple[Tuple[str, str], ...]:
+        serials = self._body_serials.get(message_id)
+        if serials is None:
+            body = MESSAGE_ARENA.get((message_id,))[0]
+            serials = tuple((item['serial'], item['component_type']) for item in extract_serials_from_text(body))
+            self._body_serials[message_id] = serials
+        return serials
+
+    def add_record(self, record: Any, source: str) -> None:
+        """Index a Deployment ("deployment") or SupportCase ("support")."""
+        serials = _field_serials(record.serial_number)
+        for message_id in record.message_ids:
+            for serial, component_type in self._body(message_id):
+                serials.setdefault(serial, component_type)
+
+        date = getattr(record, 'created_date', None) or record.message_date
+        self._add_serials(serials, record.account_name, record.case_number, source, date, record.order_number)
+
+    @classmethod
+    def from_records(
+        cls,
+        deployments: Iterable[Deployment] = (),
+        support_cases: Iterable[SupportCase] = (),
+    ) -> "FleetAssetIndex":
+        index = cls()
+        for deploy in deployments:
+            index.add_record(deploy, "deployment")
+        for case in support_cases:
+            index.add_record(case, "support")
+        return index
+
+    @classmethod
+    def from_linked_data(cls, data_store: Any) -> "FleetAssetIndex":
+        """Index every linked and orphan deployment and support case of a LinkedDataStore."""
+        deployments = [d for order in data_store.orders for d in order.deployments]
+        support_cases = [c for order in data_store.orders for c in order.support_cases]
+        return cls.from_records(
+            deployments + list(data_store.orphan_deployments),
+            support_cases + list(data_store.orphan_cases),
+        )
+
+    @classmethod
+    def from_case_analysis(cls, case_analysis: Iterable[Dict]) -> "FleetAssetIndex":
+        """Index single-file pipeline cases (customer_name, asset_serial, messages_full)."""
+        index = cls()
+        for case in case_analysis:
+            serials = _field_serials(case.get('asset_serial'))
+            for item in extract_serials_from_text(case.get('messages_full') or ''):
+                serials.setdefault(item['serial'], item['component_type'])
+            index._add_serials(
+                serials,
+                case.get('customer_name', 'Unknown'),
+                case['case_number'],
+                "support",
+                _parse_date(case.get('created_date')),
+            )
+        return index
+
+    # ---------------------------------------------------------------- lookup
+
+    def _lookup(self, level: str, key: str) -> List[AssetSighting]:
+        return [self.sightings[i] for i in self._by_level[level].get(key.upper(), ())]
+
+    def for_serial(self, serial: str) -> List[AssetSighting]:
+        return self._lookup('serial', serial)
+
+    def for_prefix(self, prefix: str) -> List[AssetSighting]:
+        """Sightings of a vendor / chassis prefix (A1, R1-R3, WD, ST, SAMSUNG)."""
+        return self._lookup('prefix', prefix)
+
+    def for_batch(self, batch: str) -> List[AssetSighting]:
+        return self._lookup('batch', batch)
+
+    def accounts_for_serial(self, serial: str) -> List[str]:
+        return sorted({s.account_name for s in self.for_serial(serial)})
+
+    def cross_account_serials(self, min_accounts: int = 2) -> List[Dict[str, Any]]:
+        """Serials reported by at least min_accounts accounts, most widespread first."""
+        result = []
+        for serial, positions in self._by_level['serial'].items():
+            sightings = [self.sightings[i] for i in positions]
+            accounts = sorted({s.account_name for s in sightings})
+            if len(accounts) >= min_accounts:
+                result.append({
+                    'serial': serial,
+                    'component_type': sightings[0].component_type,
+                    'accounts': accounts,
+                    'case_numbers': sorted({s.case_number for s in sightings}),
+                })
+        result.sort(key=lambda r: (-len(r['accounts']), -len(r['case_numbers']), r['serial']))
+        return result
+
+    # ------------------------------------------------------------- clusters
+
+    def failure_clusters(
+        self,
+        window_days: int = FAILURE_CLUSTER_WINDOW_DAYS,
+        min_accounts: int = 2,
+        level: str = 'batch',
+        sources: Tuple[str, ...] = ("support",),
+    ) -> List[FailureCluster]:
+        """
+        Keys with sightings at min_accounts or more accounts within window_days.
+
+        Each key's dated sightings are swept in date order; a qualifying
+        window is reported once and the sweep resumes after it, so clusters
+        of one key do not overlap.
+
+        Args:
+            window_days: Maximum days between the first and last sighting
+            min_accounts: Distinct accounts needed for a cluster
+            level: Group sightings by "batch", "prefix" or "serial"
+            sources: Sighting sources that count as failures
+
+        Returns:
+            Clusters, most accounts first
+        """
+        if level not in _LEVELS:
+            raise ValueError(f"Unknown cluster level: {level}")
+
+        clusters = []
+        for key, positions in self._by_level[level].items():
+            sightings = sorted(
+                (s for s in (self.sightings[i] for i in positions) if s.date and s.source in sources),
+                key=lambda s: s.date,
+            )
+            if len({s.account_name for s in sightings}) < min_accounts:
+                continue
+
+            start = 0
+            while start < len(sightings):
+                end = start
+                while end + 1 < len(sightings) and (sightings[end + 1].date - sightings[start].date).days <= window_days:
+                    end += 1
+                window = sightings[start:end + 1]
+                accounts = list(dict.fromkeys(s.account_name for s in window))
+                if len(accounts) >= min_accounts:
+                    clusters.append(FailureCluster(
+                        key=key,
+                        level=level,
+                        component_type=window[0].component_type,
+                        start=window[0].date,
+                        end=window[-1].date,
+                        accounts=accounts,
+                        case_numbers=list(dict.fromkeys(s.case_number for s in window)),
+                        serials=list(dict.fromkeys(s.serial for s in window)),
+                    ))
+                    start = end + 1
+                else:
+                    start += 1
+
+        clusters.sort(key=lambda c: (-c.account_count, -len(c.case_numbers), c.start, c.key))
+        return clusters
+
+    def report(
+        self,
+        window_days: int = FAILURE_CLUSTER_WINDOW_DAYS,
+        min_accounts: int = 2,
+    ) -> Dict[str, Any]:
+        """JSON-compatible summary: index size, cross-account serials and batch clusters."""
+        clusters = self.failure_clusters(window_days=window_days, min_accounts=min_accounts)
+        return {
+            'total_sightings': len(self.sightings),
+            'total_serials': len(self._by_level['serial']),
+            'accounts': len({s.account_name for s in self.sightings}),
+            'prefix_counts': {prefix: len(p) for prefix, p in sorted(self._by_level['prefix'].items())},
+            'window_days': window_days,
+            'min_accounts': min_accounts,
+            'cross_account_serials': self.cross_account_serials(min_accounts),
+            'failure_clusters': [c.to_dict() for c in clusters],
+        }
@@ -6,6 +6,13 @@ Provides multi-dimensional metrics aggregation across:
 - Accounts (customer-level health and performance)
 - Use Cases (workload-specific performance)
 - Service Teams (deployment effectiveness)
+
+calculate_all_metrics() computes every family in one pass over the data;
+calculate_metrics_from_facts() does the same with grouped pandas operations
+on the flattened fact table from build_fact_table(). MetricsState keeps
+the accumulated state between runs so a delta only revisits touched orders.
+build_metrics_cube() pre-aggregates the fact table over product, use case,
+fiscal period, support level and account for arbitrary pivots.
 """
 
 from .product_metrics import (
@@ -32,6 +39,28 @@ from .service_metrics import (
     compare_service_vs_self_deploy,
 )
 
+from .engine import (
+    AllMetrics,
+    calculate_all_metrics,
+)
+
+from .incremental import MetricsState
+
+from .fact_table import (
+    build_fact_table,
+    calculate_metrics_from_facts,
+    save_fact_table,
+    load_fact_table,
+)
+
+from .cube import (
+    CUBE_DIMENSIONS,
+    build_metrics_cube,
+    query_cube,
+    save_metrics_cube,
+    load_metrics_cube,
+)
+
 __all__ = [
     # Product
     "ProductMetrics",
@@ -49,4 +78,20 @@ __all__ = [
     "ServiceMetrics",
     "calculate_service_metrics",
     "compare_service_vs_self_deploy",
+    # All families, single pass
+    "AllMetrics",
+    "calculate_all_metrics",
+    # Incremental state
+    "MetricsState",
+    # Fact table backend
+    "build_fact_table",
+    "calculate_metrics_from_facts",
+    "save_fact_table",
+    "load_fact_table",
+    # Aggregation cube
+    "CUBE_DIMENSIONS",
+    "build_metrics_cube",
+    "query_cube",
+    "save_metrics_cube",
+    "load_metrics_cube",
 ]
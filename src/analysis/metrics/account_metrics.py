@@ -18,8 +18,9 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
-from ...data.models import LinkedOrder
+from ...data.models import LinkedOrder, Deployment, SupportCase, Severity
 from ...data.data_linker import LinkedDataStore
+from .accumulator import Accumulator, sketch_bucket
 
 
 @dataclass
@@ -63,6 +64,9 @@ class AccountMetrics:
     configuration_issues: int = 0
     issue_categories: Dict[str, int] = field(default_factory=dict)
 
+    # Distributions: measure -> {"p50", "p90", "p99"} from mergeable sketches
+    percentiles: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
     # Health scores
     account_health_score: float = 0.0  # 0-100, higher = healthier
     journey_health_avg: float = 0.0  # Avg across orders
@@ -80,158 +84,219 @@ class AccountMetrics:
     recommended_actions: List[str] = field(default_factory=list)
 
 
-def calculate_account_metrics(
-    data_store: LinkedDataStore,
-    account_name: str,
-) -> AccountMetrics:
+class _AccountAccumulator(Accumulator):
     """
-    Calculate aggregated metrics for a specific account.
-
-    Args:
-        data_store: LinkedDataStore with correlated data
-        account_name: Name of the account to analyze
+    Running totals for one account.
 
-    Returns:
-        AccountMetrics with aggregated data
+    Fed one order at a time (open_order, add_deployment, add_case,
+    close_order). Shared by calculate_account_metrics(), the fused metrics
+    engine and the incremental metrics state.
     """
-    metrics = AccountMetrics()
-    metrics.account_name = account_name
 
-    # Get all orders for this account
-    orders = data_store.get_orders_by_account(account_name)
+    def __init__(self, account_name: str):
+        super().__init__()
+        self.account_name = account_name
 
-    if not orders:
-        return metrics
-
-    # Collect data points
-    deployment_scores = []
-    deployment_days = []
-    case_ages = []
-    frustration_scores = []
-    journey_health_scores = []
-    products_seen = set()
-    purchase_dates = []
+    def add_order(self, order: LinkedOrder) -> None:
+        """Feed a whole order."""
+        self.open_order(order)
+        for dep in order.deployments:
+            self.add_deployment(dep)
+        for case in order.support_cases:
+            self.add_case(case)
+        self.close_order(order)
 
-    for order in orders:
-        metrics.total_orders += 1
+    def open_order(self, order: LinkedOrder) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        totals["orders"] += 1
 
         # Opportunity metrics
         if order.opportunity:
-            metrics.total_spend += order.opportunity.amount
+            totals["total_spend"] += order.opportunity.amount
             if order.opportunity.primary_product:
-                products_seen.add(order.opportunity.primary_product)
+                histograms["products"][order.opportunity.primary_product] += 1
             if order.opportunity.close_date:
-                purchase_dates.append(order.opportunity.close_date)
+                histograms["purchase_dates"][order.opportunity.close_date.isoformat()] += 1
 
-        # Deployment metrics
-        for dep in order.deployments:
-            metrics.total_deployments += 1
-            deployment_days.append(dep.case_age_days)
-
-            if dep.is_service_deploy:
-                metrics.service_deploys += 1
-            else:
-                metrics.self_deploys += 1
-
-            if dep.deployment_score is not None:
-                deployment_scores.append(dep.deployment_score)
-                if dep.deployment_score > 70:
-                    metrics.successful_deployments += 1
-
-        # Support case metrics
-        for case in order.support_cases:
-            metrics.total_support_cases += 1
-            case_ages.append(case.case_age_days)
-
-            if case.status and "open" in case.status.lower():
-                metrics.open_cases += 1
-
-            if case.severity.value == "S1":
-                metrics.s1_cases += 1
-            elif case.severity.value == "S2":
-                metrics.s2_cases += 1
-
-            if case.frustration_score is not None:
-                frustration_scores.append(case.frustration_score)
-
-            if case.escalation_detected:
-                metrics.escalation_count += 1
-            if case.is_repeat_issue:
-                metrics.repeat_issues += 1
-            if case.is_hardware_failure:
-                metrics.hardware_failures += 1
-            if case.is_performance_issue:
-                metrics.performance_issues += 1
-            if case.is_configuration_issue:
-                metrics.configuration_issues += 1
-            if case.deployment_related:
-                metrics.deployment_related_issues += 1
-
-            # Issue categories
-            reason = case.case_reason or "Unknown"
-            metrics.issue_categories[reason] = metrics.issue_categories.get(reason, 0) + 1
+    def add_deployment(self, dep: Deployment) -> None:
+        totals = self.totals
+        totals["deployments"] += 1
+        totals["deployment_days"] += dep.case_age_days
+        self.histograms["deployment_days_sketch"][sketch_bucket(dep.case_age_days)] += 1
 
+        if dep.is_service_deploy:
+            totals["service_deploys"] += 1
+        else:
+            totals["self_deploys"] += 1
+
+        if dep.deployment_score is not None:
+            totals["scored_deployments"] += 1
+            totals["deployment_score"] += dep.deployment_score
+            if dep.deployment_score > 70:
+                totals["successful_deployments"] += 1
+
+    def add_case(self, case: SupportCase) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        totals["support_cases"] += 1
+        totals["case_age_days"] += case.case_age_days
+        histograms["case_age_sketch"][sketch_bucket(case.case_age_days)] += 1
+
+        if case.status and "open" in case.status.lower():
+            totals["open_cases"] += 1
+
+        if case.severity is Severity.S1:
+            totals["s1_cases"] += 1
+        elif case.severity is Severity.S2:
+            totals["s2_cases"] += 1
+
+        if case.frustration_score is not None:
+            totals["frustration_cases"] += 1
+            totals["frustration_score"] += case.frustration_score
+            # Histogram of scores, for the maximum
+            histograms["frustration_scores"][repr(case.frustration_score)] += 1
+            histograms["frustration_sketch"][sketch_bucket(case.frustration_score)] += 1
+
+        if case.escalation_detected:
+            totals["escalations"] += 1
+        if case.is_repeat_issue:
+            totals["repeat_issues"] += 1
+        if case.is_hardware_failure:
+            totals["hardware_failures"] += 1
+        if case.is_performance_issue:
+            totals["performance_issues"] += 1
+        if case.is_configuration_issue:
+            totals["configuration_issues"] += 1
+        if case.deployment_related:
+            totals["deployment_related_issues"] += 1
+
+        # Issue categories
+        histograms["issue_categories"][case.case_reason or "Unknown"] += 1
+
+    def close_order(self, order: LinkedOrder) -> None:
+        totals = self.totals
+        histograms = self.histograms
         # Journey health from fully linked orders
         if order.is_fully_linked:
-            metrics.fully_linked_orders += 1
+            totals["fully_linked_orders"] += 1
             if order.journey_health_score is not None:
-                journey_health_scores.append(order.journey_health_score)
+                totals["journey_orders"] += 1
+                totals["journey_health"] += order.journey_health_score
+                histograms["journey_health_sketch"][sketch_bucket(order.journey_health_score)] += 1
             if order.churn_risk in ["Critical", "High"]:
-                metrics.high_risk_order_count += 1
+                totals["high_risk_orders"] += 1
 
             # Collect insights
-            if order.critical_findings:
-                metrics.critical_findings.extend(order.critical_findings[:2])
-            if order.positive_signals:
-                metrics.positive_signals.extend(order.positive_signals[:2])
-            if order.immediate_actions:
-                metrics.recommended_actions.extend(order.immediate_actions[:2])
-
-    # Calculate averages and rates
-    if metrics.total_orders > 0:
-        metrics.avg_order_size = metrics.total_spend / metrics.total_orders
-
-    if deployment_scores:
-        metrics.avg_deployment_score = sum(deployment_scores) / len(deployment_scores)
-        metrics.deployment_success_rate = (
-            metrics.successful_deployments / len(deployment_scores) * 100
+            for finding in (order.critical_findings or [])[:2]:
+                histograms["critical_findings"][finding] += 1
+            for signal in (order.positive_signals or [])[:2]:
+                histograms["positive_signals"][signal] += 1
+            for action in (order.immediate_actions or [])[:2]:
+                histograms["recommended_actions"][action] += 1
+
+    def finalize(self) -> AccountMetrics:
+        total = self.total
+        metrics = AccountMetrics(
+            account_name=self.account_name,
+            total_orders=total("orders"),
+            total_spend=float(total("total_spend")),
+            total_deployments=total("deployments"),
+            successful_deployments=total("successful_deployments"),
+            service_deploys=total("service_deploys"),
+            self_deploys=total("self_deploys"),
+            total_support_cases=total("support_cases"),
+            open_cases=total("open_cases"),
+            s1_cases=total("s1_cases"),
+            s2_cases=total("s2_cases"),
+            escalation_count=total("escalations"),
+            repeat_issues=total("repeat_issues"),
+            hardware_failures=total("hardware_failures"),
+            performance_issues=total("performance_issues"),
+            configuration_issues=total("configuration_issues"),
+            issue_categories=dict(self.histogram("issue_categories")),
+            high_risk_order_count=total("high_risk_orders"),
+            fully_linked_orders=total("fully_linked_orders"),
+            deployment_related_issues=total("deployment_related_issues"),
         )
 
-    if deployment_days:
-        metrics.avg_deployment_days = sum(deployment_days) / len(deployment_days)
+        # Calculate averages and rates
+        if metrics.total_orders > 0:
+            metrics.avg_order_size = metrics.total_spend / metrics.total_orders
+
+        if total("scored_deployments"):
+            metrics.avg_deployment_score = self.ratio("deployment_score", "scored_deployments")
+            metrics.deployment_success_rate = (
+                metrics.successful_deployments / total("scored_deployments") * 100
+            )
 
-    if case_ages:
-        metrics.avg_case_age_days = sum(case_ages) / len(case_ages)
+        if metrics.total_deployments > 0:
+            metrics.avg_deployment_days = self.ratio("deployment_days", "deployments")
 
-    if frustration_scores:
-        metrics.avg_frustration_score = sum(frustration_scores) / len(frustration_scores)
-        metrics.max_frustration_score = max(frustration_scores)
+        if metrics.total_support_cases > 0:
+            metrics.avg_case_age_days = self.ratio("case_age_days", "support_cases")
 
-    if journey_health_scores:
-        metrics.journey_health_avg = sum(journey_health_scores) / len(journey_health_scores)
+        if total("frustration_cases"):
+            metrics.avg_frustration_score = self.ratio("frustration_score", "frustration_cases")
+            metrics.max_frustration_score = max(
+                float(score) for score in self.histogram("frustration_scores")
+            )
 
-    # Products and dates
-    metrics.products_purchased = sorted(products_seen)
+        if total("journey_orders"):
+            metrics.journey_health_avg = self.ratio("journey_health", "journey_orders")
 
-    if purchase_dates:
-        metrics.first_purchase_date = min(purchase_dates)
-        metrics.last_purchase_date = max(purchase_dates)
-        metrics.customer_tenure_days = (
-            datetime.now() - metrics.first_purchase_date
-        ).days
+        metrics.percentiles = self.percentiles()
 
-    # Calculate account health score (0-100, higher = healthier)
-    metrics.account_health_score = _calculate_health_score(metrics)
+        # Products and dates
+        metrics.products_purchased = sorted(self.histogram("products"))
 
-    # Determine churn risk
-    metrics.churn_risk = _determine_churn_risk(metrics)
+        purchase_dates = [datetime.fromisoformat(d) for d in self.histogram("purchase_dates")]
+        if purchase_dates:
+            metrics.first_purchase_date = min(purchase_dates)
+            metrics.last_purchase_date = max(purchase_dates)
+            metrics.customer_tenure_days = (
+                datetime.now() - metrics.first_purchase_date
+            ).days
 
-    # Trim lists
-    metrics.critical_findings = list(set(metrics.critical_findings))[:5]
-    metrics.positive_signals = list(set(metrics.positive_signals))[:5]
-    metrics.recommended_actions = list(set(metrics.recommended_actions))[:5]
+        # Calculate account health score (0-100, higher = healthier)
+        metrics.account_health_score = _calculate_health_score(metrics)
+
+        # Determine churn risk
+        metrics.churn_risk = _determine_churn_risk(metrics)
+
+        # Trim lists
+        metrics.critical_findings = list(set(list(self.histogram("critical_findings"))))[:5]
+        metrics.positive_signals = list(set(list(self.histogram("positive_signals"))))[:5]
+        metrics.recommended_actions = list(set(list(self.histogram("recommended_actions"))))[:5]
+
+        return metrics
+
+
+def calculate_account_metrics(
+    data_store: LinkedDataStore,
+    account_name: str,
+) -> AccountMetrics:
+    """
+    Calculate aggregated metrics for a specific account.
+
+    Args:
+        data_store: LinkedDataStore with correlated data
+        account_name: Name of the account to analyze
+
+    Returns:
+        AccountMetrics with aggregated data
+    """
+    # Get all orders for this account
+    orders = data_store.get_orders_by_account(account_name)
+
+    if not orders:
+        return AccountMetrics(account_name=account_name)
+
+    accumulator = _AccountAccumulator(account_name)
+    for order in orders:
+        accumulator.add_order(order)
 
-    return metrics
+    return accumulator.finalize()
 
 
 def _calculate_health_score(metrics: AccountMetrics) -> float:
@@ -0,0 +1,160 @@
+"""
+Mergeable accumulator state for the metric families.
+
+Every metric family keeps its running state as named totals (counts and
+sums) and histograms (key -> count). Both combine by addition, so:
+- accumulators for disjoint sets of orders can be merged
+- one order's contribution can be retracted by merging it with sign=-1
+- the state round-trips through plain JSON-compatible dicts
+
+Distributions are kept as quantile sketches: histograms over logarithmic
+buckets (as in DDSketch), so percentiles are within SKETCH_ACCURACY of
+the exact value and, like every other histogram, sketches merge and
+retract by addition without keeping the individual values.
+"""
+
+import math
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+
+# Relative accuracy of sketch percentiles (1%)
+SKETCH_ACCURACY = 0.01
+_GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Bucket of values <= 0
+_ZERO_BUCKET = "z"
+
+PERCENTILES = (50, 90, 99)
+
+# Distribution measure -> sketch histogram, shared by the metric families
+SKETCHES = {
+    "case_age_days": "case_age_sketch",
+    "deployment_days": "deployment_days_sketch",
+    "frustration_score": "frustration_sketch",
+    "journey_health": "journey_health_sketch",
+}
+
+
+@lru_cache(maxsize=65536)
+def sketch_bucket(value: float) -> str:
+    """Sketch bucket of a value: i such that gamma^(i-1) < value <= gamma^i."""
+    if value <= 0:
+        return _ZERO_BUCKET
+    return str(math.ceil(math.log(value) / _LOG_GAMMA))
+
+
+def _bucket_value(bucket: str) -> float:
+    """Representative value of a bucket (relative error <= SKETCH_ACCURACY)."""
+    if bucket == _ZERO_BUCKET:
+        return 0.0
+    return 2 * _GAMMA ** int(bucket) / (_GAMMA + 1)
+
+
+def sketch_percentiles(
+    buckets: Dict[str, float],
+    percentiles: Iterable[int] = PERCENTILES,
+) -> Dict[str, float]:
+    """
+    Percentiles of a sketch, e.g. {"p50": ..., "p90": ..., "p99": ...}.
+
+    Empty sketches give an empty dict.
+    """
+    ordered = sorted(
+        ((bucket, count) for bucket, count in buckets.items() if count > 0),
+        key=lambda item: -math.inf if item[0] == _ZERO_BUCKET else int(item[0]),
+    )
+    total = sum(count for _, count in ordered)
+    if not total:
+        return {}
+
+    # One walk over the buckets, percentiles in ascending order
+    ranks = [(percentile, percentile / 100 * (total - 1)) for percentile in sorted(percentiles)]
+    result = {}
+    seen = 0
+    for bucket, count in ordered:
+        seen += count
+        while ranks and seen > ranks[0][1]:
+            result[f"p{ranks.pop(0)[0]}"] = _bucket_value(bucket)
+        if not ranks:
+            break
+    return result
+
+
+class Accumulator:
+    """
+    Named totals and histograms that merge by addition.
+
+    Subclasses update the state directly, which keeps the per-record cost
+    to a dict increment:
+        totals["support_cases"] += 1
+        histograms["issue_categories"][reason] += 1
+        histograms["case_age_sketch"][sketch_bucket(age)] += 1
+
+    Histogram buckets keep first-seen order.
+    """
+
+    def __init__(self):
+        self.totals: Dict[str, float] = defaultdict(int)
+        self.histograms: Dict[str, Counter] = defaultdict(Counter)
+
+    def total(self, name: str) -> float:
+        return self.totals.get(name, 0)
+
+    def histogram(self, name: str) -> Dict[str, float]:
+        return self.histograms.get(name, {})
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles of every non-empty sketch in SKETCHES, keyed by measure."""
+        result = {}
+        for measure, sketch in SKETCHES.items():
+            values = sketch_percentiles(self.histogram(sketch))
+            if values:
+                result[measure] = values
+        return result
+
+    def ratio(self, numerator: str, denominator: str) -> Optional[float]:
+        """totals[numerator] / totals[denominator], or None if the denominator is 0."""
+        count = self.total(denominator)
+        return self.total(numerator) / count if count else None
+
+    def merge(self, other: "Accumulator", sign: int = 1) -> None:
+        """Add (sign=1) or retract (sign=-1) another accumulator's state."""
+        for name, value in other.totals.items():
+            total = self.totals.get(name, 0) + sign * value
+            if total:
+                self.totals[name] = total
+            else:
+                self.totals.pop(name, None)
+
+        for name, buckets in other.histograms.items():
+            target = self.histograms[name]
+            for key, value in buckets.items():
+                count = target.get(key, 0) + sign * value
+                if count:
+                    target[key] = count
+                else:
+                    target.pop(key, None)
+            if not target:
+                del self.histograms[name]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse, JSON-compatible state."""
+        data: Dict[str, Any] = {}
+        totals = {name: value for name, value in self.totals.items() if value}
+        if totals:
+            data["totals"] = totals
+        histograms = {name: dict(buckets) for name, buckets in self.histograms.items() if buckets}
+        if histograms:
+            data["histograms"] = histograms
+        return data
+
+    def load_dict(self, data: Dict[str, Any]) -> "Accumulator":
+        """Replace the state with one produced by to_dict()."""
+        self.totals = defaultdict(int, data.get("totals", {}))
+        self.histograms = defaultdict(Counter, {
+            name: Counter(buckets) for name, buckets in data.get("histograms", {}).items()
+        })
+        return self
@@ -0,0 +1,201 @@
+"""
+Pre-aggregated Metrics Cube for Account Solutions Success.
+
+Aggregates the fact table (see fact_table.py) over the main dimensions:
+
+- product_series: series of the record ("F-Series", ..., "Unknown")
+- use_case: use case category of the order
+- fiscal_period: fiscal period of the order's opportunity
+- support_level: support tier of the order's deployments / cases
+- account_name: customer account
+
+Every cell holds additive measures only (counts and sums), so any roll-up
+is a grouped sum over the cube and ratios (averages, rates) are derived
+after summing. query_cube() answers roll-up and drill-down queries from
+the cube without touching the linked data:
+
+    cube = build_metrics_cube(facts)
+    query_cube(cube, by=["product_series", "fiscal_period"])
+    query_cube(cube, by=["use_case"], filters={"support_level": "Gold"})
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .fact_table import OPPORTUNITY, DEPLOYMENT, CASE
+
+
+CUBE_DIMENSIONS = [
+    "product_series",
+    "use_case",
+    "fiscal_period",
+    "support_level",
+    "account_name",
+]
+
+ADDITIVE_MEASURES = [
+    "opportunities",
+    "revenue",
+    "deployments",
+    "service_deploys",
+    "scored_deployments",
+    "deployment_score_sum",
+    "successful_deployments",
+    "deployment_days_sum",
+    "support_cases",
+    "case_age_days_sum",
+    "s1_cases",
+    "s2_cases",
+    "escalations",
+    "hardware_failures",
+    "performance_issues",
+    "configuration_issues",
+    "repeat_issues",
+    "frustration_cases",
+    "frustration_score_sum",
+]
+
+# name -> (numerator, denominator, scale); 0.0 where the denominator is 0
+DERIVED_MEASURES = {
+    "avg_deal_size": ("revenue", "opportunities", 1),
+    "avg_deployment_score": ("deployment_score_sum", "scored_deployments", 1),
+    "deployment_success_rate": ("successful_deployments", "scored_deployments", 100),
+    "service_deploy_rate": ("service_deploys", "deployments", 100),
+    "avg_deployment_days": ("deployment_days_sum", "deployments", 1),
+    "support_intensity": ("support_cases", "deployments", 1),
+    "avg_case_age_days": ("case_age_days_sum", "support_cases", 1),
+    "avg_frustration_score": ("frustration_score_sum", "frustration_cases", 1),
+    "escalation_rate": ("escalations", "support_cases", 100),
+}
+
+# Case flag columns of the fact table -> cube measure
+_CASE_FLAG_MEASURES = {
+    "escalation_detected": "escalations",
+    "is_hardware_failure": "hardware_failures",
+    "is_performance_issue": "performance_issues",
+    "is_configuration_issue": "configuration_issues",
+    "is_repeat_issue": "repeat_issues",
+}
+
+
+def _series_label(series: str) -> str:
+    """ProductSeries value -> product metrics name ("F" -> "F-Series")."""
+    return series if series == "Unknown" else f"{series}-Series"
+
+
+def build_metrics_cube(facts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate a fact table into the metrics cube.
+
+    Args:
+        facts: DataFrame from build_fact_table() / load_fact_table()
+
+    Returns:
+        DataFrame with one row per populated combination of CUBE_DIMENSIONS
+        and one column per ADDITIVE_MEASURES entry
+    """
+    record_type = facts["record_type"]
+    is_opp = record_type == OPPORTUNITY
+    is_dep = record_type == DEPLOYMENT
+    is_case = record_type == CASE
+
+    score = facts["deployment_score"].where(is_dep)
+    frustration = facts["frustration_score"].where(is_case)
+    age = facts["case_age_days"]
+
+    measures = {
+        "opportunities": is_opp,
+        "revenue": facts["amount"].where(is_opp).fillna(0.0),
+        "deployments": is_dep,
+        "service_deploys": is_dep & facts["is_service_deploy"].fillna(False).astype(bool),
+        "scored_deployments": score.notna(),
+        "deployment_score_sum": score.fillna(0.0),
+        "successful_deployments": score > 70,
+        "deployment_days_sum": age.where(is_dep).fillna(0.0),
+        "support_cases": is_case,
+        "case_age_days_sum": age.where(is_case).fillna(0.0),
+        "s1_cases": is_case & (facts["severity"] == "S1"),
+        "s2_cases": is_case & (facts["severity"] == "S2"),
+        "frustration_cases": frustration.notna(),
+        "frustration_score_sum": frustration.fillna(0.0),
+    }
+    for column, measure in _CASE_FLAG_MEASURES.items():
+        measures[measure] = is_case & facts[column].astype(bool)
+
+    frame = facts[CUBE_DIMENSIONS].assign(
+        product_series=facts["product_series"].map(_series_label),
+        **{
+            name: values.astype(int) if values.dtype == bool else values.astype(float)
+            for name, values in measures.items()
+        },
+    )
+    cube = frame.groupby(CUBE_DIMENSIONS, sort=True, dropna=False)[ADDITIVE_MEASURES].sum()
+    return cube.reset_index()
+
+
+def query_cube(
+    cube: pd.DataFrame,
+    by: Iterable[str] = (),
+    filters: Optional[Dict[str, Any]] = None,
+    derived: bool = True,
+) -> pd.DataFrame:
+    """
+    Roll the cube up to the given dimensions.
+
+    Args:
+        cube: DataFrame from build_metrics_cube() / load_metrics_cube()
+        by: Dimensions to keep (empty = grand total, one row)
+        filters: dimension -> value or list of values to keep (drill-down)
+        derived: Add DERIVED_MEASURES columns computed from the sums
+
+    Returns:
+        DataFrame with the `by` columns and the summed measures
+    """
+    by = list(by)
+    filters = filters or {}
+    unknown = [dim for dim in by + list(filters) if dim not in CUBE_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown cube dimension(s): {unknown}. Expected any of {CUBE_DIMENSIONS}")
+
+    frame = cube
+    for dim, value in filters.items():
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        frame = frame[frame[dim].isin(values)]
+
+    if by:
+        result = frame.groupby(by, sort=True)[ADDITIVE_MEASURES].sum().reset_index()
+    else:
+        # Grand total, column by column so integer measures stay integer
+        result = pd.DataFrame({measure: [frame[measure].sum()] for measure in ADDITIVE_MEASURES})
+
+    if derived:
+        for name, (numerator, denominator, scale) in DERIVED_MEASURES.items():
+            count = result[denominator]
+            result[name] = (result[numerator] / count.where(count > 0) * scale).fillna(0.0)
+    return result
+
+
+def dimension_values(cube: pd.DataFrame, dimension: str) -> List[str]:
+    """Distinct values of a dimension, sorted."""
+    if dimension not in CUBE_DIMENSIONS:
+        raise ValueError(f"Unknown cube dimension: {dimension}. Expected one of {CUBE_DIMENSIONS}")
+    return sorted(cube[dimension].unique())
+
+
+def save_metrics_cube(cube: pd.DataFrame, path: Path) -> Path:
+    """Write the cube to CSV."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cube.to_csv(path, index=False)
+    return path
+
+
+def load_metrics_cube(path: Path) -> pd.DataFrame:
+    """Read a cube written by save_metrics_cube()."""
+    return pd.read_csv(
+        path,
+        dtype={dim: str for dim in CUBE_DIMENSIONS},
+        keep_default_na=False,
+    )
@@ -0,0 +1,238 @@
+"""
+Fused Metrics Engine for Account Solutions Success.
+
+Computes product, account, use case and service metrics in a single pass:
+every order, deployment and support case is visited once and handed to the
+accumulator of each dimension it belongs to. Results are identical to
+calling the per-family functions one after another:
+
+- calculate_all_product_metrics()
+- calculate_all_account_metrics()
+- calculate_all_usecase_metrics()
+- compare_service_vs_self_deploy()
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+
+from ...data.models import LinkedOrder
+from ...data.data_linker import LinkedDataStore, PRODUCT_SERIES_KEYS
+from .product_metrics import ProductMetrics, PRODUCT_SERIES, _ProductAccumulator
+from .account_metrics import AccountMetrics, _AccountAccumulator
+from .usecase_metrics import UseCaseMetrics, reported_use_cases, _UseCaseAccumulator
+from .service_metrics import ServiceComparison, _ServiceAccumulator, _build_comparison
+
+
+@dataclass
+class AllMetrics:
+    """Every metric family computed from one pass over the data store."""
+    product_metrics: Dict[str, ProductMetrics] = field(default_factory=dict)
+    account_metrics: Dict[str, AccountMetrics] = field(default_factory=dict)
+    usecase_metrics: Dict[str, UseCaseMetrics] = field(default_factory=dict)
+    service_comparison: ServiceComparison = field(default_factory=ServiceComparison)
+
+
+class MetricsAccumulators:
+    """
+    Accumulators of every metric family, keyed by dimension value.
+
+    add_order() dispatches each record of an order to the product, account,
+    use case and service accumulators it belongs to. Containers merge by
+    addition (merge(other, sign=-1) retracts), which the incremental
+    metrics state builds on.
+    """
+
+    def __init__(self):
+        self.products: Dict[str, _ProductAccumulator] = {}
+        self.accounts: Dict[str, _AccountAccumulator] = {}
+        self.use_cases: Dict[str, _UseCaseAccumulator] = {}
+        self.services: Dict[bool, _ServiceAccumulator] = {}
+        self.escalations = 0
+
+    def _product(self, series: str) -> _ProductAccumulator:
+        product = self.products.get(series)
+        if product is None:
+            product = self.products[series] = _ProductAccumulator(series)
+        return product
+
+    def _account(self, account_name: str) -> _AccountAccumulator:
+        account = self.accounts.get(account_name)
+        if account is None:
+            account = self.accounts[account_name] = _AccountAccumulator(account_name)
+        return account
+
+    def _use_case(self, use_case: str) -> _UseCaseAccumulator:
+        accumulator = self.use_cases.get(use_case)
+        if accumulator is None:
+            accumulator = self.use_cases[use_case] = _UseCaseAccumulator(use_case)
+        return accumulator
+
+    def _service(self, is_service_deploy: bool) -> _ServiceAccumulator:
+        service = self.services.get(is_service_deploy)
+        if service is None:
+            service = self.services[is_service_deploy] = _ServiceAccumulator(is_service_deploy)
+        return service
+
+    def add_order(self, order: LinkedOrder, use_case: str) -> None:
+        """Feed one order (and its records) to every accumulator it belongs to."""
+        account = self._account(order.account_name)
+        use_case_accumulator = self._use_case(use_case)
+
+        account.open_order(order)
+        use_case_accumulator.open_order(order)
+
+        # Product series matched by the opportunity, then by each record;
+        # an accumulator is opened the first time its series is seen
+        open_products = {}
+        opp = order.opportunity
+        if opp:
+            opp_product = (opp.primary_product or "").upper()
+            for key in PRODUCT_SERIES_KEYS:
+                if key in opp_product:
+                    product = open_products[key] = self._product(key)
+                    product.open_order(order)
+
+        open_services = {}
+        for dep in order.deployments:
+            account.add_deployment(dep)
+            use_case_accumulator.add_deployment(dep)
+
+            key = dep.product_series.value.upper()
+            product = open_products.get(key)
+            if product is None and key in PRODUCT_SERIES:
+                product = open_products[key] = self._product(key)
+                product.open_order(order)
+            if product is not None:
+                product.add_deployment(dep)
+
+            service = open_services.get(dep.is_service_deploy)
+            if service is None:
+                service = open_services[dep.is_service_deploy] = self._service(dep.is_service_deploy)
+                service.open_order(order)
+            service.add_deployment(dep)
+
+        for case in order.support_cases:
+            account.add_case(case)
+            use_case_accumulator.add_case(case)
+            for service in open_services.values():
+                service.add_case(case)
+
+            key = case.product_series.value.upper()
+            product = open_products.get(key)
+            if product is None and key in PRODUCT_SERIES:
+                product = open_products[key] = self._product(key)
+                product.open_order(order)
+            if product is not None:
+                product.add_case(case)
+
+            if case.escalation_detected:
+                self.escalations += 1
+
+        account.close_order(order)
+        use_case_accumulator.close_order(order)
+        for product in open_products.values():
+            product.close_order(order)
+        for service in open_services.values():
+            service.close_order(order)
+
+    def merge(self, other: "MetricsAccumulators", sign: int = 1) -> None:
+        """Add (sign=1) or retract (sign=-1) another container's state."""
+        for series, product in other.products.items():
+            self._product(series).merge(product, sign)
+        for account_name, account in other.accounts.items():
+            target = self._account(account_name)
+            target.merge(account, sign)
+            if not target.total("orders"):
+                del self.accounts[account_name]
+        for use_case, accumulator in other.use_cases.items():
+            target = self._use_case(use_case)
+            target.merge(accumulator, sign)
+            if not target.total("orders"):
+                del self.use_cases[use_case]
+        for flag, service in other.services.items():
+            self._service(flag).merge(service, sign)
+        self.escalations += sign * other.escalations
+
+    def finalize(self, account_order: Optional[Iterable[str]] = None) -> AllMetrics:
+        """
+        Compute every metric family from the accumulated state.
+
+        Args:
+            account_order: Account names in the order results should list
+                them (default: order first seen)
+        """
+        results = AllMetrics()
+
+        for series in PRODUCT_SERIES:
+            if series not in self.products:
+                continue
+            metrics = self.products[series].finalize()
+            if metrics.units_sold > 0 or metrics.units_deployed > 0 or metrics.total_support_cases > 0:
+                results.product_metrics[metrics.product_series] = metrics
+
+        for account_name in (self.accounts if account_order is None else account_order):
+            results.account_metrics[account_name] = self.accounts[account_name].finalize()
+
+        for use_case in reported_use_cases():
+            if use_case in self.use_cases:
+                results.usecase_metrics[use_case] = self.use_cases[use_case].finalize(self.escalations)
+
+        results.service_comparison = _build_comparison(
+            self._service(True).finalize(),
+            self._service(False).finalize(),
+        )
+
+        return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse, JSON-compatible state (empty accumulators are left out)."""
+        data: Dict[str, Any] = {}
+        for name, accumulators in (
+            ("products", self.products),
+            ("accounts", self.accounts),
+            ("use_cases", self.use_cases),
+            ("services", {str(flag).lower(): service for flag, service in self.services.items()}),
+        ):
+            states = {key: acc.to_dict() for key, acc in accumulators.items()}
+            states = {key: state for key, state in states.items() if state}
+            if states:
+                data[name] = states
+        if self.escalations:
+            data["escalations"] = self.escalations
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricsAccumulators":
+        """Rebuild a container from to_dict() output."""
+        container = cls()
+        for series, state in data.get("products", {}).items():
+            container._product(series).load_dict(state)
+        for account_name, state in data.get("accounts", {}).items():
+            container._account(account_name).load_dict(state)
+        for use_case, state in data.get("use_cases", {}).items():
+            container._use_case(use_case).load_dict(state)
+        for flag, state in data.get("services", {}).items():
+            container._service(flag == "true").load_dict(state)
+        container.escalations = data.get("escalations", 0)
+        return container
+
+
+def calculate_all_metrics(data_store: LinkedDataStore) -> AllMetrics:
+    """
+    Calculate all metric families in one traversal of the linked orders.
+
+    Args:
+        data_store: LinkedDataStore with correlated data
+
+    Returns:
+        AllMetrics with the same values as the per-family functions
+    """
+    accumulators = MetricsAccumulators()
+    account_names = set()
+
+    for order in data_store.orders:
+        account_names.add(order.account_name)
+        accumulators.add_order(order, data_store.get_use_case(order.order_number))
+
+    # Same (set) iteration order as calculate_all_account_metrics()
+    return accumulators.finalize(account_order=account_names)
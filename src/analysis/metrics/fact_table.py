@@ -0,0 +1,688 @@
+"""
+Columnar Fact Table for Account Solutions Success.
+
+Flattens a LinkedDataStore into one pandas DataFrame with a row per
+opportunity, deployment and support case. Every row carries its order,
+account, use case and order-level journey fields, so any metric can be
+computed with grouped column operations instead of walking objects:
+
+- build_fact_table(): LinkedDataStore -> DataFrame
+- calculate_metrics_from_facts(): DataFrame -> AllMetrics (same dataclasses
+  as the per-family functions, equal up to float rounding)
+- save_fact_table() / load_fact_table(): standalone CSV copy (runs save the
+  table with result_tables.save_result_table())
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Any
+
+import numpy as np
+import pandas as pd
+
+from ...data.models import SupportLevel
+from ...data.data_linker import LinkedDataStore, PRODUCT_SERIES_KEYS
+from .product_metrics import ProductMetrics, PRODUCT_SERIES
+from .account_metrics import AccountMetrics, _calculate_health_score, _determine_churn_risk
+from .usecase_metrics import UseCaseMetrics, reported_use_cases
+from .service_metrics import ServiceMetrics, _build_comparison
+from .engine import AllMetrics
+from .accumulator import sketch_bucket, sketch_percentiles
+
+
+# Record types in the record_type column
+OPPORTUNITY = "opportunity"
+DEPLOYMENT = "deployment"
+CASE = "case"
+
+# Order-level columns repeated on every row of an order
+ORDER_COLUMNS = [
+    "order_number",
+    "account_name",
+    "use_case",
+    "fiscal_period",
+    "support_level",
+    "has_opportunity",
+    "is_fully_linked",
+    "journey_health_score",
+    "churn_risk",
+]
+
+# Insight lists (order level) kept as Python lists; JSON-encoded on disk
+LIST_COLUMNS = ["critical_findings", "positive_signals", "immediate_actions"]
+
+RECORD_COLUMNS = [
+    "record_type",
+    "record_id",
+    "product_series",
+    # Opportunity
+    "primary_product",
+    "amount",
+    "close_date",
+    "pain_points",
+    # Deployment
+    "is_service_deploy",
+    "deployment_score",
+    # Deployment and case
+    "case_age_days",
+    "case_reason",
+    "status",
+    # Case
+    "severity",
+    "frustration_score",
+    "escalation_detected",
+    "is_repeat_issue",
+    "is_hardware_failure",
+    "is_performance_issue",
+    "is_configuration_issue",
+    "deployment_related",
+]
+
+FACT_COLUMNS = ORDER_COLUMNS + RECORD_COLUMNS + LIST_COLUMNS
+
+_CASE_FLAGS = [
+    "escalation_detected",
+    "is_repeat_issue",
+    "is_hardware_failure",
+    "is_performance_issue",
+    "is_configuration_issue",
+    "deployment_related",
+]
+
+_HIGH_CHURN = ["Critical", "High"]
+
+UNKNOWN = "Unknown"
+
+
+def _order_support_level(order) -> str:
+    """First known support level of the order's deployments, then its cases."""
+    for record in order.deployments + order.support_cases:
+        if record.support_level is not SupportLevel.UNKNOWN:
+            return record.support_level.value
+    return UNKNOWN
+
+
+def build_fact_table(data_store: LinkedDataStore) -> pd.DataFrame:
+    """
+    Flatten linked orders into a fact table.
+
+    Rows follow store order: for each order its opportunity, then its
+    deployments, then its support cases.
+
+    Args:
+        data_store: LinkedDataStore with correlated data
+
+    Returns:
+        DataFrame with FACT_COLUMNS
+    """
+    rows: List[tuple] = []
+    nan = np.nan
+
+    for order in data_store.orders:
+        order_values = (
+            order.order_number,
+            order.account_name,
+            data_store.get_use_case(order.order_number),
+            (order.opportunity.fiscal_period if order.opportunity else "") or UNKNOWN,
+            _order_support_level(order),
+            order.opportunity is not None,
+            order.is_fully_linked,
+            order.journey_health_score,
+            order.churn_risk,
+        )
+        insights = (order.critical_findings, order.positive_signals, order.immediate_actions)
+
+        opp = order.opportunity
+        if opp:
+            rows.append(order_values + (
+                OPPORTUNITY, opp.order_number, opp.product_series.value,
+                opp.primary_product, opp.amount, opp.close_date, opp.pain_points,
+                None, nan,
+                nan, "", "",
+                "", nan, False, False, False, False, False, False,
+            ) + insights)
+
+        for dep in order.deployments:
+            rows.append(order_values + (
+                DEPLOYMENT, dep.case_number, dep.product_series.value,
+                "", nan, None, "",
+                dep.is_service_deploy, dep.deployment_score,
+                dep.case_age_days, dep.case_reason, dep.status,
+                dep.severity.value, nan, False, False, False, False, False, False,
+            ) + insights)
+
+        for case in order.support_cases:
+            rows.append(order_values + (
+                CASE, case.case_number, case.product_series.value,
+                "", nan, None, "",
+                None, nan,
+                case.case_age_days, case.case_reason, case.status,
+                case.severity.value, case.frustration_score,
+                case.escalation_detected, case.is_repeat_issue, case.is_hardware_failure,
+                case.is_performance_issue, case.is_configuration_issue, bool(case.deployment_related),
+            ) + insights)
+
+    facts = pd.DataFrame.from_records(rows, columns=FACT_COLUMNS)
+    facts["is_service_deploy"] = facts["is_service_deploy"].astype("boolean")
+    for column in ["amount", "deployment_score", "case_age_days", "frustration_score", "journey_health_score"]:
+        facts[column] = pd.to_numeric(facts[column], errors="coerce").astype(float)
+    facts["close_date"] = pd.to_datetime(facts["close_date"])
+    return facts
+
+
+def save_fact_table(facts: pd.DataFrame, path: Path) -> Path:
+    """Write the fact table to CSV (insight lists as JSON arrays)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    out = facts.copy()
+    for column in LIST_COLUMNS:
+        out[column] = out[column].map(json.dumps)
+    out.to_csv(path, index=False)
+    return path
+
+
+def load_fact_table(path: Path) -> pd.DataFrame:
+    """Read a fact table written by save_fact_table()."""
+    facts = pd.read_csv(
+        path,
+        dtype={"order_number": str, "record_id": str, "account_name": str},
+        keep_default_na=False,
+        na_values={
+            column: [""] for column in
+            ["amount", "deployment_score", "case_age_days", "frustration_score",
+             "journey_health_score", "is_service_deploy", "close_date"]
+        },
+        parse_dates=["close_date"],
+    )
+    facts["is_service_deploy"] = facts["is_service_deploy"].astype("boolean")
+    for column in LIST_COLUMNS:
+        facts[column] = facts[column].map(json.loads)
+    return facts
+
+
+def _mean(value: float) -> float:
+    """Group mean, or 0.0 when the group had no values."""
+    return 0.0 if pd.isna(value) else float(value)
+
+
+def _rows(stats: pd.DataFrame) -> Dict[Any, Dict[str, Any]]:
+    """Per-key stats as plain dicts (row lookups in a loop are slow on frames)."""
+    return stats.to_dict("index")
+
+
+def _ordered_counts(frame: pd.DataFrame, key: str, column: str) -> Dict[Any, Dict[str, int]]:
+    """Counts of column values per key, in first-appearance order."""
+    result: Dict[Any, Dict[str, int]] = {}
+    sizes = frame.groupby([key, column], sort=False, dropna=False).size()
+    for (group, value), size in sizes.items():
+        result.setdefault(group, {})[value] = int(size)
+    return result
+
+
+def _sorted_unique(frame: pd.DataFrame, key: str, column: str) -> Dict[Any, List[str]]:
+    """Sorted distinct column values per key."""
+    pairs = frame[[key, column]].drop_duplicates().sort_values(column)
+    result: Dict[Any, List[str]] = {}
+    for group, value in zip(pairs[key], pairs[column]):
+        result.setdefault(group, []).append(value)
+    return result
+
+
+def _top(counts: Dict[str, int], n: int) -> List[tuple]:
+    """Highest counts first; ties keep first-appearance order."""
+    return sorted(counts.items(), key=lambda x: x[1], reverse=True)[:n]
+
+
+def _sketches(frame: pd.DataFrame, key: str, column: str) -> Dict[Any, Dict[str, int]]:
+    """Sketch bucket counts of a column's non-null values per key."""
+    values = frame[column].dropna()
+    buckets = frame.loc[values.index, [key]].assign(_bucket=values.map(sketch_bucket))
+    return _ordered_counts(buckets, key, "_bucket")
+
+
+def _distribution_sketches(orders, deployments, cases, key: str) -> Dict[str, Dict[Any, Dict[str, int]]]:
+    """Sketches of every distribution measure (see accumulator.SKETCHES) per key."""
+    journey = orders[orders["is_fully_linked"].astype(bool)]
+    return {
+        "case_age_days": _sketches(cases, key, "case_age_days"),
+        "deployment_days": _sketches(deployments, key, "case_age_days"),
+        "frustration_score": _sketches(cases, key, "frustration_score"),
+        "journey_health": _sketches(journey, key, "journey_health_score"),
+    }
+
+
+def _percentiles(sketches: Dict[str, Dict[Any, Dict[str, int]]], group: Any) -> Dict[str, Dict[str, float]]:
+    """Percentiles of one key's sketches, skipping empty ones."""
+    result = {}
+    for measure, by_key in sketches.items():
+        values = sketch_percentiles(by_key.get(group, {}))
+        if values:
+            result[measure] = values
+    return result
+
+
+def _deployment_stats(deployments: pd.DataFrame, key: str) -> Dict[Any, Dict[str, Any]]:
+    """Count, scores, success and duration of deployments per key."""
+    scored = deployments["deployment_score"]
+    frame = deployments.assign(
+        _service=deployments["is_service_deploy"].fillna(False).astype(int),
+        _success=(scored > 70).astype(int),
+    )
+    grouped = frame.groupby(key, sort=False)
+    return _rows(pd.DataFrame({
+        "count": grouped.size(),
+        "service": grouped["_service"].sum(),
+        "scored": grouped["deployment_score"].count(),
+        "score_mean": grouped["deployment_score"].mean(),
+        "success": grouped["_success"].sum(),
+        "days_mean": grouped["case_age_days"].mean(),
+    }))
+
+
+def _case_stats(cases: pd.DataFrame, key: str) -> Dict[Any, Dict[str, Any]]:
+    """Count, severity, frustration and issue flags of cases per key."""
+    frame = cases.assign(
+        _s1=(cases["severity"] == "S1").astype(int),
+        _s2=(cases["severity"] == "S2").astype(int),
+        _open=cases["status"].fillna("").str.lower().str.contains("open", regex=False).astype(int),
+    )
+    frame[_CASE_FLAGS] = frame[_CASE_FLAGS].astype(int)
+    grouped = frame.groupby(key, sort=False)
+    stats = pd.DataFrame({
+        "count": grouped.size(),
+        "s1": grouped["_s1"].sum(),
+        "s2": grouped["_s2"].sum(),
+        "open": grouped["_open"].sum(),
+        "age_mean": grouped["case_age_days"].mean(),
+        "frustration_mean": grouped["frustration_score"].mean(),
+        "frustration_max": grouped["frustration_score"].max(),
+    })
+    for flag in _CASE_FLAGS:
+        stats[flag] = grouped[flag].sum()
+    return _rows(stats)
+
+
+def _order_stats(orders: pd.DataFrame, key: str, journey_required: bool) -> Dict[Any, Dict[str, Any]]:
+    """
+    Order counts, revenue and journey outcomes per key.
+
+    Args:
+        orders: One row per (key, order) with order-level columns and amount
+        journey_required: Count high churn risk only when a journey score exists
+    """
+    linked = orders["is_fully_linked"].astype(bool)
+    scored = linked & orders["journey_health_score"].notna()
+    high_churn = orders["churn_risk"].isin(_HIGH_CHURN) & (scored if journey_required else linked)
+    frame = orders.assign(
+        _opportunity=orders["has_opportunity"].astype(int),
+        _linked=linked.astype(int),
+        _journey=orders["journey_health_score"].where(scored),
+        _high_churn=high_churn.astype(int),
+    )
+    grouped = frame.groupby(key, sort=False)
+    return _rows(pd.DataFrame({
+        "orders": grouped.size(),
+        "opportunities": grouped["_opportunity"].sum(),
+        "revenue": grouped["amount"].sum(),
+        "fully_linked": grouped["_linked"].sum(),
+        "journey_mean": grouped["_journey"].mean(),
+        "high_churn": grouped["_high_churn"].sum(),
+        "accounts": grouped["account_name"].nunique(),
+    }))
+
+
+def _product_metrics(facts, orders, deployments, cases) -> Dict[str, ProductMetrics]:
+    # Order membership: substring match on the opportunity product, plus the
+    # series of each deployment and case on the order
+    opportunities = facts[facts["record_type"] == OPPORTUNITY]
+    opp_product = opportunities["primary_product"].fillna("").str.upper()
+    pairs = [
+        opportunities.loc[opp_product.str.contains(key, regex=False), ["order_number"]].assign(series=key)
+        for key in PRODUCT_SERIES_KEYS
+    ]
+    # Record series are ProductSeries values, already upper case for F/M/H/R
+    records = facts[facts["record_type"] != OPPORTUNITY]
+    pairs.append(records[["order_number"]].assign(series=records["product_series"]))
+    membership = pd.concat(pairs).drop_duplicates()
+    membership = membership[membership["series"].isin(PRODUCT_SERIES)]
+
+    member_orders = membership.merge(orders, on="order_number")
+    order_stats = _order_stats(member_orders, "series", journey_required=False)
+
+    deployments = deployments.assign(series=deployments["product_series"])
+    cases = cases.assign(
+        series=cases["product_series"],
+        reason=cases["case_reason"].replace("", "Unknown").fillna("Unknown"),
+    )
+    dep_stats = _deployment_stats(deployments, "series")
+    case_stats = _case_stats(cases, "series")
+    issue_counts = _ordered_counts(cases, "series", "reason")
+    accounts = _sorted_unique(member_orders, "series", "account_name")
+    sketches = _distribution_sketches(member_orders, deployments, cases, "series")
+
+    results = {}
+    for series in PRODUCT_SERIES:
+        metrics = ProductMetrics(product_series=f"{series}-Series")
+
+        if series in order_stats:
+            row = order_stats[series]
+            metrics.units_sold = int(row["opportunities"])
+            metrics.total_revenue = float(row["revenue"])
+            metrics.fully_linked_orders = int(row["fully_linked"])
+            metrics.high_churn_risk_count = int(row["high_churn"])
+            metrics.avg_journey_health = _mean(row["journey_mean"])
+            metrics.unique_accounts = int(row["accounts"])
+            metrics.accounts = accounts[series][:20]
+
+        if series in dep_stats:
+            row = dep_stats[series]
+            metrics.units_deployed = int(row["count"])
+            metrics.service_deploy_count = int(row["service"])
+            metrics.self_deploy_count = metrics.units_deployed - metrics.service_deploy_count
+            metrics.avg_deployment_days = float(row["days_mean"])
+            if row["scored"] > 0:
+                metrics.avg_deployment_score = float(row["score_mean"])
+                metrics.deployment_success_rate = row["success"] / row["scored"] * 100
+
+        if series in case_stats:
+            row = case_stats[series]
+            metrics.total_support_cases = int(row["count"])
+            metrics.avg_case_age_days = float(row["age_mean"])
+            metrics.avg_frustration_score = _mean(row["frustration_mean"])
+            metrics.s1_case_count = int(row["s1"])
+            metrics.s2_case_count = int(row["s2"])
+            metrics.hardware_failure_count = int(row["is_hardware_failure"])
+            metrics.performance_issue_count = int(row["is_performance_issue"])
+            metrics.configuration_issue_count = int(row["is_configuration_issue"])
+            metrics.escalation_count = int(row["escalation_detected"])
+            metrics.repeat_issue_rate = row["is_repeat_issue"] / metrics.total_support_cases * 100
+            metrics.issue_categories = issue_counts[series]
+            metrics.top_issues = [issue for issue, _ in _top(metrics.issue_categories, 5)]
+
+        if metrics.units_sold > 0:
+            metrics.avg_deal_size = metrics.total_revenue / metrics.units_sold
+        if metrics.units_deployed > 0:
+            metrics.support_intensity = metrics.total_support_cases / metrics.units_deployed
+            metrics.hardware_failure_rate = metrics.hardware_failure_count / metrics.units_deployed
+
+        metrics.percentiles = _percentiles(sketches, series)
+
+        if metrics.units_sold > 0 or metrics.units_deployed > 0 or metrics.total_support_cases > 0:
+            results[metrics.product_series] = metrics
+
+    return results
+
+
+def _account_metrics(facts, orders, deployments, cases) -> Dict[str, AccountMetrics]:
+    order_stats = _order_stats(orders, "account_name", journey_required=False)
+    dep_stats = _deployment_stats(deployments, "account_name")
+    case_stats = _case_stats(cases, "account_name")
+    issue_counts = _ordered_counts(
+        cases.assign(reason=cases["case_reason"].replace("", "Unknown").fillna("Unknown")),
+        "account_name", "reason",
+    )
+    sketches = _distribution_sketches(orders, deployments, cases, "account_name")
+
+    opportunities = facts[facts["record_type"] == OPPORTUNITY]
+    products = _sorted_unique(
+        opportunities[opportunities["primary_product"].fillna("") != ""], "account_name", "primary_product",
+    )
+    dates = _rows(opportunities.dropna(subset=["close_date"]).groupby("account_name")["close_date"].agg(["min", "max"]))
+
+    # Insights: first two of each list per fully linked order, in order
+    linked = orders[orders["is_fully_linked"].astype(bool)]
+    insights: Dict[str, Dict[str, List[str]]] = {}
+    for account_name, *lists in linked[["account_name"] + LIST_COLUMNS].itertuples(index=False):
+        collected = insights.setdefault(account_name, {column: [] for column in LIST_COLUMNS})
+        for column, values in zip(LIST_COLUMNS, lists):
+            if values:
+                collected[column].extend(values[:2])
+
+    # Same (set) iteration order as calculate_all_account_metrics()
+    account_names = set()
+    for account_name in orders["account_name"]:
+        account_names.add(account_name)
+
+    now = pd.Timestamp.now()
+    results = {}
+    for account_name in account_names:
+        metrics = AccountMetrics(account_name=account_name)
+
+        row = order_stats[account_name]
+        metrics.total_orders = int(row["orders"])
+        metrics.total_spend = float(row["revenue"])
+        metrics.fully_linked_orders = int(row["fully_linked"])
+        metrics.high_risk_order_count = int(row["high_churn"])
+        metrics.journey_health_avg = _mean(row["journey_mean"])
+        metrics.avg_order_size = metrics.total_spend / metrics.total_orders
+
+        if account_name in dep_stats:
+            row = dep_stats[account_name]
+            metrics.total_deployments = int(row["count"])
+            metrics.service_deploys = int(row["service"])
+            metrics.self_deploys = metrics.total_deployments - metrics.service_deploys
+            metrics.successful_deployments = int(row["success"])
+            metrics.avg_deployment_days = float(row["days_mean"])
+            if row["scored"] > 0:
+                metrics.avg_deployment_score = float(row["score_mean"])
+                metrics.deployment_success_rate = row["success"] / row["scored"] * 100
+
+        if account_name in case_stats:
+            row = case_stats[account_name]
+            metrics.total_support_cases = int(row["count"])
+            metrics.open_cases = int(row["open"])
+            metrics.s1_cases = int(row["s1"])
+            metrics.s2_cases = int(row["s2"])
+            metrics.avg_case_age_days = float(row["age_mean"])
+            if not pd.isna(row["frustration_mean"]):
+                metrics.avg_frustration_score = float(row["frustration_mean"])
+                metrics.max_frustration_score = float(row["frustration_max"])
+            metrics.escalation_count = int(row["escalation_detected"])
+            metrics.repeat_issues = int(row["is_repeat_issue"])
+            metrics.hardware_failures = int(row["is_hardware_failure"])
+            metrics.performance_issues = int(row["is_performance_issue"])
+            metrics.configuration_issues = int(row["is_configuration_issue"])
+            metrics.deployment_related_issues = int(row["deployment_related"])
+            metrics.issue_categories = issue_counts[account_name]
+
+        metrics.products_purchased = products.get(account_name, [])
+
+        if account_name in dates:
+            first, last = dates[account_name]["min"], dates[account_name]["max"]
+            metrics.first_purchase_date = first.to_pydatetime()
+            metrics.last_purchase_date = last.to_pydatetime()
+            metrics.customer_tenure_days = (now - first).days
+
+        metrics.percentiles = _percentiles(sketches, account_name)
+
+        metrics.account_health_score = _calculate_health_score(metrics)
+        metrics.churn_risk = _determine_churn_risk(metrics)
+
+        collected = insights.get(account_name)
+        if collected:
+            metrics.critical_findings = list(set(collected["critical_findings"]))[:5]
+            metrics.positive_signals = list(set(collected["positive_signals"]))[:5]
+            metrics.recommended_actions = list(set(collected["immediate_actions"]))[:5]
+
+        results[account_name] = metrics
+
+    return results
+
+
+def _usecase_metrics(facts, orders, deployments, cases) -> Dict[str, UseCaseMetrics]:
+    order_stats = _order_stats(orders, "use_case", journey_required=True)
+    dep_stats = _deployment_stats(deployments, "use_case")
+    case_stats = _case_stats(cases, "use_case")
+    issue_counts = _ordered_counts(cases[cases["case_reason"].fillna("") != ""], "use_case", "case_reason")
+    escalation_count = int(cases["escalation_detected"].sum())
+    sketches = _distribution_sketches(orders, deployments, cases, "use_case")
+
+    opportunities = facts[facts["record_type"] == OPPORTUNITY]
+    product_counts = _ordered_counts(
+        opportunities[opportunities["primary_product"].fillna("") != ""], "use_case", "primary_product",
+    )
+    pain_points = (
+        opportunities[opportunities["pain_points"].fillna("") != ""]
+        .groupby("use_case", sort=False)["pain_points"].agg(list)
+        .to_dict()
+    )
+
+    scored = deployments[deployments["deployment_score"].notna()]
+    by_product = scored.assign(_success=(scored["deployment_score"] > 70).astype(int)).groupby(
+        ["use_case", "product_series"], sort=False,
+    )
+    performance = by_product.agg(
+        avg_score=("deployment_score", "mean"),
+        success=("_success", "sum"),
+        count=("deployment_score", "size"),
+    )
+    product_performance: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for (use_case, product), avg_score, success, count in performance.itertuples(name=None):
+        product_performance.setdefault(use_case, {})[product] = {
+            "avg_deployment_score": float(avg_score),
+            "success_rate": success / count * 100,
+            "deployment_count": int(count),
+        }
+
+    results = {}
+    for use_case in reported_use_cases():
+        if use_case not in order_stats:
+            continue
+        metrics = UseCaseMetrics(use_case=use_case)
+
+        row = order_stats[use_case]
+        metrics.total_orders = int(row["orders"])
+        metrics.total_revenue = float(row["revenue"])
+        metrics.unique_accounts = int(row["accounts"])
+        metrics.high_churn_risk_count = int(row["high_churn"])
+        metrics.avg_journey_health = _mean(row["journey_mean"])
+        metrics.products_deployed = product_counts.get(use_case, {})
+
+        if use_case in dep_stats:
+            row = dep_stats[use_case]
+            metrics.total_deployments = int(row["count"])
+            if row["scored"] > 0:
+                metrics.avg_deployment_score = float(row["score_mean"])
+                metrics.deployment_success_rate = row["success"] / row["scored"] * 100
+            metrics.service_deploy_rate = (row["service"] / metrics.total_deployments) * 100
+
+        if use_case in case_stats:
+            row = case_stats[use_case]
+            metrics.total_support_cases = int(row["count"])
+            metrics.s1_case_count = int(row["s1"])
+            metrics.avg_frustration_score = _mean(row["frustration_mean"])
+            metrics.escalation_rate = (escalation_count / metrics.total_support_cases) * 100
+
+        if metrics.total_deployments > 0:
+            metrics.support_intensity = metrics.total_support_cases / metrics.total_deployments
+
+        metrics.product_performance = product_performance.get(use_case, {})
+        if metrics.product_performance:
+            sorted_products = sorted(
+                metrics.product_performance.items(),
+                key=lambda x: x[1]["avg_deployment_score"],
+                reverse=True
+            )
+            metrics.best_performing_product = sorted_products[0][0]
+            metrics.worst_performing_product = sorted_products[-1][0] if len(sorted_products) > 1 else ""
+
+        sorted_issues = _top(issue_counts.get(use_case, {}), 10)
+        metrics.top_issues = [issue for issue, _ in sorted_issues[:5]]
+        metrics.issue_distribution = dict(sorted_issues)
+
+        if use_case in pain_points:
+            metrics.common_pain_points = list(set(pain_points[use_case]))[:5]
+
+        qualified_products = [
+            (prod, data) for prod, data in metrics.product_performance.items()
+            if data["deployment_count"] >= 2
+        ]
+        if qualified_products:
+            sorted_by_success = sorted(qualified_products, key=lambda x: (-x[1]["success_rate"], x[0]))
+            metrics.recommended_products = [p[0] for p in sorted_by_success[:3]]
+
+        metrics.percentiles = _percentiles(sketches, use_case)
+
+        results[use_case] = metrics
+
+    return results
+
+
+def _service_metrics(facts, orders, deployments, cases) -> Dict[bool, ServiceMetrics]:
+    # Orders belong to each deploy type they have a deployment of; their
+    # cases count towards every type the order belongs to
+    membership = deployments[["order_number", "is_service_deploy"]].drop_duplicates()
+    membership = membership.rename(columns={"is_service_deploy": "deploy_type"})
+    member_orders = membership.merge(orders, on="order_number")
+    member_cases = membership.merge(cases, on="order_number")
+
+    order_stats = _order_stats(member_orders, "deploy_type", journey_required=True)
+    dep_stats = _deployment_stats(deployments.assign(deploy_type=deployments["is_service_deploy"]), "deploy_type")
+    case_stats = _case_stats(member_cases, "deploy_type")
+    product_counts = _ordered_counts(
+        deployments.assign(deploy_type=deployments["is_service_deploy"]), "deploy_type", "product_series",
+    )
+
+    results = {}
+    for flag in (True, False):
+        metrics = ServiceMetrics(category="Service Deploy" if flag else "Self Deploy")
+
+        if flag in order_stats:
+            row = order_stats[flag]
+            metrics.unique_accounts = int(row["accounts"])
+            metrics.total_revenue = float(row["revenue"])
+            metrics.high_churn_risk_count = int(row["high_churn"])
+            metrics.avg_journey_health = _mean(row["journey_mean"])
+
+        if flag in dep_stats:
+            row = dep_stats[flag]
+            metrics.total_deployments = int(row["count"])
+            metrics.avg_deployment_days = float(row["days_mean"])
+            if row["scored"] > 0:
+                metrics.avg_deployment_score = float(row["score_mean"])
+                metrics.deployment_success_rate = row["success"] / row["scored"] * 100
+            metrics.products_deployed = product_counts.get(flag, {})
+
+        if flag in case_stats:
+            row = case_stats[flag]
+            metrics.total_support_cases = int(row["count"])
+            metrics.s1_cases = int(row["s1"])
+            metrics.s2_cases = int(row["s2"])
+            metrics.escalation_count = int(row["escalation_detected"])
+            metrics.deployment_related_issues = int(row["deployment_related"])
+            metrics.avg_frustration_score = _mean(row["frustration_mean"])
+
+        if metrics.total_deployments > 0:
+            metrics.support_cases_per_deployment = metrics.total_support_cases / metrics.total_deployments
+
+        results[flag] = metrics
+
+    return results
+
+
+def calculate_metrics_from_facts(facts: pd.DataFrame) -> AllMetrics:
+    """
+    Calculate all metric families with grouped operations on a fact table.
+
+    Args:
+        facts: DataFrame from build_fact_table() or load_fact_table()
+
+    Returns:
+        AllMetrics equal to calculate_all_metrics() up to float rounding
+    """
+    # One row per order, with the opportunity amount (NaN without one)
+    first_rows = facts.drop_duplicates("order_number")[ORDER_COLUMNS + LIST_COLUMNS]
+    amounts = facts.loc[facts["record_type"] == OPPORTUNITY, ["order_number", "amount"]]
+    orders = first_rows.merge(amounts, on="order_number", how="left")
+
+    deployments = facts[facts["record_type"] == DEPLOYMENT]
+    cases = facts[facts["record_type"] == CASE]
+
+    services = _service_metrics(facts, orders, deployments, cases)
+    return AllMetrics(
+        product_metrics=_product_metrics(facts, orders, deployments, cases),
+        account_metrics=_account_metrics(facts, orders, deployments, cases),
+        usecase_metrics=_usecase_metrics(facts, orders, deployments, cases),
+        service_comparison=_build_comparison(services[True], services[False]),
+    )
@@ -0,0 +1,115 @@
+"""
+Incrementally maintained metrics for Account Solutions Success.
+
+MetricsState keeps the accumulated state of every metric family (sums,
+counts and histograms per product, account, use case and deploy type)
+between runs. When a delta is folded into the linked data, only the
+touched orders are revisited:
+- retract() the affected orders before LinkedDataStore.apply_delta()
+- add() the touched orders once the delta (and their analysis) is applied
+
+Metrics are then finalized from the state, which gives the same result as
+calculate_all_metrics() over the whole store in time proportional to the
+size of the delta. run_full_analysis(delta=True) keeps the state in
+Config.METRICS_STATE_PATH, next to the linked data it describes.
+"""
+
+import json
+from pathlib import Path
+from typing import Iterable
+
+from ...data.data_linker import LinkedDataStore
+from .engine import AllMetrics, MetricsAccumulators
+
+
+STATE_VERSION = 2
+
+
+class MetricsState:
+    """
+    Persistent metrics accumulators backed by a JSON file.
+
+    The state must describe the store it is updated against: build it with
+    rebuild() and keep it in step with every delta applied afterwards.
+
+    Usage:
+        state = MetricsState(Config.METRICS_STATE_PATH)
+        if state.is_empty:
+            state.rebuild(linked)
+        state.retract(linked, linked.orders_affected_by(opps, deps, cases))
+        touched = linked.apply_delta(opps, deps, cases)
+        ...analyze touched orders...
+        state.add(linked, touched)
+        metrics = state.metrics()
+        state.save()
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.accumulators = MetricsAccumulators()
+        self.order_count = 0
+        if self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path, "r") as f:
+            data = json.load(f)
+
+        if data.get("version") != STATE_VERSION:
+            # Accumulator layout changed: the state has to be rebuilt
+            return
+        self.accumulators = MetricsAccumulators.from_dict(data.get("accumulators", {}))
+        self.order_count = data.get("order_count", 0)
+
+    def save(self) -> None:
+        """Write the state to disk (atomically, via a temp file)."""
+        data = {
+            "version": STATE_VERSION,
+            "order_count": self.order_count,
+            "accumulators": self.accumulators.to_dict(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        tmp_path.replace(self.path)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.order_count == 0
+
+    def rebuild(self, data_store: LinkedDataStore) -> None:
+        """Discard the state and accumulate every order of the store."""
+        self.accumulators = MetricsAccumulators()
+        self.order_count = 0
+        self.add(data_store, [order.order_number for order in data_store.orders])
+
+    def add(self, data_store: LinkedDataStore, order_numbers: Iterable[str]) -> int:
+        """Accumulate the current state of the given orders. Returns the order count."""
+        return self._merge(data_store, order_numbers, sign=1)
+
+    def retract(self, data_store: LinkedDataStore, order_numbers: Iterable[str]) -> int:
+        """Remove the current state of the given orders. Returns the order count."""
+        return self._merge(data_store, order_numbers, sign=-1)
+
+    def _merge(self, data_store: LinkedDataStore, order_numbers: Iterable[str], sign: int) -> int:
+        delta = MetricsAccumulators()
+        count = 0
+        for order_number in order_numbers:
+            order = data_store.get_order(order_number)
+            if order is None:
+                continue
+            delta.add_order(order, data_store.get_use_case(order_number))
+            count += 1
+
+        if sign > 0 and not self.order_count:
+            self.accumulators = delta
+        else:
+            self.accumulators.merge(delta, sign)
+        self.order_count += sign * count
+        return count
+
+    def metrics(self) -> AllMetrics:
+        """Finalize every metric family from the current state."""
+        # Same (set) iteration order as calculate_all_metrics()
+        return self.accumulators.finalize(account_order=set(self.accumulators.accounts))
@@ -16,8 +16,13 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from collections import defaultdict
 
-from ...data.models import ProductSeries, LinkedOrder
+from ...data.models import ProductSeries, LinkedOrder, Deployment, SupportCase, Severity
 from ...data.data_linker import LinkedDataStore
+from .accumulator import Accumulator, sketch_bucket
+
+
+# Product series reported on, in output order
+PRODUCT_SERIES = ["F", "M", "H", "R"]
 
 
 @dataclass
@@ -59,6 +64,9 @@ class ProductMetrics:
     issue_categories: Dict[str, int] = field(default_factory=dict)
     top_issues: List[str] = field(default_factory=list)
 
+    # Distributions: measure -> {"p50", "p90", "p99"} from mergeable sketches
+    percentiles: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
     # Journey health (from fully linked orders)
     fully_linked_orders: int = 0
     avg_journey_health: float = 0.0
@@ -69,169 +77,198 @@ class ProductMetrics:
     accounts: List[str] = field(default_factory=list)
 
 
-def calculate_product_metrics(
-    data_store: LinkedDataStore,
-    product_series: str,
-    include_analysis: bool = True,
-) -> ProductMetrics:
-    """
-    Calculate aggregated metrics for a specific product series.
+def _normalize_series(product_series: str) -> str:
+    """Normalize "F-Series", "f series" or "F" to the series key "F"."""
+    return product_series.upper().replace("-SERIES", "").replace("SERIES", "").strip()
 
-    Args:
-        data_store: LinkedDataStore with correlated data
-        product_series: Product series name (e.g., "F-Series", "M")
-        include_analysis: If True, include AI analysis results
 
-    Returns:
-        ProductMetrics with aggregated data
+class _ProductAccumulator(Accumulator):
     """
-    metrics = ProductMetrics()
+    Running totals for one product series.
 
-    # Normalize product series name
-    series_normalized = product_series.upper().replace("-SERIES", "").replace("SERIES", "").strip()
-    metrics.product_series = f"{series_normalized}-Series"
+    Fed one order at a time: open_order() for every order matching the
+    series, add_deployment() / add_case() for records of this series only,
+    then close_order(). Shared by calculate_product_metrics(), the fused
+    metrics engine and the incremental metrics state.
+    """
 
-    # Track unique accounts
-    accounts_seen = set()
+    def __init__(self, series_normalized: str):
+        super().__init__()
+        self.series = series_normalized
 
-    # Collect orders for this product
-    matching_orders = []
+    def add_order(self, order: LinkedOrder) -> None:
+        """Feed a whole order, filtering records to this series."""
+        self.open_order(order)
+        for dep in order.deployments:
+            if dep.product_series.value.upper() == self.series:
+                self.add_deployment(dep)
+        for case in order.support_cases:
+            if case.product_series.value.upper() == self.series:
+                self.add_case(case)
+        self.close_order(order)
 
-    for order in data_store.orders:
-        # Check if any linked data matches this product series
-        matches = False
+    def open_order(self, order: LinkedOrder) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        histograms["accounts"][order.account_name] += 1
 
-        # Check opportunity
+        # Opportunity metrics
         if order.opportunity:
-            opp_product = (order.opportunity.primary_product or "").upper()
-            if series_normalized in opp_product:
-                matches = True
+            totals["units_sold"] += 1
+            totals["total_revenue"] += order.opportunity.amount
+
+    def add_deployment(self, dep: Deployment) -> None:
+        totals = self.totals
+        totals["units_deployed"] += 1
+        totals["deployment_days"] += dep.case_age_days
+        self.histograms["deployment_days_sketch"][sketch_bucket(dep.case_age_days)] += 1
+
+        if dep.is_service_deploy:
+            totals["service_deploys"] += 1
+        else:
+            totals["self_deploys"] += 1
+
+        if dep.deployment_score is not None:
+            totals["scored_deployments"] += 1
+            totals["deployment_score"] += dep.deployment_score
+            if dep.deployment_score > 70:
+                totals["successful_deployments"] += 1
+
+    def add_case(self, case: SupportCase) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        totals["support_cases"] += 1
+        totals["case_age_days"] += case.case_age_days
+        histograms["case_age_sketch"][sketch_bucket(case.case_age_days)] += 1
+
+        if case.frustration_score is not None:
+            totals["frustration_cases"] += 1
+            totals["frustration_score"] += case.frustration_score
+            histograms["frustration_sketch"][sketch_bucket(case.frustration_score)] += 1
+
+        # Severity counts
+        if case.severity is Severity.S1:
+            totals["s1_cases"] += 1
+        elif case.severity is Severity.S2:
+            totals["s2_cases"] += 1
+
+        # Issue detection
+        if case.is_hardware_failure:
+            totals["hardware_failures"] += 1
+        if case.is_performance_issue:
+            totals["performance_issues"] += 1
+        if case.is_configuration_issue:
+            totals["configuration_issues"] += 1
+        if case.is_repeat_issue:
+            totals["repeat_issues"] += 1
+        if case.escalation_detected:
+            totals["escalations"] += 1
+
+        # Issue categories
+        histograms["issue_categories"][case.case_reason or "Unknown"] += 1
+
+    def close_order(self, order: LinkedOrder) -> None:
+        totals = self.totals
+        # Journey health from fully linked orders
+        if order.is_fully_linked:
+            totals["fully_linked_orders"] += 1
+            if order.journey_health_score is not None:
+                totals["journey_orders"] += 1
+                totals["journey_health"] += order.journey_health_score
+                self.histograms["journey_health_sketch"][sketch_bucket(order.journey_health_score)] += 1
+            if order.churn_risk in ["Critical", "High"]:
+                totals["high_churn_risk"] += 1
+
+    def finalize(self) -> ProductMetrics:
+        total = self.total
+        metrics = ProductMetrics(
+            product_series=f"{self.series}-Series",
+            units_sold=total("units_sold"),
+            total_revenue=float(total("total_revenue")),
+            units_deployed=total("units_deployed"),
+            service_deploy_count=total("service_deploys"),
+            self_deploy_count=total("self_deploys"),
+            total_support_cases=total("support_cases"),
+            s1_case_count=total("s1_cases"),
+            s2_case_count=total("s2_cases"),
+            escalation_count=total("escalations"),
+            hardware_failure_count=total("hardware_failures"),
+            performance_issue_count=total("performance_issues"),
+            configuration_issue_count=total("configuration_issues"),
+            issue_categories=dict(self.histogram("issue_categories")),
+            fully_linked_orders=total("fully_linked_orders"),
+            high_churn_risk_count=total("high_churn_risk"),
+        )
 
-        # Check deployments
-        for dep in order.deployments:
-            if dep.product_series.value.upper() == series_normalized:
-                matches = True
-                break
+        # Calculate averages and rates
+        if metrics.units_sold > 0:
+            metrics.avg_deal_size = metrics.total_revenue / metrics.units_sold
 
-        # Check support cases
-        for case in order.support_cases:
-            if case.product_series.value.upper() == series_normalized:
-                matches = True
-                break
-
-        if matches:
-            matching_orders.append(order)
-            accounts_seen.add(order.account_name)
-
-    # Calculate metrics from matching orders
-    deployment_scores = []
-    deployment_days = []
-    case_ages = []
-    frustration_scores = []
-    journey_health_scores = []
-
-    for order in matching_orders:
-        # Opportunity metrics
-        if order.opportunity:
-            metrics.units_sold += 1
-            metrics.total_revenue += order.opportunity.amount
+        if total("scored_deployments"):
+            metrics.avg_deployment_score = self.ratio("deployment_score", "scored_deployments")
+            metrics.deployment_success_rate = self.ratio("successful_deployments", "scored_deployments") * 100
 
-        # Deployment metrics
-        for dep in order.deployments:
-            if dep.product_series.value.upper() == series_normalized:
-                metrics.units_deployed += 1
-                deployment_days.append(dep.case_age_days)
+        if metrics.units_deployed > 0:
+            metrics.avg_deployment_days = self.ratio("deployment_days", "units_deployed")
 
-                if dep.is_service_deploy:
-                    metrics.service_deploy_count += 1
-                else:
-                    metrics.self_deploy_count += 1
+        if metrics.total_support_cases > 0:
+            metrics.avg_case_age_days = self.ratio("case_age_days", "support_cases")
 
-                if dep.deployment_score is not None:
-                    deployment_scores.append(dep.deployment_score)
+        if total("frustration_cases"):
+            metrics.avg_frustration_score = self.ratio("frustration_score", "frustration_cases")
 
-        # Support case metrics
-        for case in order.support_cases:
-            if case.product_series.value.upper() == series_normalized:
-                metrics.total_support_cases += 1
-                case_ages.append(case.case_age_days)
-
-                if case.frustration_score is not None:
-                    frustration_scores.append(case.frustration_score)
-
-                # Severity counts
-                if case.severity.value == "S1":
-                    metrics.s1_case_count += 1
-                elif case.severity.value == "S2":
-                    metrics.s2_case_count += 1
-
-                # Issue detection
-                if case.is_hardware_failure:
-                    metrics.hardware_failure_count += 1
-                if case.is_performance_issue:
-                    metrics.performance_issue_count += 1
-                if case.is_configuration_issue:
-                    metrics.configuration_issue_count += 1
-                if case.is_repeat_issue:
-                    metrics.repeat_issue_rate += 1  # Will convert to rate later
-                if case.escalation_detected:
-                    metrics.escalation_count += 1
-
-                # Issue categories
-                reason = case.case_reason or "Unknown"
-                metrics.issue_categories[reason] = metrics.issue_categories.get(reason, 0) + 1
+        if metrics.units_deployed > 0:
+            metrics.support_intensity = metrics.total_support_cases / metrics.units_deployed
+            metrics.hardware_failure_rate = metrics.hardware_failure_count / metrics.units_deployed
 
-        # Journey health from fully linked orders
-        if order.is_fully_linked:
-            metrics.fully_linked_orders += 1
-            if order.journey_health_score is not None:
-                journey_health_scores.append(order.journey_health_score)
-            if order.churn_risk in ["Critical", "High"]:
-                metrics.high_churn_risk_count += 1
+        if metrics.total_support_cases > 0:
+            metrics.repeat_issue_rate = (total("repeat_issues") / metrics.total_support_cases) * 100
 
-    # Calculate averages and rates
-    if metrics.units_sold > 0:
-        metrics.avg_deal_size = metrics.total_revenue / metrics.units_sold
+        if total("journey_orders"):
+            metrics.avg_journey_health = self.ratio("journey_health", "journey_orders")
 
-    if deployment_scores:
-        metrics.avg_deployment_score = sum(deployment_scores) / len(deployment_scores)
-        metrics.deployment_success_rate = (
-            sum(1 for s in deployment_scores if s > 70) / len(deployment_scores) * 100
-        )
+        metrics.percentiles = self.percentiles()
 
-    if deployment_days:
-        metrics.avg_deployment_days = sum(deployment_days) / len(deployment_days)
+        # Top issues
+        sorted_issues = sorted(
+            metrics.issue_categories.items(),
+            key=lambda x: x[1],
+            reverse=True
+        )
+        metrics.top_issues = [issue for issue, _ in sorted_issues[:5]]
 
-    if case_ages:
-        metrics.avg_case_age_days = sum(case_ages) / len(case_ages)
+        # Account info
+        accounts = self.histogram("accounts")
+        metrics.unique_accounts = len(accounts)
+        metrics.accounts = sorted(accounts)[:20]  # Top 20
 
-    if frustration_scores:
-        metrics.avg_frustration_score = sum(frustration_scores) / len(frustration_scores)
+        return metrics
 
-    if metrics.units_deployed > 0:
-        metrics.support_intensity = metrics.total_support_cases / metrics.units_deployed
-        metrics.hardware_failure_rate = metrics.hardware_failure_count / metrics.units_deployed
 
-    if metrics.total_support_cases > 0:
-        # Convert repeat count to rate
-        metrics.repeat_issue_rate = (metrics.repeat_issue_rate / metrics.total_support_cases) * 100
+def calculate_product_metrics(
+    data_store: LinkedDataStore,
+    product_series: str,
+    include_analysis: bool = True,
+) -> ProductMetrics:
+    """
+    Calculate aggregated metrics for a specific product series.
 
-    if journey_health_scores:
-        metrics.avg_journey_health = sum(journey_health_scores) / len(journey_health_scores)
+    Args:
+        data_store: LinkedDataStore with correlated data
+        product_series: Product series name (e.g., "F-Series", "M")
+        include_analysis: If True, include AI analysis results
 
-    # Top issues
-    sorted_issues = sorted(
-        metrics.issue_categories.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )
-    metrics.top_issues = [issue for issue, _ in sorted_issues[:5]]
+    Returns:
+        ProductMetrics with aggregated data
+    """
+    series_normalized = _normalize_series(product_series)
+    accumulator = _ProductAccumulator(series_normalized)
 
-    # Account info
-    metrics.unique_accounts = len(accounts_seen)
-    metrics.accounts = sorted(accounts_seen)[:20]  # Top 20
+    # Orders with any record of this product series (indexed at link time)
+    for order in data_store.get_orders_by_product_series(series_normalized):
+        accumulator.add_order(order)
 
-    return metrics
+    return accumulator.finalize()
 
 
 def calculate_all_product_metrics(
@@ -248,10 +285,8 @@ def calculate_all_product_metrics(
     Returns:
         Dict mapping product series name to ProductMetrics
     """
-    series_list = ["F", "M", "H", "R"]
-
     results = {}
-    for series in series_list:
+    for series in PRODUCT_SERIES:
         metrics = calculate_product_metrics(data_store, series, include_analysis)
         if metrics.units_sold > 0 or metrics.units_deployed > 0 or metrics.total_support_cases > 0:
             results[metrics.product_series] = metrics
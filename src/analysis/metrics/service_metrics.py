@@ -12,10 +12,10 @@ Key metric: Service Value-Add = Service Team Delta vs Self-Deploy
 
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
-from collections import defaultdict
 
-from ...data.models import LinkedOrder
+from ...data.models import LinkedOrder, Deployment, SupportCase, Severity
 from ...data.data_linker import LinkedDataStore
+from .accumulator import Accumulator
 
 
 @dataclass
@@ -73,107 +73,145 @@ class ServiceComparison:
     recommendation: str = ""
 
 
-def calculate_service_metrics(
-    data_store: LinkedDataStore,
-    is_service_deploy: bool,
-) -> ServiceMetrics:
+class _ServiceAccumulator(Accumulator):
     """
-    Calculate metrics for service or self deployments.
+    Running totals for service or self deployments.
 
-    Args:
-        data_store: LinkedDataStore with correlated data
-        is_service_deploy: True for service deploys, False for self-deploys
-
-    Returns:
-        ServiceMetrics for the specified category
+    An order counts once it has a deployment of this category: open_order(),
+    add_deployment() for the matching deployments, add_case() for every
+    case on the order, then close_order(). Shared by
+    calculate_service_metrics(), the fused metrics engine and the
+    incremental metrics state.
     """
-    metrics = ServiceMetrics()
-    metrics.category = "Service Deploy" if is_service_deploy else "Self Deploy"
-
-    # Track data points
-    accounts_seen = set()
-    deployment_scores = []
-    deployment_days = []
-    frustration_scores = []
-    journey_health_scores = []
-    product_counts = defaultdict(int)
-    time_to_first_case = []
-
-    for order in data_store.orders:
+
+    def __init__(self, is_service_deploy: bool):
+        super().__init__()
+        self.is_service_deploy = is_service_deploy
+
+    def add_order(self, order: LinkedOrder) -> None:
+        """Feed a whole order; ignored without a matching deployment."""
         # Find deployments matching our category
         matching_deploys = [
             d for d in order.deployments
-            if d.is_service_deploy == is_service_deploy
+            if d.is_service_deploy == self.is_service_deploy
         ]
 
         if not matching_deploys:
-            continue
+            return
+
+        self.open_order(order)
+        for dep in matching_deploys:
+            self.add_deployment(dep)
+        # Support cases for orders with matching deployments
+        for case in order.support_cases:
+            self.add_case(case)
+        self.close_order(order)
 
-        # Count this order
-        accounts_seen.add(order.account_name)
+    def open_order(self, order: LinkedOrder) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        histograms["accounts"][order.account_name] += 1
 
         if order.opportunity:
-            metrics.total_revenue += order.opportunity.amount
+            totals["total_revenue"] += order.opportunity.amount
 
-        # Process each matching deployment
-        for dep in matching_deploys:
-            metrics.total_deployments += 1
-            deployment_days.append(dep.case_age_days)
+    def add_deployment(self, dep: Deployment) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        totals["deployments"] += 1
+        totals["deployment_days"] += dep.case_age_days
 
-            if dep.deployment_score is not None:
-                deployment_scores.append(dep.deployment_score)
+        if dep.deployment_score is not None:
+            totals["scored_deployments"] += 1
+            totals["deployment_score"] += dep.deployment_score
+            if dep.deployment_score > 70:
+                totals["successful_deployments"] += 1
 
-            product_counts[dep.product_series.value] += 1
+        histograms["products"][dep.product_series.value] += 1
 
-        # Support cases for orders with matching deployments
-        for case in order.support_cases:
-            metrics.total_support_cases += 1
+    def add_case(self, case: SupportCase) -> None:
+        totals = self.totals
+        totals["support_cases"] += 1
 
-            if case.frustration_score is not None:
-                frustration_scores.append(case.frustration_score)
+        if case.frustration_score is not None:
+            totals["frustration_cases"] += 1
+            totals["frustration_score"] += case.frustration_score
 
-            if case.severity.value == "S1":
-                metrics.s1_cases += 1
-            elif case.severity.value == "S2":
-                metrics.s2_cases += 1
+        if case.severity is Severity.S1:
+            totals["s1_cases"] += 1
+        elif case.severity is Severity.S2:
+            totals["s2_cases"] += 1
 
-            if case.escalation_detected:
-                metrics.escalation_count += 1
+        if case.escalation_detected:
+            totals["escalations"] += 1
 
-            if case.deployment_related:
-                metrics.deployment_related_issues += 1
+        if case.deployment_related:
+            totals["deployment_related_issues"] += 1
 
+    def close_order(self, order: LinkedOrder) -> None:
+        totals = self.totals
         # Journey health
         if order.is_fully_linked and order.journey_health_score is not None:
-            journey_health_scores.append(order.journey_health_score)
+            totals["journey_orders"] += 1
+            totals["journey_health"] += order.journey_health_score
             if order.churn_risk in ["Critical", "High"]:
-                metrics.high_churn_risk_count += 1
+                totals["high_churn_risk"] += 1
+
+    def finalize(self) -> ServiceMetrics:
+        total = self.total
+        metrics = ServiceMetrics(
+            category="Service Deploy" if self.is_service_deploy else "Self Deploy",
+            total_deployments=total("deployments"),
+            unique_accounts=len(self.histogram("accounts")),
+            total_revenue=float(total("total_revenue")),
+            total_support_cases=total("support_cases"),
+            s1_cases=total("s1_cases"),
+            s2_cases=total("s2_cases"),
+            escalation_count=total("escalations"),
+            deployment_related_issues=total("deployment_related_issues"),
+            high_churn_risk_count=total("high_churn_risk"),
+            products_deployed=dict(self.histogram("products")),
+        )
 
-    # Calculate aggregates
-    metrics.unique_accounts = len(accounts_seen)
-    metrics.products_deployed = dict(product_counts)
+        if total("scored_deployments"):
+            metrics.avg_deployment_score = self.ratio("deployment_score", "scored_deployments")
+            metrics.deployment_success_rate = self.ratio("successful_deployments", "scored_deployments") * 100
 
-    if deployment_scores:
-        metrics.avg_deployment_score = sum(deployment_scores) / len(deployment_scores)
-        metrics.deployment_success_rate = (
-            sum(1 for s in deployment_scores if s > 70) / len(deployment_scores) * 100
-        )
+        if metrics.total_deployments > 0:
+            metrics.avg_deployment_days = self.ratio("deployment_days", "deployments")
+            metrics.support_cases_per_deployment = (
+                metrics.total_support_cases / metrics.total_deployments
+            )
 
-    if deployment_days:
-        metrics.avg_deployment_days = sum(deployment_days) / len(deployment_days)
+        if total("frustration_cases"):
+            metrics.avg_frustration_score = self.ratio("frustration_score", "frustration_cases")
 
-    if metrics.total_deployments > 0:
-        metrics.support_cases_per_deployment = (
-            metrics.total_support_cases / metrics.total_deployments
-        )
+        if total("journey_orders"):
+            metrics.avg_journey_health = self.ratio("journey_health", "journey_orders")
 
-    if frustration_scores:
-        metrics.avg_frustration_score = sum(frustration_scores) / len(frustration_scores)
+        return metrics
 
-    if journey_health_scores:
-        metrics.avg_journey_health = sum(journey_health_scores) / len(journey_health_scores)
 
-    return metrics
+def calculate_service_metrics(
+    data_store: LinkedDataStore,
+    is_service_deploy: bool,
+) -> ServiceMetrics:
+    """
+    Calculate metrics for service or self deployments.
+
+    Args:
+        data_store: LinkedDataStore with correlated data
+        is_service_deploy: True for service deploys, False for self-deploys
+
+    Returns:
+        ServiceMetrics for the specified category
+    """
+    accumulator = _ServiceAccumulator(is_service_deploy)
+
+    for order in data_store.get_orders_by_deploy_type(is_service_deploy):
+        accumulator.add_order(order)
+
+    return accumulator.finalize()
 
 
 def compare_service_vs_self_deploy(
@@ -185,14 +223,18 @@ def compare_service_vs_self_deploy(
     Returns:
         ServiceComparison with both metrics and deltas
     """
-    comparison = ServiceComparison()
+    return _build_comparison(
+        calculate_service_metrics(data_store, is_service_deploy=True),
+        calculate_service_metrics(data_store, is_service_deploy=False),
+    )
 
-    # Calculate both sets of metrics
-    comparison.service_metrics = calculate_service_metrics(data_store, is_service_deploy=True)
-    comparison.self_metrics = calculate_service_metrics(data_store, is_service_deploy=False)
 
-    service = comparison.service_metrics
-    self_deploy = comparison.self_metrics
+def _build_comparison(
+    service: ServiceMetrics,
+    self_deploy: ServiceMetrics,
+) -> ServiceComparison:
+    """Compute deltas, value-add score and recommendation for two categories."""
+    comparison = ServiceComparison(service_metrics=service, self_metrics=self_deploy)
 
     # Calculate deltas (positive = service is better)
     comparison.deployment_score_delta = (
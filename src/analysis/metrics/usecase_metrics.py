@@ -19,10 +19,11 @@ Provides insights into:
 
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
-from collections import defaultdict
 
-from ...data.models import LinkedOrder
+from ...data.models import LinkedOrder, Deployment, SupportCase, Severity
 from ...data.data_linker import LinkedDataStore
+from ...data.normalization import use_case_categories
+from .accumulator import Accumulator, sketch_bucket
 
 
 # Standard use case categories
@@ -39,6 +40,13 @@ USE_CASE_CATEGORIES = [
 ]
 
 
+def reported_use_cases() -> List[str]:
+    """USE_CASE_CATEGORIES followed by any extra categories of the active taxonomy."""
+    return USE_CASE_CATEGORIES + [
+        category for category in use_case_categories() if category not in USE_CASE_CATEGORIES
+    ]
+
+
 @dataclass
 class UseCaseMetrics:
     """Aggregated metrics for a use case category."""
@@ -75,6 +83,9 @@ class UseCaseMetrics:
     # Performance by product for this use case
     product_performance: Dict[str, Dict[str, float]] = field(default_factory=dict)
 
+    # Distributions: measure -> {"p50", "p90", "p99"} from mergeable sketches
+    percentiles: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
     # Journey health
     avg_journey_health: float = 0.0
     high_churn_risk_count: int = 0
@@ -84,189 +95,201 @@ class UseCaseMetrics:
     common_pain_points: List[str] = field(default_factory=list)
 
 
-def _categorize_use_case(use_case_text: str) -> str:
-    """Map use case text to standard category."""
-    if not use_case_text:
-        return "Unknown"
-
-    text_lower = use_case_text.lower()
-
-    if any(kw in text_lower for kw in ["media", "video edit", "broadcast", "post-production", "4k", "8k"]):
-        return "Media & Entertainment"
-    elif any(kw in text_lower for kw in ["backup", "archive", "dr", "disaster", "retention", "cold storage"]):
-        return "Backup & Archive"
-    elif any(kw in text_lower for kw in ["vm", "virtual", "vdi", "esxi", "hyper-v", "container", "docker", "kubernetes"]):
-        return "Virtualization"
-    elif any(kw in text_lower for kw in ["database", "sql", "oracle", "mysql", "postgres", "analytics", "olap", "oltp"]):
-        return "Database"
-    elif any(kw in text_lower for kw in ["file", "share", "nas", "smb", "nfs", "cifs", "collab", "home director"]):
-        return "File Sharing"
-    elif any(kw in text_lower for kw in ["surveil", "camera", "nvr", "security", "cctv"]):
-        return "Video Surveillance"
-    elif any(kw in text_lower for kw in ["hpc", "research", "scientific", "render", "simulation", "compute"]):
-        return "Scientific/HPC"
-    else:
-        return "General Purpose"
-
-
-def calculate_usecase_metrics(
-    data_store: LinkedDataStore,
-    use_case: str,
-) -> UseCaseMetrics:
+class _UseCaseAccumulator(Accumulator):
     """
-    Calculate aggregated metrics for a specific use case.
+    Running totals for one use case category.
 
-    Args:
-        data_store: LinkedDataStore with correlated data
-        use_case: Use case category name
-
-    Returns:
-        UseCaseMetrics with aggregated data
+    Fed one order at a time (open_order, add_deployment, add_case,
+    close_order). Shared by calculate_usecase_metrics(), the fused metrics
+    engine and the incremental metrics state.
     """
-    metrics = UseCaseMetrics()
-    metrics.use_case = use_case
-
-    # Track data points
-    accounts_seen = set()
-    deployment_scores_by_product = defaultdict(list)
-    deployment_scores = []
-    frustration_scores = []
-    journey_health_scores = []
-    product_counts = defaultdict(int)
-    issue_counts = defaultdict(int)
-    pain_points = []
-
-    # Find orders matching this use case
-    for order in data_store.orders:
-        # Determine use case for this order
-        order_use_case = "Unknown"
 
-        if order.opportunity:
-            order_use_case = _categorize_use_case(order.opportunity.primary_use_case or "")
-
-            # Also check extracted use case if available
-            if order_use_case == "Unknown" and order.opportunity.business_need:
-                order_use_case = _categorize_use_case(order.opportunity.business_need)
+    def __init__(self, use_case: str):
+        super().__init__()
+        self.use_case = use_case
 
-        if order_use_case != use_case:
-            continue
+    def add_order(self, order: LinkedOrder) -> None:
+        """Feed a whole order."""
+        self.open_order(order)
+        for dep in order.deployments:
+            self.add_deployment(dep)
+        for case in order.support_cases:
+            self.add_case(case)
+        self.close_order(order)
 
-        # Match found - collect metrics
-        metrics.total_orders += 1
-        accounts_seen.add(order.account_name)
+    def open_order(self, order: LinkedOrder) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        totals["orders"] += 1
+        histograms["accounts"][order.account_name] += 1
 
         if order.opportunity:
-            metrics.total_revenue += order.opportunity.amount
+            totals["total_revenue"] += order.opportunity.amount
             if order.opportunity.primary_product:
-                product_counts[order.opportunity.primary_product] += 1
+                histograms["products"][order.opportunity.primary_product] += 1
             if order.opportunity.pain_points:
-                pain_points.append(order.opportunity.pain_points)
+                histograms["pain_points"][order.opportunity.pain_points] += 1
 
-        # Deployment metrics
-        service_count = 0
-        for dep in order.deployments:
-            metrics.total_deployments += 1
+    def add_deployment(self, dep: Deployment) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        totals["deployments"] += 1
+        histograms["deployment_days_sketch"][sketch_bucket(dep.case_age_days)] += 1
+
+        if dep.is_service_deploy:
+            totals["service_deploys"] += 1
+
+        if dep.deployment_score is not None:
             product_series = dep.product_series.value
+            totals["scored_deployments"] += 1
+            totals["deployment_score"] += dep.deployment_score
+            histograms["product_deployments"][product_series] += 1
+            histograms["product_score"][product_series] += dep.deployment_score
+            if dep.deployment_score > 70:
+                totals["successful_deployments"] += 1
+                histograms["product_successes"][product_series] += 1
+
+    def add_case(self, case: SupportCase) -> None:
+        totals = self.totals
+        histograms = self.histograms
+        totals["support_cases"] += 1
+        histograms["case_age_sketch"][sketch_bucket(case.case_age_days)] += 1
+
+        if case.frustration_score is not None:
+            totals["frustration_cases"] += 1
+            totals["frustration_score"] += case.frustration_score
+            histograms["frustration_sketch"][sketch_bucket(case.frustration_score)] += 1
+
+        if case.severity is Severity.S1:
+            totals["s1_cases"] += 1
+
+        if case.case_reason:
+            histograms["issues"][case.case_reason] += 1
+
+    def close_order(self, order: LinkedOrder) -> None:
+        totals = self.totals
+        # Journey health
+        if order.is_fully_linked and order.journey_health_score is not None:
+            totals["journey_orders"] += 1
+            totals["journey_health"] += order.journey_health_score
+            self.histograms["journey_health_sketch"][sketch_bucket(order.journey_health_score)] += 1
+            if order.churn_risk in ["Critical", "High"]:
+                totals["high_churn_risk"] += 1
+
+    def finalize(self, escalation_count: int) -> UseCaseMetrics:
+        """
+        Compute aggregates.
+
+        Args:
+            escalation_count: Escalated cases across all orders in the store
+        """
+        total = self.total
+        metrics = UseCaseMetrics(
+            use_case=self.use_case,
+            total_orders=total("orders"),
+            total_revenue=float(total("total_revenue")),
+            unique_accounts=len(self.histogram("accounts")),
+            products_deployed=dict(self.histogram("products")),
+            total_deployments=total("deployments"),
+            total_support_cases=total("support_cases"),
+            s1_case_count=total("s1_cases"),
+            high_churn_risk_count=total("high_churn_risk"),
+        )
 
-            if dep.is_service_deploy:
-                service_count += 1
+        if total("scored_deployments"):
+            metrics.avg_deployment_score = self.ratio("deployment_score", "scored_deployments")
+            metrics.deployment_success_rate = self.ratio("successful_deployments", "scored_deployments") * 100
 
-            if dep.deployment_score is not None:
-                deployment_scores.append(dep.deployment_score)
-                deployment_scores_by_product[product_series].append(dep.deployment_score)
+        if metrics.total_deployments > 0:
+            metrics.service_deploy_rate = (total("service_deploys") / metrics.total_deployments) * 100
+            metrics.support_intensity = metrics.total_support_cases / metrics.total_deployments
 
-        # Support case metrics
-        for case in order.support_cases:
-            metrics.total_support_cases += 1
+        if total("frustration_cases"):
+            metrics.avg_frustration_score = self.ratio("frustration_score", "frustration_cases")
 
-            if case.frustration_score is not None:
-                frustration_scores.append(case.frustration_score)
+        if total("journey_orders"):
+            metrics.avg_journey_health = self.ratio("journey_health", "journey_orders")
 
-            if case.severity.value == "S1":
-                metrics.s1_case_count += 1
+        metrics.percentiles = self.percentiles()
 
-            if case.case_reason:
-                issue_counts[case.case_reason] += 1
+        # Calculate escalation rate
+        if metrics.total_support_cases > 0:
+            metrics.escalation_rate = (escalation_count / metrics.total_support_cases) * 100
 
-        # Journey health
-        if order.is_fully_linked and order.journey_health_score is not None:
-            journey_health_scores.append(order.journey_health_score)
-            if order.churn_risk in ["Critical", "High"]:
-                metrics.high_churn_risk_count += 1
+        # Product performance for this use case
+        scores = self.histogram("product_score")
+        successes = self.histogram("product_successes")
+        for product, count in self.histogram("product_deployments").items():
+            metrics.product_performance[product] = {
+                "avg_deployment_score": scores.get(product, 0) / count,
+                "success_rate": successes.get(product, 0) / count * 100,
+                "deployment_count": count,
+            }
 
-    # Calculate aggregates
-    metrics.unique_accounts = len(accounts_seen)
-    metrics.products_deployed = dict(product_counts)
+        # Determine best/worst performing products
+        if metrics.product_performance:
+            sorted_products = sorted(
+                metrics.product_performance.items(),
+                key=lambda x: x[1]["avg_deployment_score"],
+                reverse=True
+            )
+            metrics.best_performing_product = sorted_products[0][0] if sorted_products else ""
+            metrics.worst_performing_product = sorted_products[-1][0] if len(sorted_products) > 1 else ""
+
+        # Top issues
+        sorted_issues = sorted(self.histogram("issues").items(), key=lambda x: x[1], reverse=True)
+        metrics.top_issues = [issue for issue, _ in sorted_issues[:5]]
+        metrics.issue_distribution = dict(sorted_issues[:10])
+
+        # Common pain points
+        pain_points = list(self.histogram("pain_points"))
+        if pain_points:
+            metrics.common_pain_points = list(set(pain_points))[:5]
+
+        # Recommended products (highest success rate with enough data, ties by name)
+        qualified_products = [
+            (prod, data) for prod, data in metrics.product_performance.items()
+            if data["deployment_count"] >= 2
+        ]
+        if qualified_products:
+            sorted_by_success = sorted(
+                qualified_products,
+                key=lambda x: (-x[1]["success_rate"], x[0]),
+            )
+            metrics.recommended_products = [p[0] for p in sorted_by_success[:3]]
+
+        return metrics
 
-    if deployment_scores:
-        metrics.avg_deployment_score = sum(deployment_scores) / len(deployment_scores)
-        metrics.deployment_success_rate = (
-            sum(1 for s in deployment_scores if s > 70) / len(deployment_scores) * 100
-        )
 
-    if metrics.total_deployments > 0:
-        metrics.service_deploy_rate = (service_count / metrics.total_deployments) * 100
-        metrics.support_intensity = metrics.total_support_cases / metrics.total_deployments
+def calculate_usecase_metrics(
+    data_store: LinkedDataStore,
+    use_case: str,
+) -> UseCaseMetrics:
+    """
+    Calculate aggregated metrics for a specific use case.
 
-    if frustration_scores:
-        metrics.avg_frustration_score = sum(frustration_scores) / len(frustration_scores)
+    Args:
+        data_store: LinkedDataStore with correlated data
+        use_case: Use case category name
+
+    Returns:
+        UseCaseMetrics with aggregated data
+    """
+    accumulator = _UseCaseAccumulator(use_case)
 
-    if journey_health_scores:
-        metrics.avg_journey_health = sum(journey_health_scores) / len(journey_health_scores)
+    # Orders in this use case (categorized once at link time)
+    for order in data_store.get_orders_by_use_case(use_case):
+        accumulator.add_order(order)
 
-    # Calculate escalation rate
-    if metrics.total_support_cases > 0:
+    escalation_count = 0
+    if accumulator.total("support_cases") > 0:
         escalation_count = sum(
             1 for order in data_store.orders
             for case in order.support_cases
             if case.escalation_detected
         )
-        metrics.escalation_rate = (escalation_count / metrics.total_support_cases) * 100
-
-    # Product performance for this use case
-    for product, scores in deployment_scores_by_product.items():
-        if scores:
-            avg_score = sum(scores) / len(scores)
-            success_rate = sum(1 for s in scores if s > 70) / len(scores) * 100
-            metrics.product_performance[product] = {
-                "avg_deployment_score": avg_score,
-                "success_rate": success_rate,
-                "deployment_count": len(scores),
-            }
-
-    # Determine best/worst performing products
-    if metrics.product_performance:
-        sorted_products = sorted(
-            metrics.product_performance.items(),
-            key=lambda x: x[1]["avg_deployment_score"],
-            reverse=True
-        )
-        metrics.best_performing_product = sorted_products[0][0] if sorted_products else ""
-        metrics.worst_performing_product = sorted_products[-1][0] if len(sorted_products) > 1 else ""
-
-    # Top issues
-    sorted_issues = sorted(issue_counts.items(), key=lambda x: x[1], reverse=True)
-    metrics.top_issues = [issue for issue, _ in sorted_issues[:5]]
-    metrics.issue_distribution = dict(sorted_issues[:10])
-
-    # Common pain points
-    if pain_points:
-        metrics.common_pain_points = list(set(pain_points))[:5]
-
-    # Recommended products (highest success rate with enough data)
-    qualified_products = [
-        (prod, data) for prod, data in metrics.product_performance.items()
-        if data["deployment_count"] >= 2
-    ]
-    if qualified_products:
-        sorted_by_success = sorted(
-            qualified_products,
-            key=lambda x: x[1]["success_rate"],
-            reverse=True
-        )
-        metrics.recommended_products = [p[0] for p in sorted_by_success[:3]]
 
-    return metrics
+    return accumulator.finalize(escalation_count)
 
 
 def calculate_all_usecase_metrics(
@@ -280,7 +303,7 @@ def calculate_all_usecase_metrics(
     """
     results = {}
 
-    for use_case in USE_CASE_CATEGORIES:
+    for use_case in reported_use_cases():
         metrics = calculate_usecase_metrics(data_store, use_case)
         if metrics.total_orders > 0:
             results[use_case] = metrics
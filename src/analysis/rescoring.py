@@ -0,0 +1,191 @@
+"""
+Re-scoring of finished analyses with alternate weight profiles.
+
+The single-account pipeline saves the scoring inputs of every case next to
+its JSON outputs (score_features.csv): frustration metrics, severity,
+issue class, resolution outlook, support level, volume, age, engagement,
+Sonnet fields and last activity. Criticality scores and the account health
+score can then be recomputed for any ScoreWeights profile without
+re-running an LLM stage:
+
+    features = load_score_features(run_dir / SCORE_FEATURES_FILE)
+    result = rescore(features, claude_statistics, ScoreWeights.from_dict({"severity": {"S1": 50}}))
+    table = sensitivity_sweep(features, claude_statistics, {"base": ScoreWeights(), ...})
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .scoring import (
+    ScoreWeights,
+    build_score_features,
+    account_health_from_columns,
+    _CATEGORICAL_FEATURES,
+    _last_activity,
+    _round1,
+    _unweighted_components,
+    _weighted_components,
+)
+
+
+SCORE_FEATURES_FILE = "score_features.csv"
+
+
+def score_feature_table(case_analysis: List[Dict]) -> pd.DataFrame:
+    """
+    Scoring inputs of every case, in case_analysis order.
+
+    build_score_features() columns plus case_number, last_activity and
+    last_modified_date (needed by the account health score).
+    """
+    features = build_score_features(case_analysis)
+    features.insert(0, 'case_number', [c['case_number'] for c in case_analysis])
+    features['last_activity'] = pd.to_datetime(pd.Series([_last_activity(c) for c in case_analysis], dtype=object))
+    features['last_modified_date'] = [c.get('last_modified_date') for c in case_analysis]
+    return features
+
+
+def save_score_features(features: pd.DataFrame, path: Path) -> Path:
+    """Write a score_feature_table() to CSV."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    features.to_csv(path, index=False)
+    return path
+
+
+def load_score_features(path: Path) -> pd.DataFrame:
+    """Read a feature table written by save_score_features()."""
+    features = pd.read_csv(path, float_precision='round_trip')
+    features['last_activity'] = pd.to_datetime(features['last_activity'])
+    for column in _CATEGORICAL_FEATURES:
+        features[column] = features[column].astype('category')
+    features['quick_scored'] = features['quick_scored'].astype(bool)
+    return features
+
+
+def load_weights(path: Path) -> ScoreWeights:
+    """Read one weight profile (only the changed entries) from JSON."""
+    with open(path, 'r') as f:
+        return ScoreWeights.from_dict(json.load(f))
+
+
+def load_weight_profiles(path: Path) -> Dict[str, ScoreWeights]:
+    """Read {"profile name": {weights...}, ...} from JSON."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Weight profiles must map profile names to weights: {path}")
+    return {name: ScoreWeights.from_dict(profile) for name, profile in data.items()}
+
+
+def _rescore(
+    features: pd.DataFrame,
+    unweighted: Dict[str, np.ndarray],
+    claude_statistics: Dict,
+    weights: ScoreWeights,
+) -> Dict[str, Any]:
+    components = _weighted_components(features, unweighted, weights)
+    scores = _round1(components['final_score'].to_numpy(float))
+
+    # Same order as calculate_criticality_scores(): descending, stable
+    order = np.argsort(-scores, kind='stable')
+    scores = scores[order]
+    health_score, score_breakdown = account_health_from_columns(
+        claude_statistics,
+        case_numbers=features['case_number'].to_numpy()[order].tolist(),
+        scores=scores,
+        issue_classes=features['issue_class'].to_numpy()[order],
+        resolution_outlooks=features['resolution_outlook'].to_numpy()[order],
+        last_activity=features['last_activity'].to_numpy(dtype='datetime64[ns]')[order],
+        last_modified=features['last_modified_date'].to_numpy()[order],
+        weights=weights,
+    )
+
+    cases = components.iloc[order].reset_index(drop=True)
+    cases.insert(0, 'case_number', features['case_number'].to_numpy()[order])
+    cases.insert(1, 'criticality_score', scores)
+    return {
+        'health_score': health_score,
+        'score_breakdown': score_breakdown,
+        'critical_cases': int(np.count_nonzero(scores >= weights.critical_threshold)),
+        'catastrophic_cases': int(np.count_nonzero(scores >= weights.catastrophic_threshold)),
+        'cases': cases,
+    }
+
+
+def rescore(
+    features: pd.DataFrame,
+    claude_statistics: Dict,
+    weights: Optional[ScoreWeights] = None,
+) -> Dict[str, Any]:
+    """
+    Recompute criticality and account health for a weight profile.
+
+    Args:
+        features: DataFrame from score_feature_table() / load_score_features()
+        claude_statistics: Haiku statistics of the run (avg_frustration_score, high_frustration)
+        weights: Scoring profile (default: the standard model)
+
+    Returns:
+        Dict with health_score, score_breakdown, critical_cases,
+        catastrophic_cases and cases (case_number, criticality_score and
+        the score components, highest score first)
+    """
+    return _rescore(features, _unweighted_components(features), claude_statistics, weights or ScoreWeights())
+
+
+def sensitivity_sweep(
+    features: pd.DataFrame,
+    claude_statistics: Dict,
+    profiles: Dict[str, ScoreWeights],
+    top_n: int = 5,
+) -> pd.DataFrame:
+    """
+    Rescore a run under many weight profiles.
+
+    Components that do not depend on the weights are computed once and
+    shared by every profile.
+
+    Returns:
+        DataFrame with one row per profile: health_score, base_health_score,
+        critical_cases, catastrophic_cases, avg_score and top_cases
+    """
+    unweighted = _unweighted_components(features)
+    rows = []
+    for name, weights in profiles.items():
+        result = _rescore(features, unweighted, claude_statistics, weights)
+        scores = result['cases']['criticality_score']
+        rows.append({
+            'profile': name,
+            'health_score': result['health_score'],
+            'base_health_score': result['score_breakdown'].get('base_health_score', 0),
+            'critical_cases': result['critical_cases'],
+            'catastrophic_cases': result['catastrophic_cases'],
+            'avg_score': round(float(scores.mean()), 1) if len(scores) else 0.0,
+            'top_cases': result['cases']['case_number'].head(top_n).tolist(),
+        })
+    return pd.DataFrame(rows)
+
+
+def rescore_run(run_dir: Path, weights: Optional[ScoreWeights] = None) -> Dict[str, Any]:
+    """
+    Rescore a finished single-account analysis folder.
+
+    Returns:
+        rescore() output plus baseline_health_score from the run's summary
+    """
+    run_dir = Path(run_dir)
+    features_file = run_dir / SCORE_FEATURES_FILE
+    if not features_file.exists():
+        raise FileNotFoundError(f"No {SCORE_FEATURES_FILE} in {run_dir}. Re-run the analysis to enable rescoring.")
+
+    with open(run_dir / "json" / "summary_statistics.json", 'r') as f:
+        summary = json.load(f)
+
+    result = rescore(load_score_features(features_file), summary['claude_statistics'], weights)
+    result['baseline_health_score'] = summary.get('account_health_score')
+    return result
@@ -0,0 +1,365 @@
+"""
+Flat, typed result tables of analysis runs.
+
+The JSON outputs are nested (cases with their Claude analysis, timeline
+entries and message scores; layer records with their result objects), so
+the dashboard pages walk dicts to build DataFrames on every rerun. The
+same results are also written as flat tables under <run>/tables/, one row
+per case, message score, timeline entry, opportunity, deployment, support
+case or evaluation, and pages load only the columns they need:
+
+    save_case_tables(case_analysis, run_dir)
+    cases = load_result_table(run_dir, "cases", columns=["case_number", "criticality_score"])
+
+Tables are Parquet when pyarrow is installed. Otherwise they are CSV with a
+schema sidecar (column dtypes, list columns as JSON), and load with the
+same column types.
+"""
+
+import json
+from dataclasses import MISSING, asdict, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .layers import (
+    DeploymentAnalysisResult,
+    EvaluationResult,
+    OpportunityAnalysisResult,
+    SupportAnalysisResult,
+)
+
+try:
+    import pyarrow  # noqa: F401  (pandas Parquet engine)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+TABLES_DIR = "tables"
+
+# Result fields kept out of the tables (full LLM responses stay in the JSON)
+EXCLUDED_FIELDS = {"raw_response"}
+
+# Column types of the case table when a column has no values
+CASE_SAMPLES = {
+    "case_number": 0, "customer_name": "", "severity": "", "support_level": "", "status": "",
+    "case_age_days": 0, "interaction_count": 0, "asset_serial": "", "issue_category": "",
+    "criticality_score": 0.0, "frustration_score": 0, "peak_score": 0, "average_score": 0.0,
+    "frustrated_message_count": 0, "total_messages": 0, "issue_class": "",
+    "resolution_outlook": "", "key_phrase": "", "customer_priority": "", "timeline_entries": 0,
+}
+
+TIMELINE_FIELDS = [
+    "entry_label", "summary", "customer_tone", "frustration_detected", "frustration_detail",
+    "positive_action_detected", "positive_action_detail", "support_quality", "relationship_impact",
+    "failure_pattern_detected", "failure_pattern_detail", "analysis", "message_excerpt",
+]
+
+
+def _typed(
+    frame: pd.DataFrame,
+    date_columns: Iterable[str] = (),
+    samples: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Column types from the values: nullable Int64 / boolean, float, strings
+    (missing as ""), lists (missing as []) and the given date columns.
+    Columns with mixed value types stay object.
+
+    samples gives a value of the intended type for columns that may be
+    entirely missing (e.g. no record was analyzed).
+    """
+    samples = samples or {}
+    for column in frame.columns:
+        if column in date_columns:
+            # One unit whatever the values (all-missing columns default to seconds,
+            # which Parquet cannot store)
+            frame[column] = pd.to_datetime(frame[column], errors="coerce").dt.as_unit("us")
+            continue
+        values = frame[column].dropna().tolist()
+        if not values and samples.get(column) is not None:
+            values = [samples[column]]
+        if not values:
+            continue
+        if all(isinstance(v, (bool, np.bool_)) for v in values):
+            frame[column] = frame[column].astype("boolean")
+        elif all(isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)) for v in values):
+            frame[column] = frame[column].astype("Int64")
+        elif all(isinstance(v, (int, float, np.integer, np.floating)) for v in values):
+            frame[column] = frame[column].astype("float64")
+        elif all(isinstance(v, str) for v in values):
+            frame[column] = frame[column].fillna("").astype(str)
+        elif all(isinstance(v, list) for v in values):
+            frame[column] = [value if isinstance(value, list) else [] for value in frame[column]]
+    return frame
+
+
+def _frame(rows: List[Dict[str, Any]], columns: List[str]) -> pd.DataFrame:
+    # object columns keep the Python values (no int -> float upcast around None)
+    return pd.DataFrame(rows, columns=columns, dtype=object) if rows else pd.DataFrame(columns=columns, dtype=object)
+
+
+# =============================================================================
+# Single-source run tables
+# =============================================================================
+
+
+def case_table(case_analysis: List[Dict]) -> pd.DataFrame:
+    """One row per case, in case_analysis (criticality) order."""
+    rows = []
+    for case in case_analysis:
+        claude = case.get("claude_analysis") or {}
+        metrics = claude.get("frustration_metrics") or {}
+        deepseek = case.get("deepseek_analysis") or {}
+        rows.append({
+            "case_number": case.get("case_number"),
+            "customer_name": case.get("customer_name"),
+            "severity": case.get("severity"),
+            "support_level": case.get("support_level"),
+            "status": case.get("status"),
+            "created_date": case.get("created_date"),
+            "last_modified_date": case.get("last_modified_date"),
+            "case_age_days": case.get("case_age_days"),
+            "interaction_count": case.get("interaction_count"),
+            "asset_serial": case.get("asset_serial"),
+            "issue_category": case.get("issue_category"),
+            "criticality_score": case.get("criticality_score"),
+            "frustration_score": claude.get("frustration_score"),
+            "peak_score": metrics.get("peak_score"),
+            "average_score": metrics.get("average_score"),
+            "frustrated_message_count": metrics.get("frustrated_message_count"),
+            "total_messages": metrics.get("total_messages"),
+            "issue_class": claude.get("issue_class"),
+            "resolution_outlook": claude.get("resolution_outlook"),
+            "key_phrase": claude.get("key_phrase"),
+            "customer_priority": deepseek.get("customer_priority"),
+            "timeline_entries": len(deepseek.get("timeline_entries") or []),
+        })
+    columns = list(rows[0]) if rows else ["case_number"]
+    return _typed(
+        _frame(rows, columns),
+        date_columns=("created_date", "last_modified_date"),
+        samples=CASE_SAMPLES,
+    )
+
+
+def message_score_table(case_analysis: List[Dict]) -> pd.DataFrame:
+    """One row per scored message (the scores kept with each case)."""
+    rows = []
+    for case in case_analysis:
+        metrics = (case.get("claude_analysis") or {}).get("frustration_metrics") or {}
+        for score in metrics.get("message_scores") or []:
+            rows.append({
+                "case_number": case.get("case_number"),
+                "msg": score.get("msg"),
+                "score": score.get("score"),
+                "reason": score.get("reason", ""),
+            })
+    return _typed(_frame(rows, ["case_number", "msg", "score", "reason"]))
+
+
+def timeline_table(case_analysis: List[Dict]) -> pd.DataFrame:
+    """One row per timeline entry, in entry order within each case."""
+    rows = []
+    for case in case_analysis:
+        entries = (case.get("deepseek_analysis") or {}).get("timeline_entries") or []
+        for position, entry in enumerate(entries):
+            row = {"case_number": case.get("case_number"), "position": position}
+            row.update({name: entry.get(name) for name in TIMELINE_FIELDS})
+            rows.append(row)
+    samples = {name: False if name.endswith("_detected") else "" for name in TIMELINE_FIELDS}
+    return _typed(_frame(rows, ["case_number", "position"] + TIMELINE_FIELDS), samples=samples)
+
+
+def save_case_tables(case_analysis: List[Dict], run_dir: Path) -> List[Path]:
+    """Write the cases, message_scores and timeline tables of a run."""
+    return [
+        save_result_table(case_table(case_analysis), run_dir, "cases"),
+        save_result_table(message_score_table(case_analysis), run_dir, "message_scores"),
+        save_result_table(timeline_table(case_analysis), run_dir, "timeline"),
+    ]
+
+
+# =============================================================================
+# Full-analysis (layer) tables
+# =============================================================================
+
+
+def _with_results(records: List[Dict[str, Any]], results: List[Any], result_type: type) -> pd.DataFrame:
+    """Record columns plus the result's fields (empty for unanalyzed records)."""
+    result_fields = [f for f in fields(result_type) if f.name not in EXCLUDED_FIELDS]
+    rows = []
+    for record, result in zip(records, results):
+        row = dict(record)
+        row["analyzed"] = result is not None
+        values = asdict(result) if result is not None else {}
+        row.update({f.name: values.get(f.name) for f in result_fields})
+        rows.append(row)
+    columns = (list(records[0]) if records else []) + ["analyzed"] + [f.name for f in result_fields]
+
+    # Field defaults type the columns when no record was analyzed
+    samples = {
+        f.name: f.default_factory() if f.default_factory is not MISSING else f.default
+        for f in result_fields
+    }
+    return _typed(_frame(rows, columns), samples={**samples, "analyzed": False})
+
+
+def opportunity_table(opportunities: List[Any], results: Dict[str, Any]) -> pd.DataFrame:
+    records = [
+        {
+            "order_number": opp.order_number,
+            "account_name": opp.account_name,
+            "opportunity_name": opp.opportunity_name,
+            "amount": opp.amount,
+            "primary_product": opp.primary_product,
+        }
+        for opp in opportunities
+    ]
+    return _with_results(records, [results.get(opp.order_number) for opp in opportunities], OpportunityAnalysisResult)
+
+
+def deployment_table(deployments: List[Any], results: Dict[str, Any]) -> pd.DataFrame:
+    records = [
+        {
+            "case_number": dep.case_number,
+            "order_number": dep.order_number,
+            "account_name": dep.account_name,
+            "product_model": dep.product_model,
+            "status": dep.status,
+        }
+        for dep in deployments
+    ]
+    return _with_results(records, [results.get(dep.case_number) for dep in deployments], DeploymentAnalysisResult)
+
+
+def support_case_table(support_cases: List[Any], results: Dict[str, Any]) -> pd.DataFrame:
+    records = [
+        {
+            "case_number": case.case_number,
+            "order_number": case.order_number,
+            "account_name": case.account_name,
+            "severity": case.severity.value,
+            "status": case.status,
+            "created_date": case.created_date,
+        }
+        for case in support_cases
+    ]
+    table = _with_results(records, [results.get(case.case_number) for case in support_cases], SupportAnalysisResult)
+    table["created_date"] = pd.to_datetime(table["created_date"], errors="coerce").dt.as_unit("us")
+    return table
+
+
+def evaluation_table(orders: List[Any], results: Dict[str, Any]) -> pd.DataFrame:
+    records = [
+        {
+            "order_number": order.order_number,
+            "account_name": order.account_name,
+            "has_opportunity": order.has_opportunity,
+            "has_deployments": order.has_deployments,
+            "has_support_cases": order.has_support_cases,
+            "is_fully_linked": order.is_fully_linked,
+        }
+        for order in orders
+    ]
+    return _with_results(records, [results.get(order.order_number) for order in orders], EvaluationResult)
+
+
+# =============================================================================
+# Storage
+# =============================================================================
+
+
+def _table_path(run_dir: Path, name: str, suffix: str) -> Path:
+    return Path(run_dir) / TABLES_DIR / f"{name}{suffix}"
+
+
+def _is_text(dtype: str) -> bool:
+    return dtype in ("object", "str", "string")
+
+
+def find_result_table(run_dir: Path, name: str) -> Optional[Path]:
+    """Path of a saved table (Parquet or CSV), or None if the run has none."""
+    for suffix in (".parquet", ".csv"):
+        path = _table_path(run_dir, name, suffix)
+        if path.exists():
+            return path
+    return None
+
+
+def save_result_table(table: pd.DataFrame, run_dir: Path, name: str) -> Path:
+    """Write a table to <run_dir>/tables/ (Parquet, or CSV plus schema)."""
+    directory = Path(run_dir) / TABLES_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+
+    if PARQUET_AVAILABLE:
+        path = _table_path(run_dir, name, ".parquet")
+        table.to_parquet(path, index=False)
+        return path
+
+    list_columns = [
+        column for column in table.columns
+        if _is_text(str(table[column].dtype)) and any(isinstance(v, list) for v in table[column])
+    ]
+    out = table.copy()
+    for column in list_columns:
+        out[column] = out[column].map(json.dumps)
+
+    path = _table_path(run_dir, name, ".csv")
+    out.to_csv(path, index=False)
+    schema = {
+        "dtypes": {column: str(dtype) for column, dtype in table.dtypes.items()},
+        "list_columns": list_columns,
+    }
+    with open(_table_path(run_dir, name, ".schema.json"), "w") as f:
+        json.dump(schema, f, indent=2)
+    return path
+
+
+def load_result_table(
+    run_dir: Path,
+    name: str,
+    columns: Optional[List[str]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Read a table written by save_result_table(), or None if the run has none.
+
+    columns selects the columns to read (only those are parsed).
+    """
+    path = find_result_table(run_dir, name)
+    if path is None:
+        return None
+    if path.suffix == ".parquet":
+        table = pd.read_parquet(path, columns=columns)
+        for column in table.columns:
+            values = table[column].dropna()
+            if not values.empty and isinstance(values.iloc[0], np.ndarray):
+                table[column] = table[column].map(list)
+        return table
+
+    with open(_table_path(run_dir, name, ".schema.json")) as f:
+        schema = json.load(f)
+
+    dtypes = schema["dtypes"]
+    selected = columns or list(dtypes)
+    text_columns = [c for c in selected if _is_text(dtypes.get(c, "object"))]
+    table = pd.read_csv(
+        path,
+        usecols=selected,
+        dtype={column: str for column in text_columns},
+        keep_default_na=False,
+        na_values={column: [""] for column in selected if column not in text_columns},
+    )[selected]
+
+    for column in selected:
+        dtype = dtypes.get(column, "object")
+        if column in schema["list_columns"]:
+            table[column] = table[column].map(json.loads)
+        elif dtype.startswith("datetime64"):
+            table[column] = pd.to_datetime(table[column]).astype(dtype)
+        elif not _is_text(dtype):
+            table[column] = table[column].astype(dtype)
+    return table
@@ -5,11 +5,286 @@ Calculates case priority scores and account health metrics.
 
 import numpy as np
 import pandas as pd
-from typing import Any, Dict, List, Tuple
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from ..core import streaming_output
 
 
+# Categorical components: value -> points (anything else gets the default)
+SEVERITY_POINTS = {"S1": 35, "S2": 25, "S3": 15}
+SEVERITY_DEFAULT_POINTS = 5
+ISSUE_CLASS_POINTS = {"Systemic": 30, "Environmental": 15, "Component": 10, "Procedural": 5}
+ISSUE_CLASS_DEFAULT_POINTS = 10
+RESOLUTION_POINTS = {"Challenging": 15, "Manageable": 8, "Straightforward": 0}
+RESOLUTION_DEFAULT_POINTS = 5
+SUPPORT_LEVEL_POINTS = {"Gold": 10, "Silver": 5}
+SUPPORT_LEVEL_DEFAULT_POINTS = 0
+QUICK_PRIORITY_POINTS = {"Critical": 20, "High": 10, "Medium": 5}
+QUICK_PRIORITY_DEFAULT_POINTS = 0
+
+# Account health thresholds on the criticality score
+CRITICAL_SCORE_THRESHOLD = 180
+CATASTROPHIC_SCORE_THRESHOLD = 200
+
+
+@dataclass
+class ScoreWeights:
+    """
+    Tunable points and thresholds of the scoring model.
+
+    Each table maps a value to points; values not in the table get the
+    matching *_default. The defaults are the standard model, so a profile
+    only needs to list what it changes (see from_dict()).
+    """
+    severity: Dict[str, float] = field(default_factory=lambda: dict(SEVERITY_POINTS))
+    severity_default: float = SEVERITY_DEFAULT_POINTS
+    issue_class: Dict[str, float] = field(default_factory=lambda: dict(ISSUE_CLASS_POINTS))
+    issue_class_default: float = ISSUE_CLASS_DEFAULT_POINTS
+    resolution_outlook: Dict[str, float] = field(default_factory=lambda: dict(RESOLUTION_POINTS))
+    resolution_outlook_default: float = RESOLUTION_DEFAULT_POINTS
+    support_level: Dict[str, float] = field(default_factory=lambda: dict(SUPPORT_LEVEL_POINTS))
+    support_level_default: float = SUPPORT_LEVEL_DEFAULT_POINTS
+    quick_priority: Dict[str, float] = field(default_factory=lambda: dict(QUICK_PRIORITY_POINTS))
+    quick_priority_default: float = QUICK_PRIORITY_DEFAULT_POINTS
+    critical_threshold: float = CRITICAL_SCORE_THRESHOLD
+    catastrophic_threshold: float = CATASTROPHIC_SCORE_THRESHOLD
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScoreWeights":
+        """
+        Build a profile from a (partial) dict, e.g. {"severity": {"S1": 50}}.
+
+        Tables are merged over the defaults; unknown names raise ValueError.
+        """
+        weights = cls()
+        for name, value in data.items():
+            if name not in weights.__dataclass_fields__:
+                raise ValueError(f"Unknown score weight: {name}")
+            current = getattr(weights, name)
+            if isinstance(current, dict):
+                if not isinstance(value, dict):
+                    raise ValueError(f"Score weight {name} must map values to points")
+                value = {**current, **value}
+            setattr(weights, name, value)
+        return weights
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _timeline_frustration_rate(timeline_analysis: Dict) -> float:
+    """Percentage of Sonnet timeline entries flagged as frustrated (0 if none)."""
+    if not timeline_analysis or not timeline_analysis.get('analysis_successful'):
+        return 0.0
+    entries = timeline_analysis.get('timeline_entries', [])
+    if not entries:
+        return 0.0
+    frustrated = sum(1 for e in entries if 'yes' in str(e.get('frustration_detected', '')).lower())
+    return frustrated / len(entries) * 100
+
+
+# build_score_features() columns: numeric, then categorical, then quick_scored
+_FEATURE_COLUMNS = [
+    'frustration_score', 'peak_score', 'total_messages', 'frustrated_message_count',
+    'interaction_count', 'case_age_days', 'engagement_ratio',
+    'quick_frustration_rate', 'quick_damage_rate', 'timeline_frustration_rate',
+    'severity', 'issue_class', 'resolution_outlook', 'support_level', 'quick_priority',
+    'quick_scored',
+]
+_CATEGORICAL_FEATURES = {'severity', 'issue_class', 'resolution_outlook', 'support_level', 'quick_priority'}
+
+
+def build_score_features(case_analysis: List[Dict]) -> pd.DataFrame:
+    """
+    Extract the scoring inputs of every case into columns.
+
+    One row per case, in case_analysis order. Defaults match the per-case
+    lookups of the scoring model (e.g. peak_score falls back to the
+    frustration score, engagement to 0.5).
+    """
+    rows = []
+    for case in case_analysis:
+        claude = case['claude_analysis']
+        frustration_score = claude['frustration_score']
+        metrics = claude.get('frustration_metrics', {})
+        quick = case.get('deepseek_quick_scoring', {})
+        quick_ok = bool(quick and quick.get('analysis_successful'))
+        timeline = case.get('deepseek_analysis', {})
+        rows.append((
+            frustration_score,
+            metrics.get('peak_score', frustration_score),
+            metrics.get('total_messages', 1),
+            metrics.get('frustrated_message_count', 0),
+            case['interaction_count'],
+            case['case_age_days'],
+            case.get('customer_engagement_ratio', 0.5),
+            quick.get('frustration_frequency', 0) if quick_ok else 0,
+            quick.get('damage_frequency', 0) if quick_ok else 0,
+            _timeline_frustration_rate(timeline) if timeline else 0.0,
+            case['severity'],
+            claude.get('issue_class', 'Unknown'),
+            claude.get('resolution_outlook', 'Unknown'),
+            case.get('support_level', 'Unknown'),
+            quick.get('priority', 'Medium') if quick_ok else None,
+            quick_ok,
+        ))
+
+    columns = list(zip(*rows)) or [()] * len(_FEATURE_COLUMNS)
+    data = {}
+    for name, values in zip(_FEATURE_COLUMNS, columns):
+        if name in _CATEGORICAL_FEATURES:
+            data[name] = pd.Categorical(values)
+        else:
+            data[name] = np.array(values, dtype=bool if name == 'quick_scored' else float)
+    return pd.DataFrame(data)
+
+
+def _points(values: pd.Series, table: Dict[str, float], default: float) -> np.ndarray:
+    """Look up categorical points for a column (one lookup per distinct value)."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    points = np.array([table.get(value, default) for value in uniques] + [default])
+    return points[codes]
+
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    """round(value, 1) for every value, vectorized away from .x5 ties."""
+    scaled = values * 10
+    result = np.rint(scaled) / 10
+    # Near a tie the scaled product may round the other way than round() does
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    result[ties] = [round(value, 1) for value in values[ties].tolist()]
+    return result
+
+
+def _unweighted_components(features: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Components that do not depend on ScoreWeights (shared by every profile)."""
+    fs = features['frustration_score'].to_numpy(float)
+    peak = features['peak_score'].to_numpy(float)
+    total_msgs = features['total_messages'].to_numpy(float)
+    frustrated_count = features['frustrated_message_count'].to_numpy(float)
+
+    # Component 1: Claude frustration - headline score (0-50), peak (0-25)
+    # and share of frustrated messages (0-25)
+    base_frust_pts = np.select(
+        [fs >= 9, fs >= 7, fs >= 5, fs >= 3],
+        [50, 35 + (fs - 7) * 7.5, 20 + (fs - 5) * 7.5, 10 + (fs - 3) * 5],
+        fs * 3.33,
+    )
+    peak_bonus = np.select(
+        [peak >= 9, peak >= 7, peak >= 5],
+        [25, 15 + (peak - 7) * 5, 5 + (peak - 5) * 5],
+        peak * 1,
+    )
+    frustrated_pct = (frustrated_count / np.maximum(1, total_msgs)) * 100
+    pct_bonus = np.select(
+        [frustrated_pct >= 30, frustrated_pct >= 20, frustrated_pct >= 10],
+        [25, 15 + (frustrated_pct - 20) * 1, 5 + (frustrated_pct - 10) * 1],
+        frustrated_pct * 0.5,
+    )
+
+    # Component 6: Message volume - inverted (5-30 pts)
+    interactions = features['interaction_count'].to_numpy(float)
+    # Component 7: Case age (0-10 pts)
+    age = features['case_age_days'].to_numpy(float)
+    # Component 8: Customer engagement (0-15 pts)
+    engagement = features['engagement_ratio'].to_numpy(float)
+
+    # Sonnet quick scoring rates: frustration (0-100) + damage (0-50)
+    frustration_rate = features['quick_frustration_rate'].to_numpy(float)
+    damage_rate = features['quick_damage_rate'].to_numpy(float)
+
+    return {
+        'claude_frustration': base_frust_pts + peak_bonus + pct_bonus,
+        'claude_frustration_base': base_frust_pts,
+        'claude_frustration_peak_bonus': peak_bonus,
+        'claude_frustration_pct_bonus': pct_bonus,
+        'volume': np.select([interactions <= 5, interactions <= 10, interactions <= 20], [5, 10, 20], 30),
+        'age': np.select([age >= 90, age >= 60, age >= 30, age >= 14], [10, 7, 5, 3], 0),
+        'engagement': np.select([engagement >= 0.7, engagement >= 0.5, engagement >= 0.3], [15, 10, 5], 0),
+        'quick_scored': features['quick_scored'].to_numpy(bool),
+        'quick_rates': (frustration_rate / 100 * 100) + (damage_rate / 100 * 50),
+        'deepseek_frustration_rate': frustration_rate,
+        'deepseek_damage_rate': damage_rate,
+        # Sonnet timeline bonus (0-10 pts)
+        'deepseek_timeline': features['timeline_frustration_rate'].to_numpy(float) / 10,
+    }
+
+
+def _weighted_components(
+    features: pd.DataFrame,
+    unweighted: Dict[str, np.ndarray],
+    weights: ScoreWeights,
+) -> pd.DataFrame:
+    """Add the weighted components and totals to _unweighted_components() output."""
+    # Components 2-5: severity, issue class, resolution outlook, support level
+    severity_points = _points(features['severity'], weights.severity, weights.severity_default)
+    issue_class_points = _points(features['issue_class'], weights.issue_class, weights.issue_class_default)
+    resolution_points = _points(
+        features['resolution_outlook'], weights.resolution_outlook, weights.resolution_outlook_default
+    )
+    support_points = _points(features['support_level'], weights.support_level, weights.support_level_default)
+
+    base_score = (
+        unweighted['claude_frustration'] +
+        severity_points +
+        issue_class_points +
+        resolution_points +
+        support_points +
+        unweighted['volume'] +
+        unweighted['age'] +
+        unweighted['engagement']
+    )
+
+    priority_points = _points(features['quick_priority'], weights.quick_priority, weights.quick_priority_default)
+    quick_score_bonus = np.where(unweighted['quick_scored'], unweighted['quick_rates'] + priority_points, 0)
+
+    return pd.DataFrame({
+        'claude_frustration': unweighted['claude_frustration'],
+        'claude_frustration_base': unweighted['claude_frustration_base'],
+        'claude_frustration_peak_bonus': unweighted['claude_frustration_peak_bonus'],
+        'claude_frustration_pct_bonus': unweighted['claude_frustration_pct_bonus'],
+        'severity': severity_points,
+        'issue_class': issue_class_points,
+        'resolution_outlook': resolution_points,
+        'support_level': support_points,
+        'volume': unweighted['volume'],
+        'age': unweighted['age'],
+        'engagement': unweighted['engagement'],
+        'deepseek_quick_score': quick_score_bonus,
+        'deepseek_frustration_rate': unweighted['deepseek_frustration_rate'],
+        'deepseek_damage_rate': unweighted['deepseek_damage_rate'],
+        'deepseek_timeline': unweighted['deepseek_timeline'],
+        'base_score': base_score,
+        'final_score': base_score + quick_score_bonus + unweighted['deepseek_timeline'],
+    }, index=features.index)
+
+
+def score_components(features: pd.DataFrame, weights: Optional[ScoreWeights] = None) -> pd.DataFrame:
+    """
+    Score every case from build_score_features() output.
+
+    Args:
+        features: DataFrame from build_score_features()
+        weights: Scoring profile (default: the standard model)
+
+    Returns:
+        DataFrame (same row order) with one column per score_breakdown
+        component, plus base_score and final_score
+    """
+    return _weighted_components(features, _unweighted_components(features), weights or ScoreWeights())
+
+
+# score_breakdown entries stored as-is (everything else is rounded to 0.1)
+_UNROUNDED_COMPONENTS = {
+    'severity', 'issue_class', 'resolution_outlook', 'support_level',
+    'volume', 'age', 'engagement', 'deepseek_frustration_rate', 'deepseek_damage_rate',
+}
+
+
 def calculate_criticality_scores(
     case_analysis: List[Dict],
     console_output: Any = None
@@ -27,6 +302,9 @@ def calculate_criticality_scores(
     - Case age (0-10 pts)
     - Engagement ratio (0-15 pts)
 
+    Components are computed column-wise over all cases (see
+    build_score_features() and score_components()).
+
     Args:
         case_analysis: List of case dictionaries from Claude analysis
         console_output: Object with stream_message() method
@@ -39,201 +317,19 @@ def calculate_criticality_scores(
 
     console_output.stream_message("\nCalculating criticality scores...")
 
-    for case in case_analysis:
-        claude = case['claude_analysis']
-        frustration_score = claude['frustration_score']
-        frustration_metrics = claude.get('frustration_metrics', {})
-
-        # Component 1: Claude frustration - ENHANCED formula
-        # Base points from headline score (0-50 pts)
-        if frustration_score >= 9:
-            base_frust_pts = 50
-        elif frustration_score >= 7:
-            base_frust_pts = 35 + (frustration_score - 7) * 7.5
-        elif frustration_score >= 5:
-            base_frust_pts = 20 + (frustration_score - 5) * 7.5
-        elif frustration_score >= 3:
-            base_frust_pts = 10 + (frustration_score - 3) * 5
-        else:
-            base_frust_pts = frustration_score * 3.33
-
-        # Peak frustration bonus (0-25 pts) - highest individual message score
-        peak_score = frustration_metrics.get('peak_score', frustration_score)
-        if peak_score >= 9:
-            peak_bonus = 25
-        elif peak_score >= 7:
-            peak_bonus = 15 + (peak_score - 7) * 5
-        elif peak_score >= 5:
-            peak_bonus = 5 + (peak_score - 5) * 5
-        else:
-            peak_bonus = peak_score * 1
-
-        # Frustrated message percentage bonus (0-25 pts)
-        total_msgs = frustration_metrics.get('total_messages', 1)
-        frustrated_count = frustration_metrics.get('frustrated_message_count', 0)
-        frustrated_pct = (frustrated_count / max(1, total_msgs)) * 100
-
-        if frustrated_pct >= 30:
-            pct_bonus = 25
-        elif frustrated_pct >= 20:
-            pct_bonus = 15 + (frustrated_pct - 20) * 1
-        elif frustrated_pct >= 10:
-            pct_bonus = 5 + (frustrated_pct - 10) * 1
-        else:
-            pct_bonus = frustrated_pct * 0.5
-
-        claude_points = base_frust_pts + peak_bonus + pct_bonus
-
-        # Component 2: Severity (5-35 pts)
-        severity = case['severity']
-        if severity == "S1":
-            severity_points = 35
-        elif severity == "S2":
-            severity_points = 25
-        elif severity == "S3":
-            severity_points = 15
-        else:  # S4
-            severity_points = 5
-
-        # Component 3: Issue class (5-30 pts)
-        issue_class = claude.get('issue_class', 'Unknown')
-        if issue_class == "Systemic":
-            issue_class_points = 30
-        elif issue_class == "Environmental":
-            issue_class_points = 15
-        elif issue_class == "Component":
-            issue_class_points = 10
-        elif issue_class == "Procedural":
-            issue_class_points = 5
-        else:
-            issue_class_points = 10
-
-        # Component 4: Resolution outlook (0-15 pts)
-        resolution_outlook = claude.get('resolution_outlook', 'Unknown')
-        if resolution_outlook == "Challenging":
-            resolution_points = 15
-        elif resolution_outlook == "Manageable":
-            resolution_points = 8
-        elif resolution_outlook == "Straightforward":
-            resolution_points = 0
-        else:
-            resolution_points = 5
-
-        # Component 5: Support level priority (0-10 pts)
-        support_level = case.get('support_level', 'Unknown')
-        if support_level == "Gold":
-            support_points = 10
-        elif support_level == "Silver":
-            support_points = 5
-        else:
-            support_points = 0
-
-        # Component 6: Message volume - inverted (5-30 pts)
-        interaction_count = case['interaction_count']
-        if interaction_count <= 5:
-            volume_points = 5
-        elif interaction_count <= 10:
-            volume_points = 10
-        elif interaction_count <= 20:
-            volume_points = 20
-        else:
-            volume_points = 30
-
-        # Component 7: Case age (0-10 pts)
-        case_age = case['case_age_days']
-        if case_age >= 90:
-            age_points = 10
-        elif case_age >= 60:
-            age_points = 7
-        elif case_age >= 30:
-            age_points = 5
-        elif case_age >= 14:
-            age_points = 3
-        else:
-            age_points = 0
-
-        # Component 8: Customer engagement (0-15 pts)
-        engagement_ratio = case.get('customer_engagement_ratio', 0.5)
-        if engagement_ratio >= 0.7:
-            engagement_points = 15
-        elif engagement_ratio >= 0.5:
-            engagement_points = 10
-        elif engagement_ratio >= 0.3:
-            engagement_points = 5
-        else:
-            engagement_points = 0
-
-        # Calculate base score
-        base_score = (
-            claude_points +
-            severity_points +
-            issue_class_points +
-            resolution_points +
-            support_points +
-            volume_points +
-            age_points +
-            engagement_points
-        )
-
-        # Add Sonnet quick scoring bonus if available
-        quick_scoring = case.get('deepseek_quick_scoring', {})
-        quick_score_bonus = 0
-        frustration_rate = 0
-        damage_rate = 0
-
-        if quick_scoring and quick_scoring.get('analysis_successful'):
-            frustration_rate = quick_scoring.get('frustration_frequency', 0)
-            damage_rate = quick_scoring.get('damage_frequency', 0)
-            priority = quick_scoring.get('priority', 'Medium')
-
-            # Original formula: (frustration_rate * 100) + (damage_rate * 50) + priority bonus
-            # Max possible: 100 + 50 + 20 = 170 points
-            quick_score_bonus = (frustration_rate / 100 * 100) + (damage_rate / 100 * 50)
-
-            if priority == 'Critical':
-                quick_score_bonus += 20
-            elif priority == 'High':
-                quick_score_bonus += 10
-            elif priority == 'Medium':
-                quick_score_bonus += 5
-
-        # Add timeline bonus if available
-        timeline_bonus = 0
-        timeline_analysis = case.get('deepseek_analysis', {})
-        if timeline_analysis and timeline_analysis.get('analysis_successful'):
-            timeline_entries = timeline_analysis.get('timeline_entries', [])
-            if timeline_entries:
-                # Count frustrated entries
-                frustrated_count = sum(
-                    1 for e in timeline_entries
-                    if 'yes' in str(e.get('frustration_detected', '')).lower()
-                )
-                frustration_rate_timeline = frustrated_count / len(timeline_entries) * 100
-                timeline_bonus = frustration_rate_timeline / 10
-
-        final_score = base_score + quick_score_bonus + timeline_bonus
-
-        # Store score breakdown
-        case['criticality_score'] = round(final_score, 1)
-        case['score_breakdown'] = {
-            'claude_frustration': round(claude_points, 1),
-            'claude_frustration_base': round(base_frust_pts, 1),
-            'claude_frustration_peak_bonus': round(peak_bonus, 1),
-            'claude_frustration_pct_bonus': round(pct_bonus, 1),
-            'severity': severity_points,
-            'issue_class': issue_class_points,
-            'resolution_outlook': resolution_points,
-            'support_level': support_points,
-            'volume': volume_points,
-            'age': age_points,
-            'engagement': engagement_points,
-            'deepseek_quick_score': round(quick_score_bonus, 1),
-            'deepseek_frustration_rate': frustration_rate,
-            'deepseek_damage_rate': damage_rate,
-            'deepseek_timeline': round(timeline_bonus, 1),
-            'base_score': round(base_score, 1),
-            'final_score': round(final_score, 1),
-        }
+    components = score_components(build_score_features(case_analysis))
+    names = list(components.columns)
+    columns = [
+        components[name].tolist() if name in _UNROUNDED_COMPONENTS
+        else _round1(components[name].to_numpy(float)).tolist()
+        for name in names
+    ]
+
+    # Store score breakdown
+    for case, values in zip(case_analysis, zip(*columns)):
+        breakdown = dict(zip(names, values))
+        case['criticality_score'] = breakdown['final_score']
+        case['score_breakdown'] = breakdown
 
     # Sort by criticality score (highest first)
     case_analysis.sort(key=lambda x: x['criticality_score'], reverse=True)
@@ -254,6 +350,25 @@ def calculate_criticality_scores(
     return case_analysis
 
 
+def _last_activity(case: Dict):
+    """Last message date of a case (last modified date without messages), or NaT."""
+    try:
+        case_data = case.get('case_data')
+        if case_data is not None and not case_data.empty:
+            return pd.Timestamp(case_data['Message Date'].max())
+        return pd.Timestamp(case['last_modified_date'])
+    except Exception:
+        return pd.NaT
+
+
+def _last_activity_array(case_analysis: List[Dict], indices: Sequence[int]) -> np.ndarray:
+    """Last activity of the given cases as datetime64 (NaT for every other case)."""
+    last_activity = np.full(len(case_analysis), np.datetime64('NaT'), dtype='datetime64[ns]')
+    for i in indices:
+        last_activity[i] = _last_activity(case_analysis[i]).to_datetime64()
+    return last_activity
+
+
 def calculate_temporal_clustering_penalty(
     case_analysis: List[Dict],
     lookback_days: int = 60
@@ -266,40 +381,57 @@ def calculate_temporal_clustering_penalty(
         - penalty_multiplier: 0.0 to 1.0 (0 = no penalty, 1 = full penalty)
         - clustering_info: dict with details for reporting
     """
+    scores = np.array([c['criticality_score'] for c in case_analysis], dtype=float)
+    if not len(scores):
+        return 0.0, {'detected': False}
+
+    # Only concerning cases need their last activity date
+    concerning = (scores >= 140) & (scores >= np.percentile(scores, 80))
+    last_activity = _last_activity_array(case_analysis, np.flatnonzero(concerning))
+
+    return _clustering_penalty(
+        [c['case_number'] for c in case_analysis], scores, last_activity, lookback_days
+    )
+
+
+def _clustering_penalty(
+    case_numbers: List[Any],
+    scores: np.ndarray,
+    last_activity: np.ndarray,
+    lookback_days: int = 60
+) -> Tuple[float, Dict]:
+    """
+    Temporal clustering penalty from per-case columns.
+
+    Args:
+        case_numbers: Case numbers, in score order
+        scores: Criticality scores
+        last_activity: Last activity dates as datetime64 (NaT = unknown)
+        lookback_days: Window for "recent" cases
+
+    Returns:
+        Same as calculate_temporal_clustering_penalty()
+    """
     current_date = pd.Timestamp.now()
     cutoff_date = current_date - pd.Timedelta(days=lookback_days)
 
-    # Find cases that are concerning AND recent
-    scores = [c['criticality_score'] for c in case_analysis]
-    if not scores:
+    scores = np.asarray(scores, dtype=float)
+    if not len(scores):
         return 0.0, {'detected': False}
 
     threshold_80th = np.percentile(scores, 80)
+    last_activity = np.asarray(last_activity, dtype='datetime64[ns]')
+    recent = (scores >= 140) & (scores >= threshold_80th) & (last_activity >= cutoff_date.to_datetime64())
 
     recent_concerning_cases = []
-    for case in case_analysis:
-        try:
-            case_data = case.get('case_data')
-            if case_data is not None and not case_data.empty:
-                last_msg = case_data['Message Date'].max()
-            else:
-                last_msg = pd.to_datetime(case['last_modified_date'])
-        except:
-            continue
-
-        is_concerning = (
-            case['criticality_score'] >= 140 and
-            case['criticality_score'] >= threshold_80th
-        )
-        is_recent = last_msg >= cutoff_date
-
-        if is_concerning and is_recent:
-            recent_concerning_cases.append({
-                'case_number': case['case_number'],
-                'score': case['criticality_score'],
-                'last_activity': last_msg,
-                'days_ago': (current_date - last_msg).days
-            })
+    for i in np.flatnonzero(recent):
+        last_msg = pd.Timestamp(last_activity[i])
+        recent_concerning_cases.append({
+            'case_number': case_numbers[i],
+            'score': scores[i].item(),
+            'last_activity': last_msg,
+            'days_ago': (current_date - last_msg).days
+        })
 
     num_recent = len(recent_concerning_cases)
 
@@ -351,6 +483,12 @@ def calculate_temporal_clustering_penalty(
     }
 
 
+def _override_weights(last_msg_dates: np.ndarray, current_date) -> np.ndarray:
+    """Catastrophic override weight of cases last active on last_msg_dates (datetime64)."""
+    days_ago = np.floor((current_date.to_datetime64() - last_msg_dates) / np.timedelta64(1, 'D'))
+    return np.select([days_ago <= 90, days_ago <= 180, days_ago <= 365], [1.0, 0.5, 0.25], 0.0)
+
+
 def calculate_catastrophic_override_weight(case: Dict, current_date) -> float:
     """
     Calculate override weight based on recency of catastrophic case.
@@ -362,34 +500,16 @@ def calculate_catastrophic_override_weight(case: Dict, current_date) -> float:
         - 0.25 = quarter override (6-12 months)
         - 0.0 = no override (>12 months)
     """
-    try:
-        case_data = case.get('case_data')
-        if case_data is not None and not case_data.empty:
-            msg_dates = case_data['Message Date'].dropna()
-            if len(msg_dates) > 0:
-                last_msg_date = msg_dates.max()
-            else:
-                last_msg_date = pd.to_datetime(case['last_modified_date'])
-        else:
-            last_msg_date = pd.to_datetime(case['last_modified_date'])
-    except:
+    last_msg_date = _last_activity(case)
+    if pd.isna(last_msg_date):
         last_msg_date = pd.to_datetime(case['last_modified_date'])
-
-    days_ago = (current_date - last_msg_date).days
-
-    if days_ago <= 90:
-        return 1.0
-    elif days_ago <= 180:
-        return 0.5
-    elif days_ago <= 365:
-        return 0.25
-    else:
-        return 0.0
+    return float(_override_weights(np.array([last_msg_date], dtype='datetime64[ns]'), current_date)[0])
 
 
 def calculate_account_health_score(
     case_analysis: List[Dict],
-    claude_statistics: Dict
+    claude_statistics: Dict,
+    weights: Optional[ScoreWeights] = None
 ) -> Tuple[float, Dict]:
     """
     Calculate holistic account health score (0-100, higher = healthier).
@@ -403,10 +523,55 @@ def calculate_account_health_score(
 
     Plus temporal clustering and catastrophic override penalties.
 
+    Args:
+        case_analysis: Scored cases (see calculate_criticality_scores())
+        claude_statistics: Haiku statistics (avg_frustration_score, high_frustration)
+        weights: Scoring profile for the critical / catastrophic thresholds
+
     Returns:
         Tuple of (health_score, score_breakdown_dict)
     """
-    total_cases = len(case_analysis)
+    weights = weights or ScoreWeights()
+    scores = np.array([c['criticality_score'] for c in case_analysis], dtype=float)
+
+    # Last activity is only needed for catastrophic and concerning cases
+    needed = scores >= weights.catastrophic_threshold
+    if len(scores):
+        needed |= (scores >= 140) & (scores >= np.percentile(scores, 80))
+    last_activity = _last_activity_array(case_analysis, np.flatnonzero(needed))
+
+    return account_health_from_columns(
+        claude_statistics,
+        case_numbers=[c['case_number'] for c in case_analysis],
+        scores=scores,
+        issue_classes=[c['claude_analysis'].get('issue_class') for c in case_analysis],
+        resolution_outlooks=[c['claude_analysis'].get('resolution_outlook') for c in case_analysis],
+        last_activity=last_activity,
+        last_modified=[c.get('last_modified_date') for c in case_analysis],
+        weights=weights,
+    )
+
+
+def account_health_from_columns(
+    claude_statistics: Dict,
+    case_numbers: Sequence[Any],
+    scores: np.ndarray,
+    issue_classes: Sequence[Any],
+    resolution_outlooks: Sequence[Any],
+    last_activity: np.ndarray,
+    last_modified: Sequence[Any],
+    weights: Optional[ScoreWeights] = None
+) -> Tuple[float, Dict]:
+    """
+    Account health score from per-case columns (see calculate_account_health_score()).
+
+    last_activity is the last message date of each case as datetime64 (NaT =
+    unknown, in which case catastrophic cases fall back to last_modified).
+    """
+    weights = weights or ScoreWeights()
+    scores = np.asarray(scores, dtype=float)
+    last_activity = np.asarray(last_activity, dtype='datetime64[ns]')
+    total_cases = len(scores)
 
     if total_cases == 0:
         return 0, {
@@ -425,16 +590,15 @@ def calculate_account_health_score(
     high_frustration_count = claude_statistics['high_frustration']
     high_frustration_ratio = high_frustration_count / total_cases
 
-    # Check for catastrophic cases (>=200)
-    catastrophic_cases = [c for c in case_analysis if c['criticality_score'] >= 200]
+    # Check for catastrophic cases
+    catastrophic_cases = np.flatnonzero(scores >= weights.catastrophic_threshold)
     current_date = pd.Timestamp.now()
 
     if len(catastrophic_cases) > 0:
-        override_weights = [
-            calculate_catastrophic_override_weight(c, current_date)
-            for c in catastrophic_cases
-        ]
-        max_override = max(override_weights)
+        last_msg_dates = last_activity[catastrophic_cases]
+        for j in np.flatnonzero(np.isnat(last_msg_dates)):
+            last_msg_dates[j] = pd.to_datetime(last_modified[catastrophic_cases[j]])
+        max_override = float(_override_weights(last_msg_dates, current_date).max())
         normal_score = max(0, 20 - (high_frustration_ratio * 100))
         high_frustration_score = normal_score * (1 - max_override)
     else:
@@ -442,7 +606,7 @@ def calculate_account_health_score(
         max_override = 0.0
 
     # Component 3: Critical Case Load (0-20 points)
-    critical_count = len([c for c in case_analysis if c['criticality_score'] >= 180])
+    critical_count = int(np.count_nonzero(scores >= weights.critical_threshold))
     critical_ratio = critical_count / total_cases
 
     if max_override > 0:
@@ -452,18 +616,12 @@ def calculate_account_health_score(
         critical_score = max(0, 20 - (critical_ratio * 100))
 
     # Component 4: Systemic Issues (0-15 points)
-    systemic_count = len([
-        c for c in case_analysis
-        if c['claude_analysis'].get('issue_class') == 'Systemic'
-    ])
+    systemic_count = int(np.count_nonzero(np.asarray(issue_classes, dtype=object) == 'Systemic'))
     systemic_ratio = systemic_count / total_cases
     systemic_score = max(0, 15 - (systemic_ratio * 75))
 
     # Component 5: Challenging Resolutions (0-15 points)
-    challenging_count = len([
-        c for c in case_analysis
-        if c['claude_analysis'].get('resolution_outlook') == 'Challenging'
-    ])
+    challenging_count = int(np.count_nonzero(np.asarray(resolution_outlooks, dtype=object) == 'Challenging'))
     challenging_ratio = challenging_count / total_cases
     challenging_score = max(0, 15 - (challenging_ratio * 75))
 
@@ -478,8 +636,8 @@ def calculate_account_health_score(
     base_health_score = max(0, min(100, base_health_score))
 
     # Apply temporal clustering penalty
-    temporal_penalty, temporal_info = calculate_temporal_clustering_penalty(
-        case_analysis, lookback_days=60
+    temporal_penalty, temporal_info = _clustering_penalty(
+        case_numbers, scores, last_activity, lookback_days=60
     )
 
     if temporal_penalty > 0:
@@ -5,6 +5,9 @@ Usage:
     python -m src.cli analyze input/salesforce_export.xlsx
     python -m src.cli analyze input/export.xlsx --output custom_output/
     python -m src.cli analyze input/export.xlsx --skip-sonnet  # Faster, cheaper
+    python -m src.cli analyze input/region_export.xlsx --portfolio --workers 4
+    python -m src.cli rescore outputs/analysis_<timestamp> --weights weights.json
+    python -m src.cli runs --account "ACME Corp" --since 2025-01-01
 """
 
 import subprocess
@@ -15,7 +18,7 @@ import click
 from rich.console import Console
 
 from .core import Config
-from .main import run_analysis, run_full_analysis
+from .main import run_analysis, run_full_analysis, run_portfolio_analysis
 
 
 console = Console()
@@ -31,12 +34,17 @@ def cli():
 @click.argument('input_file', type=click.Path(exists=True))
 @click.option('--output', '-o', default=None, help='Output directory (default: outputs/)')
 @click.option('--skip-sonnet', is_flag=True, help='Skip Claude Sonnet analysis (faster, cheaper)')
-def analyze(input_file: str, output: str, skip_sonnet: bool):
+@click.option('--portfolio', is_flag=True, help='Multi-account export: analyse every Customer Name separately')
+@click.option('--workers', default=None, type=int, help='Accounts analysed in parallel in portfolio mode (default: PORTFOLIO_WORKERS)')
+def analyze(input_file: str, output: str, skip_sonnet: bool, portfolio: bool, workers: int):
     """
     Run sentiment analysis on an Excel file.
 
     INPUT_FILE: Path to Excel file with case data (Salesforce export)
 
+    With --portfolio, the cases are split by Customer Name and each account
+    gets its own analysis folder plus a portfolio_summary.json index.
+
     Example:
         python -m src.cli analyze input/customer_cases.xlsx
     """
@@ -53,26 +61,42 @@ def analyze(input_file: str, output: str, skip_sonnet: bool):
     console.print()
 
     try:
-        result = run_analysis(
-            input_file=str(input_path),
-            output_dir=output,
-            skip_sonnet=skip_sonnet,
-        )
-
-        if result["success"]:
-            console.print()
-            console.print(f"[green bold]Success![/green bold]")
-            console.print(f"  Customer: {result['customer_name']}")
-            console.print(f"  Health Score: {result['health_score']:.0f}/100")
-            console.print(f"  Total Cases: {result['total_cases']}")
-            console.print(f"  Critical Cases: {result['critical_cases']}")
-            console.print(f"  Analysis Time: {result['analysis_time']:.1f}s")
-            console.print()
-            console.print(f"[dim]Output saved to: {result['output_dir']}[/dim]")
+        if portfolio:
+            result = run_portfolio_analysis(
+                input_file=str(input_path),
+                output_dir=output,
+                skip_sonnet=skip_sonnet,
+                max_workers=workers,
+            )
         else:
+            result = run_analysis(
+                input_file=str(input_path),
+                output_dir=output,
+                skip_sonnet=skip_sonnet,
+            )
+
+        if not result["success"]:
             console.print(f"[red]Analysis failed: {result.get('error', 'Unknown error')}[/red]")
             sys.exit(1)
 
+        console.print()
+        console.print(f"[green bold]Success![/green bold]")
+        if portfolio:
+            console.print(f"  Accounts: {result['total_accounts']} ({result['failed_accounts']} failed)")
+            for account in result["accounts"][:10]:
+                if account["success"]:
+                    console.print(f"    {account['health_score']:5.1f}  {account['account_name']}")
+                else:
+                    console.print(f"    [red]failed[/red] {account['account_name']}: {account['error']}")
+        else:
+            console.print(f"  Customer: {result['customer_name']}")
+            console.print(f"  Health Score: {result['health_score']:.0f}/100")
+        console.print(f"  Total Cases: {result['total_cases']}")
+        console.print(f"  Critical Cases: {result['critical_cases']}")
+        console.print(f"  Analysis Time: {result['analysis_time']:.1f}s")
+        console.print()
+        console.print(f"[dim]Output saved to: {result['output_dir']}[/dim]")
+
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
@@ -85,7 +109,11 @@ def analyze(input_file: str, output: str, skip_sonnet: bool):
 @click.option('--output', default=None, help='Output directory (default: outputs/)')
 @click.option('--quick', is_flag=True, help='Skip all AI analysis (fastest, for testing)')
 @click.option('--skip-sonnet', is_flag=True, help='Skip Sonnet analysis (faster, cheaper)')
-def analyze_full(opportunities: str, deployments: str, support: str, output: str, quick: bool, skip_sonnet: bool):
+@click.option('--fuzzy-link', is_flag=True, help='Resolve account aliases and near-miss order numbers after linking')
+@click.option('--save-db', is_flag=True, help='Also save linked data and layer results to a SQLite file')
+@click.option('--metrics-backend', type=click.Choice(['fused', 'facts']), default='fused', help='Metrics engine: single pass over orders, or pandas over the fact table')
+@click.option('--delta', is_flag=True, help='Only re-analyze orders touched by records new or changed since the last --delta run')
+def analyze_full(opportunities: str, deployments: str, support: str, output: str, quick: bool, skip_sonnet: bool, fuzzy_link: bool, save_db: bool, metrics_backend: str, delta: bool):
     """
     Run full 4-layer analysis across all data sources.
 
@@ -105,6 +133,11 @@ def analyze_full(opportunities: str, deployments: str, support: str, output: str
     Quick test mode (no AI):
         python -m src.cli analyze-full --quick \\
             --support "input/cases.xlsx"
+
+    Weekly exports (--delta): the linked data, metrics state and ingest
+    state are kept in LINKED_STORE_PATH, METRICS_STATE_PATH and
+    INGEST_STATE_PATH, and only orders touched by new or changed records
+    are analyzed again.
     """
     # Validate that at least one source is provided
     if not opportunities and not deployments and not support:
@@ -119,6 +152,8 @@ def analyze_full(opportunities: str, deployments: str, support: str, output: str
     console.print(f"  Deployments: {deployments or 'Not provided'}")
     console.print(f"  Support Cases: {support or 'Not provided'}")
     console.print(f"[dim]Output directory: {output or 'outputs/'}[/dim]")
+    if delta:
+        console.print(f"[dim]Delta run: previous linked data in {Config.LINKED_STORE_PATH}[/dim]")
     if quick:
         console.print(f"[yellow]Quick mode: Skipping all AI analysis[/yellow]")
     elif skip_sonnet:
@@ -133,6 +168,10 @@ def analyze_full(opportunities: str, deployments: str, support: str, output: str
             output_dir=output,
             skip_ai=quick,
             skip_sonnet=skip_sonnet,
+            fuzzy_link=fuzzy_link,
+            save_db=save_db,
+            metrics_backend=metrics_backend,
+            delta=delta,
         )
 
         if result["success"]:
@@ -155,6 +194,102 @@ def analyze_full(opportunities: str, deployments: str, support: str, output: str
         sys.exit(1)
 
 
+@cli.command()
+@click.argument('run_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--weights', '-w', default=None, type=click.Path(exists=True), help='JSON weight profile (only the entries to change)')
+@click.option('--sweep', default=None, type=click.Path(exists=True), help='JSON file mapping profile names to weight profiles')
+@click.option('--top', default=10, help='Number of top cases to show')
+@click.option('--output', '-o', default=None, help='Write the rescored cases (or sweep table) to this CSV file')
+def rescore(run_dir: str, weights: str, sweep: str, top: int, output: str):
+    """
+    Rescore a finished analysis with different criticality weights.
+
+    Uses the scoring inputs saved by `analyze` (score_features.csv), so no
+    AI stage is re-run.
+
+    RUN_DIR: Analysis output folder (outputs/analysis_<timestamp>)
+
+    Example weight profile:
+        {"severity": {"S1": 50, "S2": 30}, "issue_class": {"Systemic": 40},
+         "critical_threshold": 170, "catastrophic_threshold": 190}
+    """
+    import json
+
+    from .analysis.rescoring import (
+        SCORE_FEATURES_FILE,
+        load_score_features,
+        load_weights,
+        load_weight_profiles,
+        rescore_run,
+        sensitivity_sweep,
+    )
+
+    run_path = Path(run_dir)
+
+    try:
+        if sweep:
+            with open(run_path / "json" / "summary_statistics.json") as f:
+                claude_statistics = json.load(f)["claude_statistics"]
+            table = sensitivity_sweep(
+                load_score_features(run_path / SCORE_FEATURES_FILE),
+                claude_statistics,
+                load_weight_profiles(sweep),
+            )
+            console.print(table.to_string(index=False))
+            if output:
+                table.to_csv(output, index=False)
+                console.print(f"[dim]Sweep saved to: {output}[/dim]")
+            return
+
+        result = rescore_run(run_path, load_weights(weights) if weights else None)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        sys.exit(1)
+
+    baseline = result["baseline_health_score"]
+    console.print(f"[bold]Rescored: {run_path.name}[/bold]")
+    console.print(f"  Health Score: {result['health_score']:.1f}/100 (baseline {baseline})")
+    console.print(f"  Critical Cases: {result['critical_cases']}")
+    console.print(f"  Catastrophic Cases: {result['catastrophic_cases']}")
+    console.print()
+    console.print(f"[bold]Top {top} cases:[/bold]")
+    for i, row in enumerate(result["cases"].head(top).itertuples(index=False), 1):
+        console.print(f"  {i:>3}. Case {row.case_number}: {row.criticality_score:.1f} pts")
+
+    if output:
+        result["cases"].to_csv(output, index=False)
+        console.print()
+        console.print(f"[dim]Rescored cases saved to: {output}[/dim]")
+
+
+@cli.command()
+@click.option('--output', '-o', default=None, help='Output directory (default: outputs/)')
+@click.option('--account', '-a', default=None, help='Only runs of this account')
+@click.option('--since', default=None, help='Only runs analysed on or after this date (YYYY-MM-DD)')
+@click.option('--limit', default=20, help='Number of runs to show')
+@click.option('--repair', is_flag=True, help='Re-scan the output folders first (drop deleted runs, add missing ones)')
+def runs(output: str, account: str, since: str, limit: int, repair: bool):
+    """List analysis runs from the run catalog, newest first."""
+    from .core import RunCatalog
+
+    catalog = RunCatalog(Path(output) if output else None)
+    if repair:
+        changes = catalog.repair()
+        console.print(
+            f"[dim]Catalog repaired: {changes['added']} added, "
+            f"{changes['updated']} updated, {changes['removed']} removed[/dim]"
+        )
+
+    total = catalog.count(account=account, date_from=since)
+    for run in catalog.runs(account=account, date_from=since, limit=limit):
+        if run["analysis_type"] == "full":
+            detail = f"{run['fully_linked']}/{run['total_orders']} linked orders"
+        else:
+            detail = f"health {run['health_score']:.0f}"
+        console.print(f"  {run['date']}  {run['account']:<30} {run['total_cases']:>5} cases  {detail}  [dim]{run['name']}[/dim]")
+    console.print(f"[dim]{min(limit, total)} of {total} runs[/dim]")
+
+
 @cli.command()
 def check():
     """Check configuration and dependencies."""
@@ -1,22 +1,45 @@
 """
 Context loading module for TrueNAS Sentiment Analysis.
-Handles loading and composing context from PDFs and configuration files.
+Handles loading and composing context from PDFs and configuration files,
+retrieval of the passages relevant to each case, and per-product context
+for accounts with several product lines.
 """
 
 from .loader import (
     ContextLoader,
+    get_loader,
     load_context_for_case,
     load_global_context,
+    load_retrieval_context,
     get_product_line_from_serial,
     get_product_line_from_series,
     get_product_line_from_model,
 )
+from .retrieval import (
+    PassageIndex,
+    Passage,
+    RetrievalContext,
+    chunk_text,
+    select_passages,
+)
+from .product_context import ProductContext, case_key
 
 __all__ = [
     'ContextLoader',
+    'get_loader',
     'load_context_for_case',
     'load_global_context',
+    'load_retrieval_context',
     'get_product_line_from_serial',
     'get_product_line_from_series',
     'get_product_line_from_model',
+    # Retrieval
+    'PassageIndex',
+    'Passage',
+    'RetrievalContext',
+    'chunk_text',
+    'select_passages',
+    # Per-product context
+    'ProductContext',
+    'case_key',
 ]
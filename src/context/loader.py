@@ -3,10 +3,17 @@ Context loader for TrueNAS Sentiment Analysis.
 Loads SLA (always) and product-specific documentation based on case metadata.
 """
 
+import hashlib
 import json
+import multiprocessing
+import os
 import re
+import tempfile
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from functools import lru_cache
 
 try:
@@ -15,11 +22,37 @@ try:
 except ImportError:
     PDF_AVAILABLE = False
 
+from .retrieval import CHUNK_CHARS, CHUNK_OVERLAP, INDEX_VERSION, PassageIndex, RetrievalContext
+
 
 # Get the context directory path
 CONTEXT_DIR = Path(__file__).parent.parent.parent / "context"
 PRODUCT_MAPPING_FILE = CONTEXT_DIR / "product-mapping.json"
 
+# PDF text indexed for retrieval (whole documents, not the prompt limits)
+INDEX_MAX_CHARS = 2_000_000
+
+# Format of the on-disk extracted text cache
+TEXT_CACHE_VERSION = 1
+
+
+def join_pages(pages: List[str], max_chars: int) -> str:
+    """Join extracted page texts, truncating at max_chars with a marker."""
+    text_parts = []
+    total_chars = 0
+
+    for page_text in pages:
+        if total_chars + len(page_text) > max_chars:
+            # Truncate to fit limit
+            remaining = max_chars - total_chars
+            text_parts.append(page_text[:remaining])
+            text_parts.append(f"\n[...truncated at {max_chars} chars...]")
+            break
+        text_parts.append(page_text)
+        total_chars += len(page_text)
+
+    return "\n".join(text_parts)
+
 
 class ContextLoader:
     """
@@ -30,10 +63,23 @@ class ContextLoader:
         context = loader.get_context_for_case(asset_serial="A1-123456")
     """
 
-    def __init__(self, context_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        context_dir: Optional[Path] = None,
+        index_dir: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+    ):
         self.context_dir = context_dir or CONTEXT_DIR
+        self.cache_dir = cache_dir or self.context_dir / ".cache"
+        self.index_dir = index_dir or self.cache_dir / "index"
+        self.text_cache_dir = self.cache_dir / "text"
         self.mapping = self._load_product_mapping()
-        self._pdf_cache: Dict[str, str] = {}
+        self._pdf_pages: Dict[str, List[str]] = {}
+        self._prefetched: set = set()
+        self._indexes: Dict[str, Optional[PassageIndex]] = {}
+        # Portfolio runs share one loader across account threads
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
 
     def _load_product_mapping(self) -> Dict:
         """Load the product mapping configuration."""
@@ -109,10 +155,134 @@ class ContextLoader:
         first_letter = model_str[0]
         return self.get_product_line_from_series(first_letter)
 
+    @staticmethod
+    def read_pages(pdf_path: Path) -> List[str]:
+        """
+        Text of each page of a PDF.
+
+        A static method so parallel prefetching can run it in worker processes.
+        """
+        if not PDF_AVAILABLE:
+            raise ImportError("PyPDF2 is not installed")
+        reader = PdfReader(pdf_path)
+        return [page.extract_text() or "" for page in reader.pages]
+
+    def _text_cache_path(self, pdf_path: Path) -> Path:
+        key = hashlib.sha1(str(Path(pdf_path).resolve()).encode("utf-8")).hexdigest()
+        return self.text_cache_dir / f"{key}.json"
+
+    def _load_cached_pages(self, pdf_path: Path) -> Optional[List[str]]:
+        """Pages from the disk cache, or None if missing or the PDF changed (size/mtime)."""
+        cache_path = self._text_cache_path(pdf_path)
+        if not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        stat = pdf_path.stat()
+        if (data.get("version") != TEXT_CACHE_VERSION
+                or data.get("size") != stat.st_size
+                or data.get("mtime_ns") != stat.st_mtime_ns):
+            return None
+        return data.get("pages")
+
+    def _save_cached_pages(self, pdf_path: Path, pages: List[str]) -> None:
+        """Write extracted pages to the disk cache (atomically, via a temp file of this writer's own)."""
+        stat = pdf_path.stat()
+        data = {
+            "version": TEXT_CACHE_VERSION,
+            "path": str(pdf_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "pages": pages,
+        }
+        cache_path = self._text_cache_path(pdf_path)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp", delete=False,
+            ) as f:
+                tmp_path = Path(f.name)
+                try:
+                    json.dump(data, f)
+                except BaseException:
+                    f.close()
+                    os.unlink(tmp_path)
+                    raise
+            tmp_path.replace(cache_path)
+        except OSError:
+            pass  # read-only context folder: keep the in-memory copy
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        """Lock held while one PDF is extracted or one index is built (one per file or product line)."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _cached_pages(self, pdf_path: Path) -> Optional[List[str]]:
+        """Pages from memory or disk, without extracting."""
+        with self._lock:
+            pages = self._pdf_pages.get(str(pdf_path))
+        if pages is None:
+            pages = self._load_cached_pages(pdf_path)
+            if pages is not None:
+                with self._lock:
+                    self._pdf_pages[str(pdf_path)] = pages
+        return pages
+
+    def prefetch_pdf_texts(self, pdf_paths: Iterable[Path], max_workers: Optional[int] = None) -> None:
+        """
+        Extract uncached PDFs in parallel on a cold start.
+
+        PyPDF2 is pure Python, so extraction runs in worker processes. PDFs
+        that fail here are left to extract_pdf_text, which reports the error.
+        Workers are spawned rather than forked, as the caller may be one of
+        several account threads. Each PDF is claimed by one caller, whose
+        key locks make other threads wait for its pages instead of
+        extracting them again.
+        """
+        with ExitStack() as claimed:
+            missing = []
+            for pdf_path in pdf_paths:
+                with self._lock:
+                    if str(pdf_path) in self._prefetched:
+                        continue
+                    self._prefetched.add(str(pdf_path))
+                if not pdf_path.exists():
+                    continue
+                claimed.enter_context(self._key_lock(str(pdf_path)))
+                if self._cached_pages(pdf_path) is None:
+                    missing.append(pdf_path)
+            if len(missing) < 2:
+                return
+
+            workers = min(len(missing), max_workers or os.cpu_count() or 1)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                ) as pool:
+                    futures = {pool.submit(self.read_pages, pdf_path): pdf_path for pdf_path in missing}
+                    for future in as_completed(futures):
+                        pdf_path = futures[future]
+                        try:
+                            pages = future.result()
+                        except Exception:
+                            continue
+                        with self._lock:
+                            self._pdf_pages[str(pdf_path)] = pages
+                        self._save_cached_pages(pdf_path, pages)
+            except (OSError, BrokenExecutor):
+                pass  # no worker processes available: extract serially on demand
+
     def extract_pdf_text(self, pdf_path: Path, max_chars: int = 50000) -> str:
         """
         Extract text content from a PDF file.
 
+        Page texts are cached in memory and on disk (keyed by path, size and
+        mtime), so only the first run after a PDF changes parses it.
+
         Args:
             pdf_path: Path to the PDF file
             max_chars: Maximum characters to extract (to avoid token limits)
@@ -120,39 +290,23 @@ class ContextLoader:
         Returns:
             Extracted text content
         """
-        if not PDF_AVAILABLE:
-            return f"[PDF extraction unavailable - install PyPDF2: {pdf_path.name}]"
-
         if not pdf_path.exists():
             return f"[PDF not found: {pdf_path.name}]"
 
-        # Check cache
-        cache_key = str(pdf_path)
-        if cache_key in self._pdf_cache:
-            return self._pdf_cache[cache_key]
-
-        try:
-            reader = PdfReader(pdf_path)
-            text_parts = []
-            total_chars = 0
-
-            for page in reader.pages:
-                page_text = page.extract_text() or ""
-                if total_chars + len(page_text) > max_chars:
-                    # Truncate to fit limit
-                    remaining = max_chars - total_chars
-                    text_parts.append(page_text[:remaining])
-                    text_parts.append(f"\n[...truncated at {max_chars} chars...]")
-                    break
-                text_parts.append(page_text)
-                total_chars += len(page_text)
-
-            text = "\n".join(text_parts)
-            self._pdf_cache[cache_key] = text
-            return text
-
-        except Exception as e:
-            return f"[Error reading PDF {pdf_path.name}: {str(e)}]"
+        with self._key_lock(str(pdf_path)):
+            pages = self._cached_pages(pdf_path)
+            if pages is None:
+                try:
+                    pages = self.read_pages(pdf_path)
+                except ImportError:
+                    return f"[PDF extraction unavailable - install PyPDF2: {pdf_path.name}]"
+                except Exception as e:
+                    return f"[Error reading PDF {pdf_path.name}: {str(e)}]"
+                with self._lock:
+                    self._pdf_pages[str(pdf_path)] = pages
+                self._save_cached_pages(pdf_path, pages)
+
+        return join_pages(pages, max_chars)
 
     def load_global_context(self) -> str:
         """
@@ -176,15 +330,15 @@ class ContextLoader:
 
         return "\n".join(context_parts)
 
-    def load_product_context(self, product_line: str) -> str:
+    def load_product_metadata(self, product_line: str) -> str:
         """
-        Load context specific to a product line.
+        Structured product information from the mapping (no PDFs).
 
         Args:
             product_line: Product line name (e.g., "M-Series")
 
         Returns:
-            Combined text from product-specific PDFs plus product metadata
+            Product metadata, key features and common issues
         """
         product_info = self.mapping.get("product_lines", {}).get(product_line, {})
 
@@ -218,6 +372,25 @@ class ContextLoader:
 
         context_parts.append("")
 
+        return "\n".join(context_parts)
+
+    def load_product_context(self, product_line: str) -> str:
+        """
+        Load context specific to a product line.
+
+        Args:
+            product_line: Product line name (e.g., "M-Series")
+
+        Returns:
+            Combined text from product-specific PDFs plus product metadata
+        """
+        product_info = self.mapping.get("product_lines", {}).get(product_line, {})
+
+        if not product_info:
+            return ""
+
+        context_parts = [self.load_product_metadata(product_line)]
+
         # Load product-specific PDFs
         pdf_files = product_info.get('pdf_files', [])
         for filename in pdf_files:
@@ -314,6 +487,13 @@ class ContextLoader:
         if not detected_product and asset_serial:
             detected_product = self.get_product_line_from_serial(asset_serial)
 
+        # Extract all PDFs for this case in parallel on a cold start
+        filenames = self.context_filenames(detected_product)
+        if not include_global:
+            global_files = self.context_filenames(None)
+            filenames = [f for f in filenames if f not in global_files]
+        self.prefetch_pdf_texts(self.context_dir / filename for filename in filenames)
+
         # Load global context (SLA, etc.) - always first
         if include_global:
             global_ctx = self.load_global_context()
@@ -341,6 +521,108 @@ class ContextLoader:
 
         return combined, detected_product
 
+    def get_structured_context(self, product_line: Optional[str]) -> str:
+        """Product metadata, severity handling and support considerations (no PDFs)."""
+        if not product_line:
+            return ""
+        parts = [
+            self.load_product_metadata(product_line),
+            self.load_severity_context(product_line),
+            self.load_support_considerations(product_line),
+        ]
+        return "\n\n".join(part for part in parts if part)
+
+    def context_filenames(self, product_line: Optional[str] = None) -> List[str]:
+        """Global context files followed by the product line's PDFs."""
+        filenames = list(self.mapping.get("global_context", {}).get("always_load", []))
+        if product_line:
+            product_info = self.mapping.get("product_lines", {}).get(product_line, {})
+            filenames += [f for f in product_info.get("pdf_files", []) if f not in filenames]
+        return filenames
+
+    def context_documents(self, product_line: Optional[str] = None) -> Dict[str, str]:
+        """Full text of the global and product PDFs, keyed by file name."""
+        filenames = self.context_filenames(product_line)
+        self.prefetch_pdf_texts(self.context_dir / filename for filename in filenames)
+
+        documents = {}
+        for filename in filenames:
+            pdf_path = self.context_dir / filename
+            if pdf_path.exists():
+                text = self.extract_pdf_text(pdf_path, max_chars=INDEX_MAX_CHARS)
+                if text and not text.startswith("["):
+                    documents[filename] = text
+        return documents
+
+    def _index_fingerprint(self, product_line: Optional[str]) -> str:
+        """Hash of the indexed files (name, size, mtime) and chunking settings."""
+        entries = []
+        for filename in self.context_filenames(product_line):
+            pdf_path = self.context_dir / filename
+            if pdf_path.exists():
+                stat = pdf_path.stat()
+                entries.append([filename, stat.st_size, stat.st_mtime_ns])
+        key = json.dumps([INDEX_VERSION, CHUNK_CHARS, CHUNK_OVERLAP, entries])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get_passage_index(self, product_line: Optional[str] = None) -> Optional[PassageIndex]:
+        """
+        BM25 index over the global and product PDFs of a product line.
+
+        Loaded from index_dir when its fingerprint matches the documents,
+        otherwise rebuilt and saved. None when there is nothing to index.
+        Concurrent callers for one product line wait for a single build.
+        """
+        name = re.sub(r"[^A-Za-z0-9]+", "_", product_line or "global").strip("_").lower()
+        with self._key_lock(f"index:{name}"):
+            with self._lock:
+                if name in self._indexes:
+                    return self._indexes[name]
+
+            fingerprint = self._index_fingerprint(product_line)
+            index_path = self.index_dir / f"{name}.json"
+            index = PassageIndex.load(index_path)
+            if index is None or index.fingerprint != fingerprint:
+                documents = self.context_documents(product_line)
+                index = PassageIndex.build(documents, fingerprint) if documents else None
+                if index is not None:
+                    try:
+                        index.save(index_path)
+                    except OSError:
+                        pass  # read-only context folder: keep the in-memory index
+
+            if index is not None and not len(index):
+                index = None
+            with self._lock:
+                self._indexes[name] = index
+            return index
+
+    def get_retrieval_context(
+        self,
+        base_context: str,
+        product_line: Optional[str] = None,
+        token_budget: int = 2000,
+        top_k: int = 8,
+    ) -> Optional[RetrievalContext]:
+        """
+        Context with per-case retrieved passages instead of whole PDFs.
+
+        Args:
+            base_context: Always-included context (analysis instructions)
+            product_line: Product line whose PDFs are searched (plus global docs)
+            token_budget: Tokens of retrieved passages per case
+            top_k: Passages considered per case
+
+        Returns:
+            RetrievalContext, or None if no documents are available
+        """
+        index = self.get_passage_index(product_line)
+        if index is None:
+            return None
+        structured = self.get_structured_context(product_line)
+        base = base_context + ("\n\n" + structured if structured else "")
+        return RetrievalContext(base, index, token_budget=token_budget, top_k=top_k)
+
 
 # Convenience functions for simpler usage
 _default_loader: Optional[ContextLoader] = None
@@ -374,6 +656,18 @@ def load_context_for_case(
     )
 
 
+def load_retrieval_context(
+    base_context: str,
+    product_line: Optional[str] = None,
+    token_budget: int = 2000,
+    top_k: int = 8,
+) -> Optional[RetrievalContext]:
+    """Per-case retrieval context for a product line (None if no documents)."""
+    return get_loader().get_retrieval_context(
+        base_context, product_line, token_budget=token_budget, top_k=top_k
+    )
+
+
 def load_global_context() -> str:
     """Load global context (SLA, etc.)."""
     return get_loader().load_global_context()
@@ -0,0 +1,62 @@
+"""
+Per-product analysis context for mixed-product accounts.
+
+An account with F-Series and M-Series systems needs the F-Series docs for
+its F-Series cases and the M-Series docs for the others. The context of
+each product line present is composed once; cases are mapped to their
+product line, and prompts pick the matching context:
+
+    context = ProductContext(
+        {"F-Series": f_context, "M-Series": m_context},
+        case_products={"1001": "F-Series", "1002": "M-Series"},
+        default_product="M-Series",
+    )
+    context.for_case_number(1001)  # f_context (a string or RetrievalContext)
+"""
+
+from typing import Any, Dict
+
+
+def case_key(case_number: Any) -> str:
+    """Lookup key of a case number (int, numpy int, float or string)."""
+    try:
+        return str(int(case_number))
+    except (TypeError, ValueError):
+        return str(case_number)
+
+
+class ProductContext:
+    """
+    Analysis contexts per product line, resolved per case.
+
+    str(context) is the default product's context; cases without a known
+    product line also use the default.
+    """
+
+    def __init__(
+        self,
+        contexts: Dict[str, Any],
+        case_products: Dict[str, str],
+        default_product: str,
+    ):
+        self.contexts = contexts
+        self.case_products = {case_key(case): product for case, product in case_products.items()}
+        self.default_product = default_product
+
+    def __str__(self) -> str:
+        return str(self.contexts[self.default_product])
+
+    def __len__(self) -> int:
+        return len(str(self))
+
+    @property
+    def products(self):
+        return list(self.contexts)
+
+    def product_for_case(self, case_number: Any) -> str:
+        product = self.case_products.get(case_key(case_number))
+        return product if product in self.contexts else self.default_product
+
+    def for_case_number(self, case_number: Any) -> Any:
+        """Context of the case's product line (a string or RetrievalContext)."""
+        return self.contexts[self.product_for_case(case_number)]
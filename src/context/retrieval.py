@@ -0,0 +1,275 @@
+"""
+Retrieval of context passages for case prompts.
+
+Context documents (SLA, product PDFs) are split into overlapping passages
+and indexed with BM25. Instead of pasting whole documents into every
+prompt, each case gets the passages most relevant to its messages and
+case details, within a token budget:
+
+    index = PassageIndex.build({"sla.pdf": sla_text, "m-series.pdf": m_text})
+    index.save(path)
+    passages = PassageIndex.load(path).search("S1 production down pool degraded", k=8)
+    text = format_passages(select_passages(passages, token_budget=2000))
+
+RetrievalContext wraps the index with the always-included analysis
+context, so the prompt builders can ask for a per-case context string.
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+INDEX_VERSION = 1
+
+# Passage size and overlap (characters)
+CHUNK_CHARS = 1200
+CHUNK_OVERLAP = 200
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Rough token estimate for budgets
+CHARS_PER_TOKEN = 4
+
+# Characters of a case used as the retrieval query
+MAX_QUERY_CHARS = 8000
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have he her his i if in into is it
+its me my no not of on or our she so than that the their them then there these they this to up us was we
+were what when which who will with would you your hi hello thanks thank regards please
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric terms without stopwords (keeps short codes like s1)."""
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+@dataclass
+class Passage:
+    """A chunk of one context document."""
+    source: str
+    position: int  # passage number within its source
+    text: str
+    score: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return len(self.text) // CHARS_PER_TOKEN + 1
+
+
+def _split_long(paragraph: str, size: int) -> List[str]:
+    """Split a paragraph longer than size at whitespace."""
+    pieces = []
+    while len(paragraph) > size:
+        cut = paragraph.rfind(" ", 0, size)
+        if cut <= size // 2:
+            cut = size
+        pieces.append(paragraph[:cut].strip())
+        paragraph = paragraph[cut:].strip()
+    if paragraph:
+        pieces.append(paragraph)
+    return pieces
+
+
+def chunk_text(
+    text: str,
+    source: str,
+    chunk_chars: int = CHUNK_CHARS,
+    overlap: int = CHUNK_OVERLAP,
+) -> List[Passage]:
+    """
+    Split a document into passages of about chunk_chars characters.
+
+    Paragraphs are packed together up to the chunk size; each passage
+    starts with the last `overlap` characters of the previous one so a
+    clause split across a boundary is still found.
+    """
+    paragraphs = []
+    for block in re.split(r"\n\s*\n", text):
+        block = " ".join(block.split())
+        if block:
+            paragraphs.extend(_split_long(block, chunk_chars))
+
+    passages: List[Passage] = []
+    current = ""
+    for paragraph in paragraphs:
+        if current and len(current) + len(paragraph) + 1 > chunk_chars:
+            passages.append(Passage(source, len(passages), current))
+            tail = current[-overlap:] if overlap else ""
+            current = tail[tail.find(" ") + 1:] if " " in tail else tail
+        current = f"{current} {paragraph}".strip()
+    if current:
+        passages.append(Passage(source, len(passages), current))
+    return passages
+
+
+class PassageIndex:
+    """
+    BM25 index over context passages, stored as JSON postings.
+
+    Usage:
+        index = PassageIndex.build(documents, fingerprint=...)
+        index.save(path)
+        index = PassageIndex.load(path)
+        top = index.search(query, k=8)
+    """
+
+    def __init__(
+        self,
+        passages: List[Passage],
+        postings: Dict[str, List[List[int]]],
+        lengths: List[int],
+        fingerprint: str = "",
+    ):
+        self.passages = passages
+        self.postings = postings
+        self.lengths = lengths
+        self.fingerprint = fingerprint
+        self.avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    @classmethod
+    def build(cls, documents: Dict[str, str], fingerprint: str = "") -> "PassageIndex":
+        """Chunk and index {source name: text} documents."""
+        passages: List[Passage] = []
+        for source, text in documents.items():
+            for passage in chunk_text(text, source):
+                passages.append(passage)
+
+        postings: Dict[str, List[List[int]]] = defaultdict(list)
+        lengths = []
+        for doc_id, passage in enumerate(passages):
+            terms = tokenize(passage.text)
+            lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                postings[term].append([doc_id, tf])
+
+        return cls(passages, dict(postings), lengths, fingerprint)
+
+    def save(self, path: Path) -> None:
+        """Write the index to JSON (atomically, via a temp file of this writer's own)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "passages": [[p.source, p.position, p.text] for p in self.passages],
+            "lengths": self.lengths,
+            "postings": self.postings,
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, prefix=path.name, suffix=".tmp", delete=False,
+        ) as f:
+            tmp_path = Path(f.name)
+            try:
+                json.dump(data, f)
+            except BaseException:
+                f.close()
+                os.unlink(tmp_path)
+                raise
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["PassageIndex"]:
+        """Read an index written by save() (None if missing, unreadable or from another version)."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            passages = [Passage(source, position, text) for source, position, text in data["passages"]]
+            return cls(passages, data["postings"], data["lengths"], data.get("fingerprint", ""))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def search(self, query: str, k: int = 8) -> List[Passage]:
+        """Top-k passages by BM25 score (passages without a query term are never returned)."""
+        if not self.passages:
+            return []
+
+        n = len(self.passages)
+        scores: Dict[int, float] = defaultdict(float)
+        for term, query_tf in Counter(tokenize(query[:MAX_QUERY_CHARS])).items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc_id] / self.avg_length)
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm) * query_tf
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [
+            Passage(self.passages[doc_id].source, self.passages[doc_id].position, self.passages[doc_id].text, score)
+            for doc_id, score in ranked
+        ]
+
+
+def select_passages(passages: Iterable[Passage], token_budget: int) -> List[Passage]:
+    """Passages in rank order that fit the token budget (larger ones are skipped)."""
+    selected = []
+    remaining = token_budget
+    for passage in passages:
+        if passage.tokens <= remaining:
+            selected.append(passage)
+            remaining -= passage.tokens
+    return selected
+
+
+def format_passages(passages: List[Passage]) -> str:
+    """Prompt section with the selected passages, grouped in document order."""
+    if not passages:
+        return ""
+    lines = ["=== RELEVANT DOCUMENTATION (retrieved for this case) ==="]
+    for passage in sorted(passages, key=lambda p: (p.source, p.position)):
+        lines.append(f"[{passage.source} #{passage.position + 1}] {passage.text}")
+    return "\n\n".join(lines)
+
+
+class RetrievalContext:
+    """
+    Analysis context whose documentation part is retrieved per case.
+
+    str(context) is the base context alone; for_case(query) adds the top
+    passages for the case within the token budget.
+    """
+
+    def __init__(
+        self,
+        base: str,
+        index: PassageIndex,
+        token_budget: int = 2000,
+        top_k: int = 8,
+    ):
+        self.base = base
+        self.index = index
+        self.token_budget = token_budget
+        self.top_k = top_k
+
+    def __str__(self) -> str:
+        return self.base
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def for_case(self, query: str) -> str:
+        passages = select_passages(self.index.search(query, k=self.top_k), self.token_budget)
+        if not passages:
+            return self.base
+        return self.base + "\n\n" + format_passages(passages)
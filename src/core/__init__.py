@@ -5,6 +5,8 @@ Exports:
 - Console output functions (print_*, streaming_output)
 - Claude client (get_claude_client)
 - Configuration (Config)
+- JSON output writer and reader (OutputWriter, read_json_output)
+- Run catalog of the output directory (RunCatalog)
 """
 
 from .console import (
@@ -30,6 +32,10 @@ from .claude_client import get_claude_client
 
 from .config import Config
 
+from .json_output import OutputWriter, read_json_output, find_json_output
+
+from .run_catalog import RunCatalog
+
 __all__ = [
     # Console
     "console",
@@ -52,4 +58,10 @@ __all__ = [
     "get_claude_client",
     # Config
     "Config",
+    # JSON output
+    "OutputWriter",
+    "read_json_output",
+    "find_json_output",
+    # Run catalog
+    "RunCatalog",
 ]
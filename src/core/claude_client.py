@@ -3,6 +3,7 @@ Anthropic Claude API client wrapper.
 Replaces Abacus AI's client.evaluate_prompt() with direct Anthropic API calls.
 """
 
+import threading
 import time
 from typing import Optional
 import anthropic
@@ -28,6 +29,10 @@ class ClaudeClient:
             )
         self.client = anthropic.Anthropic(api_key=self.api_key)
 
+        # Concurrency budget shared by every thread using this client
+        self._request_slots = threading.BoundedSemaphore(Config.MAX_CONCURRENT_REQUESTS)
+        self._usage_lock = threading.Lock()
+
         # Track API usage
         self.total_input_tokens = 0
         self.total_output_tokens = 0
@@ -73,20 +78,22 @@ class ClaudeClient:
         last_error = None
         for attempt in range(max_retries):
             try:
-                response = self.client.messages.create(
-                    model=model,
-                    max_tokens=max_tokens,
-                    system=system_message,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
+                with self._request_slots:
+                    response = self.client.messages.create(
+                        model=model,
+                        max_tokens=max_tokens,
+                        system=system_message,
+                        messages=[
+                            {"role": "user", "content": prompt}
+                        ]
+                    )
 
                 # Track usage
-                self.api_calls += 1
-                if hasattr(response, 'usage'):
-                    self.total_input_tokens += response.usage.input_tokens
-                    self.total_output_tokens += response.usage.output_tokens
+                with self._usage_lock:
+                    self.api_calls += 1
+                    if hasattr(response, 'usage'):
+                        self.total_input_tokens += response.usage.input_tokens
+                        self.total_output_tokens += response.usage.output_tokens
 
                 # Extract content from response
                 content = ""
@@ -141,11 +148,13 @@ class ClaudeResponse:
 
 # Create a global client instance for convenience
 _global_client: Optional[ClaudeClient] = None
+_global_client_lock = threading.Lock()
 
 
 def get_claude_client() -> ClaudeClient:
-    """Get or create the global Claude client."""
+    """Get or create the global Claude client (shared by all threads)."""
     global _global_client
-    if _global_client is None:
-        _global_client = ClaudeClient()
+    with _global_client_lock:
+        if _global_client is None:
+            _global_client = ClaudeClient()
     return _global_client
@@ -24,6 +24,14 @@ class Config:
     OUTPUT_DIR: Path = Path(os.getenv("OUTPUT_DIR", PROJECT_ROOT / "outputs"))
     ASSETS_DIR: Path = PROJECT_ROOT / "assets"
     INPUT_DIR: Path = PROJECT_ROOT / "input"
+    # Delta runs (analyze-full --delta) - ingest state, linked data and metrics kept between exports
+    INGEST_STATE_PATH: Path = Path(os.getenv("INGEST_STATE_PATH", OUTPUT_DIR / "ingest_state.json"))
+    LINKED_STORE_PATH: Path = Path(os.getenv("LINKED_STORE_PATH", OUTPUT_DIR / "linked_store.db"))
+    METRICS_STATE_PATH: Path = Path(os.getenv("METRICS_STATE_PATH", OUTPUT_DIR / "metrics_state.json"))
+    # Optional JSON use case taxonomy ({"Category": ["keyword", ...]}); built-in rules if unset
+    USE_CASE_TAXONOMY_PATH: Optional[Path] = (
+        Path(os.environ["USE_CASE_TAXONOMY_PATH"]) if os.getenv("USE_CASE_TAXONOMY_PATH") else None
+    )
 
     # Logo
     LOGO_PATH: Optional[Path] = ASSETS_DIR / "truenas_logo.png"
@@ -35,6 +43,8 @@ class Config:
     # API settings
     MAX_TOKENS_HAIKU: int = 4096
     MAX_TOKENS_SONNET: int = 8192
+    # In-flight API calls shared by every pipeline of the process
+    MAX_CONCURRENT_REQUESTS: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "4"))
 
     # Analysis settings
     SONNET_SCORE_ALL_CASES: bool = True  # Score all cases with Sonnet, not just top N
@@ -44,6 +54,22 @@ class Config:
     TIMELINE_SCORE_THRESHOLD: int = 125  # Generate timeline for cases scoring >= this
     MAX_TIMELINE_CASES: int = 25  # Safety cap on timeline generation
 
+    # Context retrieval - per-case documentation passages instead of whole PDFs
+    CONTEXT_RETRIEVAL: bool = os.getenv("CONTEXT_RETRIEVAL", "true").lower() in ("1", "true", "yes")
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+    CONTEXT_TOP_K: int = int(os.getenv("CONTEXT_TOP_K", "8"))
+
+    # Portfolio mode - accounts analysed in parallel
+    PORTFOLIO_WORKERS: int = int(os.getenv("PORTFOLIO_WORKERS", "4"))
+
+    # JSON outputs - record files as "json" or "ndjson", compression "" / "none", "gzip" or "zstd"
+    OUTPUT_FORMAT: str = os.getenv("OUTPUT_FORMAT", "json").lower()
+    OUTPUT_COMPRESSION: str = os.getenv("OUTPUT_COMPRESSION", "").lower()
+    OUTPUT_WRITE_WORKERS: int = int(os.getenv("OUTPUT_WRITE_WORKERS", "4"))
+
+    # Dashboard - memory budget of the run artifacts cached for all sessions
+    DASHBOARD_CACHE_MB: int = int(os.getenv("DASHBOARD_CACHE_MB", "512"))
+
     # Slack (placeholder for future)
     SLACK_WEBHOOK_URL: Optional[str] = os.getenv("SLACK_WEBHOOK_URL")
     SLACK_CHANNEL: Optional[str] = os.getenv("SLACK_CHANNEL", "#customer-escalations")
@@ -57,6 +83,14 @@ class Config:
         if not cls.ANTHROPIC_API_KEY:
             errors.append("ANTHROPIC_API_KEY is not set. Add it to .env file.")
 
+        # Output settings are otherwise only checked once the outputs are written
+        from .json_output import OUTPUT_FORMATS, COMPRESSION_SUFFIXES
+
+        if cls.OUTPUT_FORMAT not in OUTPUT_FORMATS:
+            errors.append(f"OUTPUT_FORMAT must be one of {', '.join(OUTPUT_FORMATS)} (got {cls.OUTPUT_FORMAT!r}).")
+        if cls.OUTPUT_COMPRESSION not in COMPRESSION_SUFFIXES:
+            errors.append(f"OUTPUT_COMPRESSION must be none, gzip or zstd (got {cls.OUTPUT_COMPRESSION!r}).")
+
         return errors
 
     @classmethod
@@ -0,0 +1,213 @@
+"""
+JSON output files of analysis runs.
+
+Large record lists (support cases with full layer results, opportunities,
+evaluations, ...) are streamed to disk one record at a time instead of
+being built into one dict and dumped with indent=2. Record files are
+written as a JSON document (name.json) or as NDJSON (name.ndjson: a header
+line, then one record per line), optionally gzip or zstd compressed, and
+the files of a run are written in parallel:
+
+    with OutputWriter(json_dir) as writer:
+        writer.write("summary_statistics", summary)
+        writer.write_records("support_cases", {"total": n}, "support_cases", records)
+
+read_json_output(json_dir, "support_cases") returns the same dict whatever
+format and compression the file was written with.
+"""
+
+import gzip
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+from .config import Config
+
+
+OUTPUT_FORMATS = ("json", "ndjson")
+# Compression -> file suffix; "" and "none" both mean uncompressed
+COMPRESSION_SUFFIXES = {"": "", "none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# Header key of NDJSON files naming the record list
+NDJSON_RECORDS_KEY = "_records"
+
+# Compact encoding runs in the C encoder (indent forces the pure-Python one);
+# values are converted like json.dump(..., default=str)
+_ENCODER = json.JSONEncoder(default=str, separators=(",", ":"))
+
+
+def encode(obj: Any) -> bytes:
+    """Compact UTF-8 JSON of obj (non-serializable values as str)."""
+    return _ENCODER.encode(obj).encode("utf-8")
+
+
+def _open_write(path: Path, compression: str):
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise ImportError(f"zstandard is required to write {path.name}")
+        return zstandard.open(path, "wb")
+    return open(path, "wb")
+
+
+def _open_read(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        if not ZSTD_AVAILABLE:
+            raise ImportError(f"zstandard is required to read {path.name}")
+        return zstandard.open(path, "rb")
+    return open(path, "rb")
+
+
+def write_json(path: Path, obj: Any) -> Path:
+    """Write a (small) JSON document with indent=2, atomically via a temp file."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(obj, f, indent=2, default=str)
+    tmp_path.replace(path)
+    return path
+
+
+def write_json_records(
+    path: Path,
+    header: Dict[str, Any],
+    key: str,
+    records: Iterable[Any],
+    fmt: str = "json",
+    compression: str = "",
+) -> Path:
+    """
+    Stream {**header, key: [records]} to path, one record at a time.
+
+    fmt "json" writes a JSON document with one record per line; "ndjson"
+    writes the header (plus the record key) on the first line and one
+    record per following line. records may be a generator.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with _open_write(tmp_path, compression) as f:
+        if fmt == "ndjson":
+            f.write(encode({NDJSON_RECORDS_KEY: key, **header}) + b"\n")
+            for record in records:
+                f.write(encode(record) + b"\n")
+        else:
+            opening = encode(header)[:-1]
+            f.write(opening + (b"," if header else b"") + encode(key) + b":[")
+            separator = b"\n"
+            for record in records:
+                f.write(separator + encode(record))
+                separator = b",\n"
+            f.write(b"\n]}")
+    tmp_path.replace(path)
+    return path
+
+
+def find_json_output(json_dir: Path, name: str) -> Optional[Path]:
+    """Path of an output file in any supported format, or None."""
+    for extension in (".json", ".ndjson"):
+        for suffix in COMPRESSION_SUFFIXES.values():
+            path = Path(json_dir) / f"{name}{extension}{suffix}"
+            if path.exists():
+                return path
+    return None
+
+
+def read_json_output(json_dir: Path, name: str, default: Any = None) -> Any:
+    """
+    Read an output file written by OutputWriter (or a plain json.dump).
+
+    NDJSON files are reassembled into the same dict as the JSON format.
+    """
+    path = find_json_output(json_dir, name)
+    if path is None:
+        return default
+    return read_json_file(path)
+
+
+def read_json_file(path: Path) -> Any:
+    """Read one output file found by find_json_output() (any format)."""
+    path = Path(path)
+    with _open_read(path) as f:
+        if ".ndjson" not in path.suffixes:
+            return json.loads(f.read())
+        header = json.loads(f.readline())
+        key = header.pop(NDJSON_RECORDS_KEY)
+        header[key] = [json.loads(line) for line in f if line.strip()]
+        return header
+
+
+class OutputWriter:
+    """
+    Writes the JSON files of a run in parallel worker threads.
+
+    Small documents are plain indented JSON; record lists use the configured
+    format (Config.OUTPUT_FORMAT) and compression (Config.OUTPUT_COMPRESSION).
+    Leaving the with-block waits for all files and raises the first error.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        fmt: Optional[str] = None,
+        compression: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.directory = Path(directory)
+        self.fmt = fmt or Config.OUTPUT_FORMAT
+        self.compression = Config.OUTPUT_COMPRESSION if compression is None else compression
+        if self.fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format {self.fmt!r} (expected one of {OUTPUT_FORMATS})")
+        if self.compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"Unknown output compression {self.compression!r} (expected one of {tuple(COMPRESSION_SUFFIXES)})"
+            )
+        if self.compression == "zstd" and not ZSTD_AVAILABLE:
+            self.compression = "gzip"  # zstandard not installed
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or Config.OUTPUT_WRITE_WORKERS)
+        self._futures: List[Future] = []
+
+    def write(self, name: str, obj: Any) -> Path:
+        """Queue a JSON document; returns its path."""
+        path = self.directory / f"{name}.json"
+        self._futures.append(self._pool.submit(write_json, path, obj))
+        return path
+
+    def write_records(self, name: str, header: Dict[str, Any], key: str, records: Iterable[Any]) -> Path:
+        """Queue a streamed record file; returns its path."""
+        extension = ".ndjson" if self.fmt == "ndjson" else ".json"
+        path = self.directory / f"{name}{extension}{COMPRESSION_SUFFIXES[self.compression]}"
+        self._futures.append(self._pool.submit(
+            write_json_records, path, header, key, records, self.fmt, self.compression,
+        ))
+        return path
+
+    def wait(self) -> List[Path]:
+        """Wait for the queued files; returns their paths in queue order."""
+        try:
+            return [future.result() for future in self._futures]
+        finally:
+            self._futures = []
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self.close()
@@ -0,0 +1,366 @@
+"""
+Catalog of analysis runs under the output directory.
+
+The dashboard home page lists every run (single-source, portfolio account
+and full analysis). Instead of opening each run's summary JSON on every
+render, the pipelines record a run in a small SQLite index when it
+completes, and the dashboard reads one page of it with one query:
+
+    catalog = RunCatalog()                      # <OUTPUT_DIR>/run_catalog.db
+    catalog.record_runs([run_output_dir])       # at the end of a pipeline
+    runs = catalog.runs(account="ACME", limit=20, offset=0)
+
+repair() brings the catalog in line with the folders on disk: runs that
+were deleted are dropped, and runs that are new or whose summary changed
+(e.g. written before the catalog existed) are read and recorded.
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import Config
+from .json_output import find_json_output, read_json_output
+
+
+SCHEMA_VERSION = 1
+CATALOG_FILE = "run_catalog.db"
+
+SINGLE_RUN_PREFIX = "analysis_"
+PORTFOLIO_RUN_PREFIX = "portfolio_"
+FULL_RUN_PREFIX = "full_analysis_"
+
+# Summary file of each run type (its change time marks a changed run)
+SUMMARY_FILES = {"single": "summary_statistics", "full": "link_summary"}
+
+# Timestamp suffix of run folder names (analysis_20250101_093000)
+_TIMESTAMP = re.compile(r"(\d{8}_\d{6})$")
+
+COLUMNS = [
+    "folder", "run_folder", "run_timestamp", "name", "analysis_type", "account", "date",
+    "health_score", "total_cases", "total_orders", "fully_linked", "summary_mtime",
+]
+
+
+def run_type(folder: Path) -> str:
+    return "full" if folder.name.startswith(FULL_RUN_PREFIX) else "single"
+
+
+def summary_path(folder: Path) -> Optional[Path]:
+    """Summary file of a run folder, or None if the run is incomplete."""
+    return find_json_output(Path(folder) / "json", SUMMARY_FILES[run_type(Path(folder))])
+
+
+def read_run_entry(folder: Path, name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Listing entry of a run folder from its summary JSON (None if unreadable).
+
+    name defaults to the folder name; portfolio accounts use
+    "<portfolio folder>/<account folder>".
+    """
+    folder = Path(folder)
+    name = name or folder.name
+    json_dir = folder / "json"
+    try:
+        if run_type(folder) == "single":
+            data = read_json_output(json_dir, "summary_statistics")
+            if data is None:
+                return None
+            return {
+                "folder": folder,
+                "name": name,
+                "account": data.get("account_name", "Unknown"),
+                "date": data.get("analysis_date", "Unknown"),
+                "health_score": data.get("account_health_score", 0),
+                "total_cases": data.get("total_cases", 0),
+                "analysis_type": "single",
+            }
+
+        link_data = read_json_output(json_dir, "link_summary")
+        if link_data is None:
+            return None
+
+        # Try to get account name from account metrics
+        account_name = "Multi-Account"
+        acct_data = read_json_output(json_dir, "account_metrics")
+        if acct_data:
+            accounts = acct_data.get("accounts", {})
+            if accounts:
+                # Get first account name
+                if isinstance(accounts, dict):
+                    account_name = list(accounts.keys())[0]
+                elif isinstance(accounts, list) and accounts:
+                    first = accounts[0]
+                    # account_metrics.json lists account names; older runs list dicts
+                    if isinstance(first, dict):
+                        account_name = first.get("account_name", "Multi-Account")
+                    else:
+                        account_name = str(first)
+
+        # Extract timestamp from folder name
+        timestamp = folder.name.replace(FULL_RUN_PREFIX, "")
+        date_str = f"{timestamp[:4]}-{timestamp[4:6]}-{timestamp[6:8]}"
+
+        return {
+            "folder": folder,
+            "name": name,
+            "account": account_name,
+            "date": date_str,
+            "health_score": 0,  # Will show linked orders instead
+            "total_cases": link_data.get("total_cases", 0),
+            "total_orders": link_data.get("total_orders", 0),
+            "fully_linked": link_data.get("fully_linked_orders", 0),
+            "analysis_type": "full",
+        }
+    except Exception:
+        return None
+
+
+class RunCatalog:
+    """
+    SQLite index of the runs under an output directory.
+
+    Each call opens its own short-lived connection, so pipelines in other
+    processes or threads can record runs while the dashboard reads.
+    """
+
+    def __init__(self, output_dir: Optional[Path] = None, path: Optional[Path] = None):
+        self.output_dir = Path(output_dir) if output_dir else Config.OUTPUT_DIR
+        self.path = Path(path) if path else self.output_dir / CATALOG_FILE
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            _migrate(conn)
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _key(self, folder: Path) -> str:
+        """Catalog key of a run folder: its path relative to the output directory."""
+        folder = Path(folder).resolve()
+        try:
+            return folder.relative_to(self.output_dir.resolve()).as_posix()
+        except ValueError:
+            return folder.as_posix()
+
+    def _row(self, folder: Path) -> Optional[Tuple[Any, ...]]:
+        path = summary_path(folder)
+        key = self._key(folder)
+        entry = read_run_entry(folder, key) if path is not None else None
+        if entry is None:
+            return None
+        run_folder = key.split("/")[0]
+        match = _TIMESTAMP.search(run_folder)
+        return (
+            key,
+            run_folder,
+            match.group(1) if match else "",
+            entry["name"],
+            entry["analysis_type"],
+            str(entry["account"]),
+            str(entry["date"]),
+            entry.get("health_score", 0),
+            entry.get("total_cases", 0),
+            entry.get("total_orders", 0),
+            entry.get("fully_linked", 0),
+            path.stat().st_mtime_ns,
+        )
+
+    def record_runs(self, folders: Iterable[Path]) -> int:
+        """Record (or refresh) completed run folders; returns the number recorded."""
+        rows = [row for row in (self._row(folder) for folder in folders) if row is not None]
+        conn = self._connect()
+        try:
+            with conn:
+                _upsert(conn, rows)
+        finally:
+            conn.close()
+        return len(rows)
+
+    def repair(self) -> Dict[str, int]:
+        """
+        Bring the catalog in line with the run folders on disk.
+
+        Only folders whose summary file is new or changed are read.
+
+        Returns:
+            {"added": n, "updated": n, "removed": n}
+        """
+        on_disk = {self._key(folder): folder for folder in self.scan_folders()}
+        conn = self._connect()
+        try:
+            recorded = {
+                row["folder"]: row["summary_mtime"]
+                for row in conn.execute("SELECT folder, summary_mtime FROM runs")
+            }
+
+            stale = [key for key in recorded if key not in on_disk]
+            rows = []
+            for key, folder in on_disk.items():
+                path = summary_path(folder)
+                if path is None:
+                    if key in recorded:
+                        stale.append(key)
+                    continue
+                if recorded.get(key) == path.stat().st_mtime_ns:
+                    continue
+                row = self._row(folder)
+                if row is not None:
+                    rows.append(row)
+                elif key in recorded:
+                    stale.append(key)
+
+            with conn:
+                conn.executemany("DELETE FROM runs WHERE folder = ?", ((key,) for key in stale))
+                _upsert(conn, rows)
+        finally:
+            conn.close()
+
+        added = sum(1 for row in rows if row[0] not in recorded)
+        return {"added": added, "updated": len(rows) - added, "removed": len(stale)}
+
+    def scan_folders(self) -> List[Path]:
+        """Run folders under the output directory (portfolio accounts included)."""
+        if not self.output_dir.exists():
+            return []
+        folders = []
+        for folder in self.output_dir.iterdir():
+            if not folder.is_dir():
+                continue
+            if folder.name.startswith((SINGLE_RUN_PREFIX, FULL_RUN_PREFIX)):
+                folders.append(folder)
+            elif folder.name.startswith(PORTFOLIO_RUN_PREFIX):
+                folders.extend(f for f in folder.glob(f"{SINGLE_RUN_PREFIX}*") if f.is_dir())
+        return folders
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def runs(
+        self,
+        account: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        analysis_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Listing entries, newest run first (portfolio accounts by name).
+
+        Args:
+            account: Exact account name
+            date_from / date_to: Inclusive analysis date bounds ("YYYY-MM-DD")
+            analysis_type: "single" or "full"
+            limit / offset: Page of the listing
+        """
+        where, params = _filters(account, date_from, date_to, analysis_type)
+        sql = f"SELECT * FROM runs{where} ORDER BY run_timestamp DESC, run_folder DESC, name"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        conn = self._connect()
+        try:
+            return [self._entry(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def count(
+        self,
+        account: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        analysis_type: Optional[str] = None,
+    ) -> int:
+        """Number of runs matching the filters (for pagination)."""
+        where, params = _filters(account, date_from, date_to, analysis_type)
+        conn = self._connect()
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM runs{where}", params).fetchone()[0]
+        finally:
+            conn.close()
+
+    def accounts(self) -> List[str]:
+        """Distinct account names, sorted."""
+        conn = self._connect()
+        try:
+            return [row[0] for row in conn.execute("SELECT DISTINCT account FROM runs ORDER BY account")]
+        finally:
+            conn.close()
+
+    def _entry(self, row: sqlite3.Row) -> Dict[str, Any]:
+        entry = {
+            "folder": self.output_dir / row["folder"],
+            "name": row["name"],
+            "account": row["account"],
+            "date": row["date"],
+            "health_score": row["health_score"],
+            "total_cases": row["total_cases"],
+            "analysis_type": row["analysis_type"],
+        }
+        if row["analysis_type"] == "full":
+            entry["total_orders"] = row["total_orders"]
+            entry["fully_linked"] = row["fully_linked"]
+        return entry
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Create the schema of a new or outdated catalog (repair() fills it from the folders)."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another process may have created it while we waited for the lock
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS runs")
+            _create_schema(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE TABLE runs (folder TEXT PRIMARY KEY, run_folder TEXT, run_timestamp TEXT, name TEXT, analysis_type TEXT, "
+        "account TEXT, date TEXT, health_score REAL, total_cases INTEGER, total_orders INTEGER, "
+        "fully_linked INTEGER, summary_mtime INTEGER)"
+    )
+    conn.execute("CREATE INDEX idx_runs_order ON runs (run_timestamp DESC, run_folder DESC, name)")
+    conn.execute("CREATE INDEX idx_runs_account ON runs (account, date)")
+    conn.execute("CREATE INDEX idx_runs_date ON runs (date)")
+
+
+def _upsert(conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]) -> None:
+    conn.executemany(
+        f"INSERT OR REPLACE INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+        rows,
+    )
+
+
+def _filters(
+    account: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    analysis_type: Optional[str],
+) -> Tuple[str, List[Any]]:
+    clauses, params = [], []
+    if account:
+        clauses.append("account = ?")
+        params.append(account)
+    if date_from:
+        clauses.append("date >= ?")
+        params.append(str(date_from))
+    if date_to:
+        clauses.append("date <= ?")
+        params.append(str(date_to))
+    if analysis_type:
+        clauses.append("analysis_type = ?")
+        params.append(analysis_type)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
@@ -3,7 +3,6 @@ TrueNAS Enterprise Account Health Dashboard
 Main Streamlit application entry point with file upload capability.
 """
 
-import json
 import re
 import subprocess
 import sys
@@ -14,157 +13,58 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.core import Config
+from src.core import Config, RunCatalog
 from src.dashboard.branding import COLORS, get_health_color, get_health_status
+from src.dashboard.data_access import AnalysisData, artifact_cache
 from src.dashboard.styles import get_global_css
 
 
-def get_available_analyses():
-    """Get list of available analysis folders (both single and full analysis)."""
-    outputs_dir = Config.OUTPUT_DIR
-    if not outputs_dir.exists():
-        return []
+# Existing analyses listed per page on the home page
+RUNS_PER_PAGE = 10
 
-    analyses = []
-    for folder in sorted(outputs_dir.iterdir(), reverse=True):
-        if not folder.is_dir():
-            continue
-
-        # Handle traditional single-source analysis
-        if folder.name.startswith("analysis_"):
-            summary_file = folder / "json" / "summary_statistics.json"
-            if summary_file.exists():
-                try:
-                    with open(summary_file) as f:
-                        data = json.load(f)
-                    analyses.append({
-                        "folder": folder,
-                        "name": folder.name,
-                        "account": data.get("account_name", "Unknown"),
-                        "date": data.get("analysis_date", "Unknown"),
-                        "health_score": data.get("account_health_score", 0),
-                        "total_cases": data.get("total_cases", 0),
-                        "analysis_type": "single",
-                    })
-                except Exception:
-                    pass
-
-        # Handle full multi-source analysis
-        elif folder.name.startswith("full_analysis_"):
-            link_summary_file = folder / "json" / "link_summary.json"
-            account_metrics_file = folder / "json" / "account_metrics.json"
-            if link_summary_file.exists():
-                try:
-                    with open(link_summary_file) as f:
-                        link_data = json.load(f)
-
-                    # Try to get account name from account metrics
-                    account_name = "Multi-Account"
-                    if account_metrics_file.exists():
-                        with open(account_metrics_file) as f:
-                            acct_data = json.load(f)
-                            accounts = acct_data.get("accounts", {})
-                            if accounts:
-                                # Get first account name
-                                if isinstance(accounts, dict):
-                                    account_name = list(accounts.keys())[0]
-                                elif isinstance(accounts, list) and accounts:
-                                    account_name = accounts[0].get("account_name", "Multi-Account")
-
-                    # Extract timestamp from folder name
-                    timestamp = folder.name.replace("full_analysis_", "")
-                    date_str = f"{timestamp[:4]}-{timestamp[4:6]}-{timestamp[6:8]}"
-
-                    analyses.append({
-                        "folder": folder,
-                        "name": folder.name,
-                        "account": account_name,
-                        "date": date_str,
-                        "health_score": 0,  # Will show linked orders instead
-                        "total_cases": link_data.get("total_cases", 0),
-                        "total_orders": link_data.get("total_orders", 0),
-                        "fully_linked": link_data.get("fully_linked_orders", 0),
-                        "analysis_type": "full",
-                    })
-                except Exception:
-                    pass
-
-    return analyses
-
-
-def load_analysis_data(folder: Path):
-    """Load all analysis data from a folder (single or full analysis)."""
-    data = {}
-
-    # Determine analysis type
-    is_full = folder.name.startswith("full_analysis_")
-    data["analysis_type"] = "full" if is_full else "single"
 
-    json_dir = folder / "json"
+def get_run_catalog():
+    """
+    Run catalog of the output directory, or None if there are no outputs.
 
-    if is_full:
-        # Load full analysis data
-        files_to_load = {
-            "link_summary": "link_summary.json",
-            "opportunities": "opportunities.json",
-            "deployments": "deployments.json",
-            "support_cases": "support_cases.json",
-            "cross_layer_insights": "cross_layer_insights.json",
-            "product_metrics": "product_metrics.json",
-            "account_metrics": "account_metrics.json",
-            "usecase_metrics": "usecase_metrics.json",
-            "service_metrics": "service_metrics.json",
-        }
-
-        for key, filename in files_to_load.items():
-            filepath = json_dir / filename
-            if filepath.exists():
-                with open(filepath) as f:
-                    data[key] = json.load(f)
-
-        # Create a summary-like object for compatibility with existing pages
-        if "link_summary" in data:
-            ls = data["link_summary"]
-            data["summary"] = {
-                "total_cases": ls.get("total_cases", 0),
-                "total_orders": ls.get("total_orders", 0),
-                "fully_linked_orders": ls.get("fully_linked_orders", 0),
-                "total_opportunities": ls.get("total_opportunities", 0),
-                "total_deployments": ls.get("total_deployments", 0),
-            }
-            # Try to get account name
-            if "account_metrics" in data:
-                accounts = data["account_metrics"].get("accounts", {})
-                if isinstance(accounts, dict) and accounts:
-                    data["summary"]["account_name"] = list(accounts.keys())[0]
-                elif isinstance(accounts, list) and accounts:
-                    data["summary"]["account_name"] = accounts[0].get("account_name", "Multi-Account")
+    Pipelines record their runs in the catalog; it is repaired against the
+    output folders once per session (deleted runs, runs from before the
+    catalog).
+    """
+    if not Config.OUTPUT_DIR.exists():
+        return None
+    catalog = RunCatalog()
+    if not st.session_state.get("run_catalog_repaired"):
+        catalog.repair()
+        st.session_state["run_catalog_repaired"] = True
+    return catalog
 
-    else:
-        # Load traditional single-source analysis data
-        summary_file = json_dir / "summary_statistics.json"
-        if summary_file.exists():
-            with open(summary_file) as f:
-                data["summary"] = json.load(f)
 
-        cases_file = json_dir / "top_25_critical_cases.json"
-        if cases_file.exists():
-            with open(cases_file) as f:
-                data["cases"] = json.load(f)
+def get_available_analyses(account=None, date_from=None, date_to=None, page=0, page_size=RUNS_PER_PAGE):
+    """
+    Get one page of available analyses (both single and full analysis) from
+    the run catalog, plus the number of matching analyses.
+    """
+    catalog = get_run_catalog()
+    if catalog is None:
+        return [], 0
+
+    total = catalog.count(account=account, date_from=date_from, date_to=date_to)
+    analyses = catalog.runs(
+        account=account, date_from=date_from, date_to=date_to,
+        limit=page_size, offset=page * page_size,
+    )
+    return analyses, total
 
-        all_cases_file = json_dir / "all_cases.json"
-        if all_cases_file.exists():
-            with open(all_cases_file) as f:
-                data["all_cases"] = json.load(f)
 
-    # Get chart paths (both types may have charts)
-    charts_dir = folder / "charts"
-    if charts_dir.exists():
-        data["charts"] = {
-            f.stem: str(f) for f in charts_dir.glob("*.png")
-        }
+def load_analysis_data(folder: Path):
+    """
+    Data of an analysis folder (single or full analysis).
 
-    return data
+    Artifacts are loaded when a page first reads them and are shared by
+    all sessions (see data_access).
+    """
+    return AnalysisData(folder)
 
 
 def save_uploaded_file(uploaded_file) -> Path:
@@ -475,7 +375,32 @@ else:
         </h2>
         """, unsafe_allow_html=True)
 
-        analyses = get_available_analyses()
+        # Filters and pagination over the run catalog
+        col_account, col_since, col_refresh = st.columns([2, 2, 1])
+        with col_account:
+            catalog = get_run_catalog()
+            account_options = ["All accounts"] + (catalog.accounts() if catalog else [])
+            account_filter = st.selectbox("Account", account_options, label_visibility="collapsed")
+        with col_since:
+            since = st.date_input("Since", value=None, label_visibility="collapsed", format="YYYY-MM-DD")
+        with col_refresh:
+            if st.button("Refresh", use_container_width=True, help="Re-scan the output folders"):
+                st.session_state["run_catalog_repaired"] = False
+                st.rerun()
+
+        page = st.session_state.get("runs_page", 0)
+        analyses, total = get_available_analyses(
+            account=None if account_filter == "All accounts" else account_filter,
+            date_from=since.isoformat() if since else None,
+            page=page,
+        )
+        if not analyses and page > 0:
+            # Filters changed under the current page
+            st.session_state["runs_page"] = page = 0
+            analyses, total = get_available_analyses(
+                account=None if account_filter == "All accounts" else account_filter,
+                date_from=since.isoformat() if since else None,
+            )
 
         if not analyses:
             st.markdown(f"""
@@ -488,4 +413,29 @@ else:
         else:
             # Create a scrollable container for analysis cards
             for idx, analysis in enumerate(analyses):
-                render_analysis_card(analysis, idx)
+                render_analysis_card(analysis, page * RUNS_PER_PAGE + idx)
+
+            pages = (total + RUNS_PER_PAGE - 1) // RUNS_PER_PAGE
+            if pages > 1:
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    if st.button("Previous", disabled=page == 0, use_container_width=True):
+                        st.session_state["runs_page"] = page - 1
+                        st.rerun()
+                with col_page:
+                    st.markdown(f"""
+                    <div style="color: {COLORS['text_muted']}; text-align: center; padding-top: 0.5rem;">
+                        Page {page + 1} of {pages} &bull; {total} analyses
+                    </div>
+                    """, unsafe_allow_html=True)
+                with col_next:
+                    if st.button("Next", disabled=page >= pages - 1, use_container_width=True):
+                        st.session_state["runs_page"] = page + 1
+                        st.rerun()
+
+        # Memory held by the run data shared across sessions
+        cache_stats = artifact_cache().stats()
+        st.caption(
+            f"Shared data cache: {cache_stats['bytes'] / 2**20:.0f} of {cache_stats['max_bytes'] / 2**20:.0f} MB "
+            f"({cache_stats['entries']} artifacts, {cache_stats['hits']} hits, {cache_stats['misses']} loads)"
+        )
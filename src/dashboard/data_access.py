@@ -0,0 +1,311 @@
+"""
+Data access layer of the dashboard.
+
+Selecting a run used to read every artifact of it (nine JSON files and
+two CSV tables for a full analysis) into st.session_state, separately
+for each browser session. AnalysisData is instead a read-only mapping
+bound to the run folder. Pages read it as before, e.g.
+data.get("opportunities", {}), and an artifact is loaded the first time
+a page asks for it.
+
+Loaded artifacts are kept in one ArtifactCache per process, shared by all
+sessions. Entries are keyed by file path and reloaded when the file's
+mtime or size changes. The cache estimates the memory held by each entry
+and evicts the least recently used ones beyond Config.DASHBOARD_CACHE_MB.
+Cached objects are shared, so pages must not modify them in place.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.analysis.result_tables import TABLES_DIR, find_result_table, load_result_table
+from src.core import Config
+from src.core.json_output import find_json_output, read_json_file
+from src.core.run_catalog import FULL_RUN_PREFIX
+
+
+# Data keys of each run type: key -> JSON output name
+FULL_JSON_ARTIFACTS = {
+    "link_summary": "link_summary",
+    "opportunities": "opportunities",
+    "deployments": "deployments",
+    "support_cases": "support_cases",
+    "cross_layer_insights": "cross_layer_insights",
+    "product_metrics": "product_metrics",
+    "account_metrics": "account_metrics",
+    "usecase_metrics": "usecase_metrics",
+    "service_metrics": "service_metrics",
+}
+SINGLE_JSON_ARTIFACTS = {
+    "summary": "summary_statistics",
+    "cases": "top_25_critical_cases",
+    "all_cases": "all_cases",
+}
+
+
+def _load_fact_table(path: Path) -> pd.DataFrame:
+    from src.analysis.metrics.fact_table import load_fact_table
+    return load_fact_table(path)
+
+
+def _load_metrics_cube(path: Path) -> pd.DataFrame:
+    from src.analysis.metrics.cube import load_metrics_cube
+    return load_metrics_cube(path)
+
+
+def _load_score_features(path: Path) -> pd.DataFrame:
+    from src.analysis.rescoring import load_score_features
+    return load_score_features(path)
+
+
+# Data keys read from CSV files in the run folder: key -> (file name, loader).
+# Keys saved as result tables are read from <run>/tables/ instead when the
+# run has the table; the CSV is the copy written by earlier runs.
+FULL_CSV_ARTIFACTS = {
+    "metrics_facts": ("metrics_facts.csv", _load_fact_table),
+    "metrics_cube": ("metrics_cube.csv", _load_metrics_cube),
+}
+SINGLE_CSV_ARTIFACTS = {
+    "score_features": ("score_features.csv", _load_score_features),
+}
+
+
+# Locks serializing artifact loads (keys are spread over them by hash)
+LOAD_LOCK_STRIPES = 64
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate memory held by a loaded artifact, in bytes."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+
+    # JSON documents: containers, strings and numbers
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return total
+
+
+class ArtifactCache:
+    """
+    Loaded run artifacts shared by all dashboard sessions.
+
+    Each entry is validated against the file's (mtime, size) on access.
+    Concurrent requests for the same file load it once (loads are
+    serialized per key through a fixed set of striped locks). Artifacts
+    larger than the whole budget are returned without being cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Any], Tuple[Tuple[int, int], Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = [threading.Lock() for _ in range(LOAD_LOCK_STRIPES)]
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Tuple[str, Any], version: Tuple[int, int]) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def get(self, path: Path, loader: Callable[[Path], Any], variant: Any = None) -> Any:
+        """
+        Cached loader(path), reloaded when the file changes.
+
+        variant distinguishes several artifacts read from the same file
+        (e.g. column selections of a table).
+        """
+        stat = Path(path).stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (str(path), variant)
+
+        with self._lock:
+            found, value = self._lookup(key, version)
+            if found:
+                return value
+
+        with self._loading[hash(key) % LOAD_LOCK_STRIPES]:
+            with self._lock:
+                # Loaded by another session while this one waited
+                found, value = self._lookup(key, version)
+                if found:
+                    return value
+
+            value = loader(Path(path))
+            size = estimate_size(value)
+
+            with self._lock:
+                self.misses += 1
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self.bytes -= old[2]
+                if size <= self.max_bytes:
+                    self._entries[key] = (version, value, size)
+                    self.bytes += size
+                while self.bytes > self.max_bytes and self._entries:
+                    _, (_, _, evicted) = self._entries.popitem(last=False)
+                    self.bytes -= evicted
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Entries, bytes held, budget and hit / miss / eviction counts."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_cache: Optional[ArtifactCache] = None
+_cache_lock = threading.Lock()
+
+
+def artifact_cache() -> ArtifactCache:
+    """The process-wide artifact cache (created on first use)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ArtifactCache(Config.DASHBOARD_CACHE_MB * 1024 * 1024)
+        return _cache
+
+
+class AnalysisData(Mapping):
+    """
+    Lazily loaded data of one analysis run (single or full analysis).
+
+    Keys are the ones load_analysis_data() produced: analysis_type, charts,
+    summary, the JSON outputs and the CSV tables of the run type. Only
+    requested keys are read; "in" and iteration just check which files
+    exist.
+    """
+
+    def __init__(self, folder: Path, cache: Optional[ArtifactCache] = None):
+        self.folder = Path(folder)
+        self.cache = cache or artifact_cache()
+        self.is_full = self.folder.name.startswith(FULL_RUN_PREFIX)
+        self.analysis_type = "full" if self.is_full else "single"
+        self._json = FULL_JSON_ARTIFACTS if self.is_full else SINGLE_JSON_ARTIFACTS
+        self._csv = FULL_CSV_ARTIFACTS if self.is_full else SINGLE_CSV_ARTIFACTS
+        self._paths: Dict[str, Path] = {}
+
+    def _path(self, key: str) -> Optional[Path]:
+        """File of an artifact key (resolved once while it exists)."""
+        path = self._paths.get(key)
+        if path is not None and path.exists():
+            return path
+        if key in self._json:
+            path = find_json_output(self.folder / "json", self._json[key])
+        else:
+            path = find_result_table(self.folder, key) or self.folder / self._csv[key][0]
+            path = path if path.exists() else None
+        if path is not None:
+            self._paths[key] = path
+        return path
+
+    def _load(self, key: str) -> Any:
+        path = self._path(key)
+        if path is None:
+            raise KeyError(key)
+        if key in self._json:
+            loader = read_json_file
+        elif path.parent.name == TABLES_DIR:
+            loader = lambda _: load_result_table(self.folder, key)
+        else:
+            loader = self._csv[key][1]
+        return self.cache.get(path, loader)
+
+    def _full_summary(self) -> Dict[str, Any]:
+        """Summary-like dict of a full analysis (for compatibility with the single-run pages)."""
+        ls = self._load("link_summary")
+        summary = {
+            "total_cases": ls.get("total_cases", 0),
+            "total_orders": ls.get("total_orders", 0),
+            "fully_linked_orders": ls.get("fully_linked_orders", 0),
+            "total_opportunities": ls.get("total_opportunities", 0),
+            "total_deployments": ls.get("total_deployments", 0),
+        }
+        # Try to get account name
+        if self._path("account_metrics") is not None:
+            accounts = self._load("account_metrics").get("accounts", {})
+            if isinstance(accounts, dict) and accounts:
+                summary["account_name"] = list(accounts.keys())[0]
+            elif isinstance(accounts, list) and accounts:
+                first = accounts[0]
+                summary["account_name"] = (
+                    first.get("account_name", "Multi-Account") if isinstance(first, dict) else str(first)
+                )
+        return summary
+
+    def _charts(self) -> Dict[str, str]:
+        return {f.stem: str(f) for f in (self.folder / "charts").glob("*.png")}
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "analysis_type":
+            return self.analysis_type
+        if key == "charts" and (self.folder / "charts").exists():
+            return self._charts()
+        if key == "summary" and self.is_full and self._path("link_summary") is not None:
+            return self._full_summary()
+        if key in self._json or key in self._csv:
+            return self._load(key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys()
+
+    def _keys(self) -> List[str]:
+        keys = ["analysis_type"]
+        keys.extend(key for key in (*self._json, *self._csv) if self._path(key) is not None)
+        if self.is_full and "link_summary" in keys:
+            keys.append("summary")
+        if (self.folder / "charts").exists():
+            keys.append("charts")
+        return keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def table(self, name: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """A result table of the run (see result_tables), or None if the run has none."""
+        path = find_result_table(self.folder, name)
+        if path is None:
+            return None
+        return self.cache.get(
+            path,
+            lambda _: load_result_table(self.folder, name, columns=columns),
+            variant=tuple(columns) if columns else None,
+        )
@@ -16,6 +16,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.dashboard.branding import COLORS, get_logo_html, get_health_color
 from src.dashboard.styles import get_global_css
+from src.dashboard.pivot import render_cube_pivot
 
 # Page config
 st.set_page_config(
@@ -356,3 +357,14 @@ with col2:
             legend={'font': {'color': COLORS['text']}}
         )
         st.plotly_chart(fig_risk, use_container_width=True)
+
+st.markdown("---")
+
+# Arbitrary cuts of the selected account from the pre-aggregated cube
+render_cube_pivot(
+    data,
+    key="account_pivot",
+    rows=["product_series"],
+    column="fiscal_period",
+    filters={"account_name": selected_account_name} if selected_account_name else None,
+)
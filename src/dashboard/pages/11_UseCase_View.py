@@ -16,6 +16,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.dashboard.branding import COLORS, get_logo_html
 from src.dashboard.styles import get_global_css
+from src.dashboard.pivot import render_cube_pivot
 
 # Page config
 st.set_page_config(
@@ -356,3 +357,14 @@ with col2:
             yaxis={'title': 'Cases per Deploy', 'color': COLORS['text_muted']},
         )
         st.plotly_chart(fig_intensity, use_container_width=True)
+
+st.markdown("---")
+
+# Arbitrary cuts from the pre-aggregated cube
+render_cube_pivot(
+    data,
+    key="usecase_pivot",
+    rows=["use_case"],
+    column="support_level",
+    measure="deployment_success_rate",
+)
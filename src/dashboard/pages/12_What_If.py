@@ -0,0 +1,182 @@
+"""
+What-If Page - Rescore the loaded analysis with alternate criticality weights
+"""
+
+import streamlit as st
+import plotly.graph_objects as go
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.analysis.scoring import ScoreWeights
+from src.analysis.rescoring import rescore, sensitivity_sweep
+from src.dashboard.branding import COLORS, get_logo_html
+from src.dashboard.styles import get_global_css
+
+# Apply global styling
+st.markdown(get_global_css(), unsafe_allow_html=True)
+
+# Get data from session state
+data = st.session_state.get("analysis_data", {})
+summary = data.get("summary", {})
+features = data.get("score_features")
+
+if not summary:
+    st.warning("No analysis data loaded. Please select an analysis from the sidebar.")
+    st.stop()
+
+if features is None or "claude_statistics" not in summary:
+    st.info("This analysis has no saved scoring inputs. Re-run the analysis to enable what-if scoring.")
+    st.stop()
+
+claude_statistics = summary["claude_statistics"]
+
+# Branded header
+account_name = summary.get("account_name", "Unknown")
+
+logo_html = get_logo_html(height=50)
+st.markdown(f"""
+<div style="background: linear-gradient(135deg, #161b22 0%, #0d1117 100%);
+            padding: 1.5rem; border-radius: 12px; margin-bottom: 1.5rem;
+            border: 1px solid #30363d; border-left: 4px solid #0095D5;">
+    <div style="display: flex; align-items: center; gap: 1.5rem;">
+        <div>{logo_html}</div>
+        <div style="border-left: 2px solid #30363d; padding-left: 1.5rem;">
+            <h1 style="color: {COLORS['primary']}; margin: 0; font-size: 1.8rem; font-weight: 600;">What-If Scoring</h1>
+            <p style="color: #8b949e; margin: 5px 0 0 0; font-size: 1.1rem;">{account_name} | Criticality weight tuning</p>
+        </div>
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+defaults = ScoreWeights()
+
+# (label, table attribute, table keys, default attribute)
+TABLES = [
+    ("Severity", "severity", ["S1", "S2", "S3"], "severity_default"),
+    ("Issue Class", "issue_class", ["Systemic", "Environmental", "Component", "Procedural"], "issue_class_default"),
+    ("Resolution Outlook", "resolution_outlook", ["Challenging", "Manageable", "Straightforward"], "resolution_outlook_default"),
+    ("Support Level", "support_level", ["Gold", "Silver"], "support_level_default"),
+]
+
+# Weight controls
+profile = {}
+columns = st.columns(len(TABLES) + 1)
+for column, (label, table, keys, default_name) in zip(columns, TABLES):
+    with column:
+        st.markdown(f"**{label}**")
+        values = {
+            key: st.number_input(key, value=float(getattr(defaults, table)[key]), step=1.0, key=f"whatif_{table}_{key}")
+            for key in keys
+        }
+        profile[table] = values
+        profile[default_name] = st.number_input(
+            "Other", value=float(getattr(defaults, default_name)), step=1.0, key=f"whatif_{default_name}",
+        )
+with columns[-1]:
+    st.markdown("**Thresholds**")
+    profile["critical_threshold"] = st.number_input(
+        "Critical", value=float(defaults.critical_threshold), step=5.0, key="whatif_critical",
+    )
+    profile["catastrophic_threshold"] = st.number_input(
+        "Catastrophic", value=float(defaults.catastrophic_threshold), step=5.0, key="whatif_catastrophic",
+    )
+
+weights = ScoreWeights.from_dict(profile)
+baseline = rescore(features, claude_statistics)
+what_if = rescore(features, claude_statistics, weights)
+
+# Headline deltas
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric(
+        "Account Health", f"{what_if['health_score']:.1f}",
+        delta=f"{what_if['health_score'] - baseline['health_score']:+.1f}",
+    )
+with col2:
+    st.metric(
+        "Critical Cases", what_if["critical_cases"],
+        delta=what_if["critical_cases"] - baseline["critical_cases"], delta_color="inverse",
+    )
+with col3:
+    st.metric(
+        "Catastrophic Cases", what_if["catastrophic_cases"],
+        delta=what_if["catastrophic_cases"] - baseline["catastrophic_cases"], delta_color="inverse",
+    )
+
+# Re-ranked cases
+st.markdown(f"<h2 style='color: {COLORS['white']}; border-bottom: 2px solid {COLORS['primary']}; padding-bottom: 0.5rem;'>Re-ranked Cases</h2>", unsafe_allow_html=True)
+
+baseline_cases = baseline["cases"][["case_number", "criticality_score"]].assign(
+    baseline_rank=np.arange(1, len(baseline["cases"]) + 1)
+).rename(columns={"criticality_score": "baseline_score"})
+ranked = what_if["cases"][["case_number", "criticality_score"]].assign(
+    rank=np.arange(1, len(what_if["cases"]) + 1)
+).merge(baseline_cases, on="case_number", how="left")
+ranked["rank_change"] = ranked["baseline_rank"] - ranked["rank"]
+ranked["score_change"] = (ranked["criticality_score"] - ranked["baseline_score"]).round(1)
+
+st.dataframe(
+    ranked.head(25)[["rank", "case_number", "criticality_score", "baseline_score", "score_change", "rank_change"]],
+    use_container_width=True,
+    hide_index=True,
+)
+
+# Sensitivity sweep over one weight
+st.markdown(f"<h2 style='color: {COLORS['white']}; border-bottom: 2px solid {COLORS['primary']}; padding-bottom: 0.5rem;'>Sensitivity</h2>", unsafe_allow_html=True)
+
+SWEEPABLE = {
+    "S1 points": ("severity", "S1"),
+    "S2 points": ("severity", "S2"),
+    "Systemic points": ("issue_class", "Systemic"),
+    "Challenging points": ("resolution_outlook", "Challenging"),
+    "Gold points": ("support_level", "Gold"),
+    "Critical threshold": ("critical_threshold", None),
+    "Catastrophic threshold": ("catastrophic_threshold", None),
+}
+
+col1, col2 = st.columns([1, 2])
+with col1:
+    swept = st.selectbox("Weight", list(SWEEPABLE), key="whatif_sweep_weight")
+    name, key = SWEEPABLE[swept]
+    current = profile[name][key] if key else profile[name]
+    low, high = st.slider(
+        "Range", 0.0, max(2 * current, 10.0), (max(0.0, current / 2), current * 1.5 or 10.0),
+        key="whatif_sweep_range",
+    )
+
+profiles = {}
+for value in np.linspace(low, high, 11):
+    variant = dict(profile)
+    if key:
+        variant[name] = {**profile[name], key: float(value)}
+    else:
+        variant[name] = float(value)
+    profiles[round(float(value), 1)] = ScoreWeights.from_dict(variant)
+sweep = sensitivity_sweep(features, claude_statistics, profiles)
+
+with col2:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=sweep["profile"], y=sweep["health_score"], name="Health Score",
+        mode="lines+markers", line={'color': COLORS['primary']},
+    ))
+    fig.add_trace(go.Scatter(
+        x=sweep["profile"], y=sweep["critical_cases"], name="Critical Cases",
+        mode="lines+markers", line={'color': COLORS['critical']}, yaxis="y2",
+    ))
+    fig.update_layout(
+        height=350,
+        paper_bgcolor=COLORS['background'],
+        plot_bgcolor=COLORS['background'],
+        font={'color': COLORS['text']},
+        xaxis={'title': swept, 'color': COLORS['text_muted']},
+        yaxis={'title': 'Health Score', 'color': COLORS['text_muted']},
+        yaxis2={'title': 'Critical Cases', 'overlaying': 'y', 'side': 'right', 'color': COLORS['text_muted']},
+        legend={'font': {'color': COLORS['text']}},
+    )
+    st.plotly_chart(fig, use_container_width=True)
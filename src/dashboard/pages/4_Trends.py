@@ -48,20 +48,34 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
-# Prepare data for charts
-df_cases = pd.DataFrame([
-    {
-        "case_number": c.get("case_number"),
-        "created_date": pd.to_datetime(c.get("created_date")),
-        "severity": c.get("severity"),
-        "frustration": (c.get("claude_analysis") or {}).get("frustration_score", 0),
-        "criticality": c.get("criticality_score", 0),
-        "issue_class": (c.get("claude_analysis") or {}).get("issue_class", "Unknown"),
-        "status": c.get("status"),
-        "support_level": c.get("support_level"),
-    }
-    for c in cases
-])
+# Prepare data for charts (typed cases table of the run; JSON walk for older runs)
+df_cases = data.table(
+    "cases",
+    columns=["case_number", "created_date", "severity", "frustration_score", "criticality_score",
+             "issue_class", "status", "support_level"],
+)
+
+if df_cases is not None:
+    # Same criticality order as the top cases JSON
+    df_cases = df_cases.head(len(cases)).rename(columns={
+        "frustration_score": "frustration", "criticality_score": "criticality",
+    })
+    df_cases["frustration"] = df_cases["frustration"].fillna(0)
+    df_cases["issue_class"] = df_cases["issue_class"].replace("", "Unknown")
+else:
+    df_cases = pd.DataFrame([
+        {
+            "case_number": c.get("case_number"),
+            "created_date": pd.to_datetime(c.get("created_date")),
+            "severity": c.get("severity"),
+            "frustration": (c.get("claude_analysis") or {}).get("frustration_score", 0),
+            "criticality": c.get("criticality_score", 0),
+            "issue_class": (c.get("claude_analysis") or {}).get("issue_class", "Unknown"),
+            "status": c.get("status"),
+            "support_level": c.get("support_level"),
+        }
+        for c in cases
+    ])
 
 # Top Critical Cases Chart
 st.markdown(f"<h2 style='color: {COLORS['white']}; border-bottom: 2px solid {COLORS['primary']}; padding-bottom: 0.5rem;'>Top Critical Cases</h2>", unsafe_allow_html=True)
@@ -152,22 +152,41 @@ st.markdown(f"""
 </h2>
 """, unsafe_allow_html=True)
 
-# Build table data
-table_data = []
-for opp in opps_list:
-    analysis = opp.get("analysis", {})
-    table_data.append({
-        "Order #": opp.get("order_number", "N/A"),
-        "Account": opp.get("account_name", "N/A"),
-        "Opportunity": opp.get("opportunity_name", "N/A")[:40] + "..." if len(opp.get("opportunity_name", "")) > 40 else opp.get("opportunity_name", "N/A"),
-        "Amount": f"${opp.get('amount', 0):,.0f}",
-        "Product": opp.get("primary_product", "N/A"),
-        "Use Case": analysis.get("use_case_category", "Unknown") if analysis else "Not Analyzed",
-        "Clarity Score": f"{analysis.get('opportunity_score', 0)}/100" if analysis else "N/A",
-    })
+# Build table data (typed opportunities table of the run; JSON walk for older runs)
+opps_table = data.table(
+    "opportunities",
+    columns=["order_number", "account_name", "opportunity_name", "amount", "primary_product",
+             "analyzed", "use_case_category", "opportunity_score"],
+)
 
-if table_data:
+if opps_table is not None:
+    names = opps_table["opportunity_name"]
+    analyzed = opps_table["analyzed"].fillna(False).astype(bool)
+    df = pd.DataFrame({
+        "Order #": opps_table["order_number"],
+        "Account": opps_table["account_name"],
+        "Opportunity": names.where(names.str.len() <= 40, names.str[:40] + "..."),
+        "Amount": opps_table["amount"].fillna(0).map("${:,.0f}".format),
+        "Product": opps_table["primary_product"],
+        "Use Case": opps_table["use_case_category"].where(analyzed, "Not Analyzed"),
+        "Clarity Score": opps_table["opportunity_score"].fillna(0).astype(int).astype(str).add("/100").where(analyzed, "N/A"),
+    })
+else:
+    table_data = []
+    for opp in opps_list:
+        analysis = opp.get("analysis", {})
+        table_data.append({
+            "Order #": opp.get("order_number", "N/A"),
+            "Account": opp.get("account_name", "N/A"),
+            "Opportunity": opp.get("opportunity_name", "N/A")[:40] + "..." if len(opp.get("opportunity_name", "")) > 40 else opp.get("opportunity_name", "N/A"),
+            "Amount": f"${opp.get('amount', 0):,.0f}",
+            "Product": opp.get("primary_product", "N/A"),
+            "Use Case": analysis.get("use_case_category", "Unknown") if analysis else "Not Analyzed",
+            "Clarity Score": f"{analysis.get('opportunity_score', 0)}/100" if analysis else "N/A",
+        })
     df = pd.DataFrame(table_data)
+
+if not df.empty:
     st.dataframe(
         df,
         use_container_width=True,
@@ -0,0 +1,135 @@
+"""
+Cube pivot section shared by the Product, Account and Use Case views.
+
+Answers arbitrary product x use case x fiscal period x support level x
+account cuts from the pre-aggregated metrics cube (tables/metrics_cube)
+instead of re-running the pipeline.
+"""
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from src.analysis.metrics.cube import (
+    ADDITIVE_MEASURES,
+    CUBE_DIMENSIONS,
+    DERIVED_MEASURES,
+    dimension_values,
+    query_cube,
+)
+from src.dashboard.branding import COLORS
+
+
+def _label(name: str) -> str:
+    return name.replace("_", " ").title()
+
+
+def render_cube_pivot(
+    data: dict,
+    key: str,
+    rows: List[str],
+    column: Optional[str] = None,
+    measure: str = "support_cases",
+    filters: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Render a pivot table and chart over the metrics cube.
+
+    Args:
+        data: Dashboard analysis data (uses data["metrics_cube"])
+        key: Widget key prefix, unique per page
+        rows: Default row dimensions
+        column: Default column dimension (None = no column split)
+        measure: Default measure
+        filters: Fixed dimension filters (e.g. the selected account)
+    """
+    cube: Optional[pd.DataFrame] = data.get("metrics_cube")
+    if cube is None or cube.empty:
+        st.info("No metrics cube in this analysis. Re-run the full analysis to enable pivots.")
+        return
+
+    st.markdown(f"""
+    <h2 style="color: {COLORS['white']}; border-bottom: 2px solid {COLORS['primary']}; padding-bottom: 0.5rem;">
+        Pivot
+    </h2>
+    """, unsafe_allow_html=True)
+
+    fixed = filters or {}
+    free_dimensions = [dim for dim in CUBE_DIMENSIONS if dim not in fixed]
+    measures = list(DERIVED_MEASURES) + ADDITIVE_MEASURES
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        selected_rows = st.multiselect(
+            "Rows", free_dimensions,
+            default=[dim for dim in rows if dim in free_dimensions],
+            format_func=_label, key=f"{key}_rows",
+        )
+    with col2:
+        column_options = ["(none)"] + [dim for dim in free_dimensions if dim not in selected_rows]
+        selected_column = st.selectbox(
+            "Columns", column_options,
+            index=column_options.index(column) if column in column_options else 0,
+            format_func=lambda name: name if name == "(none)" else _label(name),
+            key=f"{key}_column",
+        )
+    with col3:
+        selected_measure = st.selectbox(
+            "Measure", measures,
+            index=measures.index(measure) if measure in measures else 0,
+            format_func=_label, key=f"{key}_measure",
+        )
+
+    query_filters = dict(fixed)
+    with st.expander("Filters"):
+        filter_columns = st.columns(len(free_dimensions))
+        for dim, filter_column in zip(free_dimensions, filter_columns):
+            with filter_column:
+                chosen = st.multiselect(_label(dim), dimension_values(cube, dim), key=f"{key}_filter_{dim}")
+            if chosen:
+                query_filters[dim] = chosen
+
+    by = list(selected_rows)
+    if selected_column != "(none)":
+        by.append(selected_column)
+    result = query_cube(cube, by=by, filters=query_filters)
+
+    if result.empty or not selected_rows:
+        st.dataframe(result[by + [selected_measure]], use_container_width=True, hide_index=True)
+        return
+
+    if selected_column != "(none)":
+        table = result.pivot_table(
+            index=selected_rows, columns=selected_column, values=selected_measure, fill_value=0,
+        )
+    else:
+        table = result.set_index(selected_rows)[[selected_measure]]
+    st.dataframe(table, use_container_width=True)
+
+    # Chart the first row dimension, grouped by the column dimension if any
+    chart = query_cube(
+        cube,
+        by=[selected_rows[0]] + ([selected_column] if selected_column != "(none)" else []),
+        filters=query_filters,
+    )
+    fig = go.Figure()
+    if selected_column != "(none)":
+        for value, group in chart.groupby(selected_column):
+            fig.add_trace(go.Bar(x=group[selected_rows[0]], y=group[selected_measure], name=str(value)))
+    else:
+        fig.add_trace(go.Bar(
+            x=chart[selected_rows[0]], y=chart[selected_measure], marker_color=COLORS['primary'],
+        ))
+    fig.update_layout(
+        barmode="group",
+        height=350,
+        paper_bgcolor=COLORS['background'],
+        plot_bgcolor=COLORS['background'],
+        font={'color': COLORS['text']},
+        xaxis={'title': _label(selected_rows[0]), 'color': COLORS['text_muted']},
+        yaxis={'title': _label(selected_measure), 'color': COLORS['text_muted']},
+        legend={'font': {'color': COLORS['text']}},
+    )
+    st.plotly_chart(fig, use_container_width=True)
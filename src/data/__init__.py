@@ -5,6 +5,9 @@ This package handles:
 - Loading data from Excel exports (Opportunities, Deployments, Support Cases)
 - Data models (dataclasses) for each entity type
 - Linking data across sources via Order Number
+- Delta ingestion of weekly exports against a persisted watermark
+- Entity resolution (account aliases, near-miss order numbers, orphans)
+- SQLite persistence and slice queries over linked data
 """
 
 from .models import (
@@ -16,11 +19,16 @@ from .models import (
     Severity,
     SupportLevel,
     ProductSeries,
+    MessageArena,
+    MESSAGE_ARENA,
 )
 from .opportunity_loader import load_opportunities
 from .deployment_loader import load_deployments
 from .case_loader import load_support_cases
 from .data_linker import link_data_sources, LinkedDataStore, load_and_link_all_sources
+from .ingest_store import IngestStore, IngestDelta, ingest_exports, commit_deltas
+from .entity_resolution import resolve_entities, ResolutionReport, normalize_account_name
+from .sqlite_store import LinkedDataDB
 
 __all__ = [
     # Models
@@ -32,6 +40,8 @@ __all__ = [
     "Severity",
     "SupportLevel",
     "ProductSeries",
+    "MessageArena",
+    "MESSAGE_ARENA",
     # Loaders
     "load_opportunities",
     "load_deployments",
@@ -40,4 +50,15 @@ __all__ = [
     "link_data_sources",
     "LinkedDataStore",
     "load_and_link_all_sources",
+    # Delta ingestion
+    "IngestStore",
+    "IngestDelta",
+    "ingest_exports",
+    "commit_deltas",
+    # Entity resolution
+    "resolve_entities",
+    "ResolutionReport",
+    "normalize_account_name",
+    # Persistence
+    "LinkedDataDB",
 ]
@@ -7,14 +7,22 @@ dataclass instances. Includes repeat issue detection.
 
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Any, Dict, Set
-from collections import defaultdict
+from typing import List, Optional, Any, Dict, Set, Tuple
+from collections import defaultdict, deque
 import glob
 import re
 
 import pandas as pd
 
-from .models import SupportCase, Severity, SupportLevel, ProductSeries
+from .models import SupportCase
+from .normalization import (
+    source_column,
+    normalize_severity,
+    normalize_support_level,
+    normalize_product_series,
+    parse_date_column,
+    to_datetime_or_none,
+)
 
 
 # Column mappings: expected column name -> possible variations
@@ -69,77 +77,61 @@ def _get_value(row: pd.Series, df: pd.DataFrame, field_name: str, default: Any =
     return default
 
 
-def _parse_date(value: Any) -> Optional[datetime]:
-    """Parse a date value to datetime."""
+def _parse_int(value: Any, default: int = 0) -> int:
+    """Parse value to integer."""
     if pd.isna(value):
-        return None
+        return default
     try:
-        return pd.to_datetime(value)
+        return int(float(value))
     except:
-        return None
-
-
-def _parse_severity(value: Any) -> Severity:
-    """Parse severity string to Severity enum."""
-    if pd.isna(value):
-        return Severity.S4
-
-    val_upper = str(value).upper().strip()
-
-    if "S1" in val_upper or "SEV1" in val_upper or "CRITICAL" in val_upper:
-        return Severity.S1
-    if "S2" in val_upper or "SEV2" in val_upper or "HIGH" in val_upper:
-        return Severity.S2
-    if "S3" in val_upper or "SEV3" in val_upper or "MEDIUM" in val_upper:
-        return Severity.S3
-
-    return Severity.S4
+        return default
 
 
-def _parse_support_level(value: Any) -> SupportLevel:
-    """Parse support level string to SupportLevel enum."""
-    if pd.isna(value):
-        return SupportLevel.UNKNOWN
+# Days within which a similar case on the same asset counts as a repeat
+REPEAT_WINDOW_DAYS = 90
 
-    val_upper = str(value).upper().strip()
+# Keywords that make two case reasons "similar" when both contain one
+REASON_KEYWORDS = ["performance", "network", "disk", "pool", "replication",
+                   "upgrade", "ha", "failover", "snapshot", "share", "smb", "nfs"]
 
-    if "GOLD" in val_upper:
-        return SupportLevel.GOLD
-    if "SILVER" in val_upper:
-        return SupportLevel.SILVER
-    if "BRONZE" in val_upper:
-        return SupportLevel.BRONZE
+# Single scanner for references to other cases in message text.
+# ("previous case NNNNN" is covered by the "case" alternative.)
+CASE_REFERENCE_PATTERN = re.compile(
+    r'(?:(case)\s*#?\s*|(ticket)\s*#?\s*|related\s+to\s+)(\d{5,8})'
+)
 
-    return SupportLevel.UNKNOWN
 
+def _reason_buckets(reason: str) -> List[str]:
+    """
+    Return the bucket keys for a case reason.
 
-def _parse_product_series(value: Any) -> ProductSeries:
-    """Parse product series string to ProductSeries enum."""
-    if pd.isna(value):
-        return ProductSeries.UNKNOWN
+    Two reasons are similar (see _similar_case_reason) exactly when they
+    share a bucket: the normalized reason itself, or any keyword in it.
+    """
+    if not reason:
+        return []
+    normalized = reason.lower().strip()
+    buckets = [f"reason:{normalized}"]
+    buckets.extend(f"kw:{kw}" for kw in REASON_KEYWORDS if kw in normalized)
+    return buckets
 
-    val_upper = str(value).upper().strip()
 
-    if val_upper in ["F", "F-SERIES", "FSERIES"]:
-        return ProductSeries.F_SERIES
-    if val_upper in ["M", "M-SERIES", "MSERIES"]:
-        return ProductSeries.M_SERIES
-    if val_upper in ["H", "H-SERIES", "HSERIES"]:
-        return ProductSeries.H_SERIES
-    if val_upper in ["R", "R-SERIES", "RSERIES"]:
-        return ProductSeries.R_SERIES
+def _similar_case_reason(reason1: str, reason2: str) -> bool:
+    """Check if two case reasons are similar."""
+    if not reason1 or not reason2:
+        return False
 
-    return ProductSeries.UNKNOWN
+    r1 = reason1.lower().strip()
+    r2 = reason2.lower().strip()
 
+    # Exact match
+    if r1 == r2:
+        return True
 
-def _parse_int(value: Any, default: int = 0) -> int:
-    """Parse value to integer."""
-    if pd.isna(value):
-        return default
-    try:
-        return int(float(value))
-    except:
-        return default
+    # If any keywords overlap
+    r1_keywords = {kw for kw in REASON_KEYWORDS if kw in r1}
+    r2_keywords = {kw for kw in REASON_KEYWORDS if kw in r2}
+    return bool(r1_keywords & r2_keywords)
 
 
 def _detect_repeat_issues(cases: List[SupportCase]) -> None:
@@ -151,44 +143,70 @@ def _detect_repeat_issues(cases: List[SupportCase]) -> None:
     - Messages reference a previous case number
     - Within 90 days of a closed case with similar issue
 
-    Modifies cases in-place to set is_repeat_issue and repeat_of_case.
+    Cases are walked in created-date order per asset group, keeping a
+    90-day sliding window of earlier cases bucketed by reason keyword, so
+    each case only looks at the earliest similar case still in its window
+    instead of every earlier case.
+
+    Args:
+        cases: Cases to check (modified in-place)
     """
     # Group cases by account + serial
-    account_serial_map: Dict[str, List[SupportCase]] = defaultdict(list)
+    asset_groups: Dict[str, List[SupportCase]] = defaultdict(list)
 
     for case in cases:
         if case.serial_number:
-            key = f"{case.account_name}|{case.serial_number}"
-            account_serial_map[key].append(case)
+            asset_groups[f"{case.account_name}|{case.serial_number}"].append(case)
+
+    bucket_cache: Dict[str, List[str]] = {}
 
-    # Check each group for repeats
-    for key, group_cases in account_serial_map.items():
+    for group_cases in asset_groups.values():
         if len(group_cases) < 2:
             continue
 
-        # Sort by date (oldest first)
+        # Sort by date (oldest first); undated cases sort first
         sorted_cases = sorted(
             group_cases,
             key=lambda c: c.created_date or datetime.min
         )
 
-        # Check for similar case reasons (simplistic matching)
-        for i, current in enumerate(sorted_cases):
-            for prev in sorted_cases[:i]:
-                # Skip if case reasons don't match
-                if not _similar_case_reason(current.case_reason, prev.case_reason):
-                    continue
-
-                # Skip if too far apart (> 90 days)
-                if current.created_date and prev.created_date:
-                    days_apart = (current.created_date - prev.created_date).days
-                    if days_apart > 90:
-                        continue
-
-                # Mark as repeat
+        # bucket -> earliest undated case / dated cases in the 90-day window,
+        # each stored with its position in sorted_cases
+        undated: Dict[str, Tuple[int, SupportCase]] = {}
+        window: Dict[str, deque] = defaultdict(deque)
+
+        for position, current in enumerate(sorted_cases):
+            reason = current.case_reason
+            if reason not in bucket_cache:
+                bucket_cache[reason] = _reason_buckets(reason)
+            buckets = bucket_cache[reason]
+
+            # Undated cases have no time limit and always sort before dated ones
+            match: Optional[Tuple[int, SupportCase]] = None
+            for bucket in buckets:
+                candidate = undated.get(bucket)
+                if candidate and (match is None or candidate[0] < match[0]):
+                    match = candidate
+
+            if match is None:
+                for bucket in buckets:
+                    queue = window.get(bucket)
+                    # Drop cases more than 90 days older than this one
+                    if current.created_date:
+                        while queue and (current.created_date - queue[0][1].created_date).days > REPEAT_WINDOW_DAYS:
+                            queue.popleft()
+                    if queue and (match is None or queue[0][0] < match[0]):
+                        match = queue[0]
+
+            if match is not None:
                 current.is_repeat_issue = True
-                current.repeat_of_case = prev.case_number
-                break
+                current.repeat_of_case = match[1].case_number
+
+            for bucket in buckets:
+                if current.created_date:
+                    window[bucket].append((position, current))
+                else:
+                    undated.setdefault(bucket, (position, current))
 
     # Also check message content for case references
     case_numbers: Set[str] = {c.case_number for c in cases}
@@ -199,51 +217,20 @@ def _detect_repeat_issues(cases: List[SupportCase]) -> None:
 
         all_messages = " ".join(case.messages).lower()
 
-        # Look for references to other case numbers
-        patterns = [
-            r'case\s*#?\s*(\d{5,8})',
-            r'ticket\s*#?\s*(\d{5,8})',
-            r'previous\s+case\s+(\d{5,8})',
-            r'related\s+to\s+(\d{5,8})',
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, all_messages)
-            for match in matches:
-                # Normalize and check if it's a different case
-                ref_case = match.strip()
-                if ref_case != case.case_number and ref_case in case_numbers:
-                    case.is_repeat_issue = True
-                    case.repeat_of_case = ref_case
-                    break
-            if case.is_repeat_issue:
+        # Prefer "case" references, then "ticket", then "related to"
+        found: Dict[int, str] = {}
+        for match in CASE_REFERENCE_PATTERN.finditer(all_messages):
+            kind = 0 if match.group(1) else 1 if match.group(2) else 2
+            ref_case = match.group(3)
+            if kind in found or ref_case == case.case_number or ref_case not in case_numbers:
+                continue
+            found[kind] = ref_case
+            if kind == 0:
                 break
 
-
-def _similar_case_reason(reason1: str, reason2: str) -> bool:
-    """Check if two case reasons are similar."""
-    if not reason1 or not reason2:
-        return False
-
-    r1 = reason1.lower().strip()
-    r2 = reason2.lower().strip()
-
-    # Exact match
-    if r1 == r2:
-        return True
-
-    # Check for common keywords
-    keywords = ["performance", "network", "disk", "pool", "replication",
-                "upgrade", "ha", "failover", "snapshot", "share", "smb", "nfs"]
-
-    r1_keywords = {kw for kw in keywords if kw in r1}
-    r2_keywords = {kw for kw in keywords if kw in r2}
-
-    # If any keywords overlap
-    if r1_keywords & r2_keywords:
-        return True
-
-    return False
+        if found:
+            case.is_repeat_issue = True
+            case.repeat_of_case = found[min(found)]
 
 
 def load_support_cases(
@@ -303,6 +290,13 @@ def load_support_cases(
     if not case_col:
         raise ValueError(f"Case Number column not found. Available columns: {list(df.columns)}")
 
+    # Normalize enum and date columns once, column-wise
+    severities = normalize_severity(source_column(df, _find_column(df, "severity")))
+    support_levels = normalize_support_level(source_column(df, _find_column(df, "support_level")))
+    product_series = normalize_product_series(source_column(df, _find_column(df, "product_series")))
+    message_dates = parse_date_column(source_column(df, _find_column(df, "message_date")))
+    created_dates = parse_date_column(source_column(df, _find_column(df, "created_date")))
+
     # Group rows by case number (each case may have multiple message rows)
     case_groups: Dict[str, List[pd.Series]] = defaultdict(list)
 
@@ -340,7 +334,7 @@ def load_support_cases(
             if from_addr and str(from_addr).strip():
                 from_addresses.append(str(from_addr))
 
-            msg_date = _parse_date(_get_value(row, df, "message_date"))
+            msg_date = to_datetime_or_none(message_dates.at[row.name])
             if msg_date:
                 if earliest_date is None or msg_date < earliest_date:
                     earliest_date = msg_date
@@ -354,16 +348,16 @@ def load_support_cases(
             serial_number=str(_get_value(first_row, df, "serial_number", "")),
             case_owner=str(_get_value(first_row, df, "case_owner", "")),
             case_age_days=_parse_int(_get_value(first_row, df, "case_age_days", 0)),
-            message_date=latest_date or _parse_date(_get_value(first_row, df, "message_date")),
-            created_date=earliest_date or _parse_date(_get_value(first_row, df, "created_date")),
-            severity=_parse_severity(_get_value(first_row, df, "severity")),
+            message_date=latest_date or to_datetime_or_none(message_dates.at[first_row.name]),
+            created_date=earliest_date or to_datetime_or_none(created_dates.at[first_row.name]),
+            severity=severities.at[first_row.name],
             case_reason=str(_get_value(first_row, df, "case_reason", "")),
             status=str(_get_value(first_row, df, "status", "")),
-            product_series=_parse_product_series(_get_value(first_row, df, "product_series")),
+            product_series=product_series.at[first_row.name],
             product_model=str(_get_value(first_row, df, "product_model", "")),
-            support_level=_parse_support_level(_get_value(first_row, df, "support_level")),
+            support_level=support_levels.at[first_row.name],
             messages=messages,
-            from_addresses=list(set(from_addresses)),  # Unique addresses
+            from_addresses=sorted(set(from_addresses)),  # Unique addresses
         )
 
         cases.append(support_case)
@@ -5,7 +5,7 @@ Links Opportunities, Deployments, and Support Cases via Order Number
 to create a unified view of the customer journey.
 """
 
-from typing import List, Dict, Tuple, Any, Optional
+from typing import List, Dict, Tuple, Any, Optional, Set
 from collections import defaultdict
 
 from .models import (
@@ -14,12 +14,23 @@ from .models import (
     SupportCase,
     LinkedOrder,
     LinkSummary,
+    ProductSeries,
 )
+from .normalization import categorize_use_case
+
+
+# Series keys indexed by get_orders_by_product_series()
+PRODUCT_SERIES_KEYS = tuple(s.value.upper() for s in ProductSeries if s is not ProductSeries.UNKNOWN)
 
 
 class LinkedDataStore:
     """
     Container for linked data with convenient access methods.
+
+    Besides order number and account, orders are indexed by product series,
+    use case category, serial number, case severity, deploy type and fiscal
+    period so metric families only visit matching orders. Indexes reflect
+    the fields set at load time; call reindex() after mutating records.
     """
 
     def __init__(
@@ -36,21 +47,146 @@ class LinkedDataStore:
         self.orphan_cases = orphan_cases
         self.summary = summary
 
-        # Build lookup indexes
+        # Order numbers touched by the most recent apply_delta()
+        self.last_updated_orders: Set[str] = set()
+
+        # Entity resolution results (see entity_resolution.resolve_entities):
+        # merged order number -> target order, account alias -> canonical name
+        self.order_aliases: Dict[str, str] = {}
+        self.account_aliases: Dict[str, str] = {}
+        self.resolution: Any = None
+
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """Build lookup indexes over the current orders."""
         self._order_by_number: Dict[str, LinkedOrder] = {
-            o.order_number: o for o in orders
+            o.order_number: o for o in self.orders
         }
         self._orders_by_account: Dict[str, List[LinkedOrder]] = defaultdict(list)
-        for order in orders:
+        for order in self.orders:
             self._orders_by_account[order.account_name].append(order)
 
+        # case number -> order number, so a re-exported case can be found
+        # (and moved) even if its order number changed
+        self._deployment_order: Dict[str, str] = {}
+        self._case_order: Dict[str, str] = {}
+        for order in self.orders:
+            for deploy in order.deployments:
+                self._deployment_order[deploy.case_number] = order.order_number
+            for case in order.support_cases:
+                self._case_order[case.case_number] = order.order_number
+
+        self._build_secondary_indexes()
+
+    def _build_secondary_indexes(self) -> None:
+        """Build the per-attribute order indexes (one pass over all records)."""
+        self._orders_by_product: Dict[str, List[LinkedOrder]] = defaultdict(list)
+        self._orders_by_use_case: Dict[str, List[LinkedOrder]] = defaultdict(list)
+        self._orders_by_serial: Dict[str, List[LinkedOrder]] = defaultdict(list)
+        self._orders_by_severity: Dict[str, List[LinkedOrder]] = defaultdict(list)
+        self._orders_by_deploy_type: Dict[bool, List[LinkedOrder]] = defaultdict(list)
+        self._orders_by_fiscal_period: Dict[str, List[LinkedOrder]] = defaultdict(list)
+        self._use_case_by_order: Dict[str, str] = {}
+
+        for order in self.orders:
+            series: Set[str] = set()
+            serials: Set[str] = set()
+            severities: Set[str] = set()
+            deploy_types: Set[bool] = set()
+
+            opp = order.opportunity
+            if opp:
+                # Opportunity products match on substring, as in product metrics
+                opp_product = (opp.primary_product or "").upper()
+                series.update(key for key in PRODUCT_SERIES_KEYS if key in opp_product)
+                if opp.fiscal_period:
+                    self._orders_by_fiscal_period[opp.fiscal_period].append(order)
+
+            for dep in order.deployments:
+                series.add(dep.product_series.value.upper())
+                deploy_types.add(dep.is_service_deploy)
+                if dep.serial_number:
+                    serials.add(dep.serial_number)
+
+            for case in order.support_cases:
+                series.add(case.product_series.value.upper())
+                severities.add(case.severity.value)
+                if case.serial_number:
+                    serials.add(case.serial_number)
+
+            use_case = _order_use_case(order)
+            self._use_case_by_order[order.order_number] = use_case
+            self._orders_by_use_case[use_case].append(order)
+
+            for key in series:
+                self._orders_by_product[key].append(order)
+            for serial in serials:
+                self._orders_by_serial[serial].append(order)
+            for severity in severities:
+                self._orders_by_severity[severity].append(order)
+            for is_service in deploy_types:
+                self._orders_by_deploy_type[is_service].append(order)
+
+    def reindex(self) -> None:
+        """Rebuild all indexes after records were mutated in place."""
+        self._build_indexes()
+
     def get_order(self, order_number: str) -> Optional[LinkedOrder]:
         """Get a linked order by order number."""
         return self._order_by_number.get(order_number)
 
     def get_orders_by_account(self, account_name: str) -> List[LinkedOrder]:
-        """Get all orders for an account."""
-        return self._orders_by_account.get(account_name, [])
+        """Get all orders for an account (aliases resolve to the canonical name)."""
+        return self._orders_by_account.get(self.account_aliases.get(account_name, account_name), [])
+
+    def get_orders_by_product_series(self, product_series: str) -> List[LinkedOrder]:
+        """
+        Get orders with any record of a product series ("F", "M-Series", ...).
+
+        An order matches if its opportunity's primary product contains the
+        series letter or any deployment or case is of that series.
+        """
+        key = product_series.upper().replace("-SERIES", "").replace("SERIES", "").strip()
+        if key in PRODUCT_SERIES_KEYS:
+            return self._orders_by_product.get(key, [])
+
+        # Not an indexed series: fall back to a scan with the same rules
+        return [
+            o for o in self.orders
+            if (o.opportunity and key in (o.opportunity.primary_product or "").upper())
+            or any(d.product_series.value.upper() == key for d in o.deployments)
+            or any(c.product_series.value.upper() == key for c in o.support_cases)
+        ]
+
+    def get_orders_by_use_case(self, use_case: str) -> List[LinkedOrder]:
+        """Get orders whose opportunity falls in a use case category."""
+        return self._orders_by_use_case.get(use_case, [])
+
+    def get_use_case(self, order_number: str) -> str:
+        """Use case category of an order ("Unknown" without an opportunity)."""
+        return self._use_case_by_order.get(order_number, "Unknown")
+
+    def get_orders_by_serial(self, serial_number: str) -> List[LinkedOrder]:
+        """Get orders with a deployment or case on a serial number."""
+        return self._orders_by_serial.get(serial_number, [])
+
+    def get_orders_by_severity(self, severity: str) -> List[LinkedOrder]:
+        """Get orders with at least one support case of a severity ("S1".."S4")."""
+        return self._orders_by_severity.get(severity, [])
+
+    def get_orders_by_deploy_type(self, is_service_deploy: bool) -> List[LinkedOrder]:
+        """Get orders with at least one service (True) or self (False) deployment."""
+        return self._orders_by_deploy_type.get(is_service_deploy, [])
+
+    def get_orders_by_fiscal_period(self, fiscal_period: str) -> List[LinkedOrder]:
+        """Get orders whose opportunity closed in a fiscal period."""
+        return self._orders_by_fiscal_period.get(fiscal_period, [])
+
+    @property
+    def all_fiscal_periods(self) -> List[str]:
+        """Fiscal periods with at least one order."""
+        return list(self._orders_by_fiscal_period.keys())
 
     def get_fully_linked_orders(self) -> List[LinkedOrder]:
         """Get all orders that have data from all three sources."""
@@ -60,6 +196,284 @@ class LinkedDataStore:
         """Get all orders that have support cases."""
         return [o for o in self.orders if o.has_support_cases]
 
+    def orders_affected_by(
+        self,
+        opportunities: List[Opportunity],
+        deployments: List[Deployment],
+        support_cases: List[SupportCase],
+    ) -> Set[str]:
+        """
+        Existing order numbers that apply_delta() would modify.
+
+        Call before applying the delta, e.g. to retract the current state of
+        those orders from running aggregates.
+        """
+        affected: Set[str] = set()
+        for opp in opportunities:
+            affected.add(self._resolve_order_number(opp.order_number))
+        for deploy in deployments:
+            affected.add(self._resolve_order_number(deploy.order_number))
+            affected.add(self._deployment_order.get(deploy.case_number))
+        for case in support_cases:
+            affected.add(self._resolve_order_number(case.order_number))
+            affected.add(self._case_order.get(case.case_number))
+        return {n for n in affected if n in self._order_by_number}
+
+    def apply_delta(
+        self,
+        opportunities: List[Opportunity],
+        deployments: List[Deployment],
+        support_cases: List[SupportCase],
+    ) -> Set[str]:
+        """
+        Merge new or changed records into the existing orders in place.
+
+        Records replace the previous version with the same key (order number
+        for opportunities, case number for deployments and cases); new order
+        numbers create new LinkedOrders. Evaluation results already on
+        untouched orders are kept.
+
+        Returns:
+            Order numbers whose LinkedOrder was created or modified
+        """
+        touched: Set[str] = set()
+
+        def order_for(norm_order: str, account_name: str) -> LinkedOrder:
+            account_name = self.account_aliases.get(account_name, account_name)
+            order = self._order_by_number.get(norm_order)
+            if order is None:
+                order = LinkedOrder(order_number=norm_order, account_name=account_name)
+                self.orders.append(order)
+                self._order_by_number[norm_order] = order
+                self._orders_by_account[account_name].append(order)
+            touched.add(norm_order)
+            return order
+
+        def replace_or_append(records: list, record: Any, key: str) -> None:
+            for i, existing in enumerate(records):
+                if getattr(existing, key) == getattr(record, key):
+                    records[i] = record
+                    return
+            records.append(record)
+
+        def remove_orphan(records: list, record: Any, key: str) -> None:
+            records[:] = [r for r in records if getattr(r, key) != getattr(record, key)]
+
+        def split_merged(own_number: str, target: LinkedOrder, account_name: str) -> None:
+            """Undo a merge into target: records filed under own_number get their own order again."""
+            del self.order_aliases[own_number]
+            order = order_for(own_number, account_name)
+            for attr, record_order in (("deployments", self._deployment_order), ("support_cases", self._case_order)):
+                kept = []
+                for record in getattr(target, attr):
+                    if _normalize_order_number(record.order_number) == own_number:
+                        getattr(order, attr).append(record)
+                        record_order[record.case_number] = own_number
+                    else:
+                        kept.append(record)
+                setattr(target, attr, kept)
+            touched.add(target.order_number)
+
+        def remove_from_order(order_number: Optional[str], attr: str, case_number: str) -> None:
+            order = self._order_by_number.get(order_number) if order_number else None
+            if order is None:
+                return
+            records = getattr(order, attr)
+            records[:] = [r for r in records if r.case_number != case_number]
+            touched.add(order_number)
+
+        for opp in opportunities:
+            norm_order = self._resolve_order_number(opp.order_number)
+            if not norm_order:
+                replace_or_append(self.orphan_opportunities, opp, "opportunity_name")
+                continue
+            remove_orphan(self.orphan_opportunities, opp, "opportunity_name")
+            own_number = _normalize_order_number(opp.order_number)
+            target = self._order_by_number.get(norm_order)
+            if (
+                norm_order != own_number and target is not None and target.opportunity is not None
+                and target.opportunity.opportunity_name != opp.opportunity_name
+            ):
+                # The merged order has an opportunity of its own: it was not a
+                # near-miss of the target, so never replace the target's opportunity
+                split_merged(own_number, target, opp.account_name)
+                norm_order = own_number
+            order = order_for(norm_order, opp.account_name)
+            order.opportunity = opp
+            self._set_account(order, self.account_aliases.get(opp.account_name, opp.account_name))
+
+        for deploy in deployments:
+            norm_order = self._resolve_order_number(deploy.order_number)
+            previous = self._deployment_order.get(deploy.case_number)
+            if previous != norm_order:
+                remove_from_order(previous, "deployments", deploy.case_number)
+            if not norm_order:
+                self._deployment_order.pop(deploy.case_number, None)
+                replace_or_append(self.orphan_deployments, deploy, "case_number")
+                continue
+            remove_orphan(self.orphan_deployments, deploy, "case_number")
+            order = order_for(norm_order, deploy.account_name)
+            replace_or_append(order.deployments, deploy, "case_number")
+            self._deployment_order[deploy.case_number] = norm_order
+
+        for case in support_cases:
+            norm_order = self._resolve_order_number(case.order_number)
+            previous = self._case_order.get(case.case_number)
+            if previous != norm_order:
+                remove_from_order(previous, "support_cases", case.case_number)
+            if not norm_order:
+                self._case_order.pop(case.case_number, None)
+                replace_or_append(self.orphan_cases, case, "case_number")
+                continue
+            remove_orphan(self.orphan_cases, case, "case_number")
+            order = order_for(norm_order, case.account_name)
+            replace_or_append(order.support_cases, case, "case_number")
+            self._case_order[case.case_number] = norm_order
+
+        # Drop orders whose records all moved to another order number
+        emptied = {n for n in touched if _is_empty(self._order_by_number[n])}
+        self._refresh(drop_empty=bool(emptied))
+        self.last_updated_orders = touched
+        return touched
+
+    def merge_orders(self, merges: Dict[str, str]) -> int:
+        """
+        Fold orders into other orders (source order number -> target).
+
+        Used for order numbers resolved to another order (typos, suffixes,
+        multi-order strings). A merge is skipped if both orders carry an
+        opportunity. Later deltas with the source order number follow the
+        merge, unless they bring a second opportunity: apply_delta() then
+        undoes the merge.
+
+        Returns:
+            Number of orders merged
+        """
+        merged = 0
+        for source_number, target_number in merges.items():
+            source = self._order_by_number.get(source_number)
+            target = self._order_by_number.get(target_number)
+            if source is None or target is None or source is target:
+                continue
+            if source.opportunity and target.opportunity:
+                continue
+
+            target.opportunity = target.opportunity or source.opportunity
+            known = {d.case_number for d in target.deployments}
+            target.deployments.extend(d for d in source.deployments if d.case_number not in known)
+            known = {c.case_number for c in target.support_cases}
+            target.support_cases.extend(c for c in source.support_cases if c.case_number not in known)
+
+            source.opportunity = None
+            source.deployments = []
+            source.support_cases = []
+            self.order_aliases[source_number] = target_number
+            merged += 1
+
+        if merged:
+            self._refresh(drop_empty=True)
+        return merged
+
+    def attach_orphans(self, links: List[Tuple[Any, str]]) -> int:
+        """
+        Link orphan records (no usable order number) to existing orders.
+
+        Args:
+            links: (orphan record, target order number) pairs
+
+        Returns:
+            Number of records attached
+        """
+        orphan_ids = {
+            id(r) for r in self.orphan_opportunities + self.orphan_deployments + self.orphan_cases
+        }
+        attached_ids: Set[int] = set()
+        for record, order_number in links:
+            order = self._order_by_number.get(order_number)
+            if order is None or id(record) not in orphan_ids or id(record) in attached_ids:
+                continue
+
+            if isinstance(record, Opportunity):
+                if order.opportunity is not None:
+                    continue
+                order.opportunity = record
+            elif isinstance(record, Deployment):
+                order.deployments.append(record)
+            elif isinstance(record, SupportCase):
+                order.support_cases.append(record)
+            else:
+                continue
+            attached_ids.add(id(record))
+
+        if attached_ids:
+            self.orphan_opportunities = [r for r in self.orphan_opportunities if id(r) not in attached_ids]
+            self.orphan_deployments = [r for r in self.orphan_deployments if id(r) not in attached_ids]
+            self.orphan_cases = [r for r in self.orphan_cases if id(r) not in attached_ids]
+            self._refresh(drop_empty=True)
+        return len(attached_ids)
+
+    def merge_accounts(self, aliases: Dict[str, str]) -> int:
+        """
+        Treat account names as aliases of a canonical name (alias -> canonical).
+
+        Orders are re-filed under the canonical name; records keep the name
+        from their export.
+
+        Returns:
+            Number of orders moved
+        """
+        moved = 0
+        for alias, canonical in aliases.items():
+            if alias == canonical:
+                continue
+            for order in list(self._orders_by_account.get(alias, [])):
+                self._set_account(order, canonical)
+                moved += 1
+            self.account_aliases[alias] = canonical
+        return moved
+
+    def _resolve_order_number(self, order_num: str) -> str:
+        """Normalize an order number, following merges from entity resolution."""
+        normalized = _normalize_order_number(order_num)
+        return self.order_aliases.get(normalized, normalized)
+
+    def _refresh(self, drop_empty: bool = False) -> None:
+        """Rebuild indexes and summary after orders changed in place."""
+        if drop_empty:
+            self.orders = [o for o in self.orders if not _is_empty(o)]
+            self._build_indexes()
+        else:
+            self._build_secondary_indexes()
+
+        self.summary = _build_link_summary(
+            self.orders,
+            self.orphan_opportunities,
+            self.orphan_deployments,
+            self.orphan_cases,
+        )
+
+    def _set_account(self, order: LinkedOrder, account_name: str) -> None:
+        """Move an order to another account in the account index."""
+        if order.account_name == account_name:
+            return
+        self._orders_by_account[order.account_name].remove(order)
+        if not self._orders_by_account[order.account_name]:
+            del self._orders_by_account[order.account_name]
+        order.account_name = account_name
+        self._orders_by_account[account_name].append(order)
+
+    def to_sqlite(self, path: Any, layer_results: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Persist the store (and optional layer results) to a SQLite file."""
+        from .sqlite_store import LinkedDataDB
+        LinkedDataDB.write(self, path, layer_results).close()
+
+    @classmethod
+    def from_sqlite(cls, path: Any) -> "LinkedDataStore":
+        """Load a store written by to_sqlite()."""
+        from .sqlite_store import LinkedDataDB
+        with LinkedDataDB(path) as db:
+            return db.load_store()
+
     @property
     def all_accounts(self) -> List[str]:
         """Get list of all unique account names."""
@@ -98,11 +512,60 @@ def _normalize_order_number(order_num: str) -> str:
     return normalized.upper()
 
 
+def _is_empty(order: LinkedOrder) -> bool:
+    """Whether an order has no records left."""
+    return not (order.has_opportunity or order.has_deployments or order.has_support_cases)
+
+
+def _order_use_case(order: LinkedOrder) -> str:
+    """Use case category of an order, from its opportunity's use case or business need."""
+    if not order.opportunity:
+        return "Unknown"
+    use_case = categorize_use_case(order.opportunity.primary_use_case or "")
+    if use_case == "Unknown" and order.opportunity.business_need:
+        use_case = categorize_use_case(order.opportunity.business_need)
+    return use_case
+
+
+def _build_link_summary(
+    linked_orders: List[LinkedOrder],
+    orphan_opps: List[Opportunity],
+    orphan_deploys: List[Deployment],
+    orphan_cases: List[SupportCase],
+    total_opportunities: Optional[int] = None,
+    total_deployments: Optional[int] = None,
+    total_cases: Optional[int] = None,
+) -> LinkSummary:
+    """Calculate summary statistics for a set of linked orders."""
+    if total_opportunities is None:
+        total_opportunities = sum(1 for o in linked_orders if o.has_opportunity) + len(orphan_opps)
+    if total_deployments is None:
+        total_deployments = sum(o.total_deployments for o in linked_orders) + len(orphan_deploys)
+    if total_cases is None:
+        total_cases = sum(o.total_support_cases for o in linked_orders) + len(orphan_cases)
+
+    return LinkSummary(
+        total_orders=len(linked_orders),
+        orders_with_opportunity=sum(1 for o in linked_orders if o.has_opportunity),
+        orders_with_deployment=sum(1 for o in linked_orders if o.has_deployments),
+        orders_with_support=sum(1 for o in linked_orders if o.has_support_cases),
+        fully_linked_orders=sum(1 for o in linked_orders if o.is_fully_linked),
+        orphan_opportunities=len(orphan_opps),
+        orphan_deployments=len(orphan_deploys),
+        orphan_cases=len(orphan_cases),
+        total_opportunities=total_opportunities,
+        total_deployments=total_deployments,
+        total_cases=total_cases,
+    )
+
+
 def link_data_sources(
     opportunities: List[Opportunity],
     deployments: List[Deployment],
     support_cases: List[SupportCase],
     console_output: Any = None,
+    existing: Optional[LinkedDataStore] = None,
+    fuzzy_link: bool = False,
 ) -> LinkedDataStore:
     """
     Link all data sources via Order Number.
@@ -116,10 +579,25 @@ def link_data_sources(
         deployments: List of loaded Deployment objects
         support_cases: List of loaded SupportCase objects
         console_output: Optional output handler with stream_message() method
+        existing: Previously linked store. When given, the records are
+            treated as a delta (new or changed records only) and merged
+            into its LinkedOrders in place; that store is returned.
+        fuzzy_link: If True, run entity resolution after exact linking:
+            account aliases, near-miss order numbers and orphans linked by
+            serial number (see entity_resolution.resolve_entities)
 
     Returns:
         LinkedDataStore with linked orders and summary statistics
     """
+    if existing is not None:
+        if console_output:
+            console_output.stream_message("\nApplying delta to linked data via Order Number...")
+        touched = existing.apply_delta(opportunities, deployments, support_cases)
+        if console_output:
+            console_output.stream_message(f"  Updated {len(touched)} orders in place")
+            console_output.stream_message(existing.summary.summary())
+        return existing
+
     if console_output:
         console_output.stream_message("\nLinking data sources via Order Number...")
 
@@ -194,15 +672,11 @@ def link_data_sources(
         linked_orders.append(linked)
 
     # Calculate summary statistics
-    summary = LinkSummary(
-        total_orders=len(linked_orders),
-        orders_with_opportunity=sum(1 for o in linked_orders if o.has_opportunity),
-        orders_with_deployment=sum(1 for o in linked_orders if o.has_deployments),
-        orders_with_support=sum(1 for o in linked_orders if o.has_support_cases),
-        fully_linked_orders=sum(1 for o in linked_orders if o.is_fully_linked),
-        orphan_opportunities=len(orphan_opps),
-        orphan_deployments=len(orphan_deploys),
-        orphan_cases=len(orphan_cases),
+    summary = _build_link_summary(
+        linked_orders,
+        orphan_opps,
+        orphan_deploys,
+        orphan_cases,
         total_opportunities=len(opportunities),
         total_deployments=len(deployments),
         total_cases=len(support_cases),
@@ -211,7 +685,7 @@ def link_data_sources(
     if console_output:
         console_output.stream_message(summary.summary())
 
-    return LinkedDataStore(
+    store = LinkedDataStore(
         orders=linked_orders,
         orphan_opportunities=orphan_opps,
         orphan_deployments=orphan_deploys,
@@ -219,12 +693,19 @@ def link_data_sources(
         summary=summary,
     )
 
+    if fuzzy_link:
+        from .entity_resolution import resolve_entities
+        resolve_entities(store, console_output=console_output)
+
+    return store
+
 
 def load_and_link_all_sources(
     opportunities_path: str,
     deployments_path: str,
     support_path: str,
     console_output: Any = None,
+    fuzzy_link: bool = False,
 ) -> LinkedDataStore:
     """
     Convenience function to load all sources and link them.
@@ -234,6 +715,7 @@ def load_and_link_all_sources(
         deployments_path: Path to deployments Excel file
         support_path: Path to support cases Excel file
         console_output: Optional output handler
+        fuzzy_link: If True, also resolve account aliases and near-miss orders
 
     Returns:
         LinkedDataStore with all data loaded and linked
@@ -251,4 +733,4 @@ def load_and_link_all_sources(
     cases = load_support_cases(support_path, console_output=console_output)
 
     # Link them
-    return link_data_sources(opps, deploys, cases, console_output)
+    return link_data_sources(opps, deploys, cases, console_output, fuzzy_link=fuzzy_link)
@@ -9,14 +9,21 @@ Deployment cases have the same structure as Support Cases
 """
 
 from pathlib import Path
-from datetime import datetime
 from typing import List, Optional, Any, Dict
 from collections import defaultdict
 import glob
 
 import pandas as pd
 
-from .models import Deployment, Severity, SupportLevel, ProductSeries
+from .models import Deployment
+from .normalization import (
+    source_column,
+    normalize_severity,
+    normalize_support_level,
+    normalize_product_series,
+    parse_date_column,
+    to_datetime_or_none,
+)
 
 
 # Column mappings: expected column name -> possible variations
@@ -70,69 +77,6 @@ def _get_value(row: pd.Series, df: pd.DataFrame, field_name: str, default: Any =
     return default
 
 
-def _parse_date(value: Any) -> Optional[datetime]:
-    """Parse a date value to datetime."""
-    if pd.isna(value):
-        return None
-    try:
-        return pd.to_datetime(value)
-    except:
-        return None
-
-
-def _parse_severity(value: Any) -> Severity:
-    """Parse severity string to Severity enum."""
-    if pd.isna(value):
-        return Severity.S4
-
-    val_upper = str(value).upper().strip()
-
-    if "S1" in val_upper or "SEV1" in val_upper or "CRITICAL" in val_upper:
-        return Severity.S1
-    if "S2" in val_upper or "SEV2" in val_upper or "HIGH" in val_upper:
-        return Severity.S2
-    if "S3" in val_upper or "SEV3" in val_upper or "MEDIUM" in val_upper:
-        return Severity.S3
-
-    return Severity.S4
-
-
-def _parse_support_level(value: Any) -> SupportLevel:
-    """Parse support level string to SupportLevel enum."""
-    if pd.isna(value):
-        return SupportLevel.UNKNOWN
-
-    val_upper = str(value).upper().strip()
-
-    if "GOLD" in val_upper:
-        return SupportLevel.GOLD
-    if "SILVER" in val_upper:
-        return SupportLevel.SILVER
-    if "BRONZE" in val_upper:
-        return SupportLevel.BRONZE
-
-    return SupportLevel.UNKNOWN
-
-
-def _parse_product_series(value: Any) -> ProductSeries:
-    """Parse product series string to ProductSeries enum."""
-    if pd.isna(value):
-        return ProductSeries.UNKNOWN
-
-    val_upper = str(value).upper().strip()
-
-    if val_upper in ["F", "F-SERIES", "FSERIES"]:
-        return ProductSeries.F_SERIES
-    if val_upper in ["M", "M-SERIES", "MSERIES"]:
-        return ProductSeries.M_SERIES
-    if val_upper in ["H", "H-SERIES", "HSERIES"]:
-        return ProductSeries.H_SERIES
-    if val_upper in ["R", "R-SERIES", "RSERIES"]:
-        return ProductSeries.R_SERIES
-
-    return ProductSeries.UNKNOWN
-
-
 def _parse_int(value: Any, default: int = 0) -> int:
     """Parse value to integer."""
     if pd.isna(value):
@@ -227,6 +171,12 @@ def load_deployments(
     if not case_col:
         raise ValueError(f"Case Number column not found. Available columns: {list(df.columns)}")
 
+    # Normalize enum and date columns once, column-wise
+    severities = normalize_severity(source_column(df, _find_column(df, "severity")))
+    support_levels = normalize_support_level(source_column(df, _find_column(df, "support_level")))
+    product_series = normalize_product_series(source_column(df, _find_column(df, "product_series")))
+    message_dates = parse_date_column(source_column(df, _find_column(df, "message_date")))
+
     # Group rows by case number (each case may have multiple message rows)
     case_groups: Dict[str, List[pd.Series]] = defaultdict(list)
 
@@ -271,15 +221,15 @@ def load_deployments(
             serial_number=str(_get_value(first_row, df, "serial_number", "")),
             case_owner=case_owner,
             case_age_days=_parse_int(_get_value(first_row, df, "case_age_days", 0)),
-            message_date=_parse_date(_get_value(first_row, df, "message_date")),
-            severity=_parse_severity(_get_value(first_row, df, "severity")),
+            message_date=to_datetime_or_none(message_dates.at[first_row.name]),
+            severity=severities.at[first_row.name],
             case_reason=str(_get_value(first_row, df, "case_reason", "")),
             status=str(_get_value(first_row, df, "status", "")),
-            product_series=_parse_product_series(_get_value(first_row, df, "product_series")),
+            product_series=product_series.at[first_row.name],
             product_model=str(_get_value(first_row, df, "product_model", "")),
-            support_level=_parse_support_level(_get_value(first_row, df, "support_level")),
+            support_level=support_levels.at[first_row.name],
             messages=messages,
-            from_addresses=list(set(from_addresses)),  # Unique addresses
+            from_addresses=sorted(set(from_addresses)),  # Unique addresses
             is_service_deploy=_detect_service_deploy(messages, case_owner),
         )
 
@@ -0,0 +1,490 @@
+"""
+Entity resolution for Account Solutions Success.
+
+Second linking pass run after exact Order Number linking:
+- Account names: "ACME Corp" / "ACME Corporation" / "Acme, Inc." resolve to
+  one canonical account
+- Orders without an opportunity whose order number is a typo, carries a
+  suffix ("12345-A") or lists several orders ("12345 / 12346") are folded
+  into the matching opportunity order
+- Orphan deployments and cases (no order number) are attached through
+  serial numbers seen on linked orders
+
+Candidates come from blocking indexes (phonetic account keys, single-deletion
+neighbourhoods of order numbers, the store's serial index) with a bounded
+sorted-neighbourhood window inside each block, so the pass stays near-linear.
+Every proposal carries a confidence; only proposals at or above the
+threshold are applied. One-edit order number matches are only reported
+unless the orders share a serial number or a record of the order cites the
+target order number: sequential POs of one account are one edit apart too.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import LinkedOrder
+from .data_linker import LinkedDataStore, _normalize_order_number
+
+
+# Proposals at or above this confidence are applied
+MIN_APPLY_CONFIDENCE = 0.9
+
+# Proposals below this confidence are not reported at all
+MIN_REPORT_CONFIDENCE = 0.6
+
+# Base confidence per match method, before account agreement is considered
+METHOD_CONFIDENCE = {
+    "multi_order": 0.9,
+    "suffix": 0.9,
+    "edit_distance": 0.8,
+    "serial": 0.85,
+    "account_only": 0.75,
+}
+SAME_ACCOUNT_BONUS = 0.08
+OTHER_ACCOUNT_PENALTY = 0.3
+# Edit-distance matches backed by a shared serial or an order reference
+CORROBORATED_EDIT_BONUS = 0.1
+
+# Legal-form and filler tokens dropped from account names before comparing
+ACCOUNT_STOP_TOKENS = {
+    "the", "inc", "incorporated", "corp", "corporation", "co", "company",
+    "llc", "llp", "lp", "ltd", "limited", "plc", "gmbh", "ag", "sa", "bv",
+    "pty", "srl", "group", "holdings",
+}
+
+# Within a block, each account key is compared with this many sorted neighbours
+COMPARISON_WINDOW = 50
+
+ACCOUNT_SIMILARITY_THRESHOLD = 0.85
+SHARED_SERIAL_BONUS = 0.05
+
+_ORDER_SPLIT_PATTERN = re.compile(r"\s*(?:[,;/&+|]|\bAND\b)\s*|\s+")
+_ORDER_SUFFIX_PATTERN = re.compile(r"^(\d{4,})(?:[-_. ]?[A-Z]{1,3}\d{0,2}|[-_. ]\d{1,2})$")
+_NON_WORD_PATTERN = re.compile(r"[^a-z0-9 ]+")
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+@dataclass
+class OrderMatch:
+    """Proposed link of an order (or orphan record) to a target order."""
+    target_order: str
+    method: str  # multi_order, suffix, edit_distance, serial, account_only
+    confidence: float
+    source_order: Optional[str] = None  # Order being merged (None for orphans)
+    record: Any = None  # Orphan record being attached
+    applied: bool = False
+
+    @property
+    def description(self) -> str:
+        if self.source_order is not None:
+            source = f"order {self.source_order}"
+        else:
+            source = f"orphan {getattr(self.record, 'case_number', None) or getattr(self.record, 'opportunity_name', '')}"
+        return f"{source} -> order {self.target_order} ({self.method}, {self.confidence:.2f})"
+
+
+@dataclass
+class AccountAlias:
+    """Proposed alias of an account name to a canonical name."""
+    alias: str
+    canonical: str
+    method: str  # normalized_name, similar_name
+    confidence: float
+    applied: bool = False
+
+
+@dataclass
+class ResolutionReport:
+    """Proposals and applied results from resolve_entities()."""
+    account_aliases: List[AccountAlias] = field(default_factory=list)
+    order_matches: List[OrderMatch] = field(default_factory=list)
+    min_confidence: float = MIN_APPLY_CONFIDENCE
+
+    @property
+    def applied_aliases(self) -> int:
+        return sum(1 for a in self.account_aliases if a.applied)
+
+    @property
+    def applied_matches(self) -> int:
+        return sum(1 for m in self.order_matches if m.applied)
+
+    def summary(self) -> str:
+        return f"""Entity Resolution (confidence >= {self.min_confidence:.2f}):
+  Account aliases: {self.applied_aliases} applied / {len(self.account_aliases)} proposed
+  Order links:     {self.applied_matches} applied / {len(self.order_matches)} proposed"""
+
+
+def normalize_account_name(name: str) -> str:
+    """Lower-case an account name and drop punctuation and legal-form tokens."""
+    if not name:
+        return ""
+    text = _NON_WORD_PATTERN.sub(" ", str(name).lower().replace("&", " and "))
+    tokens = [t for t in text.split() if t not in ACCOUNT_STOP_TOKENS]
+    return " ".join(tokens)
+
+
+def _soundex(word: str) -> str:
+    """American Soundex code of a word ("" for non-alphabetic input)."""
+    letters = [c for c in word.lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def propose_account_aliases(store: LinkedDataStore) -> List[AccountAlias]:
+    """
+    Propose account aliases from the store's account names.
+
+    Names with the same normalized form are aliases outright; names in the
+    same phonetic block are compared on character trigrams, with a bonus
+    when both accounts have a serial number in common.
+    """
+    names = [n for n in store.all_accounts if n and n != "Unknown"]
+    by_key: Dict[str, List[str]] = defaultdict(list)
+    for name in names:
+        key = normalize_account_name(name)
+        if key:
+            by_key[key].append(name)
+
+    # Block distinct normalized keys on the phonetic code of their first token
+    # plus the initial of the second
+    blocks: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for key in by_key:
+        tokens = key.split()
+        blocks[(_soundex(tokens[0]), tokens[1][:1] if len(tokens) > 1 else "")].append(key)
+
+    serials_by_key: Dict[str, Set[str]] = defaultdict(set)
+    for key, key_names in by_key.items():
+        for name in key_names:
+            for order in store.get_orders_by_account(name):
+                for record in order.deployments + order.support_cases:
+                    if record.serial_number:
+                        serials_by_key[key].add(record.serial_number)
+
+    def canonical_rank(name: str) -> Tuple[int, int, str]:
+        return (-len(store.get_orders_by_account(name)), len(name), name)
+
+    # alias -> (canonical, method, confidence); each name keeps its best edge
+    best: Dict[str, Tuple[str, str, float]] = {}
+
+    def propose(a: str, b: str, method: str, confidence: float) -> None:
+        if confidence < MIN_REPORT_CONFIDENCE:
+            return
+        canonical, alias = sorted((a, b), key=canonical_rank)
+        current = best.get(alias)
+        if current is None or confidence > current[2]:
+            best[alias] = (canonical, method, confidence)
+
+    # Same normalized name: alias of the group's canonical name
+    canonical_by_key: Dict[str, str] = {}
+    for key, key_names in by_key.items():
+        canonical_by_key[key] = min(key_names, key=canonical_rank)
+        for name in key_names:
+            if name != canonical_by_key[key]:
+                propose(canonical_by_key[key], name, "normalized_name", 0.95)
+
+    # Similar normalized names within a block (numbers must agree: "Site 2" is not "Site 3")
+    for block_keys in blocks.values():
+        if len(block_keys) < 2:
+            continue
+        block_keys.sort()
+        grams = {k: _trigrams(k) for k in block_keys}
+        numbers = {k: {t for t in k.split() if t.isdigit()} for k in block_keys}
+        for i, a in enumerate(block_keys):
+            for b in block_keys[i + 1:i + 1 + COMPARISON_WINDOW]:
+                if numbers[a] != numbers[b]:
+                    continue
+                similarity = _jaccard(grams[a], grams[b])
+                if similarity < ACCOUNT_SIMILARITY_THRESHOLD:
+                    continue
+                confidence = similarity * 0.95
+                if serials_by_key[a] & serials_by_key[b]:
+                    confidence += SHARED_SERIAL_BONUS
+                propose(canonical_by_key[a], canonical_by_key[b], "similar_name", min(confidence, 0.99))
+
+    return [
+        AccountAlias(alias=alias, canonical=canonical, method=method, confidence=confidence)
+        for alias, (canonical, method, confidence) in sorted(best.items())
+    ]
+
+
+def _resolve_alias_chains(aliases: Dict[str, str]) -> Dict[str, str]:
+    """Point every alias at the end of its chain (A -> B -> C becomes A -> C)."""
+    resolved = {}
+    for alias in aliases:
+        seen = {alias}
+        target = aliases[alias]
+        while target in aliases and target not in seen:
+            seen.add(target)
+            target = aliases[target]
+        resolved[alias] = target
+    return resolved
+
+
+def _deletions(key: str) -> Iterable[str]:
+    """The key and every single-character deletion of it."""
+    yield key
+    for i in range(len(key)):
+        yield key[:i] + key[i + 1:]
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Whether a and b differ by one substitution, insertion, deletion or transposition."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (
+            len(diffs) == 2 and diffs[1] == diffs[0] + 1
+            and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]]
+        )
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    for i in range(len(longer)):
+        if longer[:i] + longer[i + 1:] == shorter:
+            return True
+    return False
+
+
+class _OrderNumberIndex:
+    """Deletion-neighbourhood index over anchor order numbers (edit distance 1 lookups)."""
+
+    def __init__(self, order_numbers: Iterable[str]):
+        self.keys: Set[str] = set()
+        self._by_deletion: Dict[str, Set[str]] = defaultdict(set)
+        for key in order_numbers:
+            self.keys.add(key)
+            if len(key) >= 4:
+                for variant in _deletions(key):
+                    self._by_deletion[variant].add(key)
+
+    def near(self, key: str) -> Set[str]:
+        if len(key) < 4:
+            return set()
+        candidates: Set[str] = set()
+        for variant in _deletions(key):
+            candidates.update(self._by_deletion.get(variant, ()))
+        candidates.discard(key)
+        return {c for c in candidates if _within_one_edit(key, c)}
+
+
+def _order_number_candidates(order_number: str, index: _OrderNumberIndex) -> List[Tuple[str, str]]:
+    """(target order, method) candidates for a non-matching order number."""
+    tokens = [t for t in _ORDER_SPLIT_PATTERN.split(order_number) if t]
+    if len(tokens) > 1:
+        hits = []
+        for token in tokens:
+            norm = _normalize_order_number(token)
+            if norm in index.keys and norm not in hits:
+                hits.append(norm)
+        if hits:
+            return [(h, "multi_order") for h in hits]
+
+    match = _ORDER_SUFFIX_PATTERN.match(order_number)
+    if match:
+        base = _normalize_order_number(match.group(1))
+        if base in index.keys:
+            return [(base, "suffix")]
+
+    return [(near, "edit_distance") for near in sorted(index.near(order_number))]
+
+
+def _account_confidence(base: float, record_account: str, target: LinkedOrder, aliases: Dict[str, str]) -> float:
+    """Adjust a method's confidence for whether the accounts agree."""
+    account = aliases.get(record_account, record_account)
+    if not account or account == "Unknown" or target.account_name == "Unknown":
+        return base
+    if account == target.account_name:
+        return min(base + SAME_ACCOUNT_BONUS, 0.99)
+    return base - OTHER_ACCOUNT_PENALTY
+
+
+def _corroborates(order: LinkedOrder, target: LinkedOrder) -> bool:
+    """Whether an order shares a serial number with the target or one of its records cites the target."""
+    records = order.deployments + order.support_cases
+    target_serials = {r.serial_number for r in target.deployments + target.support_cases if r.serial_number}
+    if any(r.serial_number in target_serials for r in records if r.serial_number):
+        return True
+    reference = re.compile(rf"(?<!\w){re.escape(target.order_number)}(?!\w)")
+    return any(reference.search(body) for r in records for body in r.messages)
+
+
+def _best_match(candidates: List[OrderMatch]) -> Optional[OrderMatch]:
+    """Highest-confidence candidate; ambiguous ties between targets are dropped."""
+    if not candidates:
+        return None
+    candidates.sort(key=lambda m: -m.confidence)
+    best = candidates[0]
+    if any(m.confidence == best.confidence and m.target_order != best.target_order for m in candidates[1:]):
+        return None
+    return best
+
+
+def propose_order_matches(
+    store: LinkedDataStore,
+    account_aliases: Optional[Dict[str, str]] = None,
+) -> List[OrderMatch]:
+    """
+    Propose links for orders without an opportunity and for orphan records.
+
+    Targets are orders that carry an opportunity (orphan deployments and
+    cases may also attach to any order through a serial number).
+    """
+    aliases = account_aliases if account_aliases is not None else store.account_aliases
+    anchors = {o.order_number: o for o in store.orders if o.has_opportunity}
+    index = _OrderNumberIndex(anchors)
+
+    matches: List[OrderMatch] = []
+
+    # Orders whose number matched no opportunity
+    for order in store.orders:
+        if order.has_opportunity:
+            continue
+
+        candidates = []
+        for target_number, method in _order_number_candidates(order.order_number, index):
+            confidence = _account_confidence(
+                METHOD_CONFIDENCE[method], order.account_name, anchors[target_number], aliases,
+            )
+            if method == "edit_distance" and _corroborates(order, anchors[target_number]):
+                confidence = min(confidence + CORROBORATED_EDIT_BONUS, 0.99)
+            candidates.append(OrderMatch(target_number, method, confidence, source_order=order.order_number))
+
+        if not candidates:
+            serial_targets = {
+                o.order_number
+                for record in order.deployments + order.support_cases if record.serial_number
+                for o in store.get_orders_by_serial(record.serial_number)
+                if o.order_number in anchors
+            }
+            if len(serial_targets) == 1:
+                target_number = serial_targets.pop()
+                confidence = _account_confidence(
+                    METHOD_CONFIDENCE["serial"], order.account_name, anchors[target_number], aliases,
+                )
+                candidates.append(OrderMatch(target_number, "serial", confidence, source_order=order.order_number))
+
+        best = _best_match(candidates)
+        if best and best.confidence >= MIN_REPORT_CONFIDENCE:
+            matches.append(best)
+
+    # Orphan deployments and cases: serial number co-occurrence
+    for record in store.orphan_deployments + store.orphan_cases:
+        if not record.serial_number:
+            continue
+        targets = store.get_orders_by_serial(record.serial_number)
+        if len({o.order_number for o in targets}) != 1:
+            continue
+        confidence = _account_confidence(METHOD_CONFIDENCE["serial"], record.account_name, targets[0], aliases)
+        if confidence >= MIN_REPORT_CONFIDENCE:
+            matches.append(OrderMatch(targets[0].order_number, "serial", confidence, record=record))
+
+    # Orphan opportunities: the account's only order without an opportunity
+    for opp in store.orphan_opportunities:
+        open_orders = [o for o in store.get_orders_by_account(opp.account_name) if not o.has_opportunity]
+        if len(open_orders) != 1:
+            continue
+        confidence = _account_confidence(METHOD_CONFIDENCE["account_only"], opp.account_name, open_orders[0], aliases)
+        if confidence >= MIN_REPORT_CONFIDENCE:
+            matches.append(OrderMatch(open_orders[0].order_number, "account_only", confidence, record=opp))
+
+    return matches
+
+
+def resolve_entities(
+    store: LinkedDataStore,
+    min_confidence: float = MIN_APPLY_CONFIDENCE,
+    console_output: Any = None,
+) -> ResolutionReport:
+    """
+    Run the fuzzy linking pass over a linked store and apply confident matches.
+
+    Account aliases are resolved first so order matching can compare
+    canonical account names.
+
+    Args:
+        store: LinkedDataStore produced by exact Order Number linking
+        min_confidence: Proposals at or above this confidence are applied
+        console_output: Optional output handler with stream_message() method
+
+    Returns:
+        ResolutionReport with every proposal and whether it was applied
+    """
+    if console_output:
+        console_output.stream_message("\nResolving account aliases and unmatched orders...")
+
+    report = ResolutionReport(min_confidence=min_confidence)
+
+    report.account_aliases = propose_account_aliases(store)
+    accepted = _resolve_alias_chains(
+        {a.alias: a.canonical for a in report.account_aliases if a.confidence >= min_confidence}
+    )
+    accepted = {alias: canonical for alias, canonical in accepted.items() if alias != canonical}
+    store.merge_accounts(accepted)
+    for alias in report.account_aliases:
+        alias.applied = alias.alias in accepted
+        if alias.applied:
+            alias.canonical = accepted[alias.alias]
+
+    report.order_matches = propose_order_matches(store)
+    merges = {
+        m.source_order: m.target_order
+        for m in report.order_matches
+        if m.source_order is not None and m.confidence >= min_confidence
+    }
+    store.merge_orders(merges)
+
+    # Orphans may target orders that were just merged away
+    links = []
+    for match in report.order_matches:
+        if match.record is not None and match.confidence >= min_confidence:
+            links.append((match.record, store.order_aliases.get(match.target_order, match.target_order)))
+    store.attach_orphans(links)
+
+    still_orphaned = {
+        id(r) for r in store.orphan_opportunities + store.orphan_deployments + store.orphan_cases
+    }
+    for match in report.order_matches:
+        if match.source_order is not None:
+            match.applied = store.order_aliases.get(match.source_order) == match.target_order
+        else:
+            match.applied = id(match.record) not in still_orphaned
+
+    store.resolution = report
+    if console_output:
+        console_output.stream_message(report.summary())
+    return report
@@ -0,0 +1,316 @@
+"""
+Delta ingestion for Account Solutions Success.
+
+Each weekly export is a superset of the previous one. IngestStore keeps a
+persistent record of what has already been ingested, per source:
+- a fingerprint of every record seen (keyed by case / order number)
+- a watermark: the latest message (or close) date ingested
+
+A new export is diffed against the store so only new or changed
+Opportunities, Deployments and Support Cases are passed downstream, and
+link_data_sources(existing=...) folds them into the linked orders in place.
+
+run_full_analysis(delta=True) keeps the state in Config.INGEST_STATE_PATH
+and the linked data in Config.LINKED_STORE_PATH between runs, and only
+re-analyzes the orders a new export touched.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+SOURCES = ("opportunities", "deployments", "support_cases")
+
+STATE_VERSION = 1
+
+# Fields left out of fingerprints: they drift without the record changing
+# (case age grows daily) or are filled in later by the analysis layers.
+_FINGERPRINT_EXCLUDE = {
+    "case_age_days",
+    "message_ids",
+    "criticality_score",
+    "frustration_score",
+    "is_hardware_failure",
+    "is_performance_issue",
+    "is_configuration_issue",
+    "escalation_detected",
+    "deployment_related",
+    "deployment_score",
+}
+
+# List fields without a meaningful order, hashed sorted
+_UNORDERED_FIELDS = {"from_addresses"}
+
+
+@dataclass
+class SourceWatermark:
+    """Ingestion state for one source."""
+    max_record_date: Optional[datetime] = None
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    last_ingested_at: Optional[datetime] = None
+
+    @property
+    def records_seen(self) -> int:
+        return len(self.fingerprints)
+
+
+@dataclass
+class IngestDelta:
+    """Result of diffing one source's export against the store."""
+    source: str
+    new: List[Any] = field(default_factory=list)
+    changed: List[Any] = field(default_factory=list)
+    unchanged: int = 0
+    previous_watermark: Optional[datetime] = None
+    watermark: Optional[datetime] = None
+
+    # key -> fingerprint for new/changed records (applied on commit)
+    _fingerprints: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    @property
+    def records(self) -> List[Any]:
+        """New and changed records, in export order."""
+        return self.new + self.changed
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.new or self.changed)
+
+    def summary(self) -> str:
+        return (
+            f"{self.source}: {len(self.new)} new, {len(self.changed)} changed, "
+            f"{self.unchanged} unchanged (watermark {self.previous_watermark} -> {self.watermark})"
+        )
+
+
+def _record_key(source: str, record: Any) -> str:
+    """Stable identity of a record within its source."""
+    if source == "opportunities":
+        return f"{record.order_number}|{record.opportunity_name}"
+    return str(record.case_number)
+
+
+def _record_date(source: str, record: Any) -> Optional[datetime]:
+    """Date used for the source watermark."""
+    if source == "opportunities":
+        return record.close_date or record.created_date
+    return record.message_date
+
+
+def _fingerprint(record: Any) -> str:
+    """Hash of a record's source fields (and message bodies, if any)."""
+    digest = hashlib.sha1()
+    for f in fields(record):
+        if f.name in _FINGERPRINT_EXCLUDE:
+            continue
+        value = getattr(record, f.name)
+        if hasattr(value, "value"):  # Enum
+            value = value.value
+        elif f.name in _UNORDERED_FIELDS and value:
+            value = sorted(value)
+        digest.update(f"{f.name}={value!r}\x1f".encode("utf-8", "replace"))
+    for body in getattr(record, "messages", None) or []:
+        digest.update(body.encode("utf-8", "replace"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def _to_iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    return pd.Timestamp(value).to_pydatetime() if value else None
+
+
+class IngestStore:
+    """
+    Persistent ingestion state backed by a JSON file.
+
+    Usage:
+        store = IngestStore(Config.INGEST_STATE_PATH)
+        delta = store.diff("support_cases", load_support_cases(path))
+        ...process delta.records...
+        store.commit(delta)
+        store.save()
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.sources: Dict[str, SourceWatermark] = {s: SourceWatermark() for s in SOURCES}
+        if self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path, "r") as f:
+            data = json.load(f)
+
+        for source, state in data.get("sources", {}).items():
+            if source not in self.sources:
+                continue
+            self.sources[source] = SourceWatermark(
+                max_record_date=_from_iso(state.get("max_record_date")),
+                fingerprints=dict(state.get("fingerprints", {})),
+                last_ingested_at=_from_iso(state.get("last_ingested_at")),
+            )
+
+    def save(self) -> None:
+        """Write the store to disk (atomically, via a temp file)."""
+        data = {
+            "version": STATE_VERSION,
+            "sources": {
+                source: {
+                    "max_record_date": _to_iso(state.max_record_date),
+                    "last_ingested_at": _to_iso(state.last_ingested_at),
+                    "fingerprints": state.fingerprints,
+                }
+                for source, state in self.sources.items()
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        tmp_path.replace(self.path)
+
+    def watermark(self, source: str) -> Optional[datetime]:
+        """Latest record date ingested for a source."""
+        return self.sources[source].max_record_date
+
+    def seen(self, source: str, key: str) -> bool:
+        """Whether a record key (case number, order|name) has been ingested."""
+        return key in self.sources[source].fingerprints
+
+    def diff(self, source: str, records: List[Any]) -> IngestDelta:
+        """
+        Split an export into new, changed and unchanged records.
+
+        The store is not modified; call commit() once the delta has been
+        processed downstream.
+        """
+        if source not in self.sources:
+            raise ValueError(f"Unknown source: {source}. Expected one of {SOURCES}")
+
+        state = self.sources[source]
+        delta = IngestDelta(source=source, previous_watermark=state.max_record_date)
+        watermark = state.max_record_date
+
+        for record in records:
+            key = _record_key(source, record)
+            fingerprint = _fingerprint(record)
+            record_date = _record_date(source, record)
+            if record_date is not None and (watermark is None or record_date > watermark):
+                watermark = record_date
+
+            previous = state.fingerprints.get(key)
+            if previous == fingerprint:
+                delta.unchanged += 1
+                continue
+
+            if key in delta._fingerprints:
+                # Same key twice in one export: the later row wins
+                delta.new = [r for r in delta.new if _record_key(source, r) != key]
+                delta.changed = [r for r in delta.changed if _record_key(source, r) != key]
+
+            if previous is None:
+                delta.new.append(record)
+            else:
+                delta.changed.append(record)
+            delta._fingerprints[key] = fingerprint
+
+        delta.watermark = watermark
+        return delta
+
+    def commit(self, delta: IngestDelta) -> None:
+        """Record a processed delta as ingested."""
+        state = self.sources[delta.source]
+        state.fingerprints.update(delta._fingerprints)
+        state.max_record_date = delta.watermark
+        state.last_ingested_at = datetime.now()
+
+
+def ingest_exports(
+    store: IngestStore,
+    opportunities_path: Optional[str] = None,
+    deployments_path: Optional[str] = None,
+    support_path: Optional[str] = None,
+    linked: Any = None,
+    console_output: Any = None,
+    fuzzy_link: bool = False,
+    commit: bool = True,
+    before_link: Optional[Callable[[Dict[str, IngestDelta]], None]] = None,
+) -> Tuple[Any, Dict[str, IngestDelta]]:
+    """
+    Load exports, diff them against the store and link the delta.
+
+    Args:
+        store: Ingestion state to diff against
+        opportunities_path: Path to opportunities Excel file
+        deployments_path: Path to deployments Excel file
+        support_path: Path to support cases Excel file
+        linked: Existing LinkedDataStore to update in place with the delta.
+            None links the whole export into a new store, so the result
+            always holds every record.
+        console_output: Optional output handler with stream_message() method
+        fuzzy_link: Run entity resolution when a new store is linked
+        commit: Commit the deltas and save the store. Pass False to commit
+            only once the linked data has been persisted.
+        before_link: Called with the deltas before they are applied to an
+            existing `linked` store, e.g. to retract the orders they affect
+            from running aggregates (LinkedDataStore.orders_affected_by)
+
+    Returns:
+        Tuple of (LinkedDataStore, {source: IngestDelta}) with a delta for
+        each source that had an export
+    """
+    from .opportunity_loader import load_opportunities
+    from .deployment_loader import load_deployments
+    from .case_loader import load_support_cases
+    from .data_linker import link_data_sources
+
+    loaders: Dict[str, Tuple[Optional[str], Callable[..., List[Any]]]] = {
+        "opportunities": (opportunities_path, lambda p: load_opportunities(p, console_output)),
+        "deployments": (deployments_path, lambda p: load_deployments(p, console_output)),
+        "support_cases": (support_path, lambda p: load_support_cases(p, console_output=console_output)),
+    }
+
+    deltas: Dict[str, IngestDelta] = {}
+    exports: Dict[str, List[Any]] = {}
+    for source, (path, loader) in loaders.items():
+        if not path:
+            continue
+        exports[source] = loader(path)
+        deltas[source] = store.diff(source, exports[source])
+        if console_output:
+            console_output.stream_message(f"  Delta {deltas[source].summary()}")
+
+    # A new store needs every record, not just the ones the state has not seen
+    records = exports if linked is None else {source: delta.records for source, delta in deltas.items()}
+    if linked is not None and before_link:
+        before_link(deltas)
+    linked = link_data_sources(
+        opportunities=records.get("opportunities", []),
+        deployments=records.get("deployments", []),
+        support_cases=records.get("support_cases", []),
+        console_output=console_output,
+        existing=linked,
+        fuzzy_link=fuzzy_link,
+    )
+
+    if commit:
+        commit_deltas(store, deltas)
+
+    return linked, deltas
+
+
+def commit_deltas(store: IngestStore, deltas: Dict[str, IngestDelta]) -> None:
+    """Record processed deltas (from ingest_exports) as ingested and save the store."""
+    for delta in deltas.values():
+        store.commit(delta)
+    store.save()
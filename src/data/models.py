@@ -7,11 +7,18 @@ Dataclass definitions for:
 - SupportCase: Support case messages
 - LinkedOrder: Order-linked bundle of all three sources
 - LinkSummary: Statistics about data correlation
+
+Records are slotted, repeated categorical strings (account names, owners,
+product models, ...) are interned, and message bodies are held once in a
+shared MessageArena that records reference by index.
 """
 
-from dataclasses import dataclass, field
+import sys
+import threading
+from array import array
+from dataclasses import dataclass, field, InitVar
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable
 from enum import Enum
 
 
@@ -40,7 +47,91 @@ class ProductSeries(Enum):
     UNKNOWN = "Unknown"
 
 
-@dataclass
+class MessageArena:
+    """
+    Shared, append-only store for message bodies.
+
+    Deployments and support cases keep a compact array of indexes into the
+    arena instead of their own lists of strings. Identical bodies (stock
+    replies, signatures, messages copied into duplicate cases) are stored
+    once. Indexes are only meaningful within the process that created them.
+    """
+
+    def __init__(self):
+        self._bodies: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, body: str) -> int:
+        """Store a body (if new) and return its index."""
+        idx = self._ids.get(body)
+        if idx is None:
+            with self._lock:
+                idx = self._ids.get(body)
+                if idx is None:
+                    idx = len(self._bodies)
+                    self._bodies.append(body)
+                    self._ids[body] = idx
+        return idx
+
+    def add_all(self, bodies: Iterable[str]) -> array:
+        """Store several bodies and return their indexes as an unsigned int array."""
+        return array("I", [self.add(body) for body in bodies])
+
+    def get(self, ids: Iterable[int]) -> List[str]:
+        """Resolve indexes back to message bodies."""
+        bodies = self._bodies
+        return [bodies[i] for i in ids]
+
+    def clear(self) -> None:
+        """
+        Drop every stored body, e.g. before a new ingest.
+
+        Records created before the reset hold indexes that no longer resolve,
+        so only clear once they are no longer used.
+        """
+        with self._lock:
+            self._bodies = []
+            self._ids = {}
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+
+# Process-wide arena used by Deployment and SupportCase
+MESSAGE_ARENA = MessageArena()
+
+
+def _empty_ids() -> array:
+    return array("I")
+
+
+def _intern_fields(record, names: Iterable[str]) -> None:
+    """Replace string fields with their interned copy so repeats share one object."""
+    for name in names:
+        value = getattr(record, name)
+        if type(value) is str:
+            setattr(record, name, sys.intern(value))
+
+
+def _arena_messages() -> property:
+    """Build the `messages` property that reads/writes through MESSAGE_ARENA."""
+    def get_messages(self) -> List[str]:
+        return MESSAGE_ARENA.get(self.message_ids)
+
+    def set_messages(self, bodies: Iterable[str]) -> None:
+        self.message_ids = MESSAGE_ARENA.add_all(bodies)
+
+    doc = (
+        "Message bodies, resolved from MESSAGE_ARENA.\n\n"
+        "Each read returns a new list, so in-place edits such as "
+        "`case.messages.append(body)` are lost. Write by assigning the whole "
+        "list: `case.messages = case.messages + [body]`."
+    )
+    return property(get_messages, set_messages, doc=doc)
+
+
+@dataclass(slots=True)
 class Opportunity:
     """
     Salesforce Opportunity record.
@@ -81,7 +172,9 @@ class Opportunity:
     product_series: ProductSeries = ProductSeries.UNKNOWN
 
     def __post_init__(self):
-        """Derive product series from primary product."""
+        """Derive product series from primary product and intern categorical fields."""
+        _intern_fields(self, _OPPORTUNITY_INTERNED_FIELDS)
+
         if self.primary_product:
             product_upper = str(self.primary_product).upper()
             if product_upper.startswith("F"):
@@ -94,7 +187,18 @@ class Opportunity:
                 self.product_series = ProductSeries.R_SERIES
 
 
-@dataclass
+_OPPORTUNITY_INTERNED_FIELDS = (
+    "order_number", "account_name", "opportunity_owner", "owner_role",
+    "fiscal_period", "lead_source", "deal_type", "primary_product", "system_model",
+)
+
+_CASE_INTERNED_FIELDS = (
+    "order_number", "account_name", "serial_number", "case_owner",
+    "case_reason", "status", "product_model",
+)
+
+
+@dataclass(slots=True)
 class Deployment:
     """
     Deployment case record.
@@ -127,16 +231,26 @@ class Deployment:
     # Support tier
     support_level: SupportLevel = SupportLevel.UNKNOWN
 
-    # Content (deployment notes/communication)
-    messages: List[str] = field(default_factory=list)
+    # Content (deployment notes/communication); bodies live in MESSAGE_ARENA
+    messages: InitVar[Optional[List[str]]] = None
     from_addresses: List[str] = field(default_factory=list)
 
     # Deployment-specific flags (derived during analysis)
     is_service_deploy: bool = False  # vs self-deploy
     deployment_score: int = 0  # 0-100
 
+    # Indexes of this record's messages in MESSAGE_ARENA
+    message_ids: array = field(default_factory=_empty_ids, repr=False)
+
+    def __post_init__(self, messages: Optional[List[str]]):
+        """Move messages into the shared arena and intern categorical fields."""
+        if messages:
+            self.message_ids = MESSAGE_ARENA.add_all(messages)
+        self.from_addresses = [sys.intern(a) for a in self.from_addresses]
+        _intern_fields(self, _CASE_INTERNED_FIELDS)
+
 
-@dataclass
+@dataclass(slots=True)
 class SupportCase:
     """
     Support case record.
@@ -169,8 +283,8 @@ class SupportCase:
     # Support tier
     support_level: SupportLevel = SupportLevel.UNKNOWN
 
-    # Content
-    messages: List[str] = field(default_factory=list)
+    # Content; bodies live in MESSAGE_ARENA
+    messages: InitVar[Optional[List[str]]] = None
     from_addresses: List[str] = field(default_factory=list)
 
     # Analysis results (populated later by analysis layers)
@@ -186,8 +300,24 @@ class SupportCase:
     escalation_detected: bool = False
     deployment_related: Optional[bool] = None  # If linked to deployment issues
 
+    # Indexes of this record's messages in MESSAGE_ARENA
+    message_ids: array = field(default_factory=_empty_ids, repr=False)
+
+    def __post_init__(self, messages: Optional[List[str]]):
+        """Move messages into the shared arena and intern categorical fields."""
+        if messages:
+            self.message_ids = MESSAGE_ARENA.add_all(messages)
+        self.from_addresses = [sys.intern(a) for a in self.from_addresses]
+        _intern_fields(self, _CASE_INTERNED_FIELDS)
+
+
+# `messages` keeps its list-of-strings API on top of the arena. Assigned after
+# class creation so the dataclass still sees the InitVar default of None.
+Deployment.messages = _arena_messages()
+SupportCase.messages = _arena_messages()
+
 
-@dataclass
+@dataclass(slots=True)
 class LinkedOrder:
     """
     Order-linked bundle of Opportunity, Deployments, and Support Cases.
@@ -239,7 +369,7 @@ class LinkedOrder:
         return len(self.deployments)
 
 
-@dataclass
+@dataclass(slots=True)
 class LinkSummary:
     """
     Summary statistics about data linking results.
@@ -0,0 +1,348 @@
+"""
+Column normalization for Account Solutions Success.
+
+Vectorized parsing shared by all loaders:
+- Severity, Support Level and Product Series columns -> pandas Categoricals
+- Date columns -> datetime64, parsed column-wise with a detected format
+- Free-text use case descriptions -> standard use case categories, via a
+  keyword taxonomy compiled once into a single word-boundary regex
+
+Enum columns are parsed once per *distinct* raw value (exports only contain
+a handful, e.g. "S2 - High", "Gold") and the result is broadcast back to the
+column through the factorized codes, so cost no longer grows with the
+per-row Python parsing the loaders used to do.
+"""
+
+import json
+import re
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from .models import Severity, SupportLevel, ProductSeries
+
+
+# Substring rules, checked in order (first match wins)
+SEVERITY_RULES: List[Tuple[Severity, Tuple[str, ...]]] = [
+    (Severity.S1, ("S1", "SEV1", "CRITICAL")),
+    (Severity.S2, ("S2", "SEV2", "HIGH")),
+    (Severity.S3, ("S3", "SEV3", "MEDIUM")),
+]
+
+# Stricter rules used by the single-file pipeline (analysis.data_loader),
+# which only recognises explicit S1-S4 labels.
+SEVERITY_CODE_RULES: List[Tuple[Severity, Tuple[str, ...]]] = [
+    (Severity.S1, ("S1",)),
+    (Severity.S2, ("S2",)),
+    (Severity.S3, ("S3",)),
+    (Severity.S4, ("S4",)),
+]
+
+SUPPORT_LEVEL_RULES: List[Tuple[SupportLevel, Tuple[str, ...]]] = [
+    (SupportLevel.GOLD, ("GOLD",)),
+    (SupportLevel.SILVER, ("SILVER",)),
+    (SupportLevel.BRONZE, ("BRONZE",)),
+]
+
+# Exact-match lookup for the "Product Series" column of case exports
+PRODUCT_SERIES_LOOKUP: Dict[str, ProductSeries] = {
+    "F": ProductSeries.F_SERIES, "F-SERIES": ProductSeries.F_SERIES, "FSERIES": ProductSeries.F_SERIES,
+    "M": ProductSeries.M_SERIES, "M-SERIES": ProductSeries.M_SERIES, "MSERIES": ProductSeries.M_SERIES,
+    "H": ProductSeries.H_SERIES, "H-SERIES": ProductSeries.H_SERIES, "HSERIES": ProductSeries.H_SERIES,
+    "R": ProductSeries.R_SERIES, "R-SERIES": ProductSeries.R_SERIES, "RSERIES": ProductSeries.R_SERIES,
+}
+
+# Substring rules for free-text product names (Opportunity "Primary Product")
+PRIMARY_PRODUCT_RULES: List[Tuple[ProductSeries, Tuple[str, ...]]] = [
+    (ProductSeries.F_SERIES, ("F-SERIES", "FSERIES", "F100", "F60", "F130")),
+    (ProductSeries.M_SERIES, ("M-SERIES", "MSERIES", "M40", "M50", "M60")),
+    (ProductSeries.H_SERIES, ("H-SERIES", "HSERIES", "H10", "H20")),
+    (ProductSeries.R_SERIES, ("R-SERIES", "RSERIES", "R10", "R20", "R30", "R40", "R50")),
+]
+
+PRIMARY_PRODUCT_PREFIXES: List[Tuple[ProductSeries, str]] = [
+    (ProductSeries.F_SERIES, "F"),
+    (ProductSeries.M_SERIES, "M"),
+    (ProductSeries.H_SERIES, "H"),
+    (ProductSeries.R_SERIES, "R"),
+]
+
+# Keyword taxonomy for free-text use cases, checked in order (first match
+# wins). Keywords match whole words (plural "s" allowed); a trailing "*"
+# matches any word starting with the keyword ("virtual*" -> "virtualization").
+USE_CASE_RULES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("Media & Entertainment", ("media", "video edit*", "broadcast*", "post-production", "4k", "8k")),
+    ("Backup & Archive", ("backup*", "archiv*", "dr", "disaster*", "retention", "cold storage")),
+    ("Virtualization", ("vm*", "virtual*", "vdi", "esxi", "hyper-v", "container*", "docker", "kubernetes")),
+    ("Database", ("database*", "sql", "oracle", "mysql", "mssql", "postgres*", "analytics", "olap", "oltp")),
+    ("File Sharing", ("file*", "share*", "nas", "smb", "nfs", "cifs", "collab*", "home director*")),
+    ("Video Surveillance", ("surveil*", "camera*", "nvr", "security", "cctv")),
+    ("Scientific/HPC", ("hpc", "research*", "scientific", "render*", "simulation*", "compute*")),
+]
+
+# Candidate formats tried (in order) when detecting a date column's format.
+# Month-first only, to agree with pd.to_datetime's default parsing.
+DATE_FORMAT_CANDIDATES: Tuple[str, ...] = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+    "%m/%d/%y %I:%M %p",
+    "%m/%d/%y %H:%M",
+    "%m/%d/%y",
+)
+
+_DATE_SAMPLE_SIZE = 200
+
+# Column name -> detected strptime format (None = no single format fits)
+_date_format_cache: Dict[str, Optional[str]] = {}
+
+
+def source_column(df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+    """Return df[column], or an all-missing column if it was not found."""
+    if column and column in df.columns:
+        return df[column]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _unique_text(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Factorize a column into codes and its distinct values as upper-case, stripped text."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    text = pd.Index([str(v) for v in uniques], dtype=object).str.upper().str.strip()
+    return codes, text
+
+
+def _categorical(
+    codes: np.ndarray,
+    unique_members: Sequence[Enum],
+    default: Enum,
+    enum_cls: Type[Enum],
+    index: pd.Index,
+) -> pd.Series:
+    """Broadcast per-unique enum members back to a Categorical column."""
+    categories = list(enum_cls)
+    position = {member: i for i, member in enumerate(categories)}
+    lookup = np.array([position[m] for m in unique_members] + [position[default]], dtype=np.int8)
+    # NA codes are -1, which indexes the trailing default slot
+    cat_codes = lookup[codes]
+    return pd.Series(
+        pd.Categorical.from_codes(cat_codes, categories=categories),
+        index=index,
+    )
+
+
+def _match_rules(
+    text: pd.Index,
+    rules: Sequence[Tuple[Enum, Tuple[str, ...]]],
+    default: Enum,
+) -> List[Enum]:
+    """Apply ordered substring rules to the distinct values of a column."""
+    if len(text) == 0:
+        return []
+    conditions = []
+    for _, needles in rules:
+        hit = np.zeros(len(text), dtype=bool)
+        for needle in needles:
+            hit |= np.asarray(text.str.contains(needle, regex=False), dtype=bool)
+        conditions.append(hit)
+    choices = np.arange(len(rules))
+    picked = np.select(conditions, choices, default=-1)
+    return [rules[i][0] if i >= 0 else default for i in picked]
+
+
+def normalize_severity(
+    values: pd.Series,
+    rules: Sequence[Tuple[Severity, Tuple[str, ...]]] = SEVERITY_RULES,
+) -> pd.Series:
+    """
+    Map a raw severity column to a Severity Categorical.
+
+    Missing or unrecognised values become Severity.S4.
+    """
+    codes, text = _unique_text(values)
+    members = _match_rules(text, rules, Severity.S4)
+    return _categorical(codes, members, Severity.S4, Severity, values.index)
+
+
+def normalize_severity_codes(values: pd.Series) -> pd.Series:
+    """
+    Map a raw severity column to "S1".."S4" string categories.
+
+    Used by the single-file pipeline, whose DataFrame keeps severity as text.
+    """
+    normalized = normalize_severity(values, rules=SEVERITY_CODE_RULES)
+    return normalized.cat.rename_categories([s.value for s in Severity])
+
+
+def normalize_support_level(values: pd.Series) -> pd.Series:
+    """Map a raw support level column to a SupportLevel Categorical."""
+    codes, text = _unique_text(values)
+    members = _match_rules(text, SUPPORT_LEVEL_RULES, SupportLevel.UNKNOWN)
+    return _categorical(codes, members, SupportLevel.UNKNOWN, SupportLevel, values.index)
+
+
+def normalize_product_series(values: pd.Series) -> pd.Series:
+    """Map a raw "Product Series" column (F, M-Series, ...) to a ProductSeries Categorical."""
+    codes, text = _unique_text(values)
+    members = [PRODUCT_SERIES_LOOKUP.get(t, ProductSeries.UNKNOWN) for t in text]
+    return _categorical(codes, members, ProductSeries.UNKNOWN, ProductSeries, values.index)
+
+
+def normalize_primary_product(values: pd.Series) -> pd.Series:
+    """
+    Derive a ProductSeries Categorical from free-text product names.
+
+    Explicit series/model identifiers win; otherwise the first character decides.
+    """
+    codes, text = _unique_text(values)
+    members = _match_rules(text, PRIMARY_PRODUCT_RULES, ProductSeries.UNKNOWN)
+    for i, member in enumerate(members):
+        if member is ProductSeries.UNKNOWN:
+            for series, prefix in PRIMARY_PRODUCT_PREFIXES:
+                if text[i].startswith(prefix):
+                    members[i] = series
+                    break
+    return _categorical(codes, members, ProductSeries.UNKNOWN, ProductSeries, values.index)
+
+
+def _keyword_pattern(keyword: str) -> str:
+    """Regex for one taxonomy keyword (see USE_CASE_RULES)."""
+    if keyword.endswith("*"):
+        return re.escape(keyword[:-1].strip()).replace(r"\ ", r"\s+")
+    return re.escape(keyword.strip()).replace(r"\ ", r"\s+") + r"s?\b"
+
+
+class UseCaseClassifier:
+    """
+    Keyword taxonomy compiled into one case-insensitive regex.
+
+    Each category is a named group of the alternation, anchored at a word
+    boundary, so one scan of the text finds every keyword ("dr" does not
+    match "drive"). Results are memoized per distinct text.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[str]]]):
+        self.categories = [category for category, _ in rules]
+        groups = [
+            f"(?P<c{i}>{'|'.join(_keyword_pattern(kw) for kw in keywords)})"
+            for i, (_, keywords) in enumerate(rules)
+            if keywords
+        ]
+        self._pattern = re.compile(r"\b(?:" + "|".join(groups) + ")", re.IGNORECASE) if groups else None
+        self.categorize = lru_cache(maxsize=8192)(self._categorize)
+
+    def _categorize(self, text: str) -> str:
+        if not text:
+            return "Unknown"
+        best = None
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                index = int(match.lastgroup[1:])
+                if best is None or index < best:
+                    best = index
+        return self.categories[best] if best is not None else "General Purpose"
+
+
+def load_use_case_taxonomy(path: str | Path) -> List[Tuple[str, Tuple[str, ...]]]:
+    """
+    Read a use case taxonomy from JSON: {"Category": ["keyword", ...], ...}.
+
+    Categories keep file order, which is also their priority.
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Use case taxonomy must map categories to keyword lists: {path}")
+    return [(str(category), tuple(str(kw) for kw in keywords)) for category, keywords in data.items()]
+
+
+_use_case_classifier = UseCaseClassifier(USE_CASE_RULES)
+
+
+def set_use_case_taxonomy(rules: Optional[Sequence[Tuple[str, Sequence[str]]]] = None) -> None:
+    """Replace the active use case taxonomy (None restores USE_CASE_RULES)."""
+    global _use_case_classifier
+    _use_case_classifier = UseCaseClassifier(USE_CASE_RULES if rules is None else rules)
+
+
+def use_case_categories() -> List[str]:
+    """Categories of the active taxonomy, in priority order."""
+    return list(_use_case_classifier.categories)
+
+
+def categorize_use_case(use_case_text: str) -> str:
+    """Map use case text to standard category."""
+    return _use_case_classifier.categorize(use_case_text or "")
+
+
+def _detect_date_format(sample: pd.Series) -> Optional[str]:
+    """Return the first candidate format that parses every value in the sample."""
+    for fmt in DATE_FORMAT_CANDIDATES:
+        parsed = pd.to_datetime(sample, format=fmt, errors="coerce")
+        if not parsed.isna().any():
+            return fmt
+    return None
+
+
+def parse_date_column(values: pd.Series) -> pd.Series:
+    """
+    Parse a date column to datetime64 in one pass.
+
+    The strptime format is detected from a sample of the column and cached by
+    column name, so later files from the same export skip detection. Values
+    the detected format cannot parse fall back to per-value inference;
+    unparseable values become NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    non_null = values.dropna()
+    if non_null.empty:
+        return pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    # Excel usually yields datetime cells already; only text needs a format
+    is_text = non_null.map(lambda v: isinstance(v, str))
+    if not is_text.any():
+        return pd.to_datetime(values, errors="coerce")
+
+    text = non_null[is_text].str.strip()
+    cache_key = str(values.name)
+
+    fmt = _date_format_cache.get(cache_key)
+    if fmt is None or pd.to_datetime(text.head(_DATE_SAMPLE_SIZE), format=fmt, errors="coerce").isna().any():
+        fmt = _detect_date_format(text.drop_duplicates().head(_DATE_SAMPLE_SIZE))
+        _date_format_cache[cache_key] = fmt
+
+    result = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]", name=values.name)
+    if fmt is not None:
+        parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+    else:
+        parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+
+    missed = parsed.isna()
+    if missed.any():
+        parsed[missed] = pd.to_datetime(text[missed], format="mixed", errors="coerce")
+    result.loc[text.index] = parsed
+
+    non_text = non_null[~is_text]
+    if not non_text.empty:
+        result.loc[non_text.index] = pd.to_datetime(non_text, errors="coerce")
+
+    return result
+
+
+def to_datetime_or_none(value) -> Optional[datetime]:
+    """Convert a parsed cell (Timestamp or NaT) to a model-ready value."""
+    if pd.isna(value):
+        return None
+    return value
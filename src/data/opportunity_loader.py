@@ -6,13 +6,18 @@ them to Opportunity dataclass instances.
 """
 
 from pathlib import Path
-from datetime import datetime
 from typing import List, Optional, Any
 import glob
 
 import pandas as pd
 
-from .models import Opportunity, ProductSeries
+from .models import Opportunity
+from .normalization import (
+    source_column,
+    normalize_primary_product,
+    parse_date_column,
+    to_datetime_or_none,
+)
 
 
 # Column mappings: expected column name -> possible variations
@@ -69,16 +74,6 @@ def _get_value(row: pd.Series, df: pd.DataFrame, field_name: str, default: Any =
     return default
 
 
-def _parse_date(value: Any) -> Optional[datetime]:
-    """Parse a date value to datetime."""
-    if pd.isna(value):
-        return None
-    try:
-        return pd.to_datetime(value)
-    except:
-        return None
-
-
 def _parse_amount(value: Any) -> float:
     """Parse amount value to float."""
     if pd.isna(value):
@@ -92,36 +87,6 @@ def _parse_amount(value: Any) -> float:
         return 0.0
 
 
-def _derive_product_series(primary_product: str) -> ProductSeries:
-    """Derive product series from primary product string."""
-    if not primary_product:
-        return ProductSeries.UNKNOWN
-
-    product_upper = str(primary_product).upper().strip()
-
-    # Check for explicit series identifiers
-    if any(x in product_upper for x in ["F-SERIES", "FSERIES", "F100", "F60", "F130"]):
-        return ProductSeries.F_SERIES
-    if any(x in product_upper for x in ["M-SERIES", "MSERIES", "M40", "M50", "M60"]):
-        return ProductSeries.M_SERIES
-    if any(x in product_upper for x in ["H-SERIES", "HSERIES", "H10", "H20"]):
-        return ProductSeries.H_SERIES
-    if any(x in product_upper for x in ["R-SERIES", "RSERIES", "R10", "R20", "R30", "R40", "R50"]):
-        return ProductSeries.R_SERIES
-
-    # Check first character
-    if product_upper.startswith("F"):
-        return ProductSeries.F_SERIES
-    if product_upper.startswith("M"):
-        return ProductSeries.M_SERIES
-    if product_upper.startswith("H"):
-        return ProductSeries.H_SERIES
-    if product_upper.startswith("R"):
-        return ProductSeries.R_SERIES
-
-    return ProductSeries.UNKNOWN
-
-
 def load_opportunities(
     file_path: str | Path,
     console_output: Any = None
@@ -172,6 +137,11 @@ def load_opportunities(
     if not order_col:
         raise ValueError(f"Order Number column not found. Available columns: {list(df.columns)}")
 
+    # Normalize product series and date columns once, column-wise
+    product_series = normalize_primary_product(source_column(df, _find_column(df, "primary_product")))
+    close_dates = parse_date_column(source_column(df, _find_column(df, "close_date")))
+    created_dates = parse_date_column(source_column(df, _find_column(df, "created_date")))
+
     opportunities = []
     skipped = 0
 
@@ -195,8 +165,8 @@ def load_opportunities(
             lead_source=str(_get_value(row, df, "lead_source", "")),
             deal_type=str(_get_value(row, df, "deal_type", "")),
             amount=_parse_amount(_get_value(row, df, "amount", 0)),
-            close_date=_parse_date(_get_value(row, df, "close_date")),
-            created_date=_parse_date(_get_value(row, df, "created_date")),
+            close_date=to_datetime_or_none(close_dates.at[row.name]),
+            created_date=to_datetime_or_none(created_dates.at[row.name]),
             products_quoted=str(_get_value(row, df, "products_quoted", "")),
             primary_product=primary_product,
             system_model=str(_get_value(row, df, "system_model", "")),
@@ -204,7 +174,7 @@ def load_opportunities(
             primary_use_case=str(_get_value(row, df, "primary_use_case", "")),
             pain_points=str(_get_value(row, df, "pain_points", "")),
             next_step=str(_get_value(row, df, "next_step", "")),
-            product_series=_derive_product_series(primary_product),
+            product_series=product_series.at[row.name],
         )
 
         opportunities.append(opp)
@@ -0,0 +1,535 @@
+"""
+SQLite persistence for Account Solutions Success.
+
+Persists a LinkedDataStore (plus per-layer analysis results) to one SQLite
+file with normalized tables:
+- orders: one row per linked order, with cross-layer evaluation fields
+- opportunities / deployments / support_cases: one row per record;
+  linked_order is NULL for orphans
+- messages: message bodies per deployment / case, in order
+- layer_results: analysis results per layer and record key, as JSON
+- aliases: order and account aliases from entity resolution
+
+LinkedDataDB queries slices ("S1 cases for F-Series in FY25 Q3") without
+loading the whole dataset, or rebuilds the full LinkedDataStore.
+"""
+
+import json
+import sqlite3
+from dataclasses import asdict, fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from .models import (
+    Opportunity,
+    Deployment,
+    SupportCase,
+    LinkedOrder,
+    LinkSummary,
+    Severity,
+    SupportLevel,
+    ProductSeries,
+)
+from .data_linker import LinkedDataStore
+
+
+SCHEMA_VERSION = 1
+
+# Enum-typed model fields, stored as their value
+ENUM_FIELDS: Dict[str, Type[Enum]] = {
+    "severity": Severity,
+    "support_level": SupportLevel,
+    "product_series": ProductSeries,
+}
+
+# List-typed model fields, stored as JSON
+JSON_FIELDS = {"from_addresses", "critical_findings", "positive_signals", "immediate_actions"}
+
+# Model fields not persisted as columns (messages get their own table)
+SKIPPED_FIELDS = {"message_ids", "opportunity", "deployments", "support_cases"}
+
+# Message owners in the messages table
+DEPLOYMENT_MESSAGES = "deployment"
+CASE_MESSAGES = "support_case"
+
+# SQLite's default limit on bound parameters is 999
+_MAX_PARAMS = 900
+
+_INDEXES = (
+    "CREATE INDEX idx_orders_account ON orders(account_name)",
+    "CREATE INDEX idx_orders_use_case ON orders(use_case)",
+    "CREATE INDEX idx_opportunities_order ON opportunities(linked_order)",
+    "CREATE INDEX idx_opportunities_period ON opportunities(fiscal_period)",
+    "CREATE INDEX idx_opportunities_account ON opportunities(account_name)",
+    "CREATE INDEX idx_deployments_order ON deployments(linked_order)",
+    "CREATE INDEX idx_deployments_series ON deployments(product_series)",
+    "CREATE INDEX idx_deployments_serial ON deployments(serial_number)",
+    "CREATE INDEX idx_cases_order ON support_cases(linked_order)",
+    "CREATE INDEX idx_cases_series_severity ON support_cases(product_series, severity)",
+    "CREATE INDEX idx_cases_serial ON support_cases(serial_number)",
+    "CREATE INDEX idx_cases_account ON support_cases(account_name)",
+)
+
+
+# Bool-typed model fields (SQLite returns them as 0/1)
+_BOOL_FIELDS: Dict[type, set] = {
+    model: {f.name for f in fields(model) if isinstance(f.default, bool)}
+    | ({"deployment_related"} if model is SupportCase else set())
+    for model in (Opportunity, Deployment, SupportCase, LinkedOrder)
+}
+
+
+def _columns(model: type) -> List[str]:
+    return [f.name for f in fields(model) if f.name not in SKIPPED_FIELDS]
+
+
+def _encode_date(value: datetime) -> str:
+    return value.isoformat(timespec="microseconds")
+
+
+def _column_encoder(model: type, name: str) -> Optional[Callable[[Any], Any]]:
+    """Converter from a model field value to its SQLite value (None = as is)."""
+    if name in ENUM_FIELDS:
+        return attrgetter("value")
+    if name.endswith("_date"):
+        return _encode_date
+    if name in JSON_FIELDS:
+        return lambda value: json.dumps(list(value))
+    return None
+
+
+def _column_decoder(model: type, name: str) -> Optional[Callable[[Any], Any]]:
+    """Converter from a SQLite value back to the model field value (None = as is)."""
+    if name in ENUM_FIELDS:
+        return ENUM_FIELDS[name]
+    if name.endswith("_date"):
+        return datetime.fromisoformat
+    if name in JSON_FIELDS:
+        return json.loads
+    if name in _BOOL_FIELDS[model]:
+        return bool
+    return None
+
+
+class _Codec:
+    """Row <-> record conversion for one model, with per-column converters precomputed."""
+
+    def __init__(self, model: type):
+        self.model = model
+        self.columns = _columns(model)
+        self._getter = attrgetter(*self.columns)
+        self._encoders = [
+            (i, fn) for i, name in enumerate(self.columns) if (fn := _column_encoder(model, name))
+        ]
+        self._decoders = [
+            (name, fn) for name in self.columns if (fn := _column_decoder(model, name))
+        ]
+
+    def encode(self, record: Any) -> List[Any]:
+        values = list(self._getter(record))
+        for i, fn in self._encoders:
+            if values[i] is not None:
+                values[i] = fn(values[i])
+        return values
+
+    def decode(self, row: sqlite3.Row) -> Dict[str, Any]:
+        values = {name: row[name] for name in self.columns}
+        for name, fn in self._decoders:
+            if values[name] is not None or name in ENUM_FIELDS:
+                values[name] = fn(values[name])
+        return values
+
+
+_CODECS: Dict[type, _Codec] = {
+    model: _Codec(model) for model in (Opportunity, Deployment, SupportCase, LinkedOrder)
+}
+
+
+def _to_sql(name: str, value: Any) -> Any:
+    """Convert a single filter value to its SQLite value."""
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return _encode_date(value)
+    return value
+
+
+def _payload(result: Any) -> str:
+    """Serialize a layer result (dataclass or plain object) to JSON."""
+    if is_dataclass(result):
+        data = asdict(result)
+    elif hasattr(result, "__dict__"):
+        data = vars(result)
+    else:
+        data = result
+    return json.dumps(data, default=str)
+
+
+def _normalize_series(product_series: str) -> str:
+    """Normalize "F", "f-series", "F-Series" to a ProductSeries value ("F")."""
+    key = product_series.upper().replace("-SERIES", "").replace("SERIES", "").strip()
+    return ProductSeries.UNKNOWN.value if key == ProductSeries.UNKNOWN.value.upper() else key
+
+
+class LinkedDataDB:
+    """
+    Query API over a persisted LinkedDataStore.
+
+    Usage:
+        LinkedDataDB.write(linked_data, "outputs/run/linked_data.db", layer_results)
+        with LinkedDataDB("outputs/run/linked_data.db") as db:
+            cases = db.cases(severity="S1", product_series="F", fiscal_period="FY25 Q3")
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Linked data database not found: {self.path}")
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "LinkedDataDB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def write(
+        cls,
+        store: LinkedDataStore,
+        path: str | Path,
+        layer_results: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> "LinkedDataDB":
+        """
+        Write a LinkedDataStore to a new SQLite file (replacing any existing one).
+
+        Args:
+            store: Linked data to persist
+            path: Database file path
+            layer_results: Optional {layer name: {record key: result}}, e.g.
+                {"opportunity": {...}, "deployment": {...}, "support": {...}, "evaluation": {...}}
+
+        Returns:
+            LinkedDataDB opened on the written file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        conn = sqlite3.connect(str(tmp_path))
+        try:
+            # Bulk load into a scratch file: no journal, indexes built afterwards
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            _create_schema(conn)
+            with conn:
+                _write_store(conn, store)
+                for layer, results in (layer_results or {}).items():
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO layer_results (layer, record_key, payload) VALUES (?, ?, ?)",
+                        ((layer, str(key), _payload(result)) for key, result in results.items()),
+                    )
+                for statement in _INDEXES:
+                    conn.execute(statement)
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+
+        tmp_path.replace(path)
+        return cls(path)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """Run an ad-hoc SQL query and return its rows."""
+        return self.conn.execute(sql, params).fetchall()
+
+    def summary(self) -> LinkSummary:
+        """Link summary captured when the store was written."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'summary'").fetchone()
+        return LinkSummary(**json.loads(row["value"])) if row else LinkSummary()
+
+    def opportunities(
+        self,
+        account: Optional[str] = None,
+        fiscal_period: Optional[str] = None,
+        product_series: Optional[str] = None,
+        order_number: Optional[str] = None,
+    ) -> List[Opportunity]:
+        """Opportunities matching all given filters."""
+        where, params = _filters("o", account=account, fiscal_period=fiscal_period,
+                                 product_series=product_series, order_number=order_number)
+        rows = self.execute(f"SELECT o.* FROM opportunities o {where} ORDER BY o.rowid", params)
+        return [_build(Opportunity, row) for row in rows]
+
+    def deployments(
+        self,
+        account: Optional[str] = None,
+        product_series: Optional[str] = None,
+        is_service_deploy: Optional[bool] = None,
+        serial_number: Optional[str] = None,
+        fiscal_period: Optional[str] = None,
+        order_number: Optional[str] = None,
+        with_messages: bool = True,
+    ) -> List[Deployment]:
+        """Deployments matching all given filters (fiscal period via the linked opportunity)."""
+        where, params = _filters("d", account=account, product_series=product_series,
+                                 is_service_deploy=is_service_deploy, serial_number=serial_number,
+                                 fiscal_period=fiscal_period, order_number=order_number)
+        rows = self.execute(f"SELECT d.* FROM deployments d {where} ORDER BY d.rowid", params)
+        messages = self._messages(DEPLOYMENT_MESSAGES, [r["case_number"] for r in rows]) if with_messages else {}
+        return [_build(Deployment, row, messages.get(row["case_number"])) for row in rows]
+
+    def cases(
+        self,
+        account: Optional[str] = None,
+        severity: Optional[str] = None,
+        product_series: Optional[str] = None,
+        status: Optional[str] = None,
+        serial_number: Optional[str] = None,
+        fiscal_period: Optional[str] = None,
+        order_number: Optional[str] = None,
+        with_messages: bool = True,
+    ) -> List[SupportCase]:
+        """Support cases matching all given filters (fiscal period via the linked opportunity)."""
+        where, params = _filters("c", account=account, severity=severity, product_series=product_series,
+                                 status=status, serial_number=serial_number,
+                                 fiscal_period=fiscal_period, order_number=order_number)
+        rows = self.execute(f"SELECT c.* FROM support_cases c {where} ORDER BY c.rowid", params)
+        messages = self._messages(CASE_MESSAGES, [r["case_number"] for r in rows]) if with_messages else {}
+        return [_build(SupportCase, row, messages.get(row["case_number"])) for row in rows]
+
+    def orders(
+        self,
+        account: Optional[str] = None,
+        use_case: Optional[str] = None,
+        churn_risk: Optional[str] = None,
+        order_numbers: Optional[Iterable[str]] = None,
+        with_messages: bool = True,
+    ) -> List[LinkedOrder]:
+        """Linked orders (with their records) matching all given filters."""
+        clauses, params = [], []
+        for column, value in (("account_name", account), ("use_case", use_case), ("churn_risk", churn_risk)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if order_numbers is None:
+            rows = self.execute(
+                "SELECT * FROM orders" + (" WHERE " + " AND ".join(clauses) if clauses else "") + " ORDER BY rowid",
+                params,
+            )
+            return self._assemble_orders(rows, with_messages)
+
+        # Order number lists are looked up in batches, then put back in table order
+        numbers = list(dict.fromkeys(order_numbers))
+        rows = []
+        for start in range(0, len(numbers), _MAX_PARAMS):
+            chunk = numbers[start:start + _MAX_PARAMS]
+            where = " AND ".join(clauses + [f"order_number IN ({','.join('?' * len(chunk))})"])
+            rows.extend(self.execute(f"SELECT rowid, * FROM orders WHERE {where}", [*params, *chunk]))
+        rows.sort(key=lambda r: r["rowid"])
+        return self._assemble_orders(rows, with_messages)
+
+    def layer_results(self, layer: str, record_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Analysis results for a layer, keyed by record key (order or case number)."""
+        sql = "SELECT record_key, payload FROM layer_results WHERE layer = ?"
+        params: List[Any] = [layer]
+        if record_key is not None:
+            sql += " AND record_key = ?"
+            params.append(str(record_key))
+        return {row["record_key"]: json.loads(row["payload"]) for row in self.execute(sql, params)}
+
+    def load_store(self) -> LinkedDataStore:
+        """Rebuild the full LinkedDataStore."""
+        orders = self._assemble_orders(self.execute("SELECT * FROM orders ORDER BY rowid"), with_messages=True)
+
+        orphan_opps = [_build(Opportunity, r) for r in self.execute(
+            "SELECT * FROM opportunities WHERE linked_order IS NULL ORDER BY rowid")]
+        deploy_rows = self.execute("SELECT * FROM deployments WHERE linked_order IS NULL ORDER BY rowid")
+        deploy_messages = self._messages(DEPLOYMENT_MESSAGES, [r["case_number"] for r in deploy_rows])
+        case_rows = self.execute("SELECT * FROM support_cases WHERE linked_order IS NULL ORDER BY rowid")
+        case_messages = self._messages(CASE_MESSAGES, [r["case_number"] for r in case_rows])
+
+        store = LinkedDataStore(
+            orders=orders,
+            orphan_opportunities=orphan_opps,
+            orphan_deployments=[_build(Deployment, r, deploy_messages.get(r["case_number"])) for r in deploy_rows],
+            orphan_cases=[_build(SupportCase, r, case_messages.get(r["case_number"])) for r in case_rows],
+            summary=self.summary(),
+        )
+        for row in self.execute("SELECT kind, alias, canonical FROM aliases"):
+            target = store.order_aliases if row["kind"] == "order" else store.account_aliases
+            target[row["alias"]] = row["canonical"]
+        return store
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _messages(self, record_type: str, case_numbers: List[str]) -> Dict[str, List[str]]:
+        """Message bodies per case number, in their original order."""
+        messages: Dict[str, List[str]] = {}
+        for start in range(0, len(case_numbers), _MAX_PARAMS):
+            chunk = case_numbers[start:start + _MAX_PARAMS]
+            rows = self.execute(
+                f"SELECT case_number, body FROM messages WHERE record_type = ? "
+                f"AND case_number IN ({','.join('?' * len(chunk))}) ORDER BY case_number, position",
+                [record_type, *chunk],
+            )
+            for row in rows:
+                messages.setdefault(row["case_number"], []).append(row["body"])
+        return messages
+
+    def _assemble_orders(self, order_rows: List[sqlite3.Row], with_messages: bool) -> List[LinkedOrder]:
+        """Build LinkedOrders for order rows, attaching their records."""
+        orders: Dict[str, LinkedOrder] = {}
+        for row in order_rows:
+            orders[row["order_number"]] = LinkedOrder(**_CODECS[LinkedOrder].decode(row))
+        if not orders:
+            return []
+
+        numbers = list(orders)
+        for start in range(0, len(numbers), _MAX_PARAMS):
+            chunk = numbers[start:start + _MAX_PARAMS]
+            marks = ",".join("?" * len(chunk))
+
+            for row in self.execute(f"SELECT * FROM opportunities WHERE linked_order IN ({marks})", chunk):
+                orders[row["linked_order"]].opportunity = _build(Opportunity, row)
+
+            rows = self.execute(f"SELECT * FROM deployments WHERE linked_order IN ({marks}) ORDER BY rowid", chunk)
+            messages = self._messages(DEPLOYMENT_MESSAGES, [r["case_number"] for r in rows]) if with_messages else {}
+            for row in rows:
+                orders[row["linked_order"]].deployments.append(
+                    _build(Deployment, row, messages.get(row["case_number"])))
+
+            rows = self.execute(f"SELECT * FROM support_cases WHERE linked_order IN ({marks}) ORDER BY rowid", chunk)
+            messages = self._messages(CASE_MESSAGES, [r["case_number"] for r in rows]) if with_messages else {}
+            for row in rows:
+                orders[row["linked_order"]].support_cases.append(
+                    _build(SupportCase, row, messages.get(row["case_number"])))
+
+        return list(orders.values())
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    def table(name: str, model: type, extra: str, key: Optional[str]) -> str:
+        cols = [f"{c} PRIMARY KEY" if c == key else c for c in _columns(model)]
+        return f"CREATE TABLE {name} ({extra}{', '.join(cols)})"
+
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute(table("orders", LinkedOrder, "use_case TEXT, ", "order_number"))
+    conn.execute(table("opportunities", Opportunity, "linked_order TEXT, ", None))
+    conn.execute(table("deployments", Deployment, "linked_order TEXT, ", "case_number"))
+    conn.execute(table("support_cases", SupportCase, "linked_order TEXT, ", "case_number"))
+    conn.execute(
+        "CREATE TABLE messages (record_type TEXT, case_number TEXT, position INTEGER, body TEXT, "
+        "PRIMARY KEY (record_type, case_number, position))"
+    )
+    conn.execute(
+        "CREATE TABLE layer_results (layer TEXT, record_key TEXT, payload TEXT, PRIMARY KEY (layer, record_key))"
+    )
+    conn.execute("CREATE TABLE aliases (kind TEXT, alias TEXT, canonical TEXT, PRIMARY KEY (kind, alias))")
+
+
+def _insert(conn: sqlite3.Connection, table: str, model: type, rows: Iterable[Tuple[Optional[str], Any]]) -> None:
+    """Insert (linked order, record) pairs into a record table."""
+    codec = _CODECS[model]
+    sql = (
+        f"INSERT OR REPLACE INTO {table} (linked_order, {', '.join(codec.columns)}) "
+        f"VALUES ({', '.join('?' * (len(codec.columns) + 1))})"
+    )
+    conn.executemany(sql, ([linked, *codec.encode(record)] for linked, record in rows))
+
+
+def _insert_messages(conn: sqlite3.Connection, record_type: str, records: Iterable[Any]) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO messages (record_type, case_number, position, body) VALUES (?, ?, ?, ?)",
+        (
+            (record_type, record.case_number, position, body)
+            for record in records
+            for position, body in enumerate(record.messages)
+        ),
+    )
+
+
+def _write_store(conn: sqlite3.Connection, store: LinkedDataStore) -> None:
+    codec = _CODECS[LinkedOrder]
+    conn.executemany(
+        f"INSERT INTO orders (use_case, {', '.join(codec.columns)}) "
+        f"VALUES ({', '.join('?' * (len(codec.columns) + 1))})",
+        ([store.get_use_case(order.order_number), *codec.encode(order)] for order in store.orders),
+    )
+
+    _insert(conn, "opportunities", Opportunity,
+            [(o.order_number, o.opportunity) for o in store.orders if o.opportunity]
+            + [(None, opp) for opp in store.orphan_opportunities])
+
+    deployments = [(o.order_number, d) for o in store.orders for d in o.deployments]
+    deployments += [(None, d) for d in store.orphan_deployments]
+    _insert(conn, "deployments", Deployment, deployments)
+    _insert_messages(conn, DEPLOYMENT_MESSAGES, (d for _, d in deployments))
+
+    cases = [(o.order_number, c) for o in store.orders for c in o.support_cases]
+    cases += [(None, c) for c in store.orphan_cases]
+    _insert(conn, "support_cases", SupportCase, cases)
+    _insert_messages(conn, CASE_MESSAGES, (c for _, c in cases))
+
+    conn.executemany(
+        "INSERT INTO aliases (kind, alias, canonical) VALUES (?, ?, ?)",
+        [("order", a, c) for a, c in store.order_aliases.items()]
+        + [("account", a, c) for a, c in store.account_aliases.items()],
+    )
+    conn.executemany(
+        "INSERT INTO meta (key, value) VALUES (?, ?)",
+        [
+            ("schema_version", str(SCHEMA_VERSION)),
+            ("written_at", datetime.now().isoformat()),
+            ("summary", json.dumps(asdict(store.summary))),
+        ],
+    )
+
+
+def _filters(alias: str, **filters: Any) -> Tuple[str, List[Any]]:
+    """Build a WHERE clause for record-table filters (None = not filtered)."""
+    clauses, params, join = [], [], ""
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name == "fiscal_period" and alias != "o":
+            join = f"JOIN opportunities fp ON fp.linked_order = {alias}.linked_order "
+            clauses.append("fp.fiscal_period = ?")
+        elif name == "account":
+            clauses.append(f"{alias}.account_name = ?")
+        elif name == "order_number":
+            clauses.append(f"{alias}.linked_order = ?")
+        else:
+            clauses.append(f"{alias}.{name} = ?")
+        if name == "product_series":
+            value = _normalize_series(value)
+        params.append(_to_sql(name, value))
+    return join + ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _build(model: type, row: sqlite3.Row, messages: Optional[List[str]] = None) -> Any:
+    """Construct a model instance from a table row."""
+    values = _CODECS[model].decode(row)
+    if model is not Opportunity:
+        values["messages"] = messages or []
+    return model(**values)
@@ -9,18 +9,28 @@ This module coordinates the full analysis pipeline:
 4. Run Claude 3.5 Sonnet quick scoring and detailed timelines
 5. Generate visualizations
 6. Save outputs (charts, JSON, PDF report)
+
+run_portfolio_analysis() runs the same pipeline for every account of a
+multi-account export, several accounts at a time.
 """
 
 import json
+import re
+import sqlite3
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 import numpy as np
 
 from .core import (
     Config,
+    OutputWriter,
+    RunCatalog,
     console,
     print_header,
     print_stage,
@@ -37,85 +47,160 @@ from .analysis import (
     run_deepseek_detailed_timeline,
     calculate_criticality_scores,
     calculate_account_health_score,
+    score_feature_table,
+    save_score_features,
+    SCORE_FEATURES_FILE,
     analyze_asset_correlations,
     build_account_intelligence_brief,
+    FleetAssetIndex,
     DEFAULT_ANALYSIS_CONTEXT,
+    save_case_tables,
+    save_result_table,
+    opportunity_table,
+    deployment_table,
+    support_case_table,
+    evaluation_table,
 )
 from .visualization import generate_all_charts
 from .context import (
+    ProductContext,
+    case_key,
+    get_loader,
     load_context_for_case,
-    get_product_line_from_serial,
-    get_product_line_from_series,
-    get_product_line_from_model,
+    load_retrieval_context,
 )
 
 
+PORTFOLIO_SUMMARY_FILE = "portfolio_summary.json"
+
+_charts_lock = threading.Lock()
+
+
+def detect_case_products(df, loader=None) -> Dict[str, str]:
+    """
+    Product line of each case, keyed by case_key(case number).
+
+    A case's Product Series decides first (e.g. 'F', 'M'), then its Product
+    Model (e.g. 'F100-HA'), then its Asset Serial. Each distinct value is
+    looked up once.
+    """
+    if "Case Number" not in df.columns:
+        return {}
+
+    loader = loader or get_loader()
+    resolvers = [
+        ("Product Series", loader.get_product_line_from_series),
+        ("Product Model", loader.get_product_line_from_model),
+        ("Asset Serial", loader.get_product_line_from_serial),
+    ]
+    case_products: Dict[str, str] = {}
+    for column, resolve in resolvers:
+        if column not in df.columns:
+            continue
+        values = df.loc[df[column].notna(), ["Case Number", column]]
+        lookups = {value: resolve(str(value)) for value in values[column].unique() if str(value).strip()}
+        products = values[column].map(lookups).dropna()
+        first_products = products.groupby(values.loc[products.index, "Case Number"], sort=False).first()
+        for case_number, product in first_products.items():
+            case_products.setdefault(case_key(case_number), product)
+    return case_products
+
+
+def _product_analysis_context(product_line: Optional[str], client, label: str = ""):
+    """Analysis context (string or RetrievalContext) for one product line."""
+    # Retrieval: each prompt gets the documentation passages relevant to its case
+    if Config.CONTEXT_RETRIEVAL:
+        retrieval_context = load_retrieval_context(
+            DEFAULT_ANALYSIS_CONTEXT,
+            product_line,
+            token_budget=Config.CONTEXT_TOKEN_BUDGET,
+            top_k=Config.CONTEXT_TOP_K,
+        )
+        if retrieval_context is not None:
+            client.stream_message(
+                f"  {label}Indexed {len(retrieval_context.index):,} documentation passages "
+                f"(up to {Config.CONTEXT_TOKEN_BUDGET:,} tokens retrieved per case)"
+            )
+            return retrieval_context
+
+    # Load context (SLA + product-specific docs)
+    loaded_context, _ = load_context_for_case(product_line=product_line)
+
+    # Combine with default analysis context
+    if loaded_context:
+        client.stream_message(f"  {label}Loaded {len(loaded_context):,} chars of product documentation")
+        return DEFAULT_ANALYSIS_CONTEXT + "\n\n" + loaded_context
+
+    client.stream_message(f"  {label}Using default context (no product docs loaded)")
+    return DEFAULT_ANALYSIS_CONTEXT
+
+
 def build_enhanced_context(df, client=None) -> tuple:
     """
     Build enhanced analysis context from loaded data.
 
-    Detects product line from Product Series or Product Model columns and loads:
+    Detects the product line of each case from its Product Series, Product
+    Model or Asset Serial and loads:
     - Global context (SLA, always-load docs)
     - Product-specific documentation
 
+    With Config.CONTEXT_RETRIEVAL the documents are indexed instead and a
+    RetrievalContext is returned: prompts then carry only the passages
+    relevant to each case.
+
+    An account with several product lines gets a ProductContext: the
+    context of each product line is built once, and each case is given its
+    own product's context (cases of unknown product use the most common).
+
     Args:
         df: DataFrame with case data containing Product Series or Product Model columns
         client: Optional streaming output client for progress messages
 
     Returns:
-        Tuple of (enhanced_context_string, detected_product_line)
+        Tuple of (enhanced_context, primary_product_line); the context is a
+        string, a RetrievalContext or a ProductContext
     """
     if client is None:
         client = streaming_output
 
-    detected_products = set()
-
-    # Primary method: Use Product Series column (e.g., 'F', 'M', 'H', 'R')
-    if "Product Series" in df.columns:
-        series_values = df["Product Series"].dropna().unique().tolist()
-        for series in series_values:
-            product = get_product_line_from_series(str(series))
-            if product:
-                detected_products.add(product)
-
-    # Fallback: Use Product Model column (e.g., 'F100-HA', 'M50')
-    if not detected_products and "Product Model" in df.columns:
-        model_values = df["Product Model"].dropna().unique().tolist()
-        for model in model_values:
-            product = get_product_line_from_model(str(model))
-            if product:
-                detected_products.add(product)
-
-    # Last resort: Use Asset Serial column
-    if not detected_products and "Asset Serial" in df.columns:
-        serial_values = df["Asset Serial"].dropna().unique().tolist()
-        for serial in serial_values:
-            product = get_product_line_from_serial(str(serial))
-            if product:
-                detected_products.add(product)
-
-    # Use first detected product (most common case: single product per account)
-    primary_product = list(detected_products)[0] if detected_products else None
+    case_products = detect_case_products(df)
+    counts = Counter(case_products.values())
+    products = sorted(counts, key=lambda product: (-counts[product], product))
+    primary_product = products[0] if products else None
 
     if primary_product:
         client.stream_message(f"  Detected product line: {primary_product}")
-        if len(detected_products) > 1:
-            client.stream_message(f"  Note: Multiple products detected: {', '.join(detected_products)}")
+    if len(products) <= 1:
+        return _product_analysis_context(primary_product, client), primary_product
 
-    # Load context (SLA + product-specific docs)
-    loaded_context, product_line = load_context_for_case(
-        product_line=primary_product
+    client.stream_message(
+        "  Multiple products detected: "
+        + ", ".join(f"{product} ({counts[product]} cases)" for product in products)
     )
 
-    # Combine with default analysis context
-    if loaded_context:
-        enhanced_context = DEFAULT_ANALYSIS_CONTEXT + "\n\n" + loaded_context
-        client.stream_message(f"  Loaded {len(loaded_context):,} chars of product documentation")
-    else:
-        enhanced_context = DEFAULT_ANALYSIS_CONTEXT
-        client.stream_message("  Using default context (no product docs loaded)")
+    # Extract every product's documents in one parallel pass
+    loader = get_loader()
+    loader.prefetch_pdf_texts(
+        loader.context_dir / filename for product in products for filename in loader.context_filenames(product)
+    )
 
-    return enhanced_context, product_line
+    contexts = {product: _product_analysis_context(product, client, f"{product}: ") for product in products}
+    return ProductContext(contexts, case_products, primary_product), primary_product
+
+
+def record_completed_runs(output_path: Path, folders: List[Path], client=None) -> None:
+    """
+    Add finished run folders to the output directory's run catalog.
+
+    The catalog can be repaired from the folders, so a failed update only
+    warns instead of failing the run.
+    """
+    if client is None:
+        client = streaming_output
+    try:
+        RunCatalog(output_path).record_runs(folders)
+    except (sqlite3.Error, OSError) as e:
+        client.stream_message(f"  Run catalog not updated: {e}")
 
 
 def run_analysis(
@@ -159,14 +244,6 @@ def run_analysis(
     run_output_dir = output_path / f"analysis_{timestamp}"
     run_output_dir.mkdir(parents=True, exist_ok=True)
 
-    charts_dir = run_output_dir / "charts"
-    json_dir = run_output_dir / "json"
-    reports_dir = run_output_dir / "reports"
-
-    charts_dir.mkdir(exist_ok=True)
-    json_dir.mkdir(exist_ok=True)
-    reports_dir.mkdir(exist_ok=True)
-
     print_header(
         "TrueNAS Customer Sentiment Analysis",
         f"Input: {input_file}"
@@ -183,83 +260,147 @@ def run_analysis(
         # STAGE 1.5: Detect and merge duplicates
         df = detect_and_merge_case_relationships(df, client)
 
-        # STAGE 1.6: Load context documentation
-        if analysis_context is None:
-            print_stage(2, "CONTEXT LOADING", "Loading SLA and product documentation")
-            analysis_context, detected_product = build_enhanced_context(df, client)
-        else:
-            detected_product = None
-            client.stream_message("  Using custom analysis context provided")
-
-        # STAGE 2: Claude Haiku analysis
-        print_stage(3, "CLAUDE 3.5 HAIKU ANALYSIS", "Analyzing all cases for frustration patterns")
-        (case_analysis, claude_statistics, issue_categories,
-         support_level_distribution, claude_time) = run_claude_analysis(
-            df, analysis_context, client
+        result = analyze_account(
+            df, current_date, run_output_dir,
+            analysis_context=analysis_context,
+            skip_sonnet=skip_sonnet,
+            client=client,
+            start_time=start_time,
         )
+        record_completed_runs(output_path, [run_output_dir], client)
+        return result
 
-        # STAGE 4: Criticality scoring
-        print_stage(4, "CRITICALITY SCORING", "Calculating priority scores")
-        case_analysis = calculate_criticality_scores(case_analysis, client)
+    except Exception as e:
+        print_error(f"Analysis failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
 
-        # Initialize Sonnet statistics
-        deepseek_statistics = {
-            "total_scored": 0,
-            "total_analyzed": 0,
-            "api_errors": 0,
-            "quick_scoring_time": 0,
-            "detailed_timeline_time": 0,
-            "analysis_time_seconds": 0,
+        return {
+            "success": False,
+            "error": str(e),
         }
-        deepseek_time = 0
 
-        if not skip_sonnet:
-            # Build account brief for quick scoring
-            account_brief_light = build_account_intelligence_brief(
-                case_analysis, asset_correlations=None, mode='light'
-            )
 
-            # STAGE 5: Claude Sonnet quick scoring
-            print_stage(5, "CLAUDE 3.5 SONNET - QUICK SCORING", "Pattern analysis on top cases")
-            quick_stats, quick_time = run_deepseek_quick_scoring(
-                case_analysis, analysis_context, client, account_brief_light
-            )
-            deepseek_statistics.update(quick_stats)
-            deepseek_statistics["quick_scoring_time"] = quick_time
+def analyze_account(
+    df,
+    current_date,
+    run_output_dir: Path,
+    analysis_context: Optional[str] = None,
+    skip_sonnet: bool = False,
+    client=None,
+    start_time: Optional[float] = None,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the per-account pipeline (context, AI stages, scoring, outputs) on prepared data.
 
-            # Recalculate scores with Sonnet data
-            case_analysis = calculate_criticality_scores(case_analysis, client)
+    Args:
+        df: Loaded and merged case data of one account
+        current_date: Analysis date from load_and_prepare_data()
+        run_output_dir: Folder for the charts/, json/ and reports/ outputs
+        analysis_context: Custom analysis context (default: SLA + product docs)
+        skip_sonnet: If True, skip Sonnet analysis
+        client: Object with stream_message() for progress output
+        start_time: Start of the run, for the reported analysis time
+        verbose: If False, skip stage headers and the console summary
+            (portfolio mode runs several accounts at once)
 
-            # STAGE 6: Asset correlation
-            print_stage(6, "ASSET CORRELATION", "Analyzing hardware patterns")
-            asset_correlations = analyze_asset_correlations(case_analysis, client)
+    Returns:
+        Dictionary with analysis results and paths to output files
+    """
+    if client is None:
+        client = streaming_output
+    if start_time is None:
+        start_time = time.time()
+    stage = print_stage if verbose else (lambda *args: None)
 
-            # Build full account brief
-            account_brief_full = build_account_intelligence_brief(
-                case_analysis, asset_correlations, mode='full'
-            )
+    charts_dir = run_output_dir / "charts"
+    json_dir = run_output_dir / "json"
+    reports_dir = run_output_dir / "reports"
 
-            # STAGE 7: Claude Sonnet detailed timelines
-            print_stage(7, "CLAUDE 3.5 SONNET - DETAILED TIMELINES", "Building interaction timelines")
-            timeline_stats, timeline_time = run_deepseek_detailed_timeline(
-                case_analysis, analysis_context, client, account_brief_full, asset_correlations
-            )
-            deepseek_statistics["total_analyzed"] = timeline_stats["total_analyzed"]
-            deepseek_statistics["api_errors"] += timeline_stats["api_errors"]
-            deepseek_statistics["detailed_timeline_time"] = timeline_time
-            deepseek_statistics["analysis_time_seconds"] = quick_time + timeline_time
-            deepseek_time = quick_time + timeline_time
-        else:
-            asset_correlations = analyze_asset_correlations(case_analysis, client)
+    charts_dir.mkdir(parents=True, exist_ok=True)
+    json_dir.mkdir(exist_ok=True)
+    reports_dir.mkdir(exist_ok=True)
 
-        # STAGE 8: Generate visualizations
-        print_stage(8 if not skip_sonnet else 6, "VISUALIZATION", "Generating charts")
+    # STAGE 1.6: Load context documentation
+    if analysis_context is None:
+        stage(2, "CONTEXT LOADING", "Loading SLA and product documentation")
+        analysis_context, detected_product = build_enhanced_context(df, client)
+    else:
+        detected_product = None
+        client.stream_message("  Using custom analysis context provided")
+
+    # STAGE 2: Claude Haiku analysis
+    stage(3, "CLAUDE 3.5 HAIKU ANALYSIS", "Analyzing all cases for frustration patterns")
+    (case_analysis, claude_statistics, issue_categories,
+     support_level_distribution, claude_time) = run_claude_analysis(
+        df, analysis_context, client
+    )
+
+    # STAGE 4: Criticality scoring
+    stage(4, "CRITICALITY SCORING", "Calculating priority scores")
+    case_analysis = calculate_criticality_scores(case_analysis, client)
+
+    # Initialize Sonnet statistics
+    deepseek_statistics = {
+        "total_scored": 0,
+        "total_analyzed": 0,
+        "api_errors": 0,
+        "quick_scoring_time": 0,
+        "detailed_timeline_time": 0,
+        "analysis_time_seconds": 0,
+    }
+    deepseek_time = 0
+
+    if not skip_sonnet:
+        # Build account brief for quick scoring
+        account_brief_light = build_account_intelligence_brief(
+            case_analysis, asset_correlations=None, mode='light'
+        )
 
-        severity_distribution = {}
-        for case in case_analysis:
-            sev = case["severity"]
-            severity_distribution[sev] = severity_distribution.get(sev, 0) + 1
+        # STAGE 5: Claude Sonnet quick scoring
+        stage(5, "CLAUDE 3.5 SONNET - QUICK SCORING", "Pattern analysis on top cases")
+        quick_stats, quick_time = run_deepseek_quick_scoring(
+            case_analysis, analysis_context, client, account_brief_light
+        )
+        deepseek_statistics.update(quick_stats)
+        deepseek_statistics["quick_scoring_time"] = quick_time
 
+        # Recalculate scores with Sonnet data
+        case_analysis = calculate_criticality_scores(case_analysis, client)
+
+        # STAGE 6: Asset correlation
+        stage(6, "ASSET CORRELATION", "Analyzing hardware patterns")
+        asset_correlations = analyze_asset_correlations(case_analysis, client)
+
+        # Build full account brief
+        account_brief_full = build_account_intelligence_brief(
+            case_analysis, asset_correlations, mode='full'
+        )
+
+        # STAGE 7: Claude Sonnet detailed timelines
+        stage(7, "CLAUDE 3.5 SONNET - DETAILED TIMELINES", "Building interaction timelines")
+        timeline_stats, timeline_time = run_deepseek_detailed_timeline(
+            case_analysis, analysis_context, client, account_brief_full, asset_correlations
+        )
+        deepseek_statistics["total_analyzed"] = timeline_stats["total_analyzed"]
+        deepseek_statistics["api_errors"] += timeline_stats["api_errors"]
+        deepseek_statistics["detailed_timeline_time"] = timeline_time
+        deepseek_statistics["analysis_time_seconds"] = quick_time + timeline_time
+        deepseek_time = quick_time + timeline_time
+    else:
+        asset_correlations = analyze_asset_correlations(case_analysis, client)
+
+    # STAGE 8: Generate visualizations
+    stage(8 if not skip_sonnet else 6, "VISUALIZATION", "Generating charts")
+
+    severity_distribution = {}
+    for case in case_analysis:
+        sev = case["severity"]
+        severity_distribution[sev] = severity_distribution.get(sev, 0) + 1
+
+    # pyplot keeps global figure state: one account's charts at a time
+    with _charts_lock:
         charts = generate_all_charts(
             case_analysis,
             claude_statistics,
@@ -268,119 +409,307 @@ def run_analysis(
             support_level_distribution
         )
 
-        # Save charts
-        for chart_name, chart_bytes in charts.items():
-            chart_path = charts_dir / f"{chart_name}.png"
-            with open(chart_path, 'wb') as f:
-                f.write(chart_bytes)
-            client.stream_message(f"  Saved: {chart_path.name}")
-
-        # STAGE 6: Calculate account health
-        customer_name = case_analysis[0]['customer_name'] if case_analysis else "Unknown"
-        health_score, score_breakdown = calculate_account_health_score(
-            case_analysis, claude_statistics
-        )
+    # Save charts
+    for chart_name, chart_bytes in charts.items():
+        chart_path = charts_dir / f"{chart_name}.png"
+        with open(chart_path, 'wb') as f:
+            f.write(chart_bytes)
+        client.stream_message(f"  Saved: {chart_path.name}")
+
+    # STAGE 6: Calculate account health
+    customer_name = case_analysis[0]['customer_name'] if case_analysis else "Unknown"
+    health_score, score_breakdown = calculate_account_health_score(
+        case_analysis, claude_statistics
+    )
 
-        total_time = time.time() - start_time
+    total_time = time.time() - start_time
 
-        # Print summary
+    # Print summary
+    if verbose:
         print_health_score(health_score, customer_name)
 
-        # STAGE 9: Save JSON outputs
-        print_stage(9 if not skip_sonnet else 7, "SAVING OUTPUTS", "Writing JSON and preparing report")
-
-        def clean_for_json(case_list):
-            """Remove non-serializable data from cases."""
-            cleaned = []
-            for case in case_list:
-                case_copy = case.copy()
-                case_copy.pop('case_data', None)
-                case_copy.pop('messages_full', None)
-                cleaned.append(case_copy)
-            return cleaned
-
-        # Summary statistics
-        summary_stats = {
-            "analysis_date": current_date.strftime("%Y-%m-%d"),
-            "account_name": customer_name,
-            "account_health_score": round(health_score, 1),
-            "total_cases": len(case_analysis),
-            "analysis_time_seconds": round(total_time, 1),
-            "claude_haiku_time": round(claude_time, 1),
-            "claude_sonnet_time": round(deepseek_time, 1),
-            "severity_distribution": severity_distribution,
-            "support_level_distribution": support_level_distribution,
-            "claude_statistics": claude_statistics,
-            "deepseek_statistics": deepseek_statistics,
-            "score_breakdown": score_breakdown,
-        }
-
-        with open(json_dir / "summary_statistics.json", 'w') as f:
-            json.dump(summary_stats, f, indent=2, default=str)
-
-        # Top 25 cases
-        top_25 = case_analysis[:25]
-        top_25_data = {
-            "analysis_date": current_date.strftime("%Y-%m-%d"),
-            "account_name": customer_name,
-            "methodology": "Hybrid: Claude 3.5 Haiku + Claude 3.5 Sonnet",
-            "cases": clean_for_json(top_25),
+    # STAGE 9: Save JSON outputs
+    stage(9 if not skip_sonnet else 7, "SAVING OUTPUTS", "Writing JSON and preparing report")
+
+    def clean_for_json(case_list):
+        """Remove non-serializable data from cases."""
+        cleaned = []
+        for case in case_list:
+            case_copy = case.copy()
+            case_copy.pop('case_data', None)
+            case_copy.pop('messages_full', None)
+            cleaned.append(case_copy)
+        return cleaned
+
+    # Summary statistics
+    summary_stats = {
+        "analysis_date": current_date.strftime("%Y-%m-%d"),
+        "account_name": customer_name,
+        "account_health_score": round(health_score, 1),
+        "total_cases": len(case_analysis),
+        "analysis_time_seconds": round(total_time, 1),
+        "claude_haiku_time": round(claude_time, 1),
+        "claude_sonnet_time": round(deepseek_time, 1),
+        "severity_distribution": severity_distribution,
+        "support_level_distribution": support_level_distribution,
+        "claude_statistics": claude_statistics,
+        "deepseek_statistics": deepseek_statistics,
+        "score_breakdown": score_breakdown,
+    }
+
+    # Top 25 cases
+    top_25_header = {
+        "analysis_date": current_date.strftime("%Y-%m-%d"),
+        "account_name": customer_name,
+        "methodology": "Hybrid: Claude 3.5 Haiku + Claude 3.5 Sonnet",
+    }
+
+    # All cases (condensed)
+    all_cases_header = {
+        "analysis_date": current_date.strftime("%Y-%m-%d"),
+        "account_name": customer_name,
+        "total_cases": len(case_analysis),
+    }
+    all_cases_records = (
+        {
+            "case_number": c["case_number"],
+            "criticality_score": c["criticality_score"],
+            "frustration_score": c["claude_analysis"]["frustration_score"],
+            "severity": c["severity"],
+            "status": c["status"],
+            "age_days": c["case_age_days"],
         }
+        for c in case_analysis
+    )
 
-        with open(json_dir / "top_25_critical_cases.json", 'w') as f:
-            json.dump(top_25_data, f, indent=2, default=str)
+    with OutputWriter(json_dir) as writer:
+        saved = [
+            writer.write("summary_statistics", summary_stats),
+            writer.write_records("top_25_critical_cases", top_25_header, "cases", clean_for_json(case_analysis[:25])),
+            writer.write_records("all_cases", all_cases_header, "cases", all_cases_records),
+        ]
 
-        # All cases (condensed)
-        all_cases_data = {
-            "analysis_date": current_date.strftime("%Y-%m-%d"),
-            "account_name": customer_name,
-            "total_cases": len(case_analysis),
-            "cases": [
-                {
-                    "case_number": c["case_number"],
-                    "criticality_score": c["criticality_score"],
-                    "frustration_score": c["claude_analysis"]["frustration_score"],
-                    "severity": c["severity"],
-                    "status": c["status"],
-                    "age_days": c["case_age_days"],
-                }
-                for c in case_analysis
-            ]
-        }
+    # Scoring inputs, for rescoring with other weights without the LLM stages
+    save_score_features(score_feature_table(case_analysis), run_output_dir / SCORE_FEATURES_FILE)
 
-        with open(json_dir / "all_cases.json", 'w') as f:
-            json.dump(all_cases_data, f, indent=2, default=str)
+    # Flat typed tables for the dashboard
+    tables = save_case_tables(case_analysis, run_output_dir)
 
-        client.stream_message(f"  Saved: summary_statistics.json")
-        client.stream_message(f"  Saved: top_25_critical_cases.json")
-        client.stream_message(f"  Saved: all_cases.json")
+    for path in saved:
+        client.stream_message(f"  Saved: {path.name}")
+    client.stream_message(f"  Saved: {SCORE_FEATURES_FILE}")
+    client.stream_message(f"  Saved: {len(tables)} tables ({', '.join(path.name for path in tables)})")
 
-        # Final summary
+    # Final summary
+    if verbose:
         console.print()
         console.print(f"[bold green]Analysis complete![/bold green]")
         console.print(f"  Total time: {total_time:.1f}s")
         console.print(f"  Output directory: {run_output_dir}")
         console.print()
 
+    return {
+        "success": True,
+        "output_dir": str(run_output_dir),
+        "customer_name": customer_name,
+        "health_score": health_score,
+        "total_cases": len(case_analysis),
+        "critical_cases": len([c for c in case_analysis if c['criticality_score'] >= 180]),
+        "analysis_time": total_time,
+        "charts": charts,
+        "case_analysis": case_analysis,
+        "statistics": {
+            "claude": claude_statistics,
+            "sonnet": deepseek_statistics,
+        },
+        "asset_correlations": asset_correlations,
+    }
+
+
+class _AccountOutput:
+    """Progress output of one portfolio account, prefixed with the account name."""
+
+    def __init__(self, account_name: str, client):
+        self.prefix = f"[{account_name}] "
+        self.client = client
+
+    def stream_message(self, message: str) -> None:
+        for line in message.strip("\n").splitlines():
+            if line.strip():
+                self.client.stream_message(self.prefix + line)
+
+    def print(self, message: str) -> None:
+        self.stream_message(message)
+
+
+def _account_folder_name(account_name: str, taken: set) -> str:
+    """Unique analysis_<slug> folder name for an account."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", account_name).strip("_")[:60] or "account"
+    name = f"analysis_{slug}"
+    suffix = 2
+    while name in taken:
+        name = f"analysis_{slug}_{suffix}"
+        suffix += 1
+    taken.add(name)
+    return name
+
+
+def run_portfolio_analysis(
+    input_file: str,
+    output_dir: Optional[str] = None,
+    analysis_context: Optional[str] = None,
+    skip_sonnet: bool = False,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run the sentiment analysis pipeline on a multi-account export.
+
+    The prepared data is partitioned by Customer Name and every account is
+    analysed by its own pipeline, several at once. All accounts share one
+    Claude client, so Config.MAX_CONCURRENT_REQUESTS bounds the in-flight
+    API calls of the whole portfolio.
+
+    Outputs:
+        portfolio_<timestamp>/analysis_<account>/  - one single-account analysis per account
+        portfolio_<timestamp>/portfolio_summary.json - index of the accounts, worst health first
+        portfolio_<timestamp>/fleet_assets.json - serials and failure clusters across accounts
+
+    Args:
+        input_file: Path to Excel file with case data of many accounts
+        output_dir: Output directory (default: outputs/)
+        analysis_context: Custom analysis context (default: SLA + product docs per account)
+        skip_sonnet: If True, skip Sonnet analysis (faster, cheaper)
+        max_workers: Accounts analysed in parallel (default: Config.PORTFOLIO_WORKERS)
+
+    Returns:
+        Dictionary with the portfolio summary and output folder
+    """
+    # Validate configuration
+    errors = Config.validate()
+    if errors:
+        for error in errors:
+            print_error(error)
+        raise ValueError("Configuration validation failed")
+
+    Config.ensure_directories()
+    output_path = Path(output_dir) if output_dir else Config.OUTPUT_DIR
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    portfolio_dir = output_path / f"portfolio_{timestamp}"
+    portfolio_dir.mkdir(parents=True, exist_ok=True)
+
+    max_workers = max_workers or Config.PORTFOLIO_WORKERS
+
+    print_header(
+        "TrueNAS Portfolio Sentiment Analysis",
+        f"Input: {input_file}"
+    )
+
+    start_time = time.time()
+    client = streaming_output
+
+    try:
+        print_stage(1, "DATA LOADING", "Loading Excel file and preparing data")
+        df, current_date = load_and_prepare_data(input_file, client)
+        df = detect_and_merge_case_relationships(df, client)
+
+        accounts = [(str(name), group) for name, group in df.groupby("Customer Name", sort=False)]
+        print_stage(
+            2, "ACCOUNT ANALYSIS",
+            f"{len(accounts)} accounts, {max_workers} at a time, "
+            f"up to {Config.MAX_CONCURRENT_REQUESTS} concurrent API calls"
+        )
+
+        taken = set()
+        folders = {name: _account_folder_name(name, taken) for name, _ in accounts}
+
+        def analyze(name, account_df):
+            account_start = time.time()
+            account_client = _AccountOutput(name, client)
+            try:
+                result = analyze_account(
+                    account_df.reset_index(drop=True), current_date, portfolio_dir / folders[name],
+                    analysis_context=analysis_context,
+                    skip_sonnet=skip_sonnet,
+                    client=account_client,
+                    start_time=account_start,
+                    verbose=False,
+                )
+            except Exception as e:
+                account_client.stream_message(f"Analysis failed: {str(e)}")
+                return {"account_name": name, "folder": folders[name], "success": False, "error": str(e)}
+
+            account_cases[name] = result["case_analysis"]
+            account_client.stream_message(
+                f"Health score {result['health_score']:.1f}/100 "
+                f"({result['total_cases']} cases, {result['analysis_time']:.1f}s)"
+            )
+            return {
+                "account_name": name,
+                "folder": folders[name],
+                "success": True,
+                "health_score": round(result["health_score"], 1),
+                "total_cases": result["total_cases"],
+                "critical_cases": result["critical_cases"],
+                "analysis_time_seconds": round(result["analysis_time"], 1),
+            }
+
+        account_cases: Dict[str, List[Dict]] = {}
+        rows: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(analyze, name, account_df) for name, account_df in accounts]
+            for future in as_completed(futures):
+                rows.append(future.result())
+
+        # Hardware batches failing at several accounts
+        fleet_report = FleetAssetIndex.from_case_analysis(
+            case for name, _ in accounts for case in account_cases.get(name, [])
+        ).report()
+        with open(portfolio_dir / "fleet_assets.json", 'w') as f:
+            json.dump(fleet_report, f, indent=2, default=str)
+        client.stream_message(
+            f"  Fleet asset index: {fleet_report['total_serials']} serials, "
+            f"{len(fleet_report['failure_clusters'])} cross-account failure clusters"
+        )
+
+        # Worst health first, failed accounts last
+        rows.sort(key=lambda r: (not r["success"], r.get("health_score", 0), r["account_name"]))
+        analyzed = [r for r in rows if r["success"]]
+        total_time = time.time() - start_time
+
+        summary = {
+            "analysis_date": current_date.strftime("%Y-%m-%d"),
+            "input_file": str(input_file),
+            "total_accounts": len(rows),
+            "failed_accounts": len(rows) - len(analyzed),
+            "total_cases": sum(r["total_cases"] for r in analyzed),
+            "critical_cases": sum(r["critical_cases"] for r in analyzed),
+            "analysis_time_seconds": round(total_time, 1),
+            "max_workers": max_workers,
+            "max_concurrent_requests": Config.MAX_CONCURRENT_REQUESTS,
+            "failure_clusters": len(fleet_report["failure_clusters"]),
+            "accounts": rows,
+        }
+        with open(portfolio_dir / PORTFOLIO_SUMMARY_FILE, 'w') as f:
+            json.dump(summary, f, indent=2, default=str)
+        record_completed_runs(output_path, [portfolio_dir / r["folder"] for r in analyzed], client)
+
+        console.print()
+        console.print(f"[bold green]Portfolio analysis complete![/bold green]")
+        console.print(f"  Accounts: {len(analyzed)}/{len(rows)}")
+        console.print(f"  Total time: {total_time:.1f}s")
+        console.print(f"  Output directory: {portfolio_dir}")
+        console.print()
+
         return {
             "success": True,
-            "output_dir": str(run_output_dir),
-            "customer_name": customer_name,
-            "health_score": health_score,
-            "total_cases": len(case_analysis),
-            "critical_cases": len([c for c in case_analysis if c['criticality_score'] >= 180]),
+            "output_dir": str(portfolio_dir),
             "analysis_time": total_time,
-            "charts": charts,
-            "case_analysis": case_analysis,
-            "statistics": {
-                "claude": claude_statistics,
-                "sonnet": deepseek_statistics,
-            },
-            "asset_correlations": asset_correlations,
+            **summary,
         }
 
     except Exception as e:
-        print_error(f"Analysis failed: {str(e)}")
+        print_error(f"Portfolio analysis failed: {str(e)}")
         import traceback
         traceback.print_exc()
 
@@ -390,6 +719,35 @@ def run_analysis(
         }
 
 
+def _load_layer_results(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Layer results saved with a linked store, rebuilt as result dataclasses."""
+    from dataclasses import fields
+
+    from .analysis.layers import (
+        OpportunityAnalysisResult,
+        DeploymentAnalysisResult,
+        SupportAnalysisResult,
+        EvaluationResult,
+    )
+    from .data.sqlite_store import LinkedDataDB
+
+    result_types = {
+        "opportunity": OpportunityAnalysisResult,
+        "deployment": DeploymentAnalysisResult,
+        "support": SupportAnalysisResult,
+        "evaluation": EvaluationResult,
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    with LinkedDataDB(path) as db:
+        for layer, result_type in result_types.items():
+            names = [f.name for f in fields(result_type)]
+            results[layer] = {
+                key: result_type(**{name: payload[name] for name in names if name in payload})
+                for key, payload in db.layer_results(layer).items()
+            }
+    return results
+
+
 def run_full_analysis(
     opportunities_path: Optional[str] = None,
     deployments_path: Optional[str] = None,
@@ -397,6 +755,10 @@ def run_full_analysis(
     output_dir: Optional[str] = None,
     skip_ai: bool = False,
     skip_sonnet: bool = False,
+    fuzzy_link: bool = False,
+    save_db: bool = False,
+    metrics_backend: str = "fused",
+    delta: bool = False,
 ) -> Dict[str, Any]:
     """
     Run the full 4-layer analysis pipeline across all data sources.
@@ -415,6 +777,15 @@ def run_full_analysis(
         output_dir: Output directory (default: outputs/)
         skip_ai: If True, skip all AI analysis (fastest, for testing)
         skip_sonnet: If True, skip only Sonnet analysis (faster, cheaper)
+        fuzzy_link: If True, resolve account aliases and near-miss order numbers after linking
+        save_db: If True, also persist linked data and layer results to linked_data.db
+        metrics_backend: "fused" (single pass over linked orders) or "facts"
+            (grouped pandas operations over the flattened fact table)
+        delta: If True, diff the exports against Config.INGEST_STATE_PATH and
+            apply only new or changed records to the linked data saved by the
+            previous delta run (Config.LINKED_STORE_PATH). Orders the delta
+            touches are re-analyzed; the others keep their saved results.
+            Metrics are updated in Config.METRICS_STATE_PATH for those orders.
 
     Returns:
         Dictionary with analysis results and paths to output files
@@ -429,7 +800,12 @@ def run_full_analysis(
         load_support_cases,
         link_data_sources,
         LinkedDataStore,
+        MESSAGE_ARENA,
+        IngestStore,
+        ingest_exports,
+        commit_deltas,
     )
+    from .data.normalization import load_use_case_taxonomy, set_use_case_taxonomy
 
     # Import analysis layers
     from .analysis.layers import (
@@ -441,10 +817,11 @@ def run_full_analysis(
 
     # Import metrics
     from .analysis.metrics import (
-        calculate_all_product_metrics,
-        calculate_all_account_metrics,
-        calculate_all_usecase_metrics,
-        compare_service_vs_self_deploy,
+        calculate_all_metrics,
+        build_fact_table,
+        calculate_metrics_from_facts,
+        build_metrics_cube,
+        MetricsState,
     )
 
     # Validate configuration
@@ -499,58 +876,140 @@ def run_full_analysis(
         # =====================================================
         print_stage(1, "DATA LOADING", "Loading all data sources")
 
+        # New ingest: drop message bodies held for records of earlier runs
+        MESSAGE_ARENA.clear()
+
+        if Config.USE_CASE_TAXONOMY_PATH:
+            client.stream_message(f"  Use case taxonomy: {Config.USE_CASE_TAXONOMY_PATH}")
+            set_use_case_taxonomy(load_use_case_taxonomy(Config.USE_CASE_TAXONOMY_PATH))
+
         opportunities = []
         deployments = []
         support_cases = []
 
-        if opp_file:
-            client.stream_message(f"  Loading opportunities: {opp_file}")
-            opportunities = load_opportunities(opp_file, client)
-            client.stream_message(f"    Loaded {len(opportunities)} opportunities")
-        else:
-            client.stream_message("  No opportunities file provided")
-
-        if deploy_file:
-            client.stream_message(f"  Loading deployments: {deploy_file}")
-            deployments = load_deployments(deploy_file, client)
-            client.stream_message(f"    Loaded {len(deployments)} deployments")
-        else:
-            client.stream_message("  No deployments file provided")
-
-        if support_file:
-            client.stream_message(f"  Loading support cases: {support_file}")
-            support_cases = load_support_cases(support_file, console_output=client)
-            client.stream_message(f"    Loaded {len(support_cases)} support cases")
+        # Orders to analyze (None = all) and saved results of the others
+        reanalyze = None
+        previous_results: Dict[str, Dict[str, Any]] = {}
+        previous_data = None
+        metrics_state = None
+        metrics_in_step = False
+
+        if delta:
+            # Exports are loaded and diffed against the ingest state while linking
+            client.stream_message(f"  Ingest state: {Config.INGEST_STATE_PATH}")
+            ingest_state = IngestStore(Config.INGEST_STATE_PATH)
+            if Config.LINKED_STORE_PATH.exists():
+                client.stream_message(f"  Previous linked data: {Config.LINKED_STORE_PATH}")
+                previous_data = LinkedDataStore.from_sqlite(Config.LINKED_STORE_PATH)
+                previous_results = _load_layer_results(Config.LINKED_STORE_PATH)
+                client.stream_message(f"    Loaded {len(previous_data.orders)} orders")
+            else:
+                client.stream_message("  No previous linked data: linking the full exports")
+
+            # Metrics state is only updated in place if it describes the previous store
+            metrics_state = MetricsState(Config.METRICS_STATE_PATH)
+            metrics_in_step = (
+                previous_data is not None
+                and not metrics_state.is_empty
+                and metrics_state.order_count == len(previous_data.orders)
+            )
         else:
-            client.stream_message("  No support cases file provided")
+            if opp_file:
+                client.stream_message(f"  Loading opportunities: {opp_file}")
+                opportunities = load_opportunities(opp_file, client)
+                client.stream_message(f"    Loaded {len(opportunities)} opportunities")
+            else:
+                client.stream_message("  No opportunities file provided")
+
+            if deploy_file:
+                client.stream_message(f"  Loading deployments: {deploy_file}")
+                deployments = load_deployments(deploy_file, client)
+                client.stream_message(f"    Loaded {len(deployments)} deployments")
+            else:
+                client.stream_message("  No deployments file provided")
+
+            if support_file:
+                client.stream_message(f"  Loading support cases: {support_file}")
+                support_cases = load_support_cases(support_file, console_output=client)
+                client.stream_message(f"    Loaded {len(support_cases)} support cases")
+            else:
+                client.stream_message("  No support cases file provided")
 
         # =====================================================
         # STAGE 2: DATA LINKING
         # =====================================================
         print_stage(2, "DATA LINKING", "Correlating via Order Number")
 
-        linked_data = link_data_sources(
-            opportunities=opportunities,
-            deployments=deployments,
-            support_cases=support_cases,
-            console_output=client,
-        )
+        if delta:
+            def retract_metrics(deltas) -> None:
+                """Take the affected orders out of the metrics state before the delta changes them."""
+                if metrics_in_step:
+                    records = {source: delta.records for source, delta in deltas.items()}
+                    metrics_state.retract(previous_data, previous_data.orders_affected_by(
+                        records.get("opportunities", []),
+                        records.get("deployments", []),
+                        records.get("support_cases", []),
+                    ))
+
+            linked_data, deltas = ingest_exports(
+                ingest_state,
+                opportunities_path=opp_file,
+                deployments_path=deploy_file,
+                support_path=support_file,
+                linked=previous_data,
+                console_output=client,
+                fuzzy_link=fuzzy_link,
+                commit=False,
+                before_link=retract_metrics,
+            )
+            if previous_data is not None:
+                reanalyze = linked_data.last_updated_orders
+                client.stream_message(f"  Re-analyzing {len(reanalyze)} of {len(linked_data.orders)} orders")
+
+            # Every record of the linked data, including those of earlier exports
+            opportunities = [o.opportunity for o in linked_data.orders if o.opportunity] + linked_data.orphan_opportunities
+            deployments = [d for o in linked_data.orders for d in o.deployments] + linked_data.orphan_deployments
+            support_cases = [c for o in linked_data.orders for c in o.support_cases] + linked_data.orphan_cases
+        else:
+            linked_data = link_data_sources(
+                opportunities=opportunities,
+                deployments=deployments,
+                support_cases=support_cases,
+                console_output=client,
+                fuzzy_link=fuzzy_link,
+            )
 
         client.stream_message(linked_data.summary.summary())
 
+        # Fleet-wide serial index: hardware batches failing at several accounts
+        fleet_index = FleetAssetIndex.from_linked_data(linked_data)
+        fleet_report = fleet_index.report()
+        client.stream_message(
+            f"  Fleet asset index: {fleet_report['total_serials']} serials, "
+            f"{len(fleet_report['failure_clusters'])} cross-account failure clusters"
+        )
+
         # =====================================================
         # STAGE 3: LAYER 1 - OPPORTUNITY ANALYSIS
         # =====================================================
         print_stage(3, "OPPORTUNITY ANALYSIS", "Extracting customer expectations (Layer 1)")
 
+        def saved_result(layer: str, order, key: str):
+            """Previous run's result for an order the delta left alone (None = analyze)."""
+            if reanalyze is None or order.order_number in reanalyze:
+                return None
+            return previous_results.get(layer, {}).get(key)
+
         opportunity_results = {}
         for order in linked_data.orders:
             if order.opportunity:
-                result = analyze_opportunity(
-                    order.opportunity,
-                    console_output=client,
-                    skip_ai=skip_ai,
-                )
+                result = saved_result("opportunity", order, order.order_number)
+                if result is None:
+                    result = analyze_opportunity(
+                        order.opportunity,
+                        console_output=client,
+                        skip_ai=skip_ai,
+                    )
                 opportunity_results[order.order_number] = result
 
         client.stream_message(f"  Analyzed {len(opportunity_results)} opportunities")
@@ -563,12 +1022,14 @@ def run_full_analysis(
         deployment_results = {}
         for order in linked_data.orders:
             for deploy in order.deployments:
-                result = analyze_deployment(
-                    deploy,
-                    opportunity_context=order.opportunity,
-                    console_output=client,
-                    skip_ai=skip_ai,
-                )
+                result = saved_result("deployment", order, deploy.case_number)
+                if result is None:
+                    result = analyze_deployment(
+                        deploy,
+                        opportunity_context=order.opportunity,
+                        console_output=client,
+                        skip_ai=skip_ai,
+                    )
                 deployment_results[deploy.case_number] = result
 
         client.stream_message(f"  Analyzed {len(deployment_results)} deployments")
@@ -581,12 +1042,14 @@ def run_full_analysis(
         support_results = {}
         for order in linked_data.orders:
             for case in order.support_cases:
-                result = analyze_support_case(
-                    case,
-                    deployment_context=order.deployments,
-                    console_output=client,
-                    skip_ai=skip_ai,
-                )
+                result = saved_result("support", order, case.case_number)
+                if result is None:
+                    result = analyze_support_case(
+                        case,
+                        deployment_context=order.deployments,
+                        console_output=client,
+                        skip_ai=skip_ai,
+                    )
                 support_results[case.case_number] = result
 
         client.stream_message(f"  Analyzed {len(support_results)} support cases")
@@ -608,11 +1071,13 @@ def run_full_analysis(
                 if order.is_fully_linked:
                     fully_linked_count += 1
 
-                result = evaluate_customer_journey(
-                    order,
-                    console_output=client,
-                    skip_ai=skip_evaluation_ai,
-                )
+                result = saved_result("evaluation", order, order.order_number)
+                if result is None:
+                    result = evaluate_customer_journey(
+                        order,
+                        console_output=client,
+                        skip_ai=skip_evaluation_ai,
+                    )
                 evaluation_results[order.order_number] = result
 
                 # Update the order with evaluation results
@@ -629,16 +1094,31 @@ def run_full_analysis(
         # =====================================================
         print_stage(7, "METRICS CALCULATION", "Computing multi-dimensional metrics")
 
-        product_metrics = calculate_all_product_metrics(linked_data)
+        # Delta runs keep the metrics state in step: add the re-analyzed orders
+        if metrics_state is not None:
+            if metrics_in_step:
+                metrics_state.add(linked_data, reanalyze)
+            else:
+                metrics_state.rebuild(linked_data)
+
+        metrics_facts = build_fact_table(linked_data)
+        if metrics_backend == "facts":
+            all_metrics = calculate_metrics_from_facts(metrics_facts)
+        elif metrics_state is not None:
+            all_metrics = metrics_state.metrics()
+        else:
+            all_metrics = calculate_all_metrics(linked_data)
+
+        product_metrics = all_metrics.product_metrics
         client.stream_message(f"  Product metrics: {len(product_metrics)} product lines")
 
-        account_metrics = calculate_all_account_metrics(linked_data)
+        account_metrics = all_metrics.account_metrics
         client.stream_message(f"  Account metrics: {len(account_metrics)} accounts")
 
-        usecase_metrics = calculate_all_usecase_metrics(linked_data)
+        usecase_metrics = all_metrics.usecase_metrics
         client.stream_message(f"  Use case metrics: {len(usecase_metrics)} use cases")
 
-        service_comparison = compare_service_vs_self_deploy(linked_data)
+        service_comparison = all_metrics.service_comparison
         client.stream_message(f"  Service comparison calculated (value-add score: {service_comparison.service_value_add_score:.0f})")
 
         # =====================================================
@@ -654,135 +1134,154 @@ def run_full_analysis(
                 return obj.__dict__
             return str(obj)
 
-        # Opportunities JSON
-        opp_output = {
-            "total": len(opportunities),
-            "analyzed": len(opportunity_results),
-            "opportunities": [
-                {
-                    "order_number": opp.order_number,
-                    "account_name": opp.account_name,
-                    "opportunity_name": opp.opportunity_name,
-                    "amount": opp.amount,
-                    "primary_product": opp.primary_product,
-                    "analysis": safe_asdict(opportunity_results.get(opp.order_number)) if opp.order_number in opportunity_results else None,
-                }
-                for opp in opportunities
-            ]
-        }
-        with open(json_dir / "opportunities.json", 'w') as f:
-            json.dump(opp_output, f, indent=2, default=str)
-        client.stream_message(f"  Saved: opportunities.json")
-
-        # Deployments JSON
-        deploy_output = {
-            "total": len(deployments),
-            "analyzed": len(deployment_results),
-            "deployments": [
-                {
-                    "case_number": dep.case_number,
-                    "order_number": dep.order_number,
-                    "account_name": dep.account_name,
-                    "product_model": dep.product_model,
-                    "status": dep.status,
-                    "analysis": safe_asdict(deployment_results.get(dep.case_number)) if dep.case_number in deployment_results else None,
-                }
-                for dep in deployments
-            ]
-        }
-        with open(json_dir / "deployments.json", 'w') as f:
-            json.dump(deploy_output, f, indent=2, default=str)
-        client.stream_message(f"  Saved: deployments.json")
-
-        # Support Cases JSON
-        support_output = {
-            "total": len(support_cases),
-            "analyzed": len(support_results),
-            "support_cases": [
-                {
-                    "case_number": case.case_number,
-                    "order_number": case.order_number,
-                    "account_name": case.account_name,
-                    "severity": case.severity.value,
-                    "status": case.status,
-                    "analysis": safe_asdict(support_results.get(case.case_number)) if case.case_number in support_results else None,
+        # Record lists are streamed: each record (with its full layer result,
+        # including raw responses) is built and written one at a time
+        with OutputWriter(json_dir) as writer:
+            saved = []
+
+            # Opportunities JSON
+            saved.append(writer.write_records(
+                "opportunities",
+                {"total": len(opportunities), "analyzed": len(opportunity_results)},
+                "opportunities",
+                (
+                    {
+                        "order_number": opp.order_number,
+                        "account_name": opp.account_name,
+                        "opportunity_name": opp.opportunity_name,
+                        "amount": opp.amount,
+                        "primary_product": opp.primary_product,
+                        "analysis": safe_asdict(opportunity_results.get(opp.order_number)) if opp.order_number in opportunity_results else None,
+                    }
+                    for opp in opportunities
+                ),
+            ))
+
+            # Deployments JSON
+            saved.append(writer.write_records(
+                "deployments",
+                {"total": len(deployments), "analyzed": len(deployment_results)},
+                "deployments",
+                (
+                    {
+                        "case_number": dep.case_number,
+                        "order_number": dep.order_number,
+                        "account_name": dep.account_name,
+                        "product_model": dep.product_model,
+                        "status": dep.status,
+                        "analysis": safe_asdict(deployment_results.get(dep.case_number)) if dep.case_number in deployment_results else None,
+                    }
+                    for dep in deployments
+                ),
+            ))
+
+            # Support Cases JSON
+            saved.append(writer.write_records(
+                "support_cases",
+                {"total": len(support_cases), "analyzed": len(support_results)},
+                "support_cases",
+                (
+                    {
+                        "case_number": case.case_number,
+                        "order_number": case.order_number,
+                        "account_name": case.account_name,
+                        "severity": case.severity.value,
+                        "status": case.status,
+                        "analysis": safe_asdict(support_results.get(case.case_number)) if case.case_number in support_results else None,
+                    }
+                    for case in support_cases
+                ),
+            ))
+
+            # Cross-Layer Insights JSON
+            saved.append(writer.write_records(
+                "cross_layer_insights",
+                {"total_orders": len(linked_data.orders), "fully_linked": fully_linked_count},
+                "evaluations",
+                (
+                    {
+                        "order_number": order.order_number,
+                        "account_name": order.account_name,
+                        "has_opportunity": order.has_opportunity,
+                        "has_deployments": order.has_deployments,
+                        "has_support_cases": order.has_support_cases,
+                        "is_fully_linked": order.is_fully_linked,
+                        "evaluation": safe_asdict(evaluation_results.get(order.order_number)) if order.order_number in evaluation_results else None,
+                    }
+                    for order in linked_data.orders
+                ),
+            ))
+
+            # Product and Account Metrics JSON
+            saved.append(writer.write_records(
+                "product_metrics", {}, "products", (safe_asdict(pm) for pm in product_metrics),
+            ))
+            saved.append(writer.write_records(
+                "account_metrics", {}, "accounts", (safe_asdict(am) for am in account_metrics),
+            ))
+
+            # Use Case Metrics JSON
+            saved.append(writer.write("usecase_metrics", {
+                "use_cases": {name: safe_asdict(um) for name, um in usecase_metrics.items()}
+            }))
+
+            # Service Comparison JSON
+            saved.append(writer.write("service_metrics", {
+                "service_deploy": safe_asdict(service_comparison.service_metrics),
+                "self_deploy": safe_asdict(service_comparison.self_metrics),
+                "comparison": {
+                    "deployment_score_delta": service_comparison.deployment_score_delta,
+                    "success_rate_delta": service_comparison.success_rate_delta,
+                    "support_intensity_delta": service_comparison.support_intensity_delta,
+                    "frustration_delta": service_comparison.frustration_delta,
+                    "journey_health_delta": service_comparison.journey_health_delta,
+                    "service_value_add_score": service_comparison.service_value_add_score,
+                    "recommendation": service_comparison.recommendation,
                 }
-                for case in support_cases
-            ]
-        }
-        with open(json_dir / "support_cases.json", 'w') as f:
-            json.dump(support_output, f, indent=2, default=str)
-        client.stream_message(f"  Saved: support_cases.json")
-
-        # Cross-Layer Insights JSON
-        insights_output = {
-            "total_orders": len(linked_data.orders),
-            "fully_linked": fully_linked_count,
-            "evaluations": [
-                {
-                    "order_number": order.order_number,
-                    "account_name": order.account_name,
-                    "has_opportunity": order.has_opportunity,
-                    "has_deployments": order.has_deployments,
-                    "has_support_cases": order.has_support_cases,
-                    "is_fully_linked": order.is_fully_linked,
-                    "evaluation": safe_asdict(evaluation_results.get(order.order_number)) if order.order_number in evaluation_results else None,
-                }
-                for order in linked_data.orders
-            ]
-        }
-        with open(json_dir / "cross_layer_insights.json", 'w') as f:
-            json.dump(insights_output, f, indent=2, default=str)
-        client.stream_message(f"  Saved: cross_layer_insights.json")
-
-        # Product Metrics JSON
-        product_output = {
-            "products": [safe_asdict(pm) for pm in product_metrics]
-        }
-        with open(json_dir / "product_metrics.json", 'w') as f:
-            json.dump(product_output, f, indent=2, default=str)
-        client.stream_message(f"  Saved: product_metrics.json")
-
-        # Account Metrics JSON
-        account_output = {
-            "accounts": [safe_asdict(am) for am in account_metrics]
+            }))
+
+            # Fleet asset index JSON
+            saved.append(writer.write("fleet_assets", fleet_report))
+
+            # Link Summary JSON
+            saved.append(writer.write("link_summary", safe_asdict(linked_data.summary)))
+
+        for path in saved:
+            client.stream_message(f"  Saved: {path.name}")
+
+        # Flat typed tables for the dashboard
+        tables = [
+            save_result_table(opportunity_table(opportunities, opportunity_results), run_output_dir, "opportunities"),
+            save_result_table(deployment_table(deployments, deployment_results), run_output_dir, "deployments"),
+            save_result_table(support_case_table(support_cases, support_results), run_output_dir, "support_cases"),
+            save_result_table(evaluation_table(linked_data.orders, evaluation_results), run_output_dir, "evaluations"),
+            save_result_table(metrics_facts, run_output_dir, "metrics_facts"),
+            save_result_table(build_metrics_cube(metrics_facts), run_output_dir, "metrics_cube"),
+        ]
+        client.stream_message(f"  Saved: {len(tables)} tables ({', '.join(path.name for path in tables)})")
+
+        layer_results = {
+            "opportunity": opportunity_results,
+            "deployment": deployment_results,
+            "support": support_results,
+            "evaluation": evaluation_results,
         }
-        with open(json_dir / "account_metrics.json", 'w') as f:
-            json.dump(account_output, f, indent=2, default=str)
-        client.stream_message(f"  Saved: account_metrics.json")
+        if save_db:
+            linked_data.to_sqlite(run_output_dir / "linked_data.db", layer_results=layer_results)
+            client.stream_message(f"  Saved: linked_data.db")
 
-        # Use Case Metrics JSON
-        usecase_output = {
-            "use_cases": {name: safe_asdict(um) for name, um in usecase_metrics.items()}
-        }
-        with open(json_dir / "usecase_metrics.json", 'w') as f:
-            json.dump(usecase_output, f, indent=2, default=str)
-        client.stream_message(f"  Saved: usecase_metrics.json")
-
-        # Service Comparison JSON
-        service_output = {
-            "service_deploy": safe_asdict(service_comparison.service_metrics),
-            "self_deploy": safe_asdict(service_comparison.self_metrics),
-            "comparison": {
-                "deployment_score_delta": service_comparison.deployment_score_delta,
-                "success_rate_delta": service_comparison.success_rate_delta,
-                "support_intensity_delta": service_comparison.support_intensity_delta,
-                "frustration_delta": service_comparison.frustration_delta,
-                "journey_health_delta": service_comparison.journey_health_delta,
-                "service_value_add_score": service_comparison.service_value_add_score,
-                "recommendation": service_comparison.recommendation,
-            }
-        }
-        with open(json_dir / "service_metrics.json", 'w') as f:
-            json.dump(service_output, f, indent=2, default=str)
-        client.stream_message(f"  Saved: service_metrics.json")
+        if delta:
+            # Linked data first: the ingest state must never be ahead of it
+            linked_data.to_sqlite(Config.LINKED_STORE_PATH, layer_results=layer_results)
+            metrics_state.save()
+            commit_deltas(ingest_state, deltas)
+            for path in (Config.LINKED_STORE_PATH, Config.METRICS_STATE_PATH, Config.INGEST_STATE_PATH):
+                client.stream_message(f"  Saved: {path}")
 
-        # Link Summary JSON
-        with open(json_dir / "link_summary.json", 'w') as f:
-            json.dump(safe_asdict(linked_data.summary), f, indent=2, default=str)
-        client.stream_message(f"  Saved: link_summary.json")
+        record_completed_runs(output_path, [run_output_dir], client)
 
         total_time = time.time() - start_time
+        reanalyzed_count = sum(1 for o in linked_data.orders if reanalyze is None or o.order_number in reanalyze)
 
         # Print summary
         console.print()
@@ -793,6 +1292,8 @@ def run_full_analysis(
         console.print(f"  Support cases analyzed: {len(support_results)}")
         console.print(f"  Orders linked: {len(linked_data.orders)}")
         console.print(f"  Fully linked: {fully_linked_count}")
+        if delta:
+            console.print(f"  Orders re-analyzed: {reanalyzed_count}")
         console.print(f"  Output directory: {run_output_dir}")
         console.print()
 
@@ -804,6 +1305,7 @@ def run_full_analysis(
             "cases_analyzed": len(support_results),
             "linked_orders": len(linked_data.orders),
             "fully_linked_orders": fully_linked_count,
+            "reanalyzed_orders": reanalyzed_count,
             "analysis_time": total_time,
             "linked_data": linked_data,
             "opportunity_results": opportunity_results,
@@ -0,0 +1,87 @@
+"""
+Duplicate Case Merge Tests
+
+Validates detect_and_merge_case_relationships:
+- Duplicate detection and parent lookup across case-number formats
+- Escalation event rows ahead of merged messages
+- Chains (A dup of B dup of C) merge into the root case
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.analysis.data_loader import detect_and_merge_case_relationships
+
+
+class _QuietOutput:
+    def stream_message(self, message):
+        pass
+
+
+def _cases_frame(rows):
+    """Build a prepared-data style frame from (case, message, day) tuples."""
+    return pd.DataFrame({
+        "Case Number": [r[0] for r in rows],
+        "Customer Name": "ACME",
+        "Message": [r[1] for r in rows],
+        "Message Date": [pd.Timestamp("2024-01-01") + pd.Timedelta(days=r[2]) for r in rows],
+        "Severity": "S2",
+        "Support Level": "Gold",
+        "Created Date": pd.Timestamp("2024-01-01"),
+        "Last Modified Date": pd.Timestamp("2024-01-01"),
+        "Status": "Open",
+        "Case Age Days": 5,
+    })
+
+
+class TestDuplicateMerge:
+    """Duplicate cases are folded into their parent."""
+
+    def test_no_duplicates_returns_input(self):
+        df = _cases_frame([("00100001", "Pool is degraded", 0), ("00100002", "Upgrade failed", 1)])
+        result = detect_and_merge_case_relationships(df, _QuietOutput())
+        assert result is df
+
+    def test_duplicate_merged_with_escalation_event(self):
+        df = _cases_frame([
+            ("00100001", "Pool is degraded", 0),
+            ("00100002", "Closing as duplicate of case #100001", 2),
+            ("00100002", "Any update?", 3),
+        ])
+        result = detect_and_merge_case_relationships(df, _QuietOutput())
+
+        assert set(result["Case Number"]) == {"00100001"}
+        messages = list(result["Message"])
+        assert messages[0] == "Pool is degraded"
+        assert messages[1].startswith("[ESCALATION EVENT] Customer spawned duplicate case 00100002")
+        assert messages[2:] == [
+            "[DUPLICATE CASE 00100002] Closing as duplicate of case #100001",
+            "[DUPLICATE CASE 00100002] Any update?",
+        ]
+
+    def test_chain_merges_into_root(self):
+        df = _cases_frame([
+            (100001, "Disk failure on shelf 2", 0),
+            (100002, "This is a duplicate of ticket 100001", 1),
+            (100003, "Closed as duplicate, see case id: 100002", 2),
+        ])
+        result = detect_and_merge_case_relationships(df, _QuietOutput())
+
+        assert set(result["Case Number"]) == {100001}
+        assert sum(result["Message"].str.startswith("[ESCALATION EVENT]")) == 2
+        assert any(m.startswith("[DUPLICATE CASE 100003]") for m in result["Message"])
+
+    def test_cycle_keeps_one_root(self):
+        df = _cases_frame([
+            (100001, "Duplicate case, see ticket 100002", 0),
+            (100002, "Duplicate case, see ticket 100001", 1),
+        ])
+        result = detect_and_merge_case_relationships(df, _QuietOutput())
+
+        assert set(result["Case Number"]) == {100001}
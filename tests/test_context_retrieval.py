@@ -0,0 +1,280 @@
+"""
+Context Retrieval Tests
+
+Validates per-case retrieval of documentation passages:
+- Chunking packs paragraphs and overlaps passage boundaries
+- BM25 ranks the passage matching the case first
+- Index save/load round trip and token budgets
+- ContextLoader builds, saves and reuses the on-disk index
+- A corrupt or truncated index is rebuilt instead of failing the analysis
+- Prompt context falls back to the base context without matches
+- Extracted PDF text is cached on disk and invalidated on change
+- Concurrent callers extract each document and build each index once
+- Mixed-product accounts resolve context per case
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.context.loader import ContextLoader, join_pages
+from src.context.retrieval import (
+    PassageIndex,
+    RetrievalContext,
+    chunk_text,
+    select_passages,
+    tokenize,
+)
+from src.context.product_context import ProductContext
+from src.analysis.claude_analysis import context_for_case
+from src.main import detect_case_products
+
+
+SLA_TEXT = """S1 critical: system not serving data. Response within 2 hours, 24x7 for Gold and Silver.
+
+S2 high: performance degradation in production. Response within 4 hours.
+
+S4 low: information requests. Next business day response."""
+
+PRODUCT_TEXT = """Replication tasks can fail when the snapshot retention on the target is shorter than the source.
+
+Drive replacement: offline the failed disk, replace it, then resilver the pool.
+
+Fan and power supply alerts are reported by the enclosure management daemon."""
+
+
+class _TextLoader(ContextLoader):
+    """Reads .txt context documents (one page per paragraph) in place of PDFs."""
+
+    @staticmethod
+    def read_pages(pdf_path):
+        return Path(pdf_path).read_text().split("\n\n")
+
+
+class _NoExtractLoader(ContextLoader):
+    """Fails if a document has to be extracted (only cached text is usable)."""
+
+    @staticmethod
+    def read_pages(pdf_path):
+        raise AssertionError(f"extracted {pdf_path}")
+
+
+class _LoggingLoader(_TextLoader):
+    """Logs every extraction to reads.log next to the document (also from worker processes)."""
+
+    @staticmethod
+    def read_pages(pdf_path):
+        with open(Path(pdf_path).parent / "reads.log", "a") as f:
+            f.write(Path(pdf_path).name + "\n")
+        time.sleep(0.05)
+        return _TextLoader.read_pages(pdf_path)
+
+
+def _context_dir(tmp_path):
+    (tmp_path / "sla.txt").write_text(SLA_TEXT)
+    (tmp_path / "m-series.txt").write_text(PRODUCT_TEXT)
+    (tmp_path / "product-mapping.json").write_text(json.dumps({
+        "global_context": {"always_load": ["sla.txt"]},
+        "product_lines": {"M-Series": {"description": "High-capacity", "pdf_files": ["m-series.txt"]}},
+    }))
+    return tmp_path
+
+
+class TestPassages:
+    """Chunking and BM25 ranking."""
+
+    def test_chunking(self):
+        text = "\n\n".join(f"Paragraph {i} " + "word " * 60 for i in range(20))
+        passages = chunk_text(text, "doc.pdf", chunk_chars=800, overlap=100)
+
+        assert len(passages) > 1
+        assert all(len(p.text) <= 800 + 100 for p in passages)
+        assert [p.position for p in passages] == list(range(len(passages)))
+        # Each passage starts with the tail of the previous one
+        assert passages[0].text.split()[-1] in passages[1].text[:100]
+
+    def test_tokenize_keeps_codes(self):
+        assert tokenize("The S1 case, and a RAID-Z2 pool") == ["s1", "case", "raid", "z2", "pool"]
+
+    def test_ranking_and_round_trip(self, tmp_path):
+        index = PassageIndex.build({"sla.pdf": SLA_TEXT, "m-series.pdf": PRODUCT_TEXT}, fingerprint="v1")
+        top = index.search("Our replication to the DR site keeps failing after snapshots expire", k=2)
+
+        assert top[0].source == "m-series.pdf"
+        assert "Replication" in top[0].text
+        assert top[0].score > 0
+        assert index.search("zzz unrelated", k=3) == []
+
+        index.save(tmp_path / "index.json")
+        loaded = PassageIndex.load(tmp_path / "index.json")
+        assert loaded.fingerprint == "v1"
+        assert [(p.source, p.position, p.score) for p in loaded.search("S1 production down", k=3)] == \
+            [(p.source, p.position, p.score) for p in index.search("S1 production down", k=3)]
+
+    def test_concurrent_saves(self, tmp_path):
+        index = PassageIndex.build({"sla.pdf": SLA_TEXT, "m-series.pdf": PRODUCT_TEXT}, fingerprint="v1")
+        path = tmp_path / "index.json"
+
+        # Writers racing on one index each use their own temp file
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: index.save(path), range(32)))
+        assert PassageIndex.load(path).fingerprint == "v1"
+        assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+    def test_token_budget(self):
+        index = PassageIndex.build({"sla.pdf": SLA_TEXT, "m-series.pdf": PRODUCT_TEXT})
+        passages = index.search("response drive pool replication S1", k=10)
+        selected = select_passages(passages, token_budget=passages[0].tokens)
+
+        assert selected == passages[:1]
+        assert select_passages(passages, token_budget=0) == []
+
+
+class TestRetrievalContext:
+    """Per-case prompt context."""
+
+    def test_for_case(self):
+        context = RetrievalContext("BASE", PassageIndex.build({"sla.pdf": SLA_TEXT}), token_budget=500, top_k=1)
+
+        prompt_context = context_for_case(context, "S1 outage, data not serving")
+        assert prompt_context.startswith("BASE\n\n=== RELEVANT DOCUMENTATION")
+        assert "2 hours" in prompt_context
+        assert context_for_case(context, "qwerty") == "BASE"
+        assert context_for_case("plain context", "S1") == "plain context"
+        assert str(context) == "BASE"
+
+    def test_loader_builds_and_reuses_index(self, tmp_path):
+        context_dir = _context_dir(tmp_path)
+        loader = _TextLoader(context_dir=context_dir)
+
+        context = loader.get_retrieval_context("BASE", "M-Series", token_budget=300, top_k=2)
+        assert {p.source for p in context.index.passages} == {"sla.txt", "m-series.txt"}
+        assert "M-Series PRODUCT INFORMATION" in context.base
+        assert (context_dir / ".cache" / "index" / "m_series.json").exists()
+
+        # A new loader reads the saved index; a changed document rebuilds it
+        saved = PassageIndex.load(context_dir / ".cache" / "index" / "m_series.json")
+        assert _TextLoader(context_dir=context_dir).get_passage_index("M-Series").fingerprint == saved.fingerprint
+        (context_dir / "m-series.txt").write_text(PRODUCT_TEXT + "\n\nNew firmware notes.")
+        rebuilt = _TextLoader(context_dir=context_dir).get_passage_index("M-Series")
+        assert rebuilt.fingerprint != saved.fingerprint
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path):
+        context_dir = _context_dir(tmp_path)
+        index_dir = context_dir / ".cache" / "index"
+        fingerprint = _TextLoader(context_dir=context_dir).get_passage_index("M-Series").fingerprint
+
+        index_path = index_dir / "m_series.json"
+        for corrupt in (index_path.read_text()[:100], "", '{"version": 1}'):
+            index_path.write_text(corrupt)
+            assert PassageIndex.load(index_path) is None
+
+            index = _TextLoader(context_dir=context_dir).get_passage_index("M-Series")
+            assert index.fingerprint == fingerprint
+            assert PassageIndex.load(index_path).fingerprint == fingerprint
+
+        assert [p.name for p in index_dir.iterdir()] == ["m_series.json"]
+
+    def test_no_documents(self, tmp_path):
+        assert ContextLoader(context_dir=tmp_path).get_retrieval_context("BASE") is None
+
+
+class TestTextCache:
+    """On-disk cache of extracted PDF text."""
+
+    def test_truncation(self):
+        assert join_pages(["abc", "def"], 100) == "abc\ndef"
+        assert join_pages(["abc", "def"], 4) == "abc\nd\n\n[...truncated at 4 chars...]"
+
+    def test_cache_across_loaders(self, tmp_path):
+        context_dir = _context_dir(tmp_path)
+        sla = context_dir / "sla.txt"
+        text = _TextLoader(context_dir=context_dir).extract_pdf_text(sla)
+        assert "2 hours" in text
+
+        # A new process reads the cached text without extracting, truncation applied on read
+        assert _NoExtractLoader(context_dir=context_dir).extract_pdf_text(sla) == text
+        assert _NoExtractLoader(context_dir=context_dir).extract_pdf_text(sla, max_chars=20).endswith(
+            "[...truncated at 20 chars...]"
+        )
+
+        # A changed file is extracted again
+        sla.write_text(SLA_TEXT + "\n\nS3 medium: next business day.")
+        assert "S3 medium" in _TextLoader(context_dir=context_dir).extract_pdf_text(sla)
+        assert "S3 medium" in _NoExtractLoader(context_dir=context_dir).extract_pdf_text(sla)
+        assert all(p.suffix == ".json" for p in (context_dir / ".cache" / "text").iterdir())
+
+    def test_prefetch(self, tmp_path):
+        context_dir = _context_dir(tmp_path)
+        loader = _TextLoader(context_dir=context_dir)
+        loader.prefetch_pdf_texts([context_dir / "sla.txt", context_dir / "m-series.txt"], max_workers=2)
+
+        documents = _NoExtractLoader(context_dir=context_dir).context_documents("M-Series")
+        assert set(documents) == {"sla.txt", "m-series.txt"}
+        assert "resilver" in documents["m-series.txt"]
+
+    def test_concurrent_callers_extract_once(self, tmp_path):
+        context_dir = _context_dir(tmp_path)
+        loader = _LoggingLoader(context_dir=context_dir)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            indexes = list(pool.map(lambda _: loader.get_passage_index("M-Series"), range(4)))
+        assert all(index is indexes[0] for index in indexes)
+        assert sorted((context_dir / "reads.log").read_text().split()) == ["m-series.txt", "sla.txt"]
+
+        # Another product line shares the already extracted global document
+        (context_dir / "reads.log").unlink()
+        assert loader.get_passage_index(None) is not None
+        assert not (context_dir / "reads.log").exists()
+
+    def test_missing_and_failed_documents(self, tmp_path):
+        loader = ContextLoader(context_dir=tmp_path)
+        assert loader.extract_pdf_text(tmp_path / "absent.pdf") == "[PDF not found: absent.pdf]"
+
+        (tmp_path / "broken.pdf").write_text("not a pdf")
+        assert loader.extract_pdf_text(tmp_path / "broken.pdf").startswith(("[Error reading PDF", "[PDF extraction"))
+        assert not (tmp_path / ".cache" / "text").exists()
+
+
+class TestProductContext:
+    """Per-case product line context."""
+
+    def test_detect_case_products(self, tmp_path):
+        (tmp_path / "product-mapping.json").write_text(json.dumps({
+            "series_letter_mapping": {"F": "F-Series", "M": "M-Series"},
+            "serial_prefixes": {"A1": "M-Series"},
+        }))
+        loader = ContextLoader(context_dir=tmp_path)
+        df = pd.DataFrame({
+            "Case Number": [1001, 1001, 1002, 1003, 1004, 1005],
+            "Product Series": [None, "F", "M", None, None, None],
+            "Product Model": ["M50", None, "F100-HA", "F100", None, None],
+            "Asset Serial": ["", "", "", "", "A1-123456", "ZZ-1"],
+        })
+
+        # Series beats model and serial per case; unmatched cases are left out
+        assert detect_case_products(df, loader) == {
+            "1001": "F-Series", "1002": "M-Series", "1003": "F-Series", "1004": "M-Series",
+        }
+
+    def test_context_per_case(self):
+        m_context = RetrievalContext("M BASE", PassageIndex.build({"m-series.pdf": PRODUCT_TEXT}), top_k=1)
+        context = ProductContext(
+            {"M-Series": m_context, "F-Series": "F CONTEXT"},
+            case_products={1001: "F-Series", "1002": "M-Series"},
+            default_product="M-Series",
+        )
+
+        assert context_for_case(context, "drive replacement", 1001) == "F CONTEXT"
+        assert "resilver" in context_for_case(context, "drive replacement", 1002.0)
+        assert context_for_case(context, "qwerty", 9999) == "M BASE"
+        assert str(context) == "M BASE"
+        assert context.products == ["M-Series", "F-Series"]
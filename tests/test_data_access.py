@@ -0,0 +1,166 @@
+"""
+Dashboard Data Access Tests
+
+Validates the lazily loaded, shared run data of the dashboard:
+- Only the artifacts a page reads are loaded; "in" and keys only check files
+- Sessions share one loaded copy, reloaded when the file changes
+- The cache stays within its memory budget (LRU eviction)
+- Concurrent requests for one file load it once
+- Full analyses keep the derived summary of the old loader
+- Metric tables load from tables/, or from the CSV of older runs
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.analysis.result_tables import save_result_table
+from src.dashboard.data_access import LOAD_LOCK_STRIPES, AnalysisData, ArtifactCache, estimate_size
+
+
+def _single_run(folder: Path) -> Path:
+    (folder / "json").mkdir(parents=True)
+    (folder / "json" / "summary_statistics.json").write_text(json.dumps({"account_name": "ACME", "total_cases": 2}))
+    (folder / "json" / "top_25_critical_cases.json").write_text(json.dumps({"cases": [{"case_number": 1}]}))
+    (folder / "charts").mkdir()
+    (folder / "charts" / "health_gauge.png").write_bytes(b"")
+    return folder
+
+
+def _full_run(folder: Path) -> Path:
+    (folder / "json").mkdir(parents=True)
+    (folder / "json" / "link_summary.json").write_text(json.dumps({"total_cases": 9, "total_orders": 4}))
+    (folder / "json" / "account_metrics.json").write_text(json.dumps({"accounts": ["Globex", "Initech"]}))
+    return folder
+
+
+class TestAnalysisData:
+    """Lazy mapping over a run folder."""
+
+    def test_lazy_loading(self, tmp_path):
+        cache = ArtifactCache(max_bytes=10**7)
+        data = AnalysisData(_single_run(tmp_path / "analysis_20250101_090000"), cache)
+
+        assert sorted(data) == ["analysis_type", "cases", "charts", "summary"]
+        assert "summary" in data and "all_cases" not in data
+        assert cache.stats()["misses"] == 0
+
+        assert data["analysis_type"] == "single"
+        assert data.get("summary", {})["account_name"] == "ACME"
+        assert data.get("all_cases", {}) == {}
+        assert list(data["charts"]) == ["health_gauge"]
+        assert cache.stats()["entries"] == 1
+
+    def test_full_summary(self, tmp_path):
+        data = AnalysisData(_full_run(tmp_path / "full_analysis_20250101_090000"), ArtifactCache(10**7))
+
+        assert data["analysis_type"] == "full"
+        assert data["summary"]["total_orders"] == 4
+        assert data["summary"]["account_name"] == "Globex"
+        assert "charts" not in data and data.get("opportunities") is None
+
+    def test_tables(self, tmp_path):
+        folder = _single_run(tmp_path / "analysis_20250101_090000")
+        save_result_table(pd.DataFrame({"case_number": [1, 2], "score": [0.5, 0.7]}), folder, "cases")
+        cache = ArtifactCache(10**7)
+        data = AnalysisData(folder, cache)
+
+        assert list(data.table("cases", columns=["score"]).columns) == ["score"]
+        assert data.table("cases", columns=["score"]) is data.table("cases", columns=["score"])
+        assert data.table("cases").shape == (2, 2)
+        assert data.table("timeline") is None
+
+    def test_metric_tables(self, tmp_path):
+        folder = _full_run(tmp_path / "full_analysis_20250101_090000")
+        cube = pd.DataFrame({"product_series": ["M-Series", ""], "deployments": [3, 1]})
+        save_result_table(cube, folder, "metrics_cube")
+        data = AnalysisData(folder, ArtifactCache(10**7))
+
+        assert "metrics_cube" in data and "metrics_facts" not in data
+        assert data["metrics_cube"].equals(cube)
+
+        # Runs saved before the result tables have metrics_cube.csv in the run folder
+        legacy = _full_run(tmp_path / "full_analysis_20240101_090000")
+        cube.to_csv(legacy / "metrics_cube.csv", index=False)
+        assert AnalysisData(legacy, ArtifactCache(10**7))["metrics_cube"].equals(cube)
+
+
+class TestArtifactCache:
+    """Shared, mtime-invalidated cache with memory accounting."""
+
+    def test_shared_and_invalidated(self, tmp_path):
+        cache = ArtifactCache(10**7)
+        folder = _single_run(tmp_path / "analysis_20250101_090000")
+
+        first = AnalysisData(folder, cache)["summary"]
+        assert AnalysisData(folder, cache)["summary"] is first
+        assert cache.stats()["hits"] == 1
+
+        summary = folder / "json" / "summary_statistics.json"
+        summary.write_text(json.dumps({"account_name": "ACME Corp"}))
+        os.utime(summary, ns=(1, 1))
+        assert AnalysisData(folder, cache)["summary"] == {"account_name": "ACME Corp"}
+        assert cache.stats()["entries"] == 1
+
+    def test_memory_budget(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.txt"
+            path.write_text("x" * 1000)
+            paths.append(path)
+        size = estimate_size("x" * 1000)
+        cache = ArtifactCache(max_bytes=2 * size)
+
+        for path in paths:
+            cache.get(path, Path.read_text)
+        stats = cache.stats()
+        assert (stats["entries"], stats["evictions"]) == (2, 1)
+        assert stats["bytes"] <= stats["max_bytes"]
+
+        # Least recently used goes first; oversized artifacts are not kept
+        cache.get(paths[0], Path.read_text)
+        assert cache.stats()["misses"] == 4
+        big = tmp_path / "big.txt"
+        big.write_text("x" * 10_000)
+        assert len(cache.get(big, Path.read_text)) == 10_000
+        assert cache.stats()["entries"] == 2
+
+    def test_concurrent_load_once(self, tmp_path):
+        path = tmp_path / "slow.txt"
+        path.write_text("data")
+        cache = ArtifactCache(10**7)
+        calls = []
+
+        def slow_loader(p):
+            calls.append(p)
+            time.sleep(0.05)
+            return p.read_text()
+
+        threads = [threading.Thread(target=cache.get, args=(path, slow_loader)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+
+    def test_load_locks_do_not_grow(self, tmp_path):
+        cache = ArtifactCache(10**7)
+        for i in range(200):
+            path = tmp_path / f"{i}.txt"
+            path.write_text(str(i))
+            assert cache.get(path, Path.read_text) == str(i)
+        assert len(cache._loading) == LOAD_LOCK_STRIPES
+
+    def test_estimate_size(self):
+        frame = pd.DataFrame({"a": range(1000)})
+        assert estimate_size(frame) >= 8000
+        assert estimate_size({"cases": ["x" * 100] * 10}) > 1000
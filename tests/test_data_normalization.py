@@ -0,0 +1,143 @@
+"""
+Data Normalization Tests
+
+Validates the vectorized column normalization shared by all loaders:
+- Enum columns map to the same values the per-row parsers produced
+- Date columns parse column-wise with a detected format
+- Use case text is categorized by the compiled, memoized keyword taxonomy
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.models import Severity, SupportLevel, ProductSeries
+from src.data.normalization import (
+    normalize_severity,
+    normalize_severity_codes,
+    normalize_support_level,
+    normalize_product_series,
+    normalize_primary_product,
+    parse_date_column,
+    UseCaseClassifier,
+    categorize_use_case,
+    load_use_case_taxonomy,
+    set_use_case_taxonomy,
+    use_case_categories,
+)
+
+
+class TestEnumNormalization:
+    """Enum columns become Categoricals with the expected members."""
+
+    def test_severity(self):
+        values = pd.Series(["S1 - Critical", "sev2", "High", " medium ", "S4", None, np.nan, "other"])
+        result = normalize_severity(values)
+
+        assert isinstance(result.dtype, pd.CategoricalDtype)
+        assert list(result) == [
+            Severity.S1, Severity.S2, Severity.S2, Severity.S3,
+            Severity.S4, Severity.S4, Severity.S4, Severity.S4,
+        ]
+
+    def test_severity_codes_only_match_explicit_labels(self):
+        values = pd.Series(["S2 - High", "Critical", "s3", "S4"])
+        assert list(normalize_severity_codes(values)) == ["S2", "S4", "S3", "S4"]
+
+    def test_support_level(self):
+        values = pd.Series(["Gold", "silver plus", "BRONZE", "Platinum", None])
+        assert list(normalize_support_level(values)) == [
+            SupportLevel.GOLD, SupportLevel.SILVER, SupportLevel.BRONZE,
+            SupportLevel.UNKNOWN, SupportLevel.UNKNOWN,
+        ]
+
+    def test_product_series_is_exact_match(self):
+        values = pd.Series(["F", "m-series", " HSERIES ", "R", "F100", None])
+        assert list(normalize_product_series(values)) == [
+            ProductSeries.F_SERIES, ProductSeries.M_SERIES, ProductSeries.H_SERIES,
+            ProductSeries.R_SERIES, ProductSeries.UNKNOWN, ProductSeries.UNKNOWN,
+        ]
+
+    def test_primary_product_prefers_model_identifiers(self):
+        values = pd.Series(["TrueNAS M60", "F100", "h20", "Mini", "X-Series", None])
+        assert list(normalize_primary_product(values)) == [
+            ProductSeries.M_SERIES, ProductSeries.F_SERIES, ProductSeries.H_SERIES,
+            ProductSeries.M_SERIES, ProductSeries.UNKNOWN, ProductSeries.UNKNOWN,
+        ]
+
+
+class TestDateParsing:
+    """Date columns parse in one pass, tolerating mixed formats."""
+
+    def test_detected_format(self):
+        values = pd.Series(["03/04/2024 1:00 PM", "12/25/2023 9:05 AM", None], name="Message Date")
+        result = parse_date_column(values)
+
+        assert result.iloc[0] == pd.Timestamp("2024-03-04 13:00")
+        assert result.iloc[1] == pd.Timestamp("2023-12-25 09:05")
+        assert pd.isna(result.iloc[2])
+
+    def test_mixed_formats_and_garbage(self):
+        values = pd.Series(["2024-01-05 10:00:00", "02/01/2024", "not a date"], name="Created Date")
+        result = parse_date_column(values)
+
+        assert result.iloc[0] == pd.Timestamp("2024-01-05 10:00")
+        assert result.iloc[1] == pd.Timestamp("2024-02-01")
+        assert pd.isna(result.iloc[2])
+
+    def test_datetime_column_passes_through(self):
+        values = pd.Series(pd.to_datetime(["2024-01-01", "2024-06-30"]))
+        assert parse_date_column(values) is values
+
+
+class TestUseCaseCategorization:
+    """Keywords match on word boundaries; earlier categories win."""
+
+    def test_word_boundaries(self):
+        assert categorize_use_case("DR site replication") == "Backup & Archive"
+        assert categorize_use_case("hard drives for spares") == "General Purpose"
+        assert categorize_use_case("Shared drive for CAD files") == "File Sharing"
+
+    def test_prefix_keywords_and_plurals(self):
+        assert categorize_use_case("VMware cluster") == "Virtualization"
+        assert categorize_use_case("Archiving old projects") == "Backup & Archive"
+        assert categorize_use_case("NVRs at each store") == "Video Surveillance"
+
+    def test_priority_and_fallbacks(self):
+        # Media is listed before Backup
+        assert categorize_use_case("backup of 4K video editing projects") == "Media & Entertainment"
+        assert categorize_use_case("") == "Unknown"
+        assert categorize_use_case(None) == "Unknown"
+        assert categorize_use_case("lab equipment") == "General Purpose"
+
+    def test_memoized(self):
+        classifier = UseCaseClassifier([("Database", ["sql"])])
+        classifier.categorize("SQL server")
+        classifier.categorize("SQL server")
+        assert classifier.categorize.cache_info().hits == 1
+
+    def test_custom_taxonomy(self, tmp_path):
+        path = tmp_path / "taxonomy.json"
+        path.write_text(json.dumps({"AI/ML": ["gpu", "training*"], "Backup & Archive": ["backup*"]}))
+        try:
+            set_use_case_taxonomy(load_use_case_taxonomy(path))
+            assert use_case_categories() == ["AI/ML", "Backup & Archive"]
+            assert categorize_use_case("GPU training backups") == "AI/ML"
+            assert categorize_use_case("VMware cluster") == "General Purpose"
+        finally:
+            set_use_case_taxonomy(None)
+        assert categorize_use_case("VMware cluster") == "Virtualization"
+
+    def test_taxonomy_must_be_a_mapping(self, tmp_path):
+        path = tmp_path / "taxonomy.json"
+        path.write_text(json.dumps(["backup"]))
+        with pytest.raises(ValueError):
+            load_use_case_taxonomy(path)
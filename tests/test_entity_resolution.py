@@ -0,0 +1,154 @@
+"""
+Entity Resolution Tests
+
+Validates the fuzzy linking pass run after exact Order Number linking:
+- Account name aliases ("ACME Corp" / "ACME Corporation")
+- Order numbers with suffixes, typos or several orders folded into the
+  opportunity order
+- Adjacent order numbers of one account are only reported, never merged
+- Orphan records attached by serial number
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.models import Opportunity, Deployment, SupportCase
+from src.data.data_linker import link_data_sources
+from src.data.entity_resolution import normalize_account_name, resolve_entities
+
+
+def _opp(order, account):
+    return Opportunity(order_number=order, opportunity_name=f"{account} {order}", account_name=account)
+
+
+def _case(number, order, account, serial="", messages=None):
+    return SupportCase(
+        case_number=number, order_number=order, account_name=account, serial_number=serial, messages=messages,
+    )
+
+
+class TestAccountAliases:
+    """Account names resolve to one canonical account."""
+
+    def test_normalize_account_name(self):
+        assert normalize_account_name("ACME Corp.") == "acme"
+        assert normalize_account_name("Acme Corporation") == "acme"
+        assert normalize_account_name("Smith & Sons, LLC") == "smith and sons"
+
+    def test_aliases_merge_orders_under_canonical_name(self):
+        store = link_data_sources(
+            [_opp("5001", "ACME Corp"), _opp("5002", "ACME Corp"), _opp("5003", "Acme Corporation")],
+            [], [],
+        )
+        report = resolve_entities(store)
+
+        assert [(a.alias, a.canonical) for a in report.account_aliases] == [("Acme Corporation", "ACME Corp")]
+        assert report.applied_aliases == 1
+        assert store.all_accounts == ["ACME Corp"]
+        assert len(store.get_orders_by_account("Acme Corporation")) == 3
+
+    def test_distinct_accounts_are_not_merged(self):
+        store = link_data_sources([_opp("5001", "ACME Corp"), _opp("5002", "Apex Systems")], [], [])
+        report = resolve_entities(store)
+
+        assert report.account_aliases == []
+        assert sorted(store.all_accounts) == ["ACME Corp", "Apex Systems"]
+
+
+class TestOrderMatching:
+    """Near-miss order numbers fold into the opportunity order."""
+
+    def test_suffix_multi_order_and_typo(self):
+        store = link_data_sources(
+            [_opp("123456", "ACME"), _opp("223344", "Globex"), _opp("778899", "Initech")],
+            [],
+            [
+                _case("C1", "123456-A", "ACME"),
+                _case("C2", "223344 / 990011", "Globex"),
+                _case("C3", "778898", "Initech", messages=["Drive failed on the system from PO 778899"]),
+            ],
+        )
+        report = resolve_entities(store)
+
+        assert {m.method for m in report.order_matches} == {"suffix", "multi_order", "edit_distance"}
+        assert report.applied_matches == 3
+        assert len(store.orders) == 3
+        assert [c.case_number for c in store.get_order("778899").support_cases] == ["C3"]
+        assert store.summary.fully_linked_orders == 0
+        assert store.summary.orders_with_support == 3
+
+    def test_adjacent_order_numbers_are_only_reported(self):
+        store = link_data_sources([_opp("450001", "ACME")], [], [_case("C1", "450002", "ACME")])
+        report = resolve_entities(store)
+
+        assert [(m.source_order, m.method) for m in report.order_matches] == [("450002", "edit_distance")]
+        assert report.applied_matches == 0
+        assert store.get_order("450001").support_cases == []
+        assert [c.case_number for c in store.get_order("450002").support_cases] == ["C1"]
+
+    def test_shared_serial_applies_typo(self):
+        store = link_data_sources(
+            [_opp("450001", "ACME")],
+            [Deployment(case_number="D1", order_number="450001", account_name="ACME", serial_number="A1-1001")],
+            [_case("C1", "450002", "ACME", serial="A1-1001")],
+        )
+        report = resolve_entities(store)
+
+        assert report.applied_matches == 1
+        assert store.get_order("450002") is None
+
+    def test_merged_order_opportunity_undoes_merge(self):
+        store = link_data_sources([_opp("450001", "ACME")], [], [_case("C1", "450002", "ACME")])
+        resolve_entities(store, min_confidence=0.8)
+        assert [c.case_number for c in store.get_order("450001").support_cases] == ["C1"]
+
+        # The second PO's opportunity arrives: the orders were never the same
+        store.apply_delta([_opp("450002", "ACME")], [], [])
+
+        assert store.get_order("450001").opportunity.opportunity_name == "ACME 450001"
+        assert store.get_order("450001").support_cases == []
+        order = store.get_order("450002")
+        assert order.opportunity.opportunity_name == "ACME 450002"
+        assert [c.case_number for c in order.support_cases] == ["C1"]
+        assert "450002" not in store.order_aliases
+
+        store.apply_delta([], [], [_case("C1", "450002", "ACME")])
+        assert len(order.support_cases) == 1
+
+    def test_typo_for_other_account_is_not_applied(self):
+        store = link_data_sources([_opp("778899", "Initech")], [], [_case("C3", "778898", "Globex")])
+        report = resolve_entities(store)
+
+        assert report.order_matches == [] or not report.order_matches[0].applied
+        assert store.get_order("778898") is not None
+
+    def test_later_delta_follows_merge(self):
+        store = link_data_sources([_opp("123456", "ACME")], [], [_case("C1", "123456-A", "ACME")])
+        resolve_entities(store)
+
+        store.apply_delta([], [], [_case("C1", "123456-A", "ACME")])
+        assert store.get_order("123456-A") is None
+        assert len(store.get_order("123456").support_cases) == 1
+
+
+class TestOrphans:
+    """Orphan records attach through serial numbers."""
+
+    def test_orphan_case_attached_by_serial(self):
+        store = link_data_sources(
+            [_opp("5001", "ACME")],
+            [Deployment(case_number="D1", order_number="5001", account_name="ACME", serial_number="A1-1001")],
+            [_case("C9", "", "ACME", serial="A1-1001")],
+        )
+        assert store.summary.orphan_cases == 1
+
+        report = resolve_entities(store)
+
+        assert report.applied_matches == 1
+        assert store.orphan_cases == []
+        assert store.get_order("5001").support_cases[0].case_number == "C9"
+        assert store.summary.orphan_cases == 0
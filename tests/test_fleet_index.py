@@ -0,0 +1,153 @@
+"""
+Fleet Asset Index Tests
+
+Validates the cross-account serial index and failure clustering:
+- Serial extraction metadata (chassis refurb levels, vendor drives)
+- Serial, prefix and batch lookups across accounts
+- Time-windowed failure clusters (window, account count, sources)
+- Indexing single-file pipeline cases
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.models import Deployment, SupportCase
+from src.analysis.asset_correlation import analyze_asset_correlations, extract_serials_from_text
+from src.analysis.fleet_index import FleetAssetIndex, serial_batch, serial_prefix
+
+
+BASE_DATE = datetime(2024, 1, 1)
+
+
+class _QuietOutput:
+    def stream_message(self, message):
+        pass
+
+
+def _case(number, days, account, serial="", messages=None):
+    return SupportCase(
+        case_number=number,
+        order_number=f"ORD-{account}",
+        account_name=account,
+        serial_number=serial,
+        created_date=BASE_DATE + timedelta(days=days),
+        messages=messages or [],
+    )
+
+
+class TestSerialExtraction:
+    """Compiled patterns keep the extraction output."""
+
+    def test_metadata(self):
+        serials = extract_serials_from_text("Chassis r2-1234567 with drives WDZX12345678 and SAMSUNGAB1234")
+        assert serials == [
+            {"serial": "R2-1234567", "component_type": "Chassis", "is_refurb": True, "refurb_level": "R2"},
+            {"serial": "WDZX12345678", "component_type": "Drive", "is_refurb": False, "refurb_level": None},
+            {"serial": "SAMSUNGAB1234", "component_type": "Drive", "is_refurb": False, "refurb_level": None},
+        ]
+        assert extract_serials_from_text("") == []
+
+    def test_correlations_use_extracted_metadata(self):
+        cases = [
+            {"case_number": i, "criticality_score": 100 + i, "severity": "S2",
+             "asset_serial": "R1-7654321", "messages_full": "Replaced STAB12345678"}
+            for i in range(3)
+        ]
+        result = analyze_asset_correlations(cases, _QuietOutput())
+
+        assert result["serials_with_multiple_cases"] == 2
+        assert result["refurb_case_count"] == 3
+        assert result["refurb_breakdown"]["R1"] == 3
+        chassis = next(r for r in result["recurring_serials"] if r["serial"] == "R1-7654321")
+        assert (chassis["component_type"], chassis["refurb_level"]) == ("Chassis", "R1")
+
+    def test_prefix_and_batch(self):
+        assert serial_prefix("SAMSUNGAB1234") == "SAMSUNG"
+        assert serial_prefix("R3-1234567") == "R3"
+        assert serial_batch("WDZX12345678") == "WDZX12"
+        assert serial_batch("A1-1234567") == "A11234"
+
+
+class TestFleetIndex:
+    """Serial, prefix and batch lookups across accounts."""
+
+    def test_lookups(self):
+        index = FleetAssetIndex.from_records(
+            deployments=[Deployment(case_number="D1", order_number="ORD-3", account_name="Initech",
+                                    serial_number="A1-5550001")],
+            support_cases=[
+                _case("C1", 0, "ACME", messages=["Drive WDZX12340001 failed", "Drive WDZX12340001 failed"]),
+                _case("C2", 5, "Globex", messages=["Drive wdzx12340002 failed"]),
+                _case("C3", 9, "Globex", serial="A1-5550001"),
+            ],
+        )
+
+        assert len(index) == 4
+        assert [s.case_number for s in index.for_serial("WDZX12340001")] == ["C1"]
+        assert {s.account_name for s in index.for_prefix("wd")} == {"ACME", "Globex"}
+        assert len(index.for_batch("WDZX12")) == 2
+        assert index.accounts_for_serial("A1-5550001") == ["Globex", "Initech"]
+        assert [r["serial"] for r in index.cross_account_serials()] == ["A1-5550001"]
+
+    def test_short_serial_field_is_indexed(self):
+        index = FleetAssetIndex.from_records(support_cases=[_case("C1", 0, "ACME", serial="ST4000ABC")])
+        assert index.for_serial("ST4000ABC")[0].component_type == "Drive"
+
+
+class TestFailureClusters:
+    """A batch failing at several customers within the window."""
+
+    def _index(self, days_and_accounts, batch="WDZX1234"):
+        cases = [
+            _case(f"C{i}", days, account, messages=[f"Failed drive {batch}{i:04d}"])
+            for i, (days, account) in enumerate(days_and_accounts)
+        ]
+        return FleetAssetIndex.from_records(support_cases=cases)
+
+    def test_cluster_within_window(self):
+        index = self._index([(0, "ACME"), (10, "Globex"), (25, "Initech"), (200, "Hooli")])
+        clusters = index.failure_clusters(window_days=30)
+
+        assert len(clusters) == 1
+        cluster = clusters[0]
+        assert (cluster.key, cluster.level, cluster.component_type) == ("WDZX12", "batch", "Drive")
+        assert cluster.accounts == ["ACME", "Globex", "Initech"]
+        assert cluster.span_days == 25
+        assert cluster.to_dict()["start"] == "2024-01-01"
+
+    def test_requires_several_accounts_in_window(self):
+        assert self._index([(0, "ACME"), (60, "Globex")]).failure_clusters(window_days=30) == []
+        assert self._index([(0, "ACME"), (5, "ACME")]).failure_clusters(window_days=30) == []
+        assert len(self._index([(0, "ACME"), (60, "Globex")]).failure_clusters(window_days=90)) == 1
+
+    def test_deployments_are_not_failures(self):
+        index = FleetAssetIndex.from_records(
+            deployments=[Deployment(case_number="D1", order_number="ORD-1", account_name="Globex",
+                                    serial_number="WDZX12340001", message_date=BASE_DATE)],
+            support_cases=[_case("C1", 1, "ACME", serial="WDZX12340002")],
+        )
+        assert index.failure_clusters() == []
+        assert len(index.failure_clusters(sources=("support", "deployment"))) == 1
+
+        with pytest.raises(ValueError):
+            index.failure_clusters(level="vendor")
+
+    def test_from_case_analysis(self):
+        cases = [
+            {"case_number": 1, "customer_name": "ACME", "asset_serial": "nan",
+             "created_date": "2024-01-01", "messages_full": "Drive STAB12345678 failed"},
+            {"case_number": 2, "customer_name": "Globex", "asset_serial": "STAB12349999",
+             "created_date": "2024-01-20", "messages_full": ""},
+        ]
+        report = FleetAssetIndex.from_case_analysis(cases).report()
+
+        assert report["accounts"] == 2
+        assert report["prefix_counts"] == {"ST": 2}
+        assert report["failure_clusters"][0]["accounts"] == ["ACME", "Globex"]
@@ -0,0 +1,119 @@
+"""
+JSON Output Tests
+
+Validates the streaming output writer and format-agnostic reader:
+- Streamed record files read back as the dict json.dump would have written
+- NDJSON and gzip outputs read back identically
+- Records are consumed from generators (never materialized as one list)
+- Unknown formats are rejected (by Config.validate() before a run, too)
+  and write errors are raised on exit
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core import Config
+from src.core.json_output import (
+    OutputWriter,
+    ZSTD_AVAILABLE,
+    find_json_output,
+    read_json_output,
+    write_json_records,
+)
+from src.data.models import Severity
+
+
+HEADER = {"total": 3, "analyzed": 2}
+RECORDS = [
+    {"case_number": "C1", "severity": Severity.S1, "created": datetime(2024, 1, 2, 3, 4), "score": 1.5},
+    {"case_number": "C2", "analysis": None, "tags": ("a", "b"), "counts": {1: 2}},
+    {"case_number": "C3", "text": "Ünïcode \"quoted\"\nline"},
+]
+
+
+def _expected():
+    return json.loads(json.dumps({**HEADER, "support_cases": RECORDS}, default=str))
+
+
+class TestRecordFiles:
+    """Streamed record files in each format."""
+
+    @pytest.mark.parametrize("fmt,compression,filename", [
+        ("json", "", "support_cases.json"),
+        ("ndjson", "", "support_cases.ndjson"),
+        ("json", "gzip", "support_cases.json.gz"),
+        ("ndjson", "gzip", "support_cases.ndjson.gz"),
+        ("json", "none", "support_cases.json"),
+    ])
+    def test_round_trip(self, tmp_path, fmt, compression, filename):
+        with OutputWriter(tmp_path, fmt=fmt, compression=compression) as writer:
+            path = writer.write_records("support_cases", HEADER, "support_cases", iter(RECORDS))
+
+        assert path.name == filename
+        assert find_json_output(tmp_path, "support_cases") == path
+        assert read_json_output(tmp_path, "support_cases") == _expected()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_json_format_is_plain_json(self, tmp_path):
+        write_json_records(tmp_path / "cases.json", {}, "cases", (r for r in RECORDS))
+        with open(tmp_path / "cases.json") as f:
+            assert json.load(f) == {"cases": _expected()["support_cases"]}
+
+        write_json_records(tmp_path / "empty.json", {"total": 0}, "cases", [])
+        with open(tmp_path / "empty.json") as f:
+            assert json.load(f) == {"total": 0, "cases": []}
+
+    def test_documents_and_missing_files(self, tmp_path):
+        with OutputWriter(tmp_path, fmt="ndjson", compression="gzip") as writer:
+            path = writer.write("summary_statistics", {"account_name": "ACME"})
+
+        # Small documents stay plain indented JSON
+        assert path.name == "summary_statistics.json"
+        assert path.read_text().startswith('{\n  "account_name"')
+        assert read_json_output(tmp_path, "summary_statistics") == {"account_name": "ACME"}
+        assert read_json_output(tmp_path, "absent", default={}) == {}
+
+    def test_zstd_falls_back_without_zstandard(self, tmp_path):
+        writer = OutputWriter(tmp_path, compression="zstd")
+        writer.close()
+        assert writer.compression == ("zstd" if ZSTD_AVAILABLE else "gzip")
+
+
+class TestWriterErrors:
+    """Configuration and write errors."""
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            OutputWriter(tmp_path, fmt="xml")
+        with pytest.raises(ValueError):
+            OutputWriter(tmp_path, compression="bz2")
+
+    def test_config_validate_checks_output_settings(self, monkeypatch):
+        monkeypatch.setattr(Config, "ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setattr(Config, "OUTPUT_FORMAT", "ndjson")
+        monkeypatch.setattr(Config, "OUTPUT_COMPRESSION", "none")
+        assert Config.validate() == []
+
+        monkeypatch.setattr(Config, "OUTPUT_FORMAT", "xml")
+        monkeypatch.setattr(Config, "OUTPUT_COMPRESSION", "bz2")
+        errors = Config.validate()
+        assert len(errors) == 2
+        assert errors[0].startswith("OUTPUT_FORMAT") and errors[1].startswith("OUTPUT_COMPRESSION")
+
+    def test_record_error_is_raised(self, tmp_path):
+        def records():
+            yield {"ok": 1}
+            raise RuntimeError("bad record")
+
+        with pytest.raises(RuntimeError, match="bad record"):
+            with OutputWriter(tmp_path) as writer:
+                writer.write_records("broken", {}, "rows", records())
+        assert find_json_output(tmp_path, "broken") is None
@@ -0,0 +1,84 @@
+"""
+Linked Data Store Index Tests
+
+Validates the secondary indexes built by LinkedDataStore:
+- Product series, use case, serial, severity, deploy type, fiscal period
+- Indexes follow in-place delta updates
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.models import Opportunity, Deployment, SupportCase, ProductSeries, Severity
+from src.data.data_linker import link_data_sources
+
+
+def _store():
+    opportunities = [
+        Opportunity(order_number="5001", opportunity_name="ACME M60", account_name="ACME",
+                    primary_product="TrueNAS M60", primary_use_case="VMware ESXi datastore",
+                    fiscal_period="FY25 Q1"),
+        Opportunity(order_number="5002", opportunity_name="Globex", account_name="Globex",
+                    primary_product="F100", business_need="Nightly backup target",
+                    fiscal_period="FY25 Q2"),
+    ]
+    deployments = [
+        Deployment(case_number="D1", order_number="5001", account_name="ACME",
+                   serial_number="A1-1001", product_series=ProductSeries.M_SERIES,
+                   is_service_deploy=True),
+        Deployment(case_number="D2", order_number="5003", account_name="Initech",
+                   serial_number="A1-3003", product_series=ProductSeries.H_SERIES),
+    ]
+    cases = [
+        SupportCase(case_number="C1", order_number="5001", account_name="ACME",
+                    serial_number="A1-1001", severity=Severity.S1,
+                    product_series=ProductSeries.M_SERIES),
+        SupportCase(case_number="C2", order_number="5003", account_name="Initech",
+                    serial_number="A1-3003", severity=Severity.S3,
+                    product_series=ProductSeries.H_SERIES),
+    ]
+    return link_data_sources(opportunities, deployments, cases)
+
+
+def _numbers(orders):
+    return sorted(o.order_number for o in orders)
+
+
+class TestSecondaryIndexes:
+    """Query methods return only matching orders."""
+
+    def test_product_series(self):
+        store = _store()
+        assert _numbers(store.get_orders_by_product_series("M")) == ["5001"]
+        assert _numbers(store.get_orders_by_product_series("F-Series")) == ["5002"]
+        assert _numbers(store.get_orders_by_product_series("H")) == ["5003"]
+        # Unindexed keys fall back to substring matching on the opportunity
+        assert _numbers(store.get_orders_by_product_series("M60")) == ["5001"]
+
+    def test_use_case(self):
+        store = _store()
+        assert _numbers(store.get_orders_by_use_case("Virtualization")) == ["5001"]
+        assert _numbers(store.get_orders_by_use_case("Backup & Archive")) == ["5002"]
+        assert store.get_use_case("5003") == "Unknown"
+
+    def test_serial_severity_deploy_type_fiscal_period(self):
+        store = _store()
+        assert _numbers(store.get_orders_by_serial("A1-3003")) == ["5003"]
+        assert _numbers(store.get_orders_by_severity("S1")) == ["5001"]
+        assert store.get_orders_by_severity("S2") == []
+        assert _numbers(store.get_orders_by_deploy_type(True)) == ["5001"]
+        assert _numbers(store.get_orders_by_deploy_type(False)) == ["5003"]
+        assert _numbers(store.get_orders_by_fiscal_period("FY25 Q2")) == ["5002"]
+
+    def test_indexes_follow_delta(self):
+        store = _store()
+        store.apply_delta([], [], [
+            SupportCase(case_number="C3", order_number="5002", account_name="Globex",
+                        serial_number="B2-2002", severity=Severity.S1),
+        ])
+        assert _numbers(store.get_orders_by_severity("S1")) == ["5001", "5002"]
+        assert _numbers(store.get_orders_by_serial("B2-2002")) == ["5002"]
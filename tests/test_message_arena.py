@@ -0,0 +1,51 @@
+"""
+Message Arena Tests
+
+Validates MessageArena and the `messages` property on records:
+- Identical bodies are stored once
+- Reads go through the arena; writes need a whole-list assignment
+- clear() resets the arena for a new ingest
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.models import MessageArena, MESSAGE_ARENA, SupportCase
+
+
+class TestMessageArena:
+    """Shared storage of message bodies."""
+
+    def test_bodies_stored_once(self):
+        arena = MessageArena()
+        ids = arena.add_all(["Thanks", "Pool degraded", "Thanks"])
+        assert list(ids) == [0, 1, 0]
+        assert len(arena) == 2
+        assert arena.get(ids) == ["Thanks", "Pool degraded", "Thanks"]
+
+    def test_clear(self):
+        arena = MessageArena()
+        arena.add_all(["Thanks", "Pool degraded"])
+        arena.clear()
+        assert len(arena) == 0
+        assert arena.add("Replaced HBA") == 0
+        assert arena.get([0]) == ["Replaced HBA"]
+
+
+class TestMessagesProperty:
+    """List-of-strings API on top of MESSAGE_ARENA."""
+
+    def test_assignment_writes_through(self):
+        case = SupportCase("C1", "SO-1", "ACME", messages=["Pool offline"])
+        assert case.messages == ["Pool offline"]
+        assert MESSAGE_ARENA.get(case.message_ids) == ["Pool offline"]
+
+        # In-place edits act on a copy; assign the whole list instead
+        case.messages.append("Replaced HBA")
+        assert case.messages == ["Pool offline"]
+        case.messages = case.messages + ["Replaced HBA"]
+        assert case.messages == ["Pool offline", "Replaced HBA"]
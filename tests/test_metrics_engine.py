@@ -0,0 +1,515 @@
+"""
+Fused Metrics Engine Tests
+
+Validates calculate_all_metrics() and the per-family functions:
+- Product, account, use case and service metrics match values pinned from
+  the original per-family implementation on a fixed store
+- Use case service deploy rate counts deploys across all orders
+- Same result keys in the same order
+- The fact table backend agrees, including after a CSV round trip
+- The incremental state agrees after a delta and a save/load round trip
+- Metrics cube roll-ups agree with the product and use case metrics
+- Percentile sketches stay within their relative accuracy and retract exactly
+"""
+
+import random
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.models import Opportunity, Deployment, SupportCase, ProductSeries, Severity
+from src.data.data_linker import link_data_sources
+from src.analysis.metrics.accumulator import (
+    Accumulator,
+    SKETCH_ACCURACY,
+    sketch_bucket,
+    sketch_percentiles,
+)
+from src.analysis.metrics import (
+    calculate_all_metrics,
+    calculate_all_product_metrics,
+    calculate_all_account_metrics,
+    calculate_all_usecase_metrics,
+    compare_service_vs_self_deploy,
+    build_fact_table,
+    calculate_metrics_from_facts,
+    save_fact_table,
+    load_fact_table,
+    MetricsState,
+    CUBE_DIMENSIONS,
+    build_metrics_cube,
+    query_cube,
+    save_metrics_cube,
+    load_metrics_cube,
+)
+from src.analysis.result_tables import load_result_table, save_result_table
+
+
+def _store(n=200, seed=7):
+    rng = random.Random(seed)
+    use_cases = ["VMware cluster", "Nightly backup", "Oracle database", "Render farm", ""]
+    opportunities = [
+        Opportunity(
+            order_number=str(1000 + i),
+            opportunity_name=f"Deal {i}",
+            account_name=f"Account {i % 23}",
+            primary_product=rng.choice(["TrueNAS F100", "M50", "H20", "R30", ""]),
+            primary_use_case=rng.choice(use_cases),
+            pain_points=rng.choice(["", "Slow restores", "Capacity"]),
+            amount=rng.randint(1, 500) * 100.0,
+        )
+        for i in range(n)
+    ]
+    deployments = [
+        Deployment(
+            case_number=f"D{i}",
+            order_number=str(1000 + rng.randrange(n + 20)),
+            account_name=f"Account {i % 23}",
+            product_series=rng.choice(list(ProductSeries)),
+            is_service_deploy=rng.random() < 0.4,
+            deployment_score=rng.choice([None, rng.randint(0, 100)]),
+        )
+        for i in range(n)
+    ]
+    cases = [
+        SupportCase(
+            case_number=f"C{i}",
+            order_number=str(1000 + rng.randrange(n + 20)),
+            account_name=f"Account {i % 23}",
+            severity=rng.choice(list(Severity)),
+            product_series=rng.choice(list(ProductSeries)),
+            case_reason=rng.choice(["", "Hardware", "Performance", "Networking"]),
+            frustration_score=rng.choice([None, rng.randint(0, 10)]),
+            escalation_detected=rng.random() < 0.2,
+            is_hardware_failure=rng.random() < 0.2,
+        )
+        for i in range(n * 2)
+    ]
+    store = link_data_sources(opportunities, deployments, cases)
+
+    # Sorted: link order depends on the hash seed
+    for order in sorted(store.orders, key=lambda o: o.order_number):
+        if order.is_fully_linked:
+            order.journey_health_score = rng.randint(0, 100)
+            order.churn_risk = rng.choice(["Critical", "High", "Low"])
+            order.critical_findings = [f"Finding {rng.randint(0, 5)}"]
+    return store
+
+
+# Values from the original per-family implementation (before the fused
+# engine and shared accumulators) on _store(). Use case service_deploy_rate
+# and recommended_products changed on purpose since, and are tested separately.
+BASELINE_PRODUCTS = {
+    "F-Series": {
+        "units_sold": 113, "total_revenue": 2879300.0, "units_deployed": 37,
+        "deployment_success_rate": 23.809523809523807, "avg_deployment_score": 51.142857142857146,
+        "service_deploy_count": 16, "total_support_cases": 91, "support_intensity": 2.4594594594594597,
+        "avg_frustration_score": 4.660377358490566, "s1_case_count": 29, "escalation_count": 18,
+        "hardware_failure_rate": 0.4864864864864865, "fully_linked_orders": 64,
+        "avg_journey_health": 49.59375, "high_churn_risk_count": 46, "unique_accounts": 23,
+    },
+    "M-Series": {
+        "units_sold": 109, "total_revenue": 2888900.0, "units_deployed": 36,
+        "deployment_success_rate": 35.294117647058826, "avg_deployment_score": 62.411764705882355,
+        "service_deploy_count": 18, "total_support_cases": 77, "support_intensity": 2.138888888888889,
+        "avg_frustration_score": 5.0285714285714285, "s1_case_count": 25, "escalation_count": 18,
+        "hardware_failure_rate": 0.5277777777777778, "fully_linked_orders": 59,
+        "avg_journey_health": 51.610169491525426, "high_churn_risk_count": 42, "unique_accounts": 23,
+    },
+    "H-Series": {
+        "units_sold": 112, "total_revenue": 2864000.0, "units_deployed": 45,
+        "deployment_success_rate": 11.11111111111111, "avg_deployment_score": 36.888888888888886,
+        "service_deploy_count": 11, "total_support_cases": 65, "support_intensity": 1.4444444444444444,
+        "avg_frustration_score": 6.3125, "s1_case_count": 22, "escalation_count": 11,
+        "hardware_failure_rate": 0.26666666666666666, "fully_linked_orders": 64,
+        "avg_journey_health": 52.109375, "high_churn_risk_count": 45, "unique_accounts": 23,
+    },
+    "R-Series": {
+        "units_sold": 136, "total_revenue": 3541200.0, "units_deployed": 37,
+        "deployment_success_rate": 23.809523809523807, "avg_deployment_score": 44.476190476190474,
+        "service_deploy_count": 16, "total_support_cases": 87, "support_intensity": 2.3513513513513513,
+        "avg_frustration_score": 5.162162162162162, "s1_case_count": 25, "escalation_count": 14,
+        "hardware_failure_rate": 0.4864864864864865, "fully_linked_orders": 78,
+        "avg_journey_health": 51.14102564102564, "high_churn_risk_count": 52, "unique_accounts": 23,
+    },
+}
+
+BASELINE_ACCOUNT_0 = {
+    "total_orders": 11, "total_spend": 338900.0, "total_deployments": 15,
+    "deployment_success_rate": 28.57142857142857, "total_support_cases": 25, "s1_cases": 3,
+    "escalation_count": 4, "hardware_failures": 5, "avg_frustration_score": 3.888888888888889,
+    "max_frustration_score": 10, "journey_health_avg": 58.857142857142854, "high_risk_order_count": 5,
+    "account_health_score": 42.14285714285714, "churn_risk": "Critical",
+    "issue_categories": {"Hardware": 8, "Networking": 5, "Performance": 6, "Unknown": 6},
+    "products_purchased": ["H20", "M50", "R30", "TrueNAS F100"],
+}
+
+BASELINE_USECASES = {
+    "Backup & Archive": {
+        "total_orders": 40, "total_revenue": 1064900.0, "total_deployments": 45,
+        "deployment_success_rate": 13.333333333333334, "total_support_cases": 73,
+        "support_intensity": 1.6222222222222222, "escalation_rate": 106.84931506849315,
+        "avg_journey_health": 41.40909090909091, "unique_accounts": 20,
+        "issue_distribution": {"Hardware": 18, "Networking": 16, "Performance": 19},
+        "best_performing_product": "Unknown", "worst_performing_product": "R",
+    },
+    "Virtualization": {
+        "total_orders": 43, "total_revenue": 1055000.0, "total_deployments": 43,
+        "deployment_success_rate": 39.130434782608695, "total_support_cases": 69,
+        "support_intensity": 1.6046511627906976, "escalation_rate": 113.04347826086956,
+        "avg_journey_health": 60.9, "unique_accounts": 21,
+        "issue_distribution": {"Hardware": 15, "Networking": 20, "Performance": 18},
+        "best_performing_product": "R", "worst_performing_product": "H",
+    },
+    "Database": {
+        "total_orders": 35, "total_revenue": 924000.0, "total_deployments": 31,
+        "deployment_success_rate": 33.33333333333333, "total_support_cases": 53,
+        "support_intensity": 1.7096774193548387, "escalation_rate": 147.16981132075472,
+        "avg_journey_health": 45.8, "unique_accounts": 20,
+        "issue_distribution": {"Hardware": 12, "Networking": 16, "Performance": 10},
+        "best_performing_product": "Unknown", "worst_performing_product": "H",
+    },
+    "Scientific/HPC": {
+        "total_orders": 46, "total_revenue": 1167100.0, "total_deployments": 34,
+        "deployment_success_rate": 5.263157894736842, "total_support_cases": 102,
+        "support_intensity": 3.0, "escalation_rate": 76.47058823529412,
+        "avg_journey_health": 55.833333333333336, "unique_accounts": 19,
+        "issue_distribution": {"Hardware": 20, "Networking": 27, "Performance": 28},
+        "best_performing_product": "M", "worst_performing_product": "R",
+    },
+    "Unknown": {
+        "total_orders": 52, "total_revenue": 1021700.0, "total_deployments": 47,
+        "deployment_success_rate": 29.166666666666668, "total_support_cases": 103,
+        "support_intensity": 2.1914893617021276, "escalation_rate": 75.72815533980582,
+        "avg_journey_health": 46.833333333333336, "unique_accounts": 23,
+        "issue_distribution": {"Hardware": 29, "Networking": 23, "Performance": 23},
+        "best_performing_product": "M", "worst_performing_product": "F",
+    },
+}
+
+BASELINE_SERVICE = {
+    "deployment_score_delta": 12.256805807622499, "success_rate_delta": 10.889292196007258,
+    "support_intensity_delta": -0.1320033955857387, "frustration_delta": 0.23896103896103948,
+    "journey_health_delta": 11.637323943661968, "service_value_add_score": 67,
+}
+
+BASELINE_DEPLOY_TYPES = {
+    "service_metrics": {
+        "total_deployments": 76, "deployment_success_rate": 31.57894736842105,
+        "avg_deployment_score": 56.39473684210526, "total_support_cases": 113,
+        "support_cases_per_deployment": 1.486842105263158, "avg_journey_health": 56.75,
+    },
+    "self_metrics": {
+        "total_deployments": 124, "deployment_success_rate": 20.689655172413794,
+        "avg_deployment_score": 44.13793103448276, "total_support_cases": 168,
+        "support_cases_per_deployment": 1.3548387096774193, "avg_journey_health": 45.11267605633803,
+    },
+}
+
+
+def _assert_pinned(metrics, expected, label):
+    for name, value in expected.items():
+        assert getattr(metrics, name) == pytest.approx(value), f"{label}.{name}"
+
+
+def _per_family_metrics(store):
+    return (
+        calculate_all_product_metrics(store),
+        calculate_all_account_metrics(store),
+        calculate_all_usecase_metrics(store),
+        compare_service_vs_self_deploy(store),
+    )
+
+
+def _fused_metrics(store):
+    result = calculate_all_metrics(store)
+    return result.product_metrics, result.account_metrics, result.usecase_metrics, result.service_comparison
+
+
+class TestFusedEngine:
+    """The fused pass and the per-family functions reproduce the original metrics."""
+
+    @pytest.mark.parametrize("calculate", [_fused_metrics, _per_family_metrics], ids=["fused", "per_family"])
+    def test_matches_pinned_baseline(self, calculate):
+        products, accounts, usecases, service = calculate(_store())
+
+        assert list(products) == list(BASELINE_PRODUCTS)
+        for name, expected in BASELINE_PRODUCTS.items():
+            _assert_pinned(products[name], expected, name)
+
+        assert sorted(accounts) == sorted(f"Account {i}" for i in range(23))
+        _assert_pinned(accounts["Account 0"], BASELINE_ACCOUNT_0, "Account 0")
+
+        assert list(usecases) == list(BASELINE_USECASES)
+        for name, expected in BASELINE_USECASES.items():
+            _assert_pinned(usecases[name], expected, name)
+
+        _assert_pinned(service, BASELINE_SERVICE, "service_comparison")
+        for side, expected in BASELINE_DEPLOY_TYPES.items():
+            _assert_pinned(getattr(service, side), expected, side)
+
+    def test_same_keys_as_per_family_functions(self):
+        store = _store()
+        result = calculate_all_metrics(store)
+
+        assert list(result.product_metrics) == list(calculate_all_product_metrics(store))
+        assert list(result.account_metrics) == list(calculate_all_account_metrics(store))
+        assert list(result.usecase_metrics) == list(calculate_all_usecase_metrics(store))
+
+    def test_usecase_service_deploy_rate_spans_orders(self):
+        opportunities = [
+            Opportunity(order_number=number, opportunity_name=f"Deal {number}", account_name="ACME",
+                        primary_use_case="VMware cluster")
+            for number in ("1001", "1002")
+        ]
+        deployments = [
+            Deployment(case_number="D1", order_number="1001", account_name="ACME", is_service_deploy=True),
+            Deployment(case_number="D2", order_number="1001", account_name="ACME", is_service_deploy=False),
+            Deployment(case_number="D3", order_number="1002", account_name="ACME", is_service_deploy=True),
+        ]
+        result = calculate_all_metrics(link_data_sources(opportunities, deployments, []))
+
+        # 2 of 3 deployments were service deploys, across both orders
+        assert result.usecase_metrics["Virtualization"].service_deploy_rate == pytest.approx(200 / 3)
+
+    def test_empty_store(self):
+        result = calculate_all_metrics(link_data_sources([], [], []))
+
+        assert result.product_metrics == {}
+        assert result.account_metrics == {}
+        assert result.usecase_metrics == {}
+        assert result.service_comparison.service_metrics.total_deployments == 0
+
+
+def _assert_close(actual, expected, path="metrics"):
+    """Recursive equality with float tolerance (pandas sums pairwise)."""
+    if isinstance(expected, dict):
+        assert list(actual) == list(expected), path
+        for key in expected:
+            _assert_close(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9), path
+    else:
+        assert actual == expected, path
+
+
+class TestFactTable:
+    """The fact table backend agrees with the fused engine."""
+
+    def test_matches_fused_engine(self):
+        store = _store()
+        facts = build_fact_table(store)
+
+        assert len(facts) == sum(
+            (order.opportunity is not None) + len(order.deployments) + len(order.support_cases)
+            for order in store.orders
+        )
+        _assert_close(asdict(calculate_metrics_from_facts(facts)), asdict(calculate_all_metrics(store)))
+
+    def test_csv_round_trip(self, tmp_path):
+        store = _store()
+        path = save_fact_table(build_fact_table(store), tmp_path / "metrics_facts.csv")
+
+        facts = load_fact_table(path)
+        assert set(facts["record_type"]) == {"opportunity", "deployment", "case"}
+        _assert_close(asdict(calculate_metrics_from_facts(facts)), asdict(calculate_all_metrics(store)))
+
+    def test_result_table_round_trip(self, tmp_path):
+        store = _store()
+        facts = build_fact_table(store)
+        save_result_table(facts, tmp_path, "metrics_facts")
+
+        loaded = load_result_table(tmp_path, "metrics_facts")
+        assert loaded.dtypes.equals(facts.dtypes)
+        assert loaded["critical_findings"].tolist() == facts["critical_findings"].tolist()
+        _assert_close(asdict(calculate_metrics_from_facts(loaded)), asdict(calculate_all_metrics(store)))
+
+
+def _normalized(metrics):
+    """asdict() with accounts sorted and lists compared as sets."""
+    def normalize(value):
+        if isinstance(value, dict):
+            return {key: normalize(value[key]) for key in sorted(value)}
+        if isinstance(value, list):
+            return sorted(value, key=repr)
+        return value
+    return normalize(asdict(metrics))
+
+
+class TestIncrementalState:
+    """Updating only the touched orders matches a full recompute."""
+
+    def _delta_store(self):
+        store = _store()
+        # At most five distinct findings per account, so the trimmed
+        # lists do not depend on insertion order
+        for order in store.orders:
+            if order.critical_findings:
+                order.critical_findings = [order.critical_findings[0].replace("5", "0")]
+        return store
+
+    def test_update_after_delta(self, tmp_path):
+        store = self._delta_store()
+        state = MetricsState(tmp_path / "metrics_state.json")
+        state.rebuild(store)
+        assert state.order_count == len(store.orders)
+        _assert_close(_normalized(state.metrics()), _normalized(calculate_all_metrics(store)))
+
+        moved = next(order.deployments[0] for order in store.orders if order.deployments)
+        opportunities = [
+            Opportunity(order_number="9999", opportunity_name="New deal", account_name="New Account",
+                        primary_product="R40", primary_use_case="Render farm", amount=1200.0),
+        ]
+        deployments = [
+            Deployment(case_number="D-new", order_number="1003", account_name="Account 3",
+                       product_series=ProductSeries.F_SERIES, is_service_deploy=True, deployment_score=90),
+            Deployment(case_number=moved.case_number, order_number="1005", account_name=moved.account_name,
+                       product_series=moved.product_series),
+        ]
+        cases = [
+            SupportCase(case_number="C0", order_number="1007", account_name="Account 7",
+                        severity=Severity.S1, product_series=ProductSeries.M_SERIES,
+                        case_reason="Hardware", frustration_score=9, escalation_detected=True),
+        ]
+
+        affected = store.orders_affected_by(opportunities, deployments, cases)
+        state.retract(store, affected)
+        touched = store.apply_delta(opportunities, deployments, cases)
+        assert affected <= touched
+        state.add(store, touched)
+
+        assert state.order_count == len(store.orders)
+        assert "New Account" in state.metrics().account_metrics
+        _assert_close(_normalized(state.metrics()), _normalized(calculate_all_metrics(store)))
+
+    def test_save_load_round_trip(self, tmp_path):
+        store = self._delta_store()
+        path = tmp_path / "metrics_state.json"
+        state = MetricsState(path)
+        assert state.is_empty
+        state.rebuild(store)
+        state.save()
+
+        loaded = MetricsState(path)
+        assert loaded.order_count == len(store.orders)
+        _assert_close(_normalized(loaded.metrics()), _normalized(state.metrics()))
+
+
+@pytest.fixture(scope="module")
+def store():
+    return _store()
+
+
+@pytest.fixture(scope="module")
+def cube(store):
+    return build_metrics_cube(build_fact_table(store))
+
+
+class TestMetricsCube:
+    """Roll-up and drill-down queries answered from the cube."""
+
+    def test_rollup_matches_product_metrics(self, store, cube):
+        by_product = query_cube(cube, by=["product_series"]).set_index("product_series")
+
+        for name, metrics in calculate_all_metrics(store).product_metrics.items():
+            row = by_product.loc[name]
+            assert row["deployments"] == metrics.units_deployed
+            assert row["service_deploys"] == metrics.service_deploy_count
+            assert row["support_cases"] == metrics.total_support_cases
+            assert row["s1_cases"] == metrics.s1_case_count
+            assert row["escalations"] == metrics.escalation_count
+            assert row["avg_deployment_score"] == pytest.approx(metrics.avg_deployment_score)
+            assert row["avg_frustration_score"] == pytest.approx(metrics.avg_frustration_score)
+
+    def test_rollup_matches_usecase_metrics(self, store, cube):
+        by_use_case = query_cube(cube, by=["use_case"]).set_index("use_case")
+
+        for name, metrics in calculate_all_metrics(store).usecase_metrics.items():
+            row = by_use_case.loc[name]
+            assert row["revenue"] == pytest.approx(metrics.total_revenue)
+            assert row["deployments"] == metrics.total_deployments
+            assert row["support_cases"] == metrics.total_support_cases
+            assert row["deployment_success_rate"] == pytest.approx(metrics.deployment_success_rate)
+
+    def test_drill_down_and_grand_total(self, store, cube):
+        total = query_cube(cube)
+        assert len(total) == 1
+        assert total["support_cases"].iloc[0] == sum(len(o.support_cases) for o in store.orders)
+        assert total["opportunities"].iloc[0] == sum(o.opportunity is not None for o in store.orders)
+
+        # Every roll-up sums back to the grand total
+        by_two = query_cube(cube, by=["product_series", "account_name"])
+        assert by_two["support_cases"].sum() == total["support_cases"].iloc[0]
+
+        # Filtering one account equals that account's row of the account roll-up
+        account = store.orders[0].account_name
+        drilled = query_cube(cube, by=["product_series"], filters={"account_name": account})
+        by_account = query_cube(cube, by=["account_name"]).set_index("account_name")
+        assert drilled["deployments"].sum() == by_account.loc[account, "deployments"]
+        assert drilled["revenue"].sum() == pytest.approx(by_account.loc[account, "revenue"])
+
+    def test_unknown_dimension(self, cube):
+        with pytest.raises(ValueError):
+            query_cube(cube, by=["region"])
+
+    def test_csv_round_trip(self, cube, tmp_path):
+        loaded = load_metrics_cube(save_metrics_cube(cube, tmp_path / "metrics_cube.csv"))
+
+        assert list(loaded.columns) == list(cube.columns)
+        assert loaded[CUBE_DIMENSIONS].equals(cube[CUBE_DIMENSIONS])
+        assert query_cube(loaded, by=["use_case"]).equals(query_cube(cube, by=["use_case"]))
+
+    def test_result_table_round_trip(self, cube, tmp_path):
+        save_result_table(cube, tmp_path, "metrics_cube")
+        loaded = load_result_table(tmp_path, "metrics_cube")
+
+        assert loaded.dtypes.equals(cube.dtypes)
+        assert loaded.equals(cube)
+
+
+class TestPercentileSketches:
+    """Sketch percentiles are close to exact ones and merge like histograms."""
+
+    def _sketch(self, values):
+        accumulator = Accumulator()
+        for value in values:
+            accumulator.histograms["case_age_sketch"][sketch_bucket(value)] += 1
+        return accumulator
+
+    def test_relative_accuracy(self):
+        rng = random.Random(3)
+        values = sorted(rng.lognormvariate(3, 1.2) for _ in range(5000))
+        result = sketch_percentiles(self._sketch(values).histogram("case_age_sketch"))
+
+        assert list(result) == ["p50", "p90", "p99"]
+        for percentile in (50, 90, 99):
+            exact = values[int(percentile / 100 * (len(values) - 1))]
+            assert result[f"p{percentile}"] == pytest.approx(exact, rel=SKETCH_ACCURACY)
+
+    def test_zero_and_empty(self):
+        assert sketch_percentiles({}) == {}
+        assert self._sketch([0, 0, 0, 5]).percentiles()["case_age_days"]["p50"] == 0.0
+
+    def test_merge_and_retract(self):
+        first, second = self._sketch(range(1, 100)), self._sketch(range(100, 400))
+        merged = self._sketch(range(1, 100))
+        merged.merge(second)
+        assert merged.percentiles() == self._sketch(range(1, 400)).percentiles()
+
+        merged.merge(second, sign=-1)
+        assert merged.to_dict() == first.to_dict()
+
+    def test_metrics_report_percentiles(self):
+        result = calculate_all_metrics(_store())
+
+        for metrics in [*result.product_metrics.values(), *result.usecase_metrics.values()]:
+            if metrics.total_support_cases:
+                p = metrics.percentiles["case_age_days"]
+                assert p["p50"] <= p["p90"] <= p["p99"]
+        assert any("frustration_score" in m.percentiles for m in result.account_metrics.values())
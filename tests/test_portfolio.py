@@ -0,0 +1,178 @@
+"""
+Portfolio Analysis Tests
+
+Validates run_portfolio_analysis() on a multi-account export, with the
+Anthropic API replaced by a stub behind the real ClaudeClient:
+- The export is partitioned into one analysis per account
+- Account folder names are unique slugs
+- A failing account becomes a failure row instead of failing the run
+- The summary lists the worst health first and failed accounts last
+- Every account shares one client, bounded by MAX_CONCURRENT_REQUESTS
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import src.main as main
+from src.core import Config
+from src.core import claude_client
+from src.main import PORTFOLIO_SUMMARY_FILE, _account_folder_name, run_portfolio_analysis
+
+
+# (account, case number, messages); Hooli is frustrated, Broken Co fails
+EXPORT_CASES = [
+    ("ACME Corp", 1001, ["Pool degraded after update", "Thanks, that fixed it"]),
+    ("ACME Corp", 1002, ["Question about snapshots"]),
+    ("ACME, Corp", 1003, ["Replication task setup"]),
+    ("Hooli", 2001, ["Production is down again", "Our execs are considering alternatives"]),
+    ("Hooli", 2002, ["Still waiting, this is unacceptable"]),
+    ("Broken Co", 3001, ["Disk replacement"]),
+]
+
+
+class StubMessages:
+    """Stands in for anthropic.Anthropic().messages, recording concurrency."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    def create(self, model, max_tokens, system, messages):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.02)
+            prompt = messages[0]["content"]
+            score = 9 if "Customer: Hooli" in prompt else 1
+            count = len(re.findall(r'"index":', prompt))
+            scores = [{"msg": i + 1, "score": score, "reason": "stub"} for i in range(count)]
+            text = f"{json.dumps(scores)}\nISSUE_CLASS: Component\nRESOLUTION_OUTLOOK: Manageable\nKEY_PHRASE: none"
+            return SimpleNamespace(
+                content=[SimpleNamespace(text=text)],
+                usage=SimpleNamespace(input_tokens=10, output_tokens=10),
+            )
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def export(tmp_path):
+    rows = []
+    for account, case_number, bodies in EXPORT_CASES:
+        for i, body in enumerate(bodies):
+            rows.append({
+                "Case Number": case_number,
+                "Account Name": account,
+                "Text Body": body,
+                "Message Date": f"2025-11-{i + 1:02d} 10:00",
+                "Severity": "S2",
+                "Support Level": "Gold",
+                "Created Date": "2025-11-01",
+                "Last Modified Date": "2025-11-20",
+                "Status": "Open",
+                "Case Age Days": 30,
+            })
+    path = tmp_path / "export.xlsx"
+    pd.DataFrame(rows).to_excel(path, index=False)
+    return path
+
+
+@pytest.fixture
+def stub_api(tmp_path, monkeypatch):
+    """A real ClaudeClient (2 request slots) whose API calls go to StubMessages."""
+    monkeypatch.setattr(Config, "ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(Config, "OUTPUT_DIR", tmp_path / "outputs")
+    monkeypatch.setattr(Config, "MAX_CONCURRENT_REQUESTS", 2)
+
+    client = claude_client.ClaudeClient()
+    stub = StubMessages()
+    client.client = SimpleNamespace(messages=stub)
+    monkeypatch.setattr(claude_client, "_global_client", client)
+
+    # Charts are not under test; pyplot makes them slow
+    monkeypatch.setattr(main, "generate_all_charts", lambda *args: {})
+
+    # One account fails inside its pipeline
+    analyze_account = main.analyze_account
+
+    def failing_analyze_account(df, *args, **kwargs):
+        if df["Customer Name"].iloc[0] == "Broken Co":
+            raise RuntimeError("stub failure")
+        return analyze_account(df, *args, **kwargs)
+
+    monkeypatch.setattr(main, "analyze_account", failing_analyze_account)
+    return stub
+
+
+class TestAccountFolderName:
+    """Unique analysis_<slug> folder names."""
+
+    def test_slug_and_dedup(self):
+        taken = set()
+        assert _account_folder_name("ACME Corp", taken) == "analysis_ACME_Corp"
+        assert _account_folder_name("ACME, Corp", taken) == "analysis_ACME_Corp_2"
+        assert _account_folder_name("ACME  Corp!", taken) == "analysis_ACME_Corp_3"
+        assert _account_folder_name("Ünïcode / ???", set()) == "analysis_n_code"
+        assert _account_folder_name("???", set()) == "analysis_account"
+        assert len(_account_folder_name("x" * 100, set())) == len("analysis_") + 60
+
+
+class TestPortfolioAnalysis:
+    """End-to-end portfolio runs with a stubbed API."""
+
+    def test_partitioned_accounts_and_summary(self, export, stub_api, tmp_path):
+        result = run_portfolio_analysis(str(export), output_dir=str(tmp_path / "out"), skip_sonnet=True, max_workers=4)
+
+        assert result["success"], result.get("error")
+        assert result["total_accounts"] == 4
+        assert result["failed_accounts"] == 1
+        assert result["total_cases"] == 5
+
+        # Worst health first, failed accounts last
+        rows = result["accounts"]
+        assert [r["account_name"] for r in rows][0] == "Hooli"
+        assert rows[-1] == {
+            "account_name": "Broken Co", "folder": "analysis_Broken_Co", "success": False, "error": "stub failure",
+        }
+        scores = [r["health_score"] for r in rows if r["success"]]
+        assert scores == sorted(scores)
+
+        # One analysis per account, each with only its own cases
+        portfolio_dir = Path(result["output_dir"])
+        folders = {r["account_name"]: r["folder"] for r in rows}
+        assert folders["ACME Corp"] == "analysis_ACME_Corp"
+        assert folders["ACME, Corp"] == "analysis_ACME_Corp_2"
+        for account, cases in (("ACME Corp", [1001, 1002]), ("ACME, Corp", [1003]), ("Hooli", [2001, 2002])):
+            json_dir = portfolio_dir / folders[account] / "json"
+            summary = json.loads((json_dir / "summary_statistics.json").read_text())
+            assert summary["account_name"] == account
+            all_cases = json.loads((json_dir / "all_cases.json").read_text())
+            assert sorted(c["case_number"] for c in all_cases["cases"]) == cases
+        assert not (portfolio_dir / "analysis_Broken_Co" / "json" / "summary_statistics.json").exists()
+
+        written = json.loads((portfolio_dir / PORTFOLIO_SUMMARY_FILE).read_text())
+        assert [r["account_name"] for r in written["accounts"]] == [r["account_name"] for r in rows]
+
+    def test_shared_client_bounds_requests(self, export, stub_api, tmp_path):
+        run_portfolio_analysis(str(export), output_dir=str(tmp_path / "out"), skip_sonnet=True, max_workers=4)
+
+        # One Haiku call per analysed case, never more than 2 at a time
+        assert stub_api.calls == 5
+        assert 1 <= stub_api.max_in_flight <= 2
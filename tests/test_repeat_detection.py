@@ -0,0 +1,113 @@
+"""
+Repeat Issue Detection Tests
+
+Validates _detect_repeat_issues in the support case loader:
+- Similar case reasons on the same asset within 90 days
+- Case number references in message text
+- Cases of different accounts on one serial are not repeats
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.models import SupportCase
+from src.data.case_loader import _detect_repeat_issues
+
+
+BASE_DATE = datetime(2024, 1, 1)
+
+
+def _case(number, days, reason, account="ACME", serial="A1-1001", messages=None):
+    return SupportCase(
+        case_number=number,
+        order_number="5001",
+        account_name=account,
+        serial_number=serial,
+        created_date=BASE_DATE + timedelta(days=days) if days is not None else None,
+        case_reason=reason,
+        messages=messages or [],
+    )
+
+
+class TestAssetRepeats:
+    """Repeats on the same account + serial."""
+
+    def test_links_to_earliest_similar_case_in_window(self):
+        cases = [
+            _case("10001", 0, "Disk failure"),
+            _case("10002", 30, "Replacement disk"),
+            _case("10003", 60, "disk failure"),
+        ]
+        _detect_repeat_issues(cases)
+
+        assert not cases[0].is_repeat_issue
+        assert cases[1].repeat_of_case == "10001"
+        assert cases[2].repeat_of_case == "10001"
+
+    def test_window_expires_after_90_days(self):
+        cases = [
+            _case("10001", 0, "Network outage"),
+            _case("10002", 95, "Network outage"),
+            _case("10003", 150, "network flapping"),
+        ]
+        _detect_repeat_issues(cases)
+
+        assert not cases[1].is_repeat_issue
+        assert cases[2].repeat_of_case == "10002"
+
+    def test_unrelated_reasons_and_other_serials_do_not_match(self):
+        cases = [
+            _case("10001", 0, "Pool degraded"),
+            _case("10002", 10, "Upgrade question"),
+            _case("10003", 20, "Pool degraded", serial="A1-2002"),
+        ]
+        _detect_repeat_issues(cases)
+
+        assert not any(c.is_repeat_issue for c in cases)
+
+    def test_undated_cases_match_without_time_limit(self):
+        cases = [
+            _case("10002", 400, "SMB share"),
+            _case("10001", None, "smb permissions"),
+        ]
+        _detect_repeat_issues(cases)
+
+        assert cases[0].repeat_of_case == "10001"
+        assert not cases[1].is_repeat_issue
+
+    def test_other_account_is_not_a_repeat(self):
+        cases = [
+            _case("10001", 0, "HA failover", account="Reseller Inc"),
+            _case("10002", 5, "HA failover", account="End Customer"),
+        ]
+        _detect_repeat_issues(cases)
+        assert not cases[1].is_repeat_issue
+
+
+class TestMessageReferences:
+    """Repeats found through case numbers quoted in messages."""
+
+    def test_case_reference_preferred_over_ticket(self):
+        cases = [
+            _case("10001", 0, "", serial=""),
+            _case("10002", 0, "", serial=""),
+            _case("10003", 0, "", serial="", messages=[
+                "This looks related to 10001, see ticket 10001", "Also Case #10002",
+            ]),
+        ]
+        _detect_repeat_issues(cases)
+
+        assert cases[2].repeat_of_case == "10002"
+
+    def test_ignores_self_and_unknown_references(self):
+        cases = [
+            _case("10001", 0, "", serial="", messages=["case 10001", "case 99999"]),
+        ]
+        _detect_repeat_issues(cases)
+
+        assert not cases[0].is_repeat_issue
@@ -0,0 +1,194 @@
+"""
+Result Table Tests
+
+Validates the flat typed result tables written alongside the JSON outputs:
+- Case, message score and timeline tables are built from case analysis dicts
+- Tables round trip with their column types (Int64, boolean, datetime, lists)
+- Column projection reads only the requested columns
+- Layer tables mark unanalyzed records and keep result column types
+- Runs without tables load as None
+- Parquet and CSV storage load back the same typed table
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.analysis import result_tables
+from src.analysis.layers.opportunity_layer import OpportunityAnalysisResult
+from src.analysis.result_tables import (
+    case_table,
+    load_result_table,
+    message_score_table,
+    opportunity_table,
+    save_case_tables,
+    save_result_table,
+    timeline_table,
+)
+from src.data.models import Opportunity
+
+
+CASE_ANALYSIS = [
+    {
+        "case_number": 1001,
+        "customer_name": "ACME",
+        "severity": "S1",
+        "status": "Open",
+        "created_date": "2024-03-01T10:00:00",
+        "criticality_score": 182.5,
+        "claude_analysis": {
+            "frustration_score": 8,
+            "issue_class": "Systemic",
+            "frustration_metrics": {
+                "peak_score": 9,
+                "message_scores": [
+                    {"msg": 1, "score": 3, "reason": "Neutral report"},
+                    {"msg": 2, "score": 9, "reason": "Escalation threat"},
+                ],
+            },
+        },
+        "deepseek_analysis": {
+            "timeline_entries": [
+                {"entry_label": "Initial report", "frustration_detected": False},
+                {"entry_label": "Escalation", "frustration_detected": True, "customer_tone": "Angry"},
+            ],
+        },
+    },
+    {
+        "case_number": 1002,
+        "customer_name": "ACME",
+        "severity": "S4",
+        "status": "Closed",
+        "created_date": None,
+        "criticality_score": 20.0,
+        "claude_analysis": None,
+        "deepseek_analysis": None,
+    },
+]
+
+
+class TestCaseTables:
+    """Single-run tables from case analysis dicts."""
+
+    def test_tables(self):
+        cases = case_table(CASE_ANALYSIS)
+        assert cases["case_number"].tolist() == [1001, 1002]
+        assert str(cases["case_number"].dtype) == "Int64"
+        assert cases["frustration_score"].isna().tolist() == [False, True]
+        assert cases["issue_class"].tolist() == ["Systemic", ""]
+        assert cases["timeline_entries"].tolist() == [2, 0]
+        assert pd.api.types.is_datetime64_any_dtype(cases["created_date"])
+
+        scores = message_score_table(CASE_ANALYSIS)
+        assert scores[["case_number", "msg", "score"]].values.tolist() == [[1001, 1, 3], [1001, 2, 9]]
+
+        timeline = timeline_table(CASE_ANALYSIS)
+        assert timeline["position"].tolist() == [0, 1]
+        assert timeline["frustration_detected"].tolist() == [False, True]
+        assert timeline["customer_tone"].tolist() == ["", "Angry"]
+
+    def test_round_trip_and_projection(self, tmp_path):
+        paths = save_case_tables(CASE_ANALYSIS, tmp_path)
+        assert {p.stem for p in paths} == {"cases", "message_scores", "timeline"}
+
+        cases = case_table(CASE_ANALYSIS)
+        loaded = load_result_table(tmp_path, "cases")
+        assert list(loaded.columns) == list(cases.columns)
+        assert loaded.dtypes.astype(str).tolist() == cases.dtypes.astype(str).tolist()
+        pd.testing.assert_frame_equal(loaded, cases, check_dtype=False)
+
+        projected = load_result_table(tmp_path, "cases", columns=["criticality_score", "case_number"])
+        assert list(projected.columns) == ["criticality_score", "case_number"]
+        assert projected["criticality_score"].tolist() == [182.5, 20.0]
+
+        timeline = load_result_table(tmp_path, "timeline", columns=["frustration_detected"])
+        assert str(timeline["frustration_detected"].dtype) == "boolean"
+
+    def test_empty_and_missing(self, tmp_path):
+        save_case_tables([], tmp_path)
+        assert load_result_table(tmp_path, "message_scores").empty
+        assert load_result_table(tmp_path, "absent") is None
+
+
+class TestLayerTables:
+    """Full-analysis tables with result columns."""
+
+    def test_opportunities(self, tmp_path):
+        opportunities = [
+            Opportunity(order_number="ORD-1", opportunity_name="Backup", account_name="ACME", amount=5000.0),
+            Opportunity(order_number="ORD-2", opportunity_name="Media", account_name="ACME"),
+        ]
+        results = {"ORD-1": OpportunityAnalysisResult(
+            use_case_category="Backup",
+            pain_points_extracted=["slow restores", "capacity"],
+            opportunity_score=80,
+            analysis_successful=True,
+            raw_response="{...}",
+        )}
+
+        table = opportunity_table(opportunities, results)
+        assert "raw_response" not in table.columns
+        assert table["analyzed"].tolist() == [True, False]
+
+        save_result_table(table, tmp_path, "opportunities")
+        loaded = load_result_table(tmp_path, "opportunities")
+        assert loaded["pain_points_extracted"].tolist() == [["slow restores", "capacity"], []]
+        assert str(loaded["opportunity_score"].dtype) == "Int64"
+        assert loaded["opportunity_score"].isna().tolist() == [False, True]
+
+    def test_nothing_analyzed(self, tmp_path):
+        opportunities = [Opportunity(order_number="ORD-1", opportunity_name="Backup", account_name="ACME")]
+        save_result_table(opportunity_table(opportunities, {}), tmp_path, "opportunities")
+
+        # Result columns keep their types although every value is missing
+        loaded = load_result_table(tmp_path, "opportunities")
+        assert str(loaded["opportunity_score"].dtype) == "Int64"
+        assert str(loaded["analysis_successful"].dtype) == "boolean"
+        assert loaded["customer_expectations"].tolist() == [[]]
+
+
+def _opportunity_table():
+    opportunities = [
+        Opportunity(order_number="ORD-1", opportunity_name="Backup", account_name="ACME", amount=5000.0),
+        Opportunity(order_number="ORD-2", opportunity_name="Media", account_name="ACME"),
+    ]
+    results = {"ORD-1": OpportunityAnalysisResult(
+        pain_points_extracted=["slow restores", "capacity"], opportunity_score=80, analysis_successful=True,
+    )}
+    return opportunity_table(opportunities, results)
+
+
+class TestStorage:
+    """Both storage formats load back the same typed table."""
+
+    def _round_trip(self, tmp_path, suffix):
+        table = _opportunity_table()
+        assert save_result_table(table, tmp_path, "opportunities").suffix == suffix
+        save_case_tables(CASE_ANALYSIS, tmp_path)
+
+        loaded = load_result_table(tmp_path, "opportunities")
+        assert loaded.dtypes.astype(str).tolist() == table.dtypes.astype(str).tolist()
+        pd.testing.assert_frame_equal(loaded, table)
+
+        # List columns come back as Python lists (Parquet reads numpy arrays)
+        pain_points = load_result_table(tmp_path, "opportunities", columns=["pain_points_extracted"])
+        assert [type(v) for v in pain_points["pain_points_extracted"]] == [list, list]
+        assert pain_points["pain_points_extracted"].tolist() == [["slow restores", "capacity"], []]
+
+        cases = load_result_table(tmp_path, "cases")
+        assert cases.dtypes.astype(str).tolist() == case_table(CASE_ANALYSIS).dtypes.astype(str).tolist()
+
+    def test_parquet(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        self._round_trip(tmp_path, ".parquet")
+
+    def test_csv(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(result_tables, "PARQUET_AVAILABLE", False)
+        self._round_trip(tmp_path, ".csv")
+        assert (tmp_path / "tables" / "opportunities.schema.json").exists()
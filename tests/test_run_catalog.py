@@ -0,0 +1,129 @@
+"""
+Run Catalog Tests
+
+Validates the SQLite index of analysis runs read by the dashboard:
+- Completed runs are recorded with their listing fields
+- Listing order, account / date filters and pagination
+- Repair adds unrecorded runs, refreshes changed ones and drops deleted ones
+- Incomplete run folders are not listed
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.run_catalog import RunCatalog, read_run_entry
+
+
+def _single_run(folder: Path, account: str, date: str, health: float = 80.0, cases: int = 10) -> Path:
+    (folder / "json").mkdir(parents=True)
+    (folder / "json" / "summary_statistics.json").write_text(json.dumps({
+        "account_name": account,
+        "analysis_date": date,
+        "account_health_score": health,
+        "total_cases": cases,
+    }))
+    return folder
+
+
+def _full_run(folder: Path) -> Path:
+    (folder / "json").mkdir(parents=True)
+    (folder / "json" / "link_summary.json").write_text(json.dumps({
+        "total_cases": 192, "total_orders": 105, "fully_linked_orders": 49,
+    }))
+    (folder / "json" / "account_metrics.json").write_text(json.dumps({"accounts": ["Globex", "ACME Corp"]}))
+    return folder
+
+
+def _outputs(tmp_path: Path) -> Path:
+    _single_run(tmp_path / "analysis_20250101_090000", "ACME Corp", "2025-01-01", health=62.5)
+    _single_run(tmp_path / "analysis_20250301_090000", "Initech", "2025-03-01")
+    _single_run(tmp_path / "portfolio_20250201_090000" / "analysis_Hooli", "Hooli", "2025-02-01")
+    _single_run(tmp_path / "portfolio_20250201_090000" / "analysis_ACME_Corp", "ACME Corp", "2025-02-01")
+    _full_run(tmp_path / "full_analysis_20250401_120000")
+    (tmp_path / "analysis_20250501_090000" / "json").mkdir(parents=True)  # incomplete run
+    return tmp_path
+
+
+class TestRecording:
+    """Runs recorded by the pipelines."""
+
+    def test_record_and_list(self, tmp_path):
+        outputs = _outputs(tmp_path)
+        catalog = RunCatalog(outputs)
+        assert catalog.runs() == []
+
+        recorded = catalog.record_runs([
+            outputs / "analysis_20250101_090000",
+            outputs / "full_analysis_20250401_120000",
+            outputs / "analysis_20250501_090000",
+        ])
+        assert recorded == 2
+
+        full, single = catalog.runs()
+        assert full == {
+            "folder": outputs / "full_analysis_20250401_120000",
+            "name": "full_analysis_20250401_120000",
+            "account": "Globex",
+            "date": "2025-04-01",
+            "health_score": 0,
+            "total_cases": 192,
+            "analysis_type": "full",
+            "total_orders": 105,
+            "fully_linked": 49,
+        }
+        assert single == read_run_entry(outputs / "analysis_20250101_090000")
+        assert (outputs / "run_catalog.db").exists()
+
+    def test_filters_and_pages(self, tmp_path):
+        catalog = RunCatalog(_outputs(tmp_path))
+        catalog.repair()
+
+        # Newest run first, portfolio accounts by folder name
+        assert [run["name"] for run in catalog.runs()] == [
+            "full_analysis_20250401_120000",
+            "analysis_20250301_090000",
+            "portfolio_20250201_090000/analysis_ACME_Corp",
+            "portfolio_20250201_090000/analysis_Hooli",
+            "analysis_20250101_090000",
+        ]
+        assert [run["date"] for run in catalog.runs(account="ACME Corp")] == ["2025-02-01", "2025-01-01"]
+        assert catalog.count(date_from="2025-02-01", date_to="2025-03-01") == 3
+        assert catalog.count(analysis_type="full") == 1
+
+        pages = [catalog.runs(limit=2, offset=offset) for offset in (0, 2, 4)]
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [run["name"] for page in pages for run in page] == [run["name"] for run in catalog.runs()]
+        assert catalog.accounts() == ["ACME Corp", "Globex", "Hooli", "Initech"]
+
+
+class TestRepair:
+    """Stale-entry repair against the folders on disk."""
+
+    def test_repair(self, tmp_path):
+        outputs = _outputs(tmp_path)
+        catalog = RunCatalog(outputs)
+
+        assert catalog.repair() == {"added": 5, "updated": 0, "removed": 0}
+        assert catalog.repair() == {"added": 0, "updated": 0, "removed": 0}
+
+        # Deleted runs are dropped; a rewritten summary is read again
+        shutil.rmtree(outputs / "analysis_20250301_090000")
+        summary = outputs / "analysis_20250101_090000" / "json" / "summary_statistics.json"
+        summary.write_text(summary.read_text().replace("62.5", "70.0"))
+        os.utime(summary, ns=(1, 1))
+
+        assert catalog.repair() == {"added": 0, "updated": 1, "removed": 1}
+        assert catalog.count() == 4
+        assert catalog.runs(account="ACME Corp")[-1]["health_score"] == 70.0
+
+    def test_missing_output_dir(self, tmp_path):
+        catalog = RunCatalog(tmp_path / "absent", path=tmp_path / "catalog.db")
+        assert catalog.repair() == {"added": 0, "updated": 0, "removed": 0}
+        assert catalog.count() == 0
@@ -0,0 +1,234 @@
+"""
+Criticality Scoring Tests
+
+Validates the column-wise criticality scoring:
+- Component breakdowns for hand-computed cases
+- Defaults for missing analysis fields and Sonnet bonuses
+- Rounding matches round(value, 1), including .x5 ties
+- Temporal clustering uses last message activity of concerning cases
+- Rescoring saved features reproduces the pipeline scores and health
+- Alternate weight profiles, thresholds and sensitivity sweeps
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.analysis.rescoring import (
+    load_score_features,
+    rescore,
+    save_score_features,
+    score_feature_table,
+    sensitivity_sweep,
+)
+from src.analysis.scoring import (
+    ScoreWeights,
+    build_score_features,
+    calculate_account_health_score,
+    calculate_criticality_scores,
+    calculate_temporal_clustering_penalty,
+    score_components,
+    _round1,
+)
+
+
+class _QuietOutput:
+    def stream_message(self, message):
+        pass
+
+
+def _case(case_number, frustration_score=5, **overrides):
+    case = {
+        "case_number": case_number,
+        "severity": "S2",
+        "support_level": "Gold",
+        "interaction_count": 8,
+        "case_age_days": 45,
+        "customer_engagement_ratio": 0.6,
+        "last_modified_date": "2024-01-01",
+        "claude_analysis": {
+            "frustration_score": frustration_score,
+            "frustration_metrics": {"peak_score": 8, "total_messages": 10, "frustrated_message_count": 2},
+            "issue_class": "Systemic",
+            "resolution_outlook": "Manageable",
+        },
+    }
+    case.update(overrides)
+    return case
+
+
+class TestCriticalityScores:
+    """Breakdowns match the scoring model component by component."""
+
+    def test_breakdown(self):
+        case = _case(1, frustration_score=8)
+        calculate_criticality_scores([case], _QuietOutput())
+        breakdown = case["score_breakdown"]
+
+        assert breakdown["claude_frustration_base"] == 42.5      # 35 + 1 * 7.5
+        assert breakdown["claude_frustration_peak_bonus"] == 20  # 15 + 1 * 5
+        assert breakdown["claude_frustration_pct_bonus"] == 15   # 20% frustrated
+        assert breakdown["claude_frustration"] == 77.5
+        assert (breakdown["severity"], breakdown["issue_class"], breakdown["resolution_outlook"]) == (25, 30, 8)
+        assert (breakdown["support_level"], breakdown["volume"], breakdown["age"], breakdown["engagement"]) == (10, 10, 5, 10)
+        assert breakdown["base_score"] == 175.5
+        assert breakdown["deepseek_quick_score"] == 0
+        assert case["criticality_score"] == breakdown["final_score"] == 175.5
+
+    def test_defaults_and_sonnet_bonuses(self):
+        case = _case(2, frustration_score=2, severity=None, support_level="Bronze")
+        case["claude_analysis"] = {"frustration_score": 2}
+        del case["customer_engagement_ratio"]
+        case["deepseek_quick_scoring"] = {
+            "analysis_successful": True, "frustration_frequency": 40, "damage_frequency": 10, "priority": "High",
+        }
+        case["deepseek_analysis"] = {
+            "analysis_successful": True,
+            "timeline_entries": [{"frustration_detected": "Yes"}, {"frustration_detected": "no"}],
+        }
+        calculate_criticality_scores([case], _QuietOutput())
+        breakdown = case["score_breakdown"]
+
+        assert breakdown["claude_frustration_peak_bonus"] == 2   # peak falls back to the headline score
+        assert breakdown["claude_frustration_pct_bonus"] == 0
+        assert (breakdown["severity"], breakdown["issue_class"], breakdown["resolution_outlook"]) == (5, 10, 5)
+        assert (breakdown["support_level"], breakdown["engagement"]) == (0, 10)
+        assert breakdown["deepseek_quick_score"] == 55.0          # 40 + 5 + 10
+        assert breakdown["deepseek_timeline"] == 5.0
+        assert breakdown["final_score"] == round(breakdown["base_score"] + 55 + 5, 1)
+
+    def test_sorted_descending(self):
+        cases = [_case(i, frustration_score=score) for i, score in enumerate([2, 9, 5])]
+        result = calculate_criticality_scores(cases, _QuietOutput())
+        assert [c["case_number"] for c in result] == [1, 2, 0]
+
+    def test_components_are_columns(self):
+        cases = [_case(i, frustration_score=i % 11) for i in range(50)]
+        features = build_score_features(cases)
+        components = score_components(features)
+
+        assert len(features) == len(components) == 50
+        assert isinstance(features["severity"].dtype, pd.CategoricalDtype)
+        assert (components["final_score"] >= components["base_score"]).all()
+
+    def test_round1_matches_round(self):
+        rng = random.Random(0)
+        values = [rng.uniform(0, 300) for _ in range(2000)]
+        values += [0.05, 0.15, 0.25, 1.05, 2.675, 10.45, 133.35, 0.0]
+        assert _round1(np.array(values)).tolist() == [round(v, 1) for v in values]
+
+
+class TestTemporalClustering:
+    """Recent concerning cases drive the clustering penalty."""
+
+    def _scored(self, scores, days_ago):
+        now = pd.Timestamp.now()
+        cases = []
+        for i, (score, days) in enumerate(zip(scores, days_ago)):
+            cases.append({
+                "case_number": i,
+                "criticality_score": score,
+                "last_modified_date": "2000-01-01",
+                "case_data": pd.DataFrame({"Message Date": [now - pd.Timedelta(days=days + 3), now - pd.Timedelta(days=days)]}),
+            })
+        return cases
+
+    def test_rapid_deterioration(self):
+        cases = self._scored([200, 190, 185] + [50] * 12, [2, 5, 9] + [1] * 12)
+        penalty, info = calculate_temporal_clustering_penalty(cases)
+
+        assert penalty == 0.7
+        assert info["recent_case_count"] == 3
+        assert [c["case_number"] for c in info["cases"]] == [0, 1, 2]
+
+    def test_old_or_low_scores_ignored(self):
+        cases = self._scored([200, 130] + [50] * 8, [200, 1] + [1] * 8)
+        assert calculate_temporal_clustering_penalty(cases) == (0.0, {"detected": False})
+
+    def test_falls_back_to_last_modified(self):
+        cases = self._scored([200] + [50] * 9, [0] * 10)
+        cases[0]["case_data"] = None
+        cases[0]["last_modified_date"] = pd.Timestamp.now().strftime("%Y-%m-%d")
+        penalty, info = calculate_temporal_clustering_penalty(cases)
+        assert penalty == 0.1
+        assert calculate_temporal_clustering_penalty([]) == (0.0, {"detected": False})
+
+
+class TestRescoring:
+    """Saved scoring inputs can be rescored with other weights."""
+
+    STATISTICS = {"avg_frustration_score": 4.2, "high_frustration": 3}
+
+    def _cases(self):
+        now = pd.Timestamp.now()
+        severities = ["S1", "S2", "S3", "S4"]
+        classes = ["Systemic", "Environmental", "Component", "Procedural"]
+        cases = []
+        for i in range(40):
+            case = _case(
+                i, frustration_score=i % 11, severity=severities[i % 4],
+                support_level="Gold" if i % 3 else "Silver",
+            )
+            case["claude_analysis"]["issue_class"] = classes[i % 4]
+            case["case_data"] = pd.DataFrame({"Message Date": [now - pd.Timedelta(days=i)]})
+            cases.append(case)
+        return cases
+
+    def test_weights_from_dict(self):
+        weights = ScoreWeights.from_dict({"severity": {"S1": 50}, "critical_threshold": 170})
+        assert weights.severity["S1"] == 50
+        assert weights.severity["S2"] == ScoreWeights().severity["S2"]
+        assert weights.critical_threshold == 170
+
+        with pytest.raises(ValueError):
+            ScoreWeights.from_dict({"severty": {"S1": 50}})
+        with pytest.raises(ValueError):
+            ScoreWeights.from_dict({"severity": 50})
+
+    def test_default_weights_reproduce_pipeline(self, tmp_path):
+        cases = self._cases()
+        features = score_feature_table(cases)
+        path = save_score_features(features, tmp_path / "score_features.csv")
+
+        calculate_criticality_scores(cases, _QuietOutput())
+        health_score, breakdown = calculate_account_health_score(cases, self.STATISTICS)
+        result = rescore(load_score_features(path), self.STATISTICS)
+
+        assert result["cases"]["case_number"].tolist() == [c["case_number"] for c in cases]
+        assert result["cases"]["criticality_score"].tolist() == [c["criticality_score"] for c in cases]
+        assert result["health_score"] == health_score
+        assert result["score_breakdown"] == breakdown
+
+    def test_alternate_weights(self):
+        features = score_feature_table(self._cases())
+        base = rescore(features, self.STATISTICS)
+        heavier = rescore(features, self.STATISTICS, ScoreWeights.from_dict({"severity": {"S1": 100}}))
+
+        s1 = features.loc[features["severity"] == "S1", "case_number"]
+        base_scores = base["cases"].set_index("case_number")["criticality_score"]
+        heavier_scores = heavier["cases"].set_index("case_number")["criticality_score"]
+        assert ((heavier_scores[s1] - base_scores[s1]).round(1) == 100 - ScoreWeights().severity["S1"]).all()
+
+        lowered = rescore(features, self.STATISTICS, ScoreWeights.from_dict({"critical_threshold": 0}))
+        assert lowered["critical_cases"] == len(features)
+
+    def test_sensitivity_sweep(self):
+        features = score_feature_table(self._cases())
+        profiles = {
+            "base": ScoreWeights(),
+            "strict": ScoreWeights.from_dict({"critical_threshold": 100, "catastrophic_threshold": 120}),
+        }
+        table = sensitivity_sweep(features, self.STATISTICS, profiles)
+
+        assert table["profile"].tolist() == ["base", "strict"]
+        assert table.loc[0, "health_score"] == rescore(features, self.STATISTICS)["health_score"]
+        assert table.loc[1, "critical_cases"] >= table.loc[0, "critical_cases"]
+        assert len(table.loc[0, "top_cases"]) == 5
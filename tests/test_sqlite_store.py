@@ -0,0 +1,121 @@
+"""
+SQLite Store Tests
+
+Validates LinkedDataDB persistence of linked data:
+- Round trip of orders, records, messages, orphans and evaluation fields
+- Slice queries across severity, product series and fiscal period
+- Layer results stored as JSON per record key
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.models import Opportunity, Deployment, SupportCase, ProductSeries, Severity
+from src.data.data_linker import LinkedDataStore, link_data_sources
+from src.data.sqlite_store import LinkedDataDB
+
+
+def _store():
+    opportunities = [
+        Opportunity(order_number="5001", opportunity_name="ACME F100", account_name="ACME",
+                    primary_product="F100", fiscal_period="FY25 Q3", amount=125000.0,
+                    close_date=datetime(2024, 8, 1)),
+        Opportunity(order_number="5002", opportunity_name="Globex M50", account_name="Globex",
+                    primary_product="M50", fiscal_period="FY25 Q3"),
+    ]
+    deployments = [
+        Deployment(case_number="D1", order_number="5001", account_name="ACME",
+                   product_series=ProductSeries.F_SERIES, is_service_deploy=True,
+                   messages=["Racked and cabled", "Pool created"]),
+    ]
+    cases = [
+        SupportCase(case_number="C1", order_number="5001", account_name="ACME",
+                    severity=Severity.S1, product_series=ProductSeries.F_SERIES,
+                    message_date=datetime(2024, 9, 2, 10, 30), messages=["Pool offline", "Replaced HBA"],
+                    from_addresses=["ops@acme.example"]),
+        SupportCase(case_number="C2", order_number="5002", account_name="Globex",
+                    severity=Severity.S1, product_series=ProductSeries.M_SERIES),
+        SupportCase(case_number="C3", order_number="5001", account_name="ACME",
+                    severity=Severity.S3, product_series=ProductSeries.F_SERIES),
+        SupportCase(case_number="C4", order_number="", account_name="Initech"),
+    ]
+    store = link_data_sources(opportunities, deployments, cases)
+    order = store.get_order("5001")
+    order.churn_risk = "High"
+    order.critical_findings = ["Repeated pool outages"]
+    return store
+
+
+class TestRoundTrip:
+    """A written store loads back unchanged."""
+
+    def test_load_store(self, tmp_path):
+        store = _store()
+        path = tmp_path / "linked.db"
+        store.to_sqlite(path)
+
+        loaded = LinkedDataStore.from_sqlite(path)
+
+        assert sorted(o.order_number for o in loaded.orders) == ["5001", "5002"]
+        order = loaded.get_order("5001")
+        assert order.churn_risk == "High"
+        assert order.critical_findings == ["Repeated pool outages"]
+        assert order.opportunity.amount == 125000.0
+        assert order.opportunity.close_date == datetime(2024, 8, 1)
+        assert order.deployments[0].is_service_deploy is True
+        assert order.deployments[0].messages == ["Racked and cabled", "Pool created"]
+
+        case = next(c for c in order.support_cases if c.case_number == "C1")
+        assert case.severity is Severity.S1
+        assert case.message_date == datetime(2024, 9, 2, 10, 30)
+        assert case.messages == ["Pool offline", "Replaced HBA"]
+        assert case.from_addresses == ["ops@acme.example"]
+
+        assert [c.case_number for c in loaded.orphan_cases] == ["C4"]
+        assert loaded.summary == store.summary
+
+
+class TestQueries:
+    """Slices are fetched without loading the whole store."""
+
+    def test_cases_by_severity_series_and_period(self, tmp_path):
+        with LinkedDataDB.write(_store(), tmp_path / "linked.db") as db:
+            cases = db.cases(severity="S1", product_series="F-Series", fiscal_period="FY25 Q3")
+            assert [c.case_number for c in cases] == ["C1"]
+            assert cases[0].messages == ["Pool offline", "Replaced HBA"]
+
+            assert sorted(c.case_number for c in db.cases(severity="S1")) == ["C1", "C2"]
+            assert db.cases(account="Initech", with_messages=False)[0].case_number == "C4"
+
+    def test_orders_and_deployments(self, tmp_path):
+        with LinkedDataDB.write(_store(), tmp_path / "linked.db") as db:
+            orders = db.orders(churn_risk="High")
+            assert [o.order_number for o in orders] == ["5001"]
+            assert len(orders[0].support_cases) == 2
+
+            assert [d.case_number for d in db.deployments(is_service_deploy=True)] == ["D1"]
+            assert [o.opportunity_name for o in db.opportunities(product_series="M")] == ["Globex M50"]
+
+    def test_orders_by_number(self, tmp_path, monkeypatch):
+        with LinkedDataDB.write(_store(), tmp_path / "linked.db") as db:
+            table_order = [o.order_number for o in db.orders()]
+
+            # Batched lookups come back in table order
+            monkeypatch.setattr("src.data.sqlite_store._MAX_PARAMS", 1)
+            orders = db.orders(order_numbers=["5002", "9999", "5001", "5002"])
+            assert [o.order_number for o in orders] == table_order
+            assert len(db.orders(order_numbers=["5001"])[0].support_cases) == 2
+
+            assert [o.order_number for o in db.orders(account="Globex", order_numbers=["5001", "5002"])] == ["5002"]
+            assert db.orders(order_numbers=[]) == []
+
+    def test_layer_results(self, tmp_path):
+        results = {"evaluation": {"5001": {"journey_health_score": 40}}}
+        with LinkedDataDB.write(_store(), tmp_path / "linked.db", layer_results=results) as db:
+            assert db.layer_results("evaluation") == {"5001": {"journey_health_score": 40}}
+            assert db.layer_results("evaluation", "5002") == {}